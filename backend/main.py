@@ -5,9 +5,10 @@ main.py - FastAPI 應用程式主入口
 
 import os
 import sys
-from fastapi import FastAPI, Request
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
 # 添加專案根目錄到 Python 路徑
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -18,17 +19,45 @@ from src.core.config import settings
 # 導入所有 schema 以確保外鍵引用正確解析
 from src.contexts.user.infra.schema.user import User
 
+from src.shared.api.json_codec import FastJSONResponse
+from src.shared.api.static_responses import StaticResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """應用程式生命週期：啟動時開始監控事件迴圈，結束時停止監控並寫入最後一次指標 snapshot"""
+    if settings.api.enable_loop_watchdog:
+        from src.core.diagnostics import loop_watchdog
+        loop_watchdog.start()
+    try:
+        yield
+    finally:
+        if settings.api.enable_loop_watchdog:
+            await loop_watchdog.stop()
+        if settings.api.enable_metrics:
+            from src.core.metrics import get_multiprocess_store
+            store = get_multiprocess_store()
+            if store is not None:
+                # 等待背景執行緒結束並寫檔，不佔用事件迴圈
+                await run_in_threadpool(store.stop)
+
 # 建立 FastAPI 應用程式
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.api.title,
     description=settings.api.description,
     version=settings.api.version_info,
     docs_url=settings.api.docs_url,
     redoc_url=settings.api.redoc_url,
+    default_response_class=FastJSONResponse,
     openapi_tags=[
         {
             "name": "使用者管理",
             "description": "使用者相關的 API 操作，包括註冊、登入、查詢等"
+        },
+        {
+            "name": "批次請求",
+            "description": "在一次 HTTP 請求中執行多個 API 呼叫"
         }
     ]
 )
@@ -64,21 +93,32 @@ def custom_openapi():
         {
             "name": "使用者管理",
             "description": "使用者相關的 API 操作，包括註冊、登入、查詢等"
+        },
+        {
+            "name": "批次請求",
+            "description": "在一次 HTTP 請求中執行多個 API 呼叫"
         }
     ]
     
     # 為需要認證的端點添加安全要求
     protected_paths = [
         "/users/me",
+        "/users/export",
+        "/users/changes",
         "/users/{user_id}",
         "/users/{user_id}/password", 
         "/users/{user_id}/email"
     ]
     
+    # 需要完全比對的端點（"/users" 會以子字串比對到 /users/register 與 /users/login）
+    protected_exact_paths = [
+        "/users"
+    ]
+    
     for path in openapi_schema["paths"]:
         for method in openapi_schema["paths"][path]:
             # 檢查是否為需要認證的端點
-            if any(protected_path in path for protected_path in protected_paths):
+            if path in protected_exact_paths or any(protected_path in path for protected_path in protected_paths):
                 openapi_schema["paths"][path][method]["security"] = [{"BearerAuth": []}]
     
     app.openapi_schema = openapi_schema
@@ -86,6 +126,28 @@ def custom_openapi():
 
 app.openapi = custom_openapi
 
+# OpenAPI 文件在第一次請求時產生並編碼一次，之後直接回傳同一份位元組（支援 If-None-Match）
+_openapi_response = None
+
+
+def get_openapi_response() -> StaticResponse:
+    """取得預先編碼的 OpenAPI 文件回應"""
+    global _openapi_response
+    if _openapi_response is None:
+        _openapi_response = StaticResponse.json(app.openapi(), cache_control="public, no-cache", etag=True)
+    return _openapi_response
+
+
+# 以預先編碼的版本取代 FastAPI 內建的 OpenAPI 路由（內建路由每次請求都重新編碼）
+app.router.routes = [route for route in app.router.routes if getattr(route, "path", None) != app.openapi_url]
+
+
+@app.get(app.openapi_url, include_in_schema=False)
+async def openapi_document(request: Request):
+    """OpenAPI 文件"""
+    return get_openapi_response().for_request(request)
+
+
 # 設定 CORS
 app.add_middleware(
     CORSMiddleware,
@@ -99,20 +161,67 @@ app.add_middleware(
 from src.core.middleware.auth import AuthMiddleware
 app.add_middleware(AuthMiddleware)
 
+# 添加請求限制中介軟體（請求大小、處理期限，在認證之前拒絕過大的請求）
+from src.core.middleware.limits import RequestLimitsMiddleware
+app.add_middleware(RequestLimitsMiddleware)
+
+# 添加回應壓縮中介軟體（認證錯誤等回應也會經過）
+if settings.api.compression_enabled:
+    from src.core.middleware.compression import CompressionMiddleware
+    app.add_middleware(CompressionMiddleware)
+
+# 添加追蹤中介軟體（每個請求一個 server span，認證、Use Case、Repository、SQL 為其子 span）
+if settings.api.enable_tracing:
+    from src.core.middleware.tracing import TracingMiddleware
+    app.add_middleware(TracingMiddleware)
+
+# 添加請求上下文中介軟體（最外層，每個請求輸出一行存取日誌）
+from src.core.middleware.request_context import RequestContextMiddleware
+app.add_middleware(RequestContextMiddleware)
+
 # 全域異常處理器
+INTERNAL_ERROR_RESPONSE = StaticResponse.json(
+    {
+        "data": None,
+        "error": {
+            "code": "InternalServerError",
+            "message": "Internal server error"
+        }
+    },
+    status_code=500,
+    cache_control="no-store"
+)
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """全域異常處理器"""
-    return JSONResponse(
-        status_code=500,
-        content={
-            "data": None,
-            "error": {
-                "code": "InternalServerError",
-                "message": "Internal server error"
-            }
-        }
-    )
+    return INTERNAL_ERROR_RESPONSE
+
+# 健康檢查與根路徑的回應內容固定，啟動時預先編碼
+HEALTH_RESPONSE = StaticResponse.json(
+    {
+        "data": {
+            "status": "healthy",
+            "message": "Base API is running"
+        },
+        "error": None
+    },
+    cache_control="no-store"
+)
+
+ROOT_RESPONSE = StaticResponse.json(
+    {
+        "data": {
+            "message": "Welcome to Base API",
+            "version": "1.0.0",
+            "docs": "/docs"
+        },
+        "error": None
+    },
+    cache_control="public, max-age=300",
+    etag=True
+)
 
 # 健康檢查端點
 @app.get(
@@ -145,18 +254,58 @@ async def health_check():
     
     返回服務狀態和運行訊息。
     """
-    return {
-        "data": {
-            "status": "healthy",
-            "message": "Base API is running"
-        },
-        "error": None
-    }
+    return HEALTH_RESPONSE
 
 # 包含 User API 路由
 from src.contexts.user.api.routes import router as user_router
 app.include_router(user_router)
 
+# 包含批次請求路由
+from src.shared.api.batch import router as batch_router
+app.include_router(batch_router)
+
+# 包含管理端點路由
+from src.shared.api.admin import router as admin_router
+app.include_router(admin_router)
+
+# bcrypt 耗時記錄到請求的 password_hash 階段、指標與追蹤（領域層只提供觀察者掛鉤，不依賴 core）
+from src.contexts.user.domain.entities import PasswordHash
+from src.core.context.request_context import add_request_timing
+from src.core.metrics import PASSWORD_HASH_DURATION
+from src.core.tracing import tracer
+
+
+def observe_password_hash(operation: str, seconds: float):
+    """記錄一次 bcrypt 雜湊或驗證的耗時"""
+    add_request_timing("password_hash", seconds * 1000)
+    PASSWORD_HASH_DURATION.observe(seconds, operation)
+    tracer.record_span(f"bcrypt.{operation}", seconds)
+
+
+PasswordHash.set_timing_observer(observe_password_hash)
+
+# Prometheus 指標端點（API_ENABLE_METRICS=false 時不提供）
+if settings.api.enable_metrics:
+    from src.core.logger.logger import logger
+    from src.core.metrics import PROMETHEUS_CONTENT_TYPE, get_multiprocess_store, render_metrics
+    from src.shared.api.admin import require_metrics_access
+    from src.shared.api.api_wrapper import api_response_with_logging
+
+    # 多 worker 模式下每個 worker 啟動時即開始定期寫入 snapshot
+    get_multiprocess_store()
+
+    @app.get(settings.api.metrics_url, include_in_schema=False)
+    async def metrics(request: Request):
+        """Prometheus 指標（文字格式，需要抓取 token 或 admin 角色）"""
+        try:
+            require_metrics_access(request)
+        except Exception as e:
+            logger.api_error("MetricsError", str(e))
+            return api_response_with_logging(e, request)
+        # 多 worker 模式會寫入 snapshot 並讀取所有 worker 的檔案，不在事件迴圈上執行
+        body = await run_in_threadpool(render_metrics)
+        return Response(body, headers={"Content-Type": PROMETHEUS_CONTENT_TYPE})
+
 # 根路徑
 @app.get(
     "/",
@@ -181,7 +330,7 @@ app.include_router(user_router)
         }
     }
 )
-async def root():
+async def root(request: Request):
     """
     API 根路徑
     
@@ -189,14 +338,7 @@ async def root():
     
     提供 Swagger UI 文檔的連結。
     """
-    return {
-        "data": {
-            "message": "Welcome to Base API",
-            "version": "1.0.0",
-            "docs": "/docs"
-        },
-        "error": None
-    }
+    return ROOT_RESPONSE.for_request(request)
 
 if __name__ == "__main__":
     import uvicorn
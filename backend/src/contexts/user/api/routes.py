@@ -3,9 +3,9 @@ routes.py - User API Routes
 提供 User Context 的 API 端點
 """
 
-from fastapi import APIRouter, Request, Depends
+from fastapi import APIRouter, Request, Depends, Query
 from fastapi.responses import JSONResponse
-from typing import Tuple
+from typing import Tuple, Optional, Literal, List, Sequence, Set
 
 from src.contexts.user.app import (
     RegisterUserUseCase,
@@ -14,6 +14,10 @@ from src.contexts.user.app import (
     ChangeEmailUseCase,
     GetUserUseCase,
     GetCurrentUserUseCase,
+    ListUsersUseCase,
+    ExportUsersUseCase,
+    GetUsersByIdsUseCase,
+    GetUserChangesUseCase,
     RegisterUserInputDTO,
     RegisterUserOutputDTO,
     LoginUserInputDTO,
@@ -24,17 +28,30 @@ from src.contexts.user.app import (
     ChangeEmailOutputDTO,
     GetUserInputDTO,
     GetUserOutputDTO,
-    GetCurrentUserOutputDTO
+    GetCurrentUserOutputDTO,
+    USER_FIELDS,
+    CURRENT_USER_FIELDS,
+    ListUsersInputDTO,
+    ListUsersOutputDTO,
+    GetUsersByIdsInputDTO,
+    GetUsersByIdsOutputDTO,
+    GetUserChangesInputDTO,
+    GetUserChangesOutputDTO
 )
 from src.contexts.user.infra.repositories.user_repository_impl import UserRepositoryImpl
 from src.contexts.user.domain.services.user_domain_service import UserDomainService
 from src.shared.api.api_wrapper import api_response_with_logging
+from src.shared.api.streaming import ndjson_response, NDJSON_MEDIA_TYPE
+from src.shared.api.etag import make_etag, etag_matches, not_modified_response, apply_cache_headers
+from src.shared.api.fields import parse_fields
+from src.shared.api.json_codec import FastJSONRoute
 from src.shared.api.responses import (
     success_response,
     error_response,
     combine_responses,
     get_swagger_jwt_example
 )
+from src.shared.errors.domain_error.validation_error import ValidationError
 from src.core.config import settings
 from src.core.logger.logger import logger
 
@@ -43,6 +60,7 @@ from src.core.logger.logger import logger
 router = APIRouter(
     prefix="/users", 
     tags=["使用者管理"],
+    route_class=FastJSONRoute,
     responses=error_response(500, "InternalServerError", "Internal server error", "內部伺服器錯誤")
 )
 
@@ -102,6 +120,83 @@ def get_current_user_use_case(
     return GetCurrentUserUseCase(user_domain_service)
 
 
+def get_list_users_use_case(
+    user_domain_service: UserDomainService = Depends(get_user_domain_service)
+) -> ListUsersUseCase:
+    """取得 List Users Use Case 依賴"""
+    return ListUsersUseCase(user_domain_service)
+
+
+def get_export_users_use_case(
+    user_domain_service: UserDomainService = Depends(get_user_domain_service)
+) -> ExportUsersUseCase:
+    """取得 Export Users Use Case 依賴"""
+    return ExportUsersUseCase(user_domain_service)
+
+
+def get_users_by_ids_use_case(
+    user_domain_service: UserDomainService = Depends(get_user_domain_service)
+) -> GetUsersByIdsUseCase:
+    """取得 Get Users By Ids Use Case 依賴"""
+    return GetUsersByIdsUseCase(user_domain_service)
+
+
+def get_user_changes_use_case(
+    user_domain_service: UserDomainService = Depends(get_user_domain_service)
+) -> GetUserChangesUseCase:
+    """取得 Get User Changes Use Case 依賴"""
+    return GetUserChangesUseCase(user_domain_service)
+
+
+def _parse_ids(raw_ids: str) -> List[int]:
+    """
+    解析以逗號分隔的使用者 ID
+    
+    Args:
+        raw_ids: 例如 "1,2,3"
+        
+    Returns:
+        使用者 ID 列表
+        
+    Raises:
+        ValidationError: 含有非整數的 ID
+    """
+    try:
+        return [int(part) for part in raw_ids.split(",") if part.strip()]
+    except ValueError:
+        raise ValidationError("ids must be a comma-separated list of integers")
+
+
+def _excluded_fields(fields: Optional[List[str]], allowed: Sequence[str]) -> Optional[Set[str]]:
+    """
+    計算稀疏欄位查詢時不輸出的欄位
+    
+    Args:
+        fields: parse_fields 的結果（None 表示全部）
+        allowed: 可選擇的欄位
+        
+    Returns:
+        不輸出的欄位集合，沒有要排除的欄位時為 None
+    """
+    if fields is None:
+        return None
+    return set(allowed).difference(fields) or None
+
+
+def _etag_resource(resource: str, fields: Optional[List[str]]) -> str:
+    """
+    ETag 的表示方式名稱：不同欄位組合是同一資源的不同表示
+    
+    Args:
+        resource: 資源名稱
+        fields: parse_fields 的結果（None 表示全部）
+        
+    Returns:
+        例如 "user" 或 "user[id,email]"
+    """
+    return resource if fields is None else f"{resource}[{','.join(fields)}]"
+
+
 @router.post(
     "/register",
     summary="註冊使用者",
@@ -137,7 +232,7 @@ async def register_user(
         result = register_use_case.execute(input_dto)
         
         # 使用 API 回應包裝器
-        return api_response_with_logging(result.model_dump(), request)
+        return api_response_with_logging(result, request)
         
     except Exception as e:
         logger.api_error("RegisterUserError", str(e))
@@ -182,13 +277,199 @@ async def login_user(
         result = login_use_case.execute(input_dto)
         
         # 使用 API 回應包裝器
-        return api_response_with_logging(result.model_dump(), request)
+        return api_response_with_logging(result, request)
         
     except Exception as e:
         logger.api_error("LoginUserError", str(e))
         return api_response_with_logging(e, request)
 
 
+@router.get(
+    "",
+    summary="查詢使用者列表",
+    description="以游標分頁查詢使用者列表，每一頁的查詢成本與頁數深度無關；帶入 ids 時改為以 ID 批次查詢",
+    response_description="返回一頁使用者與下一頁的游標；批次查詢時返回以 ID 為鍵的使用者與不存在的 ID",
+    responses=combine_responses(
+        success_response(
+            {
+                "items": [{"id": 1, "username": "alice", "email": "alice@example.com"}],
+                "next_cursor": "eyJzIjoiaWQiLCJrIjp7ImlkIjoxfX0",
+                "has_more": True,
+                "limit": 20
+            },
+            "查詢成功（分頁）"
+        ),
+        error_response(401, "MissingTokenError", "Missing Authorization header", "JWT token 無效或過期"),
+        error_response(422, "ValidationError", "Invalid pagination cursor", "分頁參數或游標無效")
+    )
+)
+async def list_users(
+    request: Request,
+    limit: Optional[int] = Query(None, description="每頁筆數"),
+    cursor: Optional[str] = Query(None, description="上一頁回傳的 next_cursor"),
+    sort: Literal["id", "created_at"] = Query("id", description="排序方式"),
+    ids: Optional[str] = Query(None, description="以逗號分隔的使用者 ID（批次查詢，最多 max_page_size 個）"),
+    fields: Optional[str] = Query(None, description="以逗號分隔的回傳欄位，例如 username,email（id 一律回傳）"),
+    list_users_use_case: ListUsersUseCase = Depends(get_list_users_use_case),
+    get_users_by_ids_use_case: GetUsersByIdsUseCase = Depends(get_users_by_ids_use_case)
+):
+    """
+    查詢使用者列表
+    
+    以 keyset 游標分頁，取得下一頁時將上一頁的 `next_cursor` 原樣帶入 `cursor`。
+    
+    - **limit**: 每頁筆數（可選，預設與上限依 API 設定）
+    - **cursor**: 分頁游標（可選，第一頁不需提供）
+    - **sort**: 排序方式（`id` 或 `created_at`，換頁時需保持一致）
+    - **ids**: 以逗號分隔的使用者 ID（可選）。提供時忽略分頁參數，以單一查詢取回這些使用者，
+      回傳 `{"users": {id: 使用者}, "missing": [不存在的 ID]}`
+    - **fields**: 以逗號分隔的回傳欄位（可選，`id`、`username`、`email`），只查詢並回傳這些欄位
+    """
+    try:
+        selected_fields = parse_fields(fields, USER_FIELDS)
+        excluded = _excluded_fields(selected_fields, USER_FIELDS)
+        
+        if ids is not None:
+            logger.api_info("GET", "/users", ids=ids, fields=fields)
+            
+            # 批次查詢
+            result = get_users_by_ids_use_case.execute(
+                GetUsersByIdsInputDTO(ids=_parse_ids(ids), fields=selected_fields)
+            )
+            
+            return api_response_with_logging(
+                result,
+                request,
+                exclude={"users": {"__all__": excluded}} if excluded else None
+            )
+        
+        logger.api_info("GET", "/users", limit=limit, sort=sort, fields=fields)
+        
+        # 建立輸入 DTO
+        input_dto = ListUsersInputDTO(limit=limit, cursor=cursor, sort=sort, fields=selected_fields)
+        
+        # 呼叫 Use Case
+        result = list_users_use_case.execute(input_dto)
+        
+        # 使用 API 回應包裝器
+        return api_response_with_logging(
+            result,
+            request,
+            exclude={"items": {"__all__": excluded}} if excluded else None
+        )
+        
+    except Exception as e:
+        logger.api_error("ListUsersError", str(e))
+        return api_response_with_logging(e, request)
+
+
+@router.get(
+    "/export",
+    summary="匯出使用者",
+    description="以 NDJSON 串流匯出所有使用者，每行一筆",
+    response_description="NDJSON 串流（application/x-ndjson）",
+    responses=combine_responses(
+        {
+            200: {
+                "description": "匯出成功",
+                "content": {
+                    NDJSON_MEDIA_TYPE: {
+                        "example": '{"id":1,"username":"alice","email":"alice@example.com"}\n'
+                                   '{"id":2,"username":"bob","email":null}\n'
+                    }
+                }
+            }
+        },
+        error_response(401, "MissingTokenError", "Missing Authorization header", "JWT token 無效或過期")
+    )
+)
+async def export_users(
+    request: Request,
+    fields: Optional[str] = Query(None, description="以逗號分隔的回傳欄位，例如 username,email（id 一律回傳）"),
+    export_users_use_case: ExportUsersUseCase = Depends(get_export_users_use_case)
+):
+    """
+    匯出使用者
+    
+    依 ID 順序以 NDJSON 串流回傳所有使用者。資料透過伺服器端游標分批讀取，
+    伺服器記憶體用量與使用者總數無關；用戶端讀取較慢時，伺服器也會暫停讀取資料庫。
+    
+    - **fields**: 以逗號分隔的回傳欄位（可選，`id`、`username`、`email`），只查詢並回傳這些欄位
+    
+    **認證要求**: 需要在 Authorization header 中提供有效的 JWT token
+    """
+    try:
+        logger.api_info("GET", "/users/export", fields=fields)
+        
+        selected_fields = parse_fields(fields, USER_FIELDS)
+        
+        # 呼叫 Use Case（產生器，實際查詢在串流時才進行）
+        users = export_users_use_case.execute(fields=selected_fields)
+        
+        return ndjson_response(
+            users,
+            filename="users.ndjson",
+            include=set(selected_fields) if selected_fields else None
+        )
+        
+    except Exception as e:
+        logger.api_error("ExportUsersError", str(e))
+        return api_response_with_logging(e, request)
+
+
+@router.get(
+    "/changes",
+    summary="使用者增量同步",
+    description="查詢上次同步之後新增、修改或刪除的使用者，傳輸量與異動數量成正比",
+    response_description="返回異動的使用者、已刪除的使用者 ID 與下次同步的游標",
+    responses=combine_responses(
+        success_response(
+            {
+                "updated": [
+                    {"id": 1, "username": "alice", "email": "alice@example.com", "updated_at": "2024-01-01T00:00:00+00:00"}
+                ],
+                "deleted": [3],
+                "next_cursor": "eyJ1Ijp7InVwZGF0ZWRfYXQiOiIyMDI0LTAxLTAxIDAwOjAwOjAwKzAwOjAwIiwiaWQiOjF9LCJkIjpudWxsfQ",
+                "has_more": False
+            },
+            "查詢成功"
+        ),
+        error_response(401, "MissingTokenError", "Missing Authorization header", "JWT token 無效或過期"),
+        error_response(422, "ValidationError", "Invalid sync cursor", "同步游標無效")
+    )
+)
+async def get_user_changes(
+    request: Request,
+    since: Optional[str] = Query(None, description="上次同步回傳的 next_cursor"),
+    limit: Optional[int] = Query(None, description="最多回傳筆數"),
+    get_user_changes_use_case: GetUserChangesUseCase = Depends(get_user_changes_use_case)
+):
+    """
+    使用者增量同步
+    
+    第一次同步不帶 `since`，之後每次帶入上次回應的 `next_cursor`。
+    `has_more` 為 true 時表示還有異動，應立即以新的游標繼續同步。
+    
+    - **since**: 同步游標（可選）
+    - **limit**: 最多回傳筆數（可選，上限依 API 設定）
+    """
+    try:
+        logger.api_info("GET", "/users/changes", limit=limit)
+        
+        # 建立輸入 DTO
+        input_dto = GetUserChangesInputDTO(since=since, limit=limit)
+        
+        # 呼叫 Use Case
+        result = get_user_changes_use_case.execute(input_dto)
+        
+        # 使用 API 回應包裝器
+        return api_response_with_logging(result, request)
+        
+    except Exception as e:
+        logger.api_error("GetUserChangesError", str(e))
+        return api_response_with_logging(e, request)
+
+
 @router.get(
     "/me",
     summary="查詢當前登入者",
@@ -210,6 +491,7 @@ async def login_user(
 )
 async def get_current_user(
     request: Request,
+    fields: Optional[str] = Query(None, description="以逗號分隔的回傳欄位，例如 username,roles（id 一律回傳）"),
     get_current_user_use_case: GetCurrentUserUseCase = Depends(get_current_user_use_case)
 ):
     """
@@ -218,6 +500,10 @@ async def get_current_user(
     根據請求中的 JWT token 查詢當前登入使用者的詳細資訊。
     需要在請求 header 中包含有效的 Authorization token。
     
+    回應帶有 `ETag`，之後以 `If-None-Match` 重新查詢時，資料未變更會回傳 `304 Not Modified`（無內容）。
+    
+    - **fields**: 以逗號分隔的回傳欄位（可選，`id`、`username`、`email`、`roles`），只查詢並回傳這些欄位
+    
     **認證要求**: 需要在 Authorization header 中提供有效的 JWT token
     
     **使用步驟**:
@@ -247,13 +533,32 @@ async def get_current_user(
             from src.shared.errors.system_error.auth_error import MissingTokenError
             raise MissingTokenError("Invalid user ID format")
         
-        logger.api_info("GET", "/users/me", user_id=str(user_id_int))
+        logger.api_info("GET", "/users/me", user_id=str(user_id_int), fields=fields)
+        
+        selected_fields = parse_fields(fields, CURRENT_USER_FIELDS)
+        # 回應隨 token 的角色而不同，角色變更（重新登入）後 ETag 必須不同
+        roles = ",".join(sorted(user_info.get("roles") or []))
+        resource = f"{_etag_resource('me', selected_fields)};roles={roles}"
+        
+        # 條件式請求：只查詢版本，未變更時直接回傳 304；
+        # 沒有 If-None-Match 時不另外查詢版本，ETag 由載入的資料的 updated_at 產生
+        cache_control = settings.api.user_cache_control
+        if request.headers.get("If-None-Match"):
+            version = get_current_user_use_case.get_version(user_id_int)
+            if version is not None and etag_matches(request, make_etag(resource, user_id_int, version)):
+                return not_modified_response(make_etag(resource, user_id_int, version), cache_control)
         
         # 呼叫 Use Case
-        result = get_current_user_use_case.execute(user_id_int)
+        result = get_current_user_use_case.execute(user_id_int, fields=selected_fields)
         
         # 使用 API 回應包裝器
-        return api_response_with_logging(result.model_dump(), request)
+        response = api_response_with_logging(
+            result,
+            request,
+            exclude=_excluded_fields(selected_fields, CURRENT_USER_FIELDS)
+        )
+        etag = make_etag(resource, result.id, result.updated_at) if result.updated_at else None
+        return apply_cache_headers(response, etag, cache_control)
         
     except Exception as e:
         logger.api_error("GetCurrentUserError", str(e))
@@ -281,6 +586,7 @@ async def get_current_user(
 async def get_user(
     request: Request,
     user_id: int,
+    fields: Optional[str] = Query(None, description="以逗號分隔的回傳欄位，例如 username,email（id 一律回傳）"),
     get_user_use_case: GetUserUseCase = Depends(get_user_use_case)
 ):
     """
@@ -288,19 +594,39 @@ async def get_user(
     
     根據使用者 ID 查詢特定使用者的基本資訊。
     
+    回應帶有 `ETag`，之後以 `If-None-Match` 重新查詢時，資料未變更會回傳 `304 Not Modified`（無內容）。
+    
     - **user_id**: 使用者 ID（必填，整數）
+    - **fields**: 以逗號分隔的回傳欄位（可選，`id`、`username`、`email`），只查詢並回傳這些欄位
     """
     try:
-        logger.api_info("GET", f"/users/{user_id}", user_id=str(user_id))
+        logger.api_info("GET", f"/users/{user_id}", user_id=str(user_id), fields=fields)
+        
+        selected_fields = parse_fields(fields, USER_FIELDS)
+        resource = _etag_resource("user", selected_fields)
+        
+        # 條件式請求：只查詢版本，未變更時直接回傳 304；
+        # 沒有 If-None-Match 時不另外查詢版本，ETag 由載入的資料的 updated_at 產生
+        cache_control = settings.api.user_cache_control
+        if request.headers.get("If-None-Match"):
+            version = get_user_use_case.get_version(user_id)
+            if version is not None and etag_matches(request, make_etag(resource, user_id, version)):
+                return not_modified_response(make_etag(resource, user_id, version), cache_control)
         
         # 建立輸入 DTO
-        input_dto = GetUserInputDTO(id=user_id)
+        input_dto = GetUserInputDTO(id=user_id, fields=selected_fields)
         
         # 呼叫 Use Case
         result = get_user_use_case.execute(input_dto)
         
         # 使用 API 回應包裝器
-        return api_response_with_logging(result.model_dump(), request)
+        response = api_response_with_logging(
+            result,
+            request,
+            exclude=_excluded_fields(selected_fields, USER_FIELDS)
+        )
+        etag = make_etag(resource, result.id, result.updated_at) if result.updated_at else None
+        return apply_cache_headers(response, etag, cache_control)
         
     except Exception as e:
         logger.api_error("GetUserError", str(e))
@@ -344,7 +670,7 @@ async def change_password(
         result = change_password_use_case.execute(user_id, input_dto)
         
         # 使用 API 回應包裝器
-        return api_response_with_logging(result.model_dump(), request)
+        return api_response_with_logging(result, request)
         
     except Exception as e:
         logger.api_error("ChangePasswordError", str(e))
@@ -391,7 +717,7 @@ async def change_email(
         result = change_email_use_case.execute(user_id, input_dto)
         
         # 使用 API 回應包裝器
-        return api_response_with_logging(result.model_dump(), request)
+        return api_response_with_logging(result, request)
         
     except Exception as e:
         logger.api_error("ChangeEmailError", str(e))
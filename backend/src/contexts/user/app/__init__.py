@@ -14,7 +14,16 @@ from .dtos import (
     ChangeEmailOutputDTO,
     GetUserInputDTO,
     GetUserOutputDTO,
-    GetCurrentUserOutputDTO
+    GetCurrentUserOutputDTO,
+    USER_FIELDS,
+    CURRENT_USER_FIELDS,
+    ListUsersInputDTO,
+    ListUsersOutputDTO,
+    GetUsersByIdsInputDTO,
+    GetUsersByIdsOutputDTO,
+    GetUserChangesInputDTO,
+    GetUserChangesOutputDTO,
+    UserChangeDTO
 )
 
 from .use_cases import (
@@ -23,7 +32,11 @@ from .use_cases import (
     ChangePasswordUseCase,
     ChangeEmailUseCase,
     GetUserUseCase,
-    GetCurrentUserUseCase
+    GetCurrentUserUseCase,
+    ListUsersUseCase,
+    ExportUsersUseCase,
+    GetUsersByIdsUseCase,
+    GetUserChangesUseCase
 )
 
 from .errors import (
@@ -45,6 +58,15 @@ __all__ = [
     "GetUserInputDTO",
     "GetUserOutputDTO",
     "GetCurrentUserOutputDTO",
+    "USER_FIELDS",
+    "CURRENT_USER_FIELDS",
+    "ListUsersInputDTO",
+    "ListUsersOutputDTO",
+    "GetUsersByIdsInputDTO",
+    "GetUsersByIdsOutputDTO",
+    "GetUserChangesInputDTO",
+    "GetUserChangesOutputDTO",
+    "UserChangeDTO",
     
     # Use Cases
     "RegisterUserUseCase",
@@ -53,6 +75,10 @@ __all__ = [
     "ChangeEmailUseCase",
     "GetUserUseCase",
     "GetCurrentUserUseCase",
+    "ListUsersUseCase",
+    "ExportUsersUseCase",
+    "GetUsersByIdsUseCase",
+    "GetUserChangesUseCase",
     
     # Errors
     "UsernameAlreadyExistsError",
@@ -7,8 +7,11 @@ from .register_user_dto import RegisterUserInputDTO, RegisterUserOutputDTO
 from .login_user_dto import LoginUserInputDTO, LoginUserOutputDTO
 from .change_password_dto import ChangePasswordInputDTO, ChangePasswordOutputDTO
 from .change_email_dto import ChangeEmailInputDTO, ChangeEmailOutputDTO
-from .get_user_dto import GetUserInputDTO, GetUserOutputDTO
-from .get_current_user_dto import GetCurrentUserOutputDTO
+from .get_user_dto import GetUserInputDTO, GetUserOutputDTO, USER_FIELDS
+from .get_current_user_dto import GetCurrentUserOutputDTO, CURRENT_USER_FIELDS
+from .list_users_dto import ListUsersInputDTO, ListUsersOutputDTO
+from .get_users_by_ids_dto import GetUsersByIdsInputDTO, GetUsersByIdsOutputDTO
+from .get_user_changes_dto import GetUserChangesInputDTO, GetUserChangesOutputDTO, UserChangeDTO
 
 __all__ = [
     "RegisterUserInputDTO",
@@ -21,5 +24,14 @@ __all__ = [
     "ChangeEmailOutputDTO",
     "GetUserInputDTO",
     "GetUserOutputDTO",
-    "GetCurrentUserOutputDTO"
+    "GetCurrentUserOutputDTO",
+    "USER_FIELDS",
+    "CURRENT_USER_FIELDS",
+    "ListUsersInputDTO",
+    "ListUsersOutputDTO",
+    "GetUsersByIdsInputDTO",
+    "GetUsersByIdsOutputDTO",
+    "GetUserChangesInputDTO",
+    "GetUserChangesOutputDTO",
+    "UserChangeDTO"
 ]
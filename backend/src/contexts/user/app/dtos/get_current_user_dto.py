@@ -3,9 +3,13 @@ get_current_user_dto.py - 查詢當前登入者 DTO
 定義查詢當前登入者的輸出 DTO
 """
 
+from datetime import datetime
 from pydantic import BaseModel, Field
 from typing import List, Optional
 
+# 可透過 ?fields= 選擇的輸出欄位
+CURRENT_USER_FIELDS = ("id", "username", "email", "roles")
+
 
 class GetCurrentUserOutputDTO(BaseModel):
     """
@@ -18,6 +22,8 @@ class GetCurrentUserOutputDTO(BaseModel):
     username: str = Field(..., description="使用者名稱")
     email: Optional[str] = Field(None, description="電子郵件地址")
     roles: List[str] = Field(default_factory=list, description="使用者角色列表")
+    # 不輸出到回應，供產生 ETag 使用
+    updated_at: Optional[datetime] = Field(None, exclude=True, description="最後修改時間")
     
     class Config:
         json_schema_extra = {
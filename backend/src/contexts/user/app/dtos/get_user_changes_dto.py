@@ -0,0 +1,72 @@
+"""
+get_user_changes_dto.py - 使用者增量同步 DTO
+定義查詢使用者異動的輸入和輸出 DTO
+"""
+
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class GetUserChangesInputDTO(BaseModel):
+    """
+    使用者增量同步輸入 DTO
+    
+    對應規格：
+    { "since": "eyJ1Ijp7InVwZGF0ZWRfYXQiOi...", "limit": 100 }
+    """
+    since: Optional[str] = Field(None, description="上次同步回傳的 next_cursor，第一次同步不需提供")
+    limit: Optional[int] = Field(None, description="最多回傳筆數，未提供則使用預設值，超過上限時以上限計算")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "since": None,
+                "limit": 100
+            }
+        }
+
+
+class UserChangeDTO(BaseModel):
+    """
+    新增或修改的使用者
+    
+    對應規格：
+    { "id": 1, "username": "alice", "email": "alice@example.com", "updated_at": "2024-01-01T00:00:00+00:00" }
+    """
+    id: int = Field(..., description="使用者 ID")
+    username: str = Field(..., description="使用者名稱")
+    email: Optional[str] = Field(None, description="電子郵件地址")
+    updated_at: datetime = Field(..., description="最後修改時間")
+
+
+class GetUserChangesOutputDTO(BaseModel):
+    """
+    使用者增量同步輸出 DTO
+    
+    對應規格：
+    {
+      "updated": [{ "id": 1, "username": "alice", "email": "alice@example.com", "updated_at": "..." }],
+      "deleted": [3],
+      "next_cursor": "eyJ1Ijp7InVwZGF0ZWRfYXQiOi...",
+      "has_more": false
+    }
+    
+    next_cursor 一律回傳，用戶端保存後於下次同步帶入 since；has_more 為 true 時應立即繼續同步
+    """
+    updated: List[UserChangeDTO] = Field(default_factory=list, description="新增或修改的使用者")
+    deleted: List[int] = Field(default_factory=list, description="已刪除的使用者 ID")
+    next_cursor: str = Field(..., description="下次同步使用的游標")
+    has_more: bool = Field(False, description="是否還有尚未回傳的異動")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "updated": [
+                    {"id": 1, "username": "alice", "email": "alice@example.com", "updated_at": "2024-01-01T00:00:00+00:00"}
+                ],
+                "deleted": [3],
+                "next_cursor": "eyJ1Ijp7InVwZGF0ZWRfYXQiOiIyMDI0LTAxLTAxIDAwOjAwOjAwKzAwOjAwIiwiaWQiOjF9LCJkIjpudWxsfQ",
+                "has_more": False
+            }
+        }
@@ -3,8 +3,12 @@ get_user_dto.py - 查詢使用者資訊 DTO
 定義查詢使用者資訊的輸入和輸出 DTO
 """
 
+from datetime import datetime
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
+
+# 可透過 ?fields= 選擇的輸出欄位
+USER_FIELDS = ("id", "username", "email")
 
 
 class GetUserInputDTO(BaseModel):
@@ -15,6 +19,7 @@ class GetUserInputDTO(BaseModel):
     { "id": 1 }
     """
     id: int = Field(..., gt=0, description="使用者 ID")
+    fields: Optional[List[str]] = Field(None, description="只回傳這些欄位（None 表示全部）")
     
     class Config:
         json_schema_extra = {
@@ -34,6 +39,8 @@ class GetUserOutputDTO(BaseModel):
     id: int = Field(..., description="使用者 ID")
     username: str = Field(..., description="使用者名稱")
     email: Optional[str] = Field(None, description="電子郵件地址")
+    # 不輸出到回應，供產生 ETag 使用
+    updated_at: Optional[datetime] = Field(None, exclude=True, description="最後修改時間")
     
     class Config:
         json_schema_extra = {
@@ -0,0 +1,55 @@
+"""
+get_users_by_ids_dto.py - 批次查詢使用者 DTO
+定義以多個 ID 一次查詢使用者的輸入和輸出 DTO
+"""
+
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+from .get_user_dto import GetUserOutputDTO
+
+
+class GetUsersByIdsInputDTO(BaseModel):
+    """
+    批次查詢使用者輸入 DTO
+    
+    對應規格：
+    { "ids": [1, 2, 3] }
+    """
+    ids: List[int] = Field(..., description="使用者 ID 列表")
+    fields: Optional[List[str]] = Field(None, description="只回傳這些欄位（None 表示全部）")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "ids": [1, 2, 3]
+            }
+        }
+
+
+class GetUsersByIdsOutputDTO(BaseModel):
+    """
+    批次查詢使用者輸出 DTO
+    
+    對應規格：
+    {
+      "users": {
+        "1": { "id": 1, "username": "alice", "email": "alice@example.com" },
+        "2": { "id": 2, "username": "bob", "email": null }
+      },
+      "missing": [3]
+    }
+    """
+    users: Dict[int, GetUserOutputDTO] = Field(default_factory=dict, description="以使用者 ID 為鍵的使用者資訊")
+    missing: List[int] = Field(default_factory=list, description="不存在的使用者 ID")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "users": {
+                    "1": {"id": 1, "username": "alice", "email": "alice@example.com"},
+                    "2": {"id": 2, "username": "bob", "email": None}
+                },
+                "missing": [3]
+            }
+        }
@@ -0,0 +1,46 @@
+"""
+list_users_dto.py - 使用者列表 DTO
+定義分頁查詢使用者列表的輸入和輸出 DTO
+"""
+
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+
+from src.shared.dto.pagination_dto import PaginationDTO
+from .get_user_dto import GetUserOutputDTO
+
+
+class ListUsersInputDTO(BaseModel):
+    """
+    使用者列表輸入 DTO
+    
+    對應規格：
+    { "limit": 20, "cursor": null, "sort": "id" }
+    """
+    limit: Optional[int] = Field(None, description="每頁筆數，未提供則使用預設值，超過上限時以上限計算")
+    cursor: Optional[str] = Field(None, description="上一頁回傳的 next_cursor，第一頁不需提供")
+    sort: Literal["id", "created_at"] = Field("id", description="排序方式")
+    fields: Optional[List[str]] = Field(None, description="只回傳這些欄位（None 表示全部）")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "limit": 20,
+                "cursor": None,
+                "sort": "id"
+            }
+        }
+
+
+class ListUsersOutputDTO(PaginationDTO[GetUserOutputDTO]):
+    """
+    使用者列表輸出 DTO
+    
+    對應規格：
+    {
+      "items": [{ "id": 1, "username": "alice", "email": "alice@example.com" }],
+      "next_cursor": "eyJzIjoiaWQiLCJrIjp7ImlkIjoxfX0",
+      "has_more": true,
+      "limit": 20
+    }
+    """
@@ -9,6 +9,10 @@ from .change_password_use_case import ChangePasswordUseCase
 from .change_email_use_case import ChangeEmailUseCase
 from .get_user_use_case import GetUserUseCase
 from .get_current_user_use_case import GetCurrentUserUseCase
+from .list_users_use_case import ListUsersUseCase
+from .export_users_use_case import ExportUsersUseCase
+from .get_users_by_ids_use_case import GetUsersByIdsUseCase
+from .get_user_changes_use_case import GetUserChangesUseCase
 
 __all__ = [
     "RegisterUserUseCase",
@@ -16,5 +20,9 @@ __all__ = [
     "ChangePasswordUseCase",
     "ChangeEmailUseCase",
     "GetUserUseCase",
-    "GetCurrentUserUseCase"
+    "GetCurrentUserUseCase",
+    "ListUsersUseCase",
+    "ExportUsersUseCase",
+    "GetUsersByIdsUseCase",
+    "GetUserChangesUseCase"
 ]
@@ -7,6 +7,7 @@ from src.contexts.user.app.dtos.change_email_dto import ChangeEmailInputDTO, Cha
 from src.contexts.user.domain.services.user_domain_service import UserDomainService
 from src.contexts.user.domain.errors import UserNotFoundError, InvalidEmailFormatError, EmailAlreadyExistsError
 from src.core.logger.logger import logger
+from src.core.tracing import tracer
 
 
 class ChangeEmailUseCase:
@@ -32,6 +33,7 @@ class ChangeEmailUseCase:
         """
         self.user_domain_service = user_domain_service
     
+    @tracer.traced()
     def execute(self, user_id: int, input_dto: ChangeEmailInputDTO) -> ChangeEmailOutputDTO:
         """
         執行修改 Email 流程
@@ -48,7 +50,7 @@ class ChangeEmailUseCase:
             InvalidEmailFormatError: Email 格式錯誤
             EmailAlreadyExistsError: Email 已存在
         """
-        logger.info(f"ChangeEmailUseCase.execute - user_id={user_id} new_email={input_dto.new_email}")
+        logger.info("ChangeEmailUseCase.execute - user_id=%s new_email=%s", user_id, input_dto.new_email)
         
         try:
             # 使用 Domain Service 修改 Email
@@ -64,21 +66,21 @@ class ChangeEmailUseCase:
                 email=user.email.value if user.email else None
             )
             
-            logger.info(f"ChangeEmailUseCase.execute - success user_id={user_id}")
+            logger.info("ChangeEmailUseCase.execute - success user_id=%s", user_id)
             return output_dto
             
         except UserNotFoundError as e:
-            logger.error(f"ChangeEmailUseCase.execute - UserNotFoundError: {e}")
+            logger.error("ChangeEmailUseCase.execute - UserNotFoundError: %s", e)
             raise
             
         except InvalidEmailFormatError as e:
-            logger.error(f"ChangeEmailUseCase.execute - InvalidEmailFormatError: {e}")
+            logger.error("ChangeEmailUseCase.execute - InvalidEmailFormatError: %s", e)
             raise
             
         except EmailAlreadyExistsError as e:
-            logger.error(f"ChangeEmailUseCase.execute - EmailAlreadyExistsError: {e}")
+            logger.error("ChangeEmailUseCase.execute - EmailAlreadyExistsError: %s", e)
             raise
             
         except Exception as e:
-            logger.error(f"ChangeEmailUseCase.execute - unexpected error: {e}")
+            logger.error("ChangeEmailUseCase.execute - unexpected error: %s", e)
             raise
@@ -7,6 +7,7 @@ from src.contexts.user.app.dtos.change_password_dto import ChangePasswordInputDT
 from src.contexts.user.domain.services.user_domain_service import UserDomainService
 from src.contexts.user.domain.errors import UserNotFoundError, InvalidPasswordError
 from src.core.logger.logger import logger
+from src.core.tracing import tracer
 
 
 class ChangePasswordUseCase:
@@ -33,6 +34,7 @@ class ChangePasswordUseCase:
         """
         self.user_domain_service = user_domain_service
     
+    @tracer.traced()
     def execute(self, user_id: int, input_dto: ChangePasswordInputDTO) -> ChangePasswordOutputDTO:
         """
         執行修改密碼流程
@@ -48,7 +50,7 @@ class ChangePasswordUseCase:
             UserNotFoundError: 使用者不存在
             InvalidPasswordError: 密碼錯誤
         """
-        logger.info(f"ChangePasswordUseCase.execute - user_id={user_id}")
+        logger.info("ChangePasswordUseCase.execute - user_id=%s", user_id)
         
         try:
             # 使用 Domain Service 修改密碼
@@ -63,17 +65,17 @@ class ChangePasswordUseCase:
                 message="Password updated successfully"
             )
             
-            logger.info(f"ChangePasswordUseCase.execute - success user_id={user_id}")
+            logger.info("ChangePasswordUseCase.execute - success user_id=%s", user_id)
             return output_dto
             
         except UserNotFoundError as e:
-            logger.error(f"ChangePasswordUseCase.execute - UserNotFoundError: {e}")
+            logger.error("ChangePasswordUseCase.execute - UserNotFoundError: %s", e)
             raise
             
         except InvalidPasswordError as e:
-            logger.error(f"ChangePasswordUseCase.execute - InvalidPasswordError: {e}")
+            logger.error("ChangePasswordUseCase.execute - InvalidPasswordError: %s", e)
             raise
             
         except Exception as e:
-            logger.error(f"ChangePasswordUseCase.execute - unexpected error: {e}")
+            logger.error("ChangePasswordUseCase.execute - unexpected error: %s", e)
             raise
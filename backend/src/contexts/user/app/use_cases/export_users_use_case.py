@@ -0,0 +1,67 @@
+"""
+export_users_use_case.py - 匯出使用者 Use Case
+實作串流匯出所有使用者的業務邏輯
+"""
+
+from typing import Iterator, List, Optional
+
+from src.contexts.user.app.dtos.get_user_dto import GetUserOutputDTO
+from src.contexts.user.domain.services.user_domain_service import UserDomainService
+from src.core.config import settings
+from src.core.logger.logger import logger
+from src.core.tracing import tracer
+
+
+class ExportUsersUseCase:
+    """
+    匯出使用者 Use Case
+    
+    流程：
+    1. UserRepository.stream_all(batch_size, fields)（伺服器端游標，指定 fields 時只載入這些欄位）
+    2. 逐筆轉換為輸出 DTO
+    
+    結果為產生器：呼叫端每取一筆才向資料庫要資料，
+    記憶體用量只與 batch_size 有關，與使用者總數無關
+    """
+    
+    def __init__(self, user_domain_service: UserDomainService):
+        """
+        初始化 ExportUsersUseCase
+        
+        Args:
+            user_domain_service: 使用者領域服務
+        """
+        self.user_domain_service = user_domain_service
+    
+    @tracer.traced()
+    def execute(
+        self,
+        batch_size: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[GetUserOutputDTO]:
+        """
+        執行匯出使用者流程
+        
+        Args:
+            batch_size: 每次從資料庫取回的筆數，未提供則使用 API 設定
+            fields: 只回傳這些欄位（None 表示全部）
+            
+        Yields:
+            GetUserOutputDTO: 使用者資訊輸出 DTO
+        """
+        batch_size = batch_size or settings.api.export_batch_size
+        logger.info("ExportUsersUseCase.execute - batch_size=%s fields=%s", batch_size, fields)
+        
+        # 欄位投影時未載入的欄位為 None，略過驗證，由 API 層只輸出選擇的欄位
+        to_output = GetUserOutputDTO.model_construct if fields else GetUserOutputDTO
+        
+        exported = 0
+        for user in self.user_domain_service.export_users(batch_size=batch_size, fields=fields):
+            yield to_output(
+                id=user.id,
+                username=user.username,
+                email=user.email.value if user.email else None
+            )
+            exported += 1
+        
+        logger.info("ExportUsersUseCase.execute - success count=%s", exported)
@@ -3,11 +3,15 @@ get_current_user_use_case.py - 查詢當前登入者 Use Case
 實作查詢當前登入者的業務邏輯
 """
 
+from datetime import datetime
+from typing import List, Optional
+
 from src.contexts.user.app.dtos.get_current_user_dto import GetCurrentUserOutputDTO
 from src.contexts.user.app.errors import UserNotAuthorizedError
 from src.contexts.user.domain.services.user_domain_service import UserDomainService
 from src.contexts.user.domain.errors import UserNotFoundError
 from src.core.logger.logger import logger
+from src.core.tracing import tracer
 
 
 class GetCurrentUserUseCase:
@@ -16,7 +20,7 @@ class GetCurrentUserUseCase:
     
     流程：
     1. 從 JWT 解析 user_id
-    2. UserRepository.find_by_id(user_id)
+    2. UserRepository.find_by_id(user_id, fields)（指定 fields 時只載入這些欄位與 updated_at）
     
     錯誤：
     - UserNotAuthorizedError (401)
@@ -32,12 +36,14 @@ class GetCurrentUserUseCase:
         """
         self.user_domain_service = user_domain_service
     
-    def execute(self, user_id: int) -> GetCurrentUserOutputDTO:
+    @tracer.traced()
+    def execute(self, user_id: int, fields: Optional[List[str]] = None) -> GetCurrentUserOutputDTO:
         """
         執行查詢當前登入者流程
         
         Args:
             user_id: 從 JWT 解析出的使用者 ID
+            fields: 只回傳這些欄位（None 表示全部）
             
         Returns:
             GetCurrentUserOutputDTO: 查詢當前登入者輸出 DTO
@@ -46,7 +52,7 @@ class GetCurrentUserUseCase:
             UserNotAuthorizedError: 使用者未授權
             UserNotFoundError: 使用者不存在
         """
-        logger.info(f"GetCurrentUserUseCase.execute - user_id={user_id}")
+        logger.info("GetCurrentUserUseCase.execute - user_id=%s", user_id)
         
         try:
             # 驗證 user_id 是否有效
@@ -54,27 +60,44 @@ class GetCurrentUserUseCase:
                 raise UserNotAuthorizedError("Invalid user ID")
             
             # 使用 Domain Service 查詢使用者
-            user = self.user_domain_service.get_user_by_id(user_id)
+            user = self.user_domain_service.get_user_by_id(
+                user_id,
+                fields=[*fields, "updated_at"] if fields else None
+            )
             
-            # 轉換為輸出 DTO
-            output_dto = GetCurrentUserOutputDTO(
+            # 轉換為輸出 DTO（欄位投影時未載入的欄位為 None，略過驗證，由 API 層只輸出選擇的欄位）
+            to_output = GetCurrentUserOutputDTO.model_construct if fields else GetCurrentUserOutputDTO
+            output_dto = to_output(
                 id=user.id,
                 username=user.username,
                 email=user.email.value if user.email else None,
-                roles=[user.role]  # 轉換為列表
+                roles=[user.role],  # 轉換為列表
+                updated_at=user.updated_at
             )
             
-            logger.info(f"GetCurrentUserUseCase.execute - success user_id={user.id}")
+            logger.info("GetCurrentUserUseCase.execute - success user_id=%s", user.id)
             return output_dto
             
         except UserNotFoundError as e:
-            logger.error(f"GetCurrentUserUseCase.execute - UserNotFoundError: {e}")
+            logger.error("GetCurrentUserUseCase.execute - UserNotFoundError: %s", e)
             raise
             
         except UserNotAuthorizedError as e:
-            logger.error(f"GetCurrentUserUseCase.execute - UserNotAuthorizedError: {e}")
+            logger.error("GetCurrentUserUseCase.execute - UserNotAuthorizedError: %s", e)
             raise
             
         except Exception as e:
-            logger.error(f"GetCurrentUserUseCase.execute - unexpected error: {e}")
+            logger.error("GetCurrentUserUseCase.execute - unexpected error: %s", e)
             raise UserNotAuthorizedError("Failed to get current user")
+    
+    def get_version(self, user_id: int) -> Optional[datetime]:
+        """
+        只查詢當前登入者的版本，用於在不載入使用者的情況下判斷是否可回傳 304
+        
+        Args:
+            user_id: 從 JWT 解析出的使用者 ID
+            
+        Returns:
+            使用者的 updated_at，如果不存在則回傳 None
+        """
+        return self.user_domain_service.get_user_version(user_id)
@@ -0,0 +1,171 @@
+"""
+get_user_changes_use_case.py - 使用者增量同步 Use Case
+實作查詢指定游標之後的使用者異動（新增/修改與刪除）的業務邏輯
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from src.contexts.user.app.dtos.get_user_changes_dto import (
+    GetUserChangesInputDTO,
+    GetUserChangesOutputDTO,
+    UserChangeDTO
+)
+from src.contexts.user.domain.services.user_domain_service import UserDomainService
+from src.shared.dto.pagination_dto import encode_cursor, decode_cursor, validate_keyset
+from src.shared.errors.domain_error.validation_error import ValidationError
+from src.core.config import settings
+from src.core.logger.logger import logger
+from src.core.tracing import tracer
+
+
+# 同步游標中兩個位置的欄位與型別
+UPDATED_CURSOR_KEYS = {"updated_at": datetime, "id": int}
+DELETED_CURSOR_KEYS = {"deleted_at": datetime, "user_id": int}
+
+
+class GetUserChangesUseCase:
+    """
+    使用者增量同步 Use Case
+    
+    流程：
+    1. 解碼游標，取得上次同步的兩個位置：
+       - u: users 的 (updated_at, id)
+       - d: user_tombstones 的 (deleted_at, user_id)
+    2. 兩個來源各取最多 limit 筆，依時間合併後取前 limit 筆
+    3. 以實際回傳的最後一筆更新各自的位置，編碼為 next_cursor
+    
+    只回傳 sync_safety_lag_seconds 之前的異動：updated_at 取自 transaction 開始時間，
+    較晚 commit 的 transaction 可能寫入較早的時間，延遲回傳可避免這些異動被游標跳過
+    
+    錯誤：
+    - ValidationError (422)
+    """
+    
+    def __init__(self, user_domain_service: UserDomainService):
+        """
+        初始化 GetUserChangesUseCase
+        
+        Args:
+            user_domain_service: 使用者領域服務
+        """
+        self.user_domain_service = user_domain_service
+    
+    @tracer.traced()
+    def execute(self, input_dto: GetUserChangesInputDTO) -> GetUserChangesOutputDTO:
+        """
+        執行使用者增量同步流程
+        
+        Args:
+            input_dto: 使用者增量同步輸入 DTO
+            
+        Returns:
+            GetUserChangesOutputDTO: 使用者增量同步輸出 DTO
+            
+        Raises:
+            ValidationError: 筆數或游標無效
+        """
+        logger.info("GetUserChangesUseCase.execute - limit=%s since=%s", input_dto.limit, 'set' if input_dto.since else 'none')
+        
+        try:
+            limit = self._resolve_limit(input_dto.limit)
+            updated_after, deleted_after = self._decode_since(input_dto.since)
+            until = datetime.now(timezone.utc) - timedelta(seconds=settings.api.sync_safety_lag_seconds)
+            
+            (users, users_next), (tombstones, tombstones_next) = self.user_domain_service.get_changes(
+                limit, updated_after, deleted_after, until
+            )
+            
+            # 依時間合併兩個來源，只取前 limit 筆
+            events = sorted(
+                [(user.updated_at, user.id, user) for user in users] +
+                [(deleted_at, user_id, None) for user_id, deleted_at in tombstones],
+                key=lambda event: (event[0], event[1])
+            )[:limit]
+            
+            updated = [user for _, _, user in events if user is not None]
+            deleted = [(user_id, deleted_at) for deleted_at, user_id, user in events if user is None]
+            
+            if updated:
+                updated_after = {"updated_at": updated[-1].updated_at, "id": updated[-1].id}
+            if deleted:
+                deleted_after = {"deleted_at": deleted[-1][1], "user_id": deleted[-1][0]}
+            
+            has_more = (
+                len(updated) < len(users) or users_next is not None or
+                len(deleted) < len(tombstones) or tombstones_next is not None
+            )
+            
+            output_dto = GetUserChangesOutputDTO(
+                updated=[
+                    UserChangeDTO(
+                        id=user.id,
+                        username=user.username,
+                        email=user.email.value if user.email else None,
+                        updated_at=user.updated_at
+                    )
+                    for user in updated
+                ],
+                deleted=[user_id for user_id, _ in deleted],
+                next_cursor=encode_cursor({"u": updated_after, "d": deleted_after}),
+                has_more=has_more
+            )
+            
+            logger.info(
+                "GetUserChangesUseCase.execute - success updated=%s deleted=%s has_more=%s",
+                len(output_dto.updated), len(output_dto.deleted), has_more
+            )
+            return output_dto
+            
+        except ValidationError as e:
+            logger.error("GetUserChangesUseCase.execute - ValidationError: %s", e)
+            raise
+            
+        except Exception as e:
+            logger.error("GetUserChangesUseCase.execute - unexpected error: %s", e)
+            raise
+    
+    def _resolve_limit(self, limit: Optional[int]) -> int:
+        """
+        決定最多回傳筆數
+        
+        Args:
+            limit: 請求的筆數
+            
+        Returns:
+            實際使用的筆數
+            
+        Raises:
+            ValidationError: 筆數小於 1
+        """
+        if limit is None:
+            return settings.api.default_page_size
+        if limit < 1:
+            raise ValidationError("limit must be greater than 0")
+        return min(limit, settings.api.max_page_size)
+    
+    def _decode_since(self, since: Optional[str]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        解碼同步游標
+        
+        Args:
+            since: 上次同步回傳的 next_cursor
+            
+        Returns:
+            (新增/修改的位置, 刪除的位置)，第一次同步皆為 None
+            
+        Raises:
+            ValidationError: 游標格式錯誤、缺少欄位或欄位值型別不符
+        """
+        if not since:
+            return None, None
+        
+        payload = decode_cursor(since)
+        updated_after, deleted_after = payload.get("u"), payload.get("d")
+        
+        if updated_after is not None:
+            updated_after = validate_keyset(updated_after, UPDATED_CURSOR_KEYS, "Invalid sync cursor")
+        if deleted_after is not None:
+            deleted_after = validate_keyset(deleted_after, DELETED_CURSOR_KEYS, "Invalid sync cursor")
+        
+        return updated_after, deleted_after
@@ -3,10 +3,14 @@ get_user_use_case.py - 查詢使用者資訊 Use Case
 實作查詢使用者資訊的業務邏輯
 """
 
+from datetime import datetime
+from typing import Optional
+
 from src.contexts.user.app.dtos.get_user_dto import GetUserInputDTO, GetUserOutputDTO
 from src.contexts.user.domain.services.user_domain_service import UserDomainService
 from src.contexts.user.domain.errors import UserNotFoundError
 from src.core.logger.logger import logger
+from src.core.tracing import tracer
 
 
 class GetUserUseCase:
@@ -14,7 +18,7 @@ class GetUserUseCase:
     查詢使用者資訊 Use Case
     
     流程：
-    1. UserRepository.find_by_id(id)
+    1. UserRepository.find_by_id(id, fields)（指定 fields 時只載入這些欄位與 updated_at）
     2. 若不存在 → UserNotFoundError
     
     錯誤：
@@ -30,6 +34,7 @@ class GetUserUseCase:
         """
         self.user_domain_service = user_domain_service
     
+    @tracer.traced()
     def execute(self, input_dto: GetUserInputDTO) -> GetUserOutputDTO:
         """
         執行查詢使用者資訊流程
@@ -43,26 +48,44 @@ class GetUserUseCase:
         Raises:
             UserNotFoundError: 使用者不存在
         """
-        logger.info(f"GetUserUseCase.execute - user_id={input_dto.id}")
+        logger.info("GetUserUseCase.execute - user_id=%s", input_dto.id)
         
         try:
             # 使用 Domain Service 查詢使用者
-            user = self.user_domain_service.get_user_by_id(input_dto.id)
+            fields = input_dto.fields
+            user = self.user_domain_service.get_user_by_id(
+                input_dto.id,
+                fields=[*fields, "updated_at"] if fields else None
+            )
             
-            # 轉換為輸出 DTO
-            output_dto = GetUserOutputDTO(
+            # 轉換為輸出 DTO（欄位投影時未載入的欄位為 None，略過驗證，由 API 層只輸出選擇的欄位）
+            to_output = GetUserOutputDTO.model_construct if fields else GetUserOutputDTO
+            output_dto = to_output(
                 id=user.id,
                 username=user.username,
-                email=user.email.value if user.email else None
+                email=user.email.value if user.email else None,
+                updated_at=user.updated_at
             )
             
-            logger.info(f"GetUserUseCase.execute - success user_id={user.id}")
+            logger.info("GetUserUseCase.execute - success user_id=%s", user.id)
             return output_dto
             
         except UserNotFoundError as e:
-            logger.error(f"GetUserUseCase.execute - UserNotFoundError: {e}")
+            logger.error("GetUserUseCase.execute - UserNotFoundError: %s", e)
             raise
             
         except Exception as e:
-            logger.error(f"GetUserUseCase.execute - unexpected error: {e}")
+            logger.error("GetUserUseCase.execute - unexpected error: %s", e)
             raise
+    
+    def get_version(self, user_id: int) -> Optional[datetime]:
+        """
+        只查詢使用者的版本，用於在不載入使用者的情況下判斷是否可回傳 304
+        
+        Args:
+            user_id: 使用者 ID
+            
+        Returns:
+            使用者的 updated_at，如果不存在則回傳 None
+        """
+        return self.user_domain_service.get_user_version(user_id)
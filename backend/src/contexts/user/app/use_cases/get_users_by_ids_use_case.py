@@ -0,0 +1,89 @@
+"""
+get_users_by_ids_use_case.py - 批次查詢使用者 Use Case
+實作以多個 ID 一次查詢使用者的業務邏輯
+"""
+
+from src.contexts.user.app.dtos.get_user_dto import GetUserOutputDTO
+from src.contexts.user.app.dtos.get_users_by_ids_dto import GetUsersByIdsInputDTO, GetUsersByIdsOutputDTO
+from src.contexts.user.domain.services.user_domain_service import UserDomainService
+from src.shared.errors.domain_error.validation_error import ValidationError
+from src.core.config import settings
+from src.core.logger.logger import logger
+from src.core.tracing import tracer
+
+
+class GetUsersByIdsUseCase:
+    """
+    批次查詢使用者 Use Case
+    
+    流程：
+    1. 檢查 ID 數量（1 ~ max_page_size）與格式，去除重複
+    2. UserRepository.find_by_ids(ids, fields)（單一 IN 查詢，指定 fields 時只載入這些欄位）
+    3. 以 ID 為鍵回傳結果，並列出不存在的 ID
+    
+    錯誤：
+    - ValidationError (422)
+    """
+    
+    def __init__(self, user_domain_service: UserDomainService):
+        """
+        初始化 GetUsersByIdsUseCase
+        
+        Args:
+            user_domain_service: 使用者領域服務
+        """
+        self.user_domain_service = user_domain_service
+    
+    @tracer.traced()
+    def execute(self, input_dto: GetUsersByIdsInputDTO) -> GetUsersByIdsOutputDTO:
+        """
+        執行批次查詢使用者流程
+        
+        Args:
+            input_dto: 批次查詢使用者輸入 DTO
+            
+        Returns:
+            GetUsersByIdsOutputDTO: 批次查詢使用者輸出 DTO
+            
+        Raises:
+            ValidationError: ID 數量超過上限或格式錯誤
+        """
+        logger.info("GetUsersByIdsUseCase.execute - count=%s", len(input_dto.ids))
+        
+        try:
+            # 保留請求順序並去除重複
+            user_ids = list(dict.fromkeys(input_dto.ids))
+            
+            if not user_ids:
+                raise ValidationError("ids must not be empty")
+            if len(user_ids) > settings.api.max_page_size:
+                raise ValidationError(f"Too many ids, maximum is {settings.api.max_page_size}")
+            if any(user_id <= 0 for user_id in user_ids):
+                raise ValidationError("ids must be positive integers")
+            
+            users = self.user_domain_service.get_users_by_ids(user_ids, fields=input_dto.fields)
+            
+            # 欄位投影時未載入的欄位為 None，略過驗證，由 API 層只輸出選擇的欄位
+            to_output = GetUserOutputDTO.model_construct if input_dto.fields else GetUserOutputDTO
+            output_dto = GetUsersByIdsOutputDTO(
+                users={
+                    user_id: to_output(
+                        id=users[user_id].id,
+                        username=users[user_id].username,
+                        email=users[user_id].email.value if users[user_id].email else None
+                    )
+                    for user_id in user_ids if user_id in users
+                },
+                missing=[user_id for user_id in user_ids if user_id not in users]
+            )
+            
+            logger.info("GetUsersByIdsUseCase.execute - success found=%s missing=%s", len(output_dto.users), len(output_dto.missing))
+            return output_dto
+            
+        except ValidationError as e:
+            logger.error("GetUsersByIdsUseCase.execute - ValidationError: %s", e)
+            raise
+            
+        except Exception as e:
+            logger.error("GetUsersByIdsUseCase.execute - unexpected error: %s", e)
+            raise
@@ -0,0 +1,144 @@
+"""
+list_users_use_case.py - 使用者列表 Use Case
+實作游標式分頁查詢使用者列表的業務邏輯
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from src.contexts.user.app.dtos.get_user_dto import GetUserOutputDTO
+from src.contexts.user.app.dtos.list_users_dto import ListUsersInputDTO, ListUsersOutputDTO
+from src.contexts.user.domain.services.user_domain_service import UserDomainService
+from src.shared.dto.pagination_dto import encode_cursor, decode_cursor, validate_keyset
+from src.shared.errors.domain_error.validation_error import ValidationError
+from src.core.config import settings
+from src.core.logger.logger import logger
+from src.core.tracing import tracer
+
+
+# 各排序方式在游標中的 keyset 欄位與型別
+CURSOR_KEYS = {
+    "id": {"id": int},
+    "created_at": {"created_at": datetime, "id": int}
+}
+
+
+class ListUsersUseCase:
+    """
+    使用者列表 Use Case
+    
+    流程：
+    1. 決定每頁筆數（預設 default_page_size，上限 max_page_size）
+    2. 解碼游標，取得上一頁最後一筆的 keyset 欄位值
+    3. UserRepository.find_page(limit, after, sort, fields)（指定 fields 時只載入這些欄位與排序欄位）
+    4. 將下一頁的 keyset 欄位值編碼為 next_cursor
+    
+    游標內容包含排序方式，與本次請求的 sort 不一致時視為無效游標
+    
+    錯誤：
+    - ValidationError (422)
+    """
+    
+    def __init__(self, user_domain_service: UserDomainService):
+        """
+        初始化 ListUsersUseCase
+        
+        Args:
+            user_domain_service: 使用者領域服務
+        """
+        self.user_domain_service = user_domain_service
+    
+    @tracer.traced()
+    def execute(self, input_dto: ListUsersInputDTO) -> ListUsersOutputDTO:
+        """
+        執行使用者列表查詢流程
+        
+        Args:
+            input_dto: 使用者列表輸入 DTO
+            
+        Returns:
+            ListUsersOutputDTO: 使用者列表輸出 DTO
+            
+        Raises:
+            ValidationError: 每頁筆數或游標無效
+        """
+        logger.info("ListUsersUseCase.execute - limit=%s sort=%s", input_dto.limit, input_dto.sort)
+        
+        try:
+            limit = self._resolve_limit(input_dto.limit)
+            after = self._decode_after(input_dto.cursor, input_dto.sort)
+            
+            users, next_key = self.user_domain_service.list_users(
+                limit,
+                after=after,
+                sort=input_dto.sort,
+                fields=input_dto.fields
+            )
+            
+            # 欄位投影時未載入的欄位為 None，略過驗證，由 API 層只輸出選擇的欄位
+            to_output = GetUserOutputDTO.model_construct if input_dto.fields else GetUserOutputDTO
+            output_dto = ListUsersOutputDTO(
+                items=[
+                    to_output(
+                        id=user.id,
+                        username=user.username,
+                        email=user.email.value if user.email else None
+                    )
+                    for user in users
+                ],
+                next_cursor=encode_cursor({"s": input_dto.sort, "k": next_key}) if next_key else None,
+                has_more=next_key is not None,
+                limit=limit
+            )
+            
+            logger.info("ListUsersUseCase.execute - success count=%s has_more=%s", len(output_dto.items), output_dto.has_more)
+            return output_dto
+            
+        except ValidationError as e:
+            logger.error("ListUsersUseCase.execute - ValidationError: %s", e)
+            raise
+            
+        except Exception as e:
+            logger.error("ListUsersUseCase.execute - unexpected error: %s", e)
+            raise
+    
+    def _resolve_limit(self, limit: Optional[int]) -> int:
+        """
+        決定每頁筆數
+        
+        Args:
+            limit: 請求的每頁筆數
+            
+        Returns:
+            實際使用的每頁筆數
+            
+        Raises:
+            ValidationError: 每頁筆數小於 1
+        """
+        if limit is None:
+            return settings.api.default_page_size
+        if limit < 1:
+            raise ValidationError("limit must be greater than 0")
+        return min(limit, settings.api.max_page_size)
+    
+    def _decode_after(self, cursor: Optional[str], sort: str) -> Optional[Dict[str, Any]]:
+        """
+        解碼游標
+        
+        Args:
+            cursor: 游標字串
+            sort: 本次請求的排序方式
+            
+        Returns:
+            keyset 欄位值，第一頁為 None
+            
+        Raises:
+            ValidationError: 游標無效、與排序方式不符，或缺少排序欄位 / 欄位值型別不符
+        """
+        if not cursor:
+            return None
+        
+        payload = decode_cursor(cursor)
+        if payload.get("s") != sort or sort not in CURSOR_KEYS:
+            raise ValidationError("Invalid pagination cursor")
+        return validate_keyset(payload.get("k"), CURSOR_KEYS[sort])
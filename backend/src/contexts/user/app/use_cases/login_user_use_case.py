@@ -8,6 +8,7 @@ from src.contexts.user.app.errors import InvalidCredentialsError
 from src.contexts.user.domain.services.user_domain_service import UserDomainService
 from src.contexts.user.domain.errors import UserNotFoundError, InvalidPasswordError
 from src.core.logger.logger import logger
+from src.core.tracing import tracer
 
 
 class LoginUserUseCase:
@@ -34,6 +35,7 @@ class LoginUserUseCase:
         """
         self.user_domain_service = user_domain_service
     
+    @tracer.traced()
     def execute(self, input_dto: LoginUserInputDTO) -> LoginUserOutputDTO:
         """
         執行登入使用者流程
@@ -49,7 +51,7 @@ class LoginUserUseCase:
             InvalidPasswordError: 密碼錯誤
             InvalidCredentialsError: 無效憑證
         """
-        logger.info(f"LoginUserUseCase.execute - username={input_dto.username}")
+        logger.info("LoginUserUseCase.execute - username=%s", input_dto.username)
         
         try:
             # 使用 Domain Service 認證使用者
@@ -81,17 +83,17 @@ class LoginUserUseCase:
                 expires_in=3600  # 1 小時
             )
             
-            logger.info(f"LoginUserUseCase.execute - success user_id={user.id}")
+            logger.info("LoginUserUseCase.execute - success user_id=%s", user.id)
             return output_dto
             
         except UserNotFoundError as e:
-            logger.error(f"LoginUserUseCase.execute - UserNotFoundError: {e}")
+            logger.error("LoginUserUseCase.execute - UserNotFoundError: %s", e)
             raise InvalidCredentialsError("Invalid username or password")
             
         except InvalidPasswordError as e:
-            logger.error(f"LoginUserUseCase.execute - InvalidPasswordError: {e}")
+            logger.error("LoginUserUseCase.execute - InvalidPasswordError: %s", e)
             raise InvalidCredentialsError("Invalid username or password")
             
         except Exception as e:
-            logger.error(f"LoginUserUseCase.execute - unexpected error: {e}")
+            logger.error("LoginUserUseCase.execute - unexpected error: %s", e)
             raise InvalidCredentialsError("Login failed")
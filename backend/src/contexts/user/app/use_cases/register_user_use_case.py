@@ -8,6 +8,7 @@ from src.contexts.user.app.errors import UsernameAlreadyExistsError
 from src.contexts.user.domain.services.user_domain_service import UserDomainService
 from src.contexts.user.domain.errors import EmailAlreadyExistsError, InvalidPasswordError, InvalidEmailFormatError
 from src.core.logger.logger import logger
+from src.core.tracing import tracer
 from src.shared.decorators import handle_app_errors
 
 
@@ -36,6 +37,7 @@ class RegisterUserUseCase:
         self.user_domain_service = user_domain_service
     
     @handle_app_errors
+    @tracer.traced()
     def execute(self, input_dto: RegisterUserInputDTO) -> RegisterUserOutputDTO:
         """
         執行註冊使用者流程
@@ -51,7 +53,7 @@ class RegisterUserUseCase:
             InvalidPasswordError: 密碼格式錯誤
             InvalidEmailFormatError: Email 格式錯誤
         """
-        logger.info(f"RegisterUserUseCase.execute - username={input_dto.username}")
+        logger.info("RegisterUserUseCase.execute - username=%s", input_dto.username)
         
         try:
             # 使用 Domain Service 註冊使用者
@@ -68,7 +70,7 @@ class RegisterUserUseCase:
                 email=user.email.value if user.email else None
             )
             
-            logger.info(f"RegisterUserUseCase.execute - success user_id={user.id}")
+            logger.info("RegisterUserUseCase.execute - success user_id=%s", user.id)
             return output_dto
             
         except EmailAlreadyExistsError as e:
@@ -79,9 +81,9 @@ class RegisterUserUseCase:
                 raise UsernameAlreadyExistsError(f"Email '{input_dto.email}' already exists")
                 
         except InvalidPasswordError as e:
-            logger.error(f"RegisterUserUseCase.execute - InvalidPasswordError: {e}")
+            logger.error("RegisterUserUseCase.execute - InvalidPasswordError: %s", e)
             raise
             
         except InvalidEmailFormatError as e:
-            logger.error(f"RegisterUserUseCase.execute - InvalidEmailFormatError: {e}")
+            logger.error("RegisterUserUseCase.execute - InvalidEmailFormatError: %s", e)
             raise
@@ -4,9 +4,10 @@ value_objects.py - User Context 值物件
 """
 
 import re
+import time
 import bcrypt
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, ClassVar, Optional
 from ..errors import InvalidEmailFormatError, InvalidPasswordError
 
 
@@ -54,6 +55,25 @@ class PasswordHash:
     """
     value: str
     
+    # bcrypt 耗時的觀察者 (operation, 秒)，由應用層註冊（例如記錄指標），領域層不依賴外部實作
+    timing_observer: ClassVar[Optional[Callable[[str, float], None]]] = None
+    
+    @classmethod
+    def set_timing_observer(cls, observer: Optional[Callable[[str, float], None]]):
+        """
+        註冊 bcrypt 耗時的觀察者
+        
+        Args:
+            observer: 接收 operation（hash / verify）與耗時（秒）的函式，None 表示取消
+        """
+        cls.timing_observer = observer
+    
+    @classmethod
+    def _observe(cls, operation: str, started: float):
+        """通知觀察者 bcrypt 耗時"""
+        if cls.timing_observer is not None:
+            cls.timing_observer(operation, time.perf_counter() - started)
+    
     @staticmethod
     def from_plain(password: str) -> "PasswordHash":
         """
@@ -77,7 +97,9 @@ class PasswordHash:
             raise InvalidPasswordError("Password must be less than 128 characters")
         
         # 使用 bcrypt 生成雜湊
+        started = time.perf_counter()
         hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+        PasswordHash._observe("hash", started)
         return PasswordHash(hashed.decode('utf-8'))
     
     def verify(self, plain_password: str) -> bool:
@@ -94,10 +116,12 @@ class PasswordHash:
             if not isinstance(plain_password, str):
                 return False
             
+            started = time.perf_counter()
             is_valid = bcrypt.checkpw(
                 plain_password.encode('utf-8'), 
                 self.value.encode('utf-8')
             )
+            self._observe("verify", started)
             return is_valid
             
         except Exception:
@@ -4,7 +4,8 @@ user_repository.py - User Repository 介面
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple, Iterator, Sequence
 from ..entities.user import User
 
 
@@ -14,6 +15,9 @@ class UserRepository(ABC):
     
     定義 User 實體的資料存取契約
     實作類別應該在 infra 層提供
+    
+    查詢方法的 fields 參數為欄位投影：只載入指定欄位（id 一律載入），
+    未載入的欄位為 None，投影後的實體只能用於讀取，不可再交給 save()
     """
     
     @abstractmethod
@@ -30,12 +34,13 @@ class UserRepository(ABC):
         pass
     
     @abstractmethod
-    def find_by_id(self, user_id: int) -> Optional[User]:
+    def find_by_id(self, user_id: int, fields: Optional[Sequence[str]] = None) -> Optional[User]:
         """
         根據 ID 查詢使用者
         
         Args:
             user_id: 使用者 ID
+            fields: 只載入這些實體欄位（None 表示全部）
             
         Returns:
             找到的使用者實體，如果不存在則回傳 None
@@ -43,12 +48,40 @@ class UserRepository(ABC):
         pass
     
     @abstractmethod
-    def find_by_username(self, username: str) -> Optional[User]:
+    def find_version(self, user_id: int) -> Optional[datetime]:
+        """
+        只查詢使用者的版本（updated_at），不載入完整資料
+        
+        Args:
+            user_id: 使用者 ID
+            
+        Returns:
+            使用者的 updated_at，如果不存在則回傳 None
+        """
+        pass
+    
+    @abstractmethod
+    def find_by_ids(self, user_ids: List[int], fields: Optional[Sequence[str]] = None) -> List[User]:
+        """
+        根據多個 ID 一次查詢使用者
+        
+        Args:
+            user_ids: 使用者 ID 列表
+            fields: 只載入這些實體欄位（None 表示全部）
+            
+        Returns:
+            找到的使用者實體列表（不保證順序，不存在的 ID 不會出現在結果中）
+        """
+        pass
+    
+    @abstractmethod
+    def find_by_username(self, username: str, fields: Optional[Sequence[str]] = None) -> Optional[User]:
         """
         根據使用者名稱查詢使用者
         
         Args:
             username: 使用者名稱
+            fields: 只載入這些實體欄位（None 表示全部）
             
         Returns:
             找到的使用者實體，如果不存在則回傳 None
@@ -56,12 +89,13 @@ class UserRepository(ABC):
         pass
     
     @abstractmethod
-    def find_by_email(self, email: str) -> Optional[User]:
+    def find_by_email(self, email: str, fields: Optional[Sequence[str]] = None) -> Optional[User]:
         """
         根據電子郵件查詢使用者
         
         Args:
             email: 電子郵件地址
+            fields: 只載入這些實體欄位（None 表示全部）
             
         Returns:
             找到的使用者實體，如果不存在則回傳 None
@@ -82,6 +116,82 @@ class UserRepository(ABC):
         """
         pass
     
+    @abstractmethod
+    def find_page(
+        self,
+        limit: int,
+        after: Optional[Dict[str, Any]] = None,
+        sort: str = "id",
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[User], Optional[Dict[str, Any]]]:
+        """
+        游標式（keyset）分頁查詢使用者
+        
+        Args:
+            limit: 每頁筆數
+            after: 上一頁最後一筆的 keyset 欄位值（第一頁為 None）
+            sort: 排序方式，"id" 或 "created_at"（以 created_at, id 排序）
+            fields: 只載入這些實體欄位（None 表示全部）
+            
+        Returns:
+            (使用者實體列表, 下一頁的 keyset 欄位值；沒有下一頁時為 None)
+        """
+        pass
+    
+    @abstractmethod
+    def find_updated_since(
+        self,
+        limit: int,
+        after: Optional[Dict[str, Any]] = None,
+        until: Optional[datetime] = None
+    ) -> Tuple[List[User], Optional[Dict[str, Any]]]:
+        """
+        依 (updated_at, id) 順序查詢在指定位置之後被新增或修改的使用者
+        
+        Args:
+            limit: 最多筆數
+            after: 上次同步的位置 {"updated_at": ..., "id": ...}（第一次同步為 None）
+            until: 只回傳 updated_at 不晚於此時間的資料
+            
+        Returns:
+            (使用者實體列表, 還有更多資料時為最後一筆的位置，否則為 None)
+        """
+        pass
+    
+    @abstractmethod
+    def find_deleted_since(
+        self,
+        limit: int,
+        after: Optional[Dict[str, Any]] = None,
+        until: Optional[datetime] = None
+    ) -> Tuple[List[Tuple[int, datetime]], Optional[Dict[str, Any]]]:
+        """
+        依 (deleted_at, user_id) 順序查詢在指定位置之後被刪除的使用者
+        
+        Args:
+            limit: 最多筆數
+            after: 上次同步的位置 {"deleted_at": ..., "user_id": ...}（第一次同步為 None）
+            until: 只回傳 deleted_at 不晚於此時間的資料
+            
+        Returns:
+            ((使用者 ID, 刪除時間) 列表, 還有更多資料時為最後一筆的位置，否則為 None)
+        """
+        pass
+    
+    @abstractmethod
+    def stream_all(self, batch_size: int = 1000, fields: Optional[Sequence[str]] = None) -> Iterator[User]:
+        """
+        依 ID 順序串流所有使用者（不一次載入全部資料）
+        
+        Args:
+            batch_size: 每次從資料庫取回的筆數
+            fields: 只載入這些實體欄位（None 表示全部）
+            
+        Yields:
+            使用者實體
+        """
+        pass
+    
     @abstractmethod
     def find_by_role(self, role: str, limit: Optional[int] = None, offset: Optional[int] = None) -> List[User]:
         """
@@ -163,7 +273,7 @@ class UserRepository(ABC):
     @abstractmethod
     def delete(self, user_id: int) -> bool:
         """
-        刪除使用者
+        刪除使用者（同時寫入刪除紀錄，供增量同步回報）
         
         Args:
             user_id: 使用者 ID
@@ -3,7 +3,8 @@ user_domain_service.py - User Domain Service
 處理複雜的 User 業務邏輯，不屬於單一實體的邏輯
 """
 
-from typing import Optional
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple, Iterator, Sequence
 from ..entities.user import User
 from ..repositories.user_repository import UserRepository
 from ..errors import (
@@ -23,6 +24,9 @@ class UserDomainService:
     - 使用者資料變更驗證
     """
     
+    # 登入只需要驗證密碼與產生 token 的欄位（role 目前不是資料表欄位，固定為 "user"）
+    LOGIN_FIELDS = ("id", "password_hash")
+    
     def __init__(self, user_repository: UserRepository):
         """
         初始化 User Domain Service
@@ -76,8 +80,8 @@ class UserDomainService:
             UserNotFoundError: 使用者不存在
             InvalidPasswordError: 密碼錯誤
         """
-        # 根據使用者名稱或 Email 查詢使用者
-        user = self._find_user_by_username_or_email(username_or_email)
+        # 根據使用者名稱或 Email 查詢使用者（只載入登入需要的欄位）
+        user = self._find_user_by_username_or_email(username_or_email, fields=self.LOGIN_FIELDS)
         
         if not user:
             raise UserNotFoundError(f"User not found: {username_or_email}")
@@ -179,31 +183,37 @@ class UserDomainService:
         # 儲存變更
         return self.user_repository.save(user)
     
-    def _find_user_by_username_or_email(self, username_or_email: str) -> Optional[User]:
+    def _find_user_by_username_or_email(
+        self,
+        username_or_email: str,
+        fields: Optional[Sequence[str]] = None
+    ) -> Optional[User]:
         """
         根據使用者名稱或 Email 查詢使用者
         
         Args:
             username_or_email: 使用者名稱或電子郵件
+            fields: 只載入這些實體欄位（None 表示全部）
             
         Returns:
             找到的使用者實體，如果不存在則回傳 None
         """
         # 先嘗試作為使用者名稱查詢
-        user = self.user_repository.find_by_username(username_or_email)
+        user = self.user_repository.find_by_username(username_or_email, fields=fields)
         if user:
             return user
         
         # 再嘗試作為 Email 查詢
-        user = self.user_repository.find_by_email(username_or_email)
+        user = self.user_repository.find_by_email(username_or_email, fields=fields)
         return user
     
-    def get_user_by_id(self, user_id: int) -> User:
+    def get_user_by_id(self, user_id: int, fields: Optional[Sequence[str]] = None) -> User:
         """
         根據 ID 查詢使用者
         
         Args:
             user_id: 使用者 ID
+            fields: 只載入這些實體欄位（None 表示全部）
             
         Returns:
             使用者實體
@@ -211,8 +221,93 @@ class UserDomainService:
         Raises:
             UserNotFoundError: 使用者不存在
         """
-        user = self.user_repository.find_by_id(user_id)
+        user = self.user_repository.find_by_id(user_id, fields=fields)
         if not user:
             raise UserNotFoundError(f"User with id {user_id} not found")
         
         return user
+    
+    def list_users(
+        self,
+        limit: int,
+        after: Optional[Dict[str, Any]] = None,
+        sort: str = "id",
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[User], Optional[Dict[str, Any]]]:
+        """
+        分頁查詢使用者
+        
+        Args:
+            limit: 每頁筆數
+            after: 上一頁最後一筆的 keyset 欄位值（第一頁為 None）
+            sort: 排序方式，"id" 或 "created_at"
+            fields: 只載入這些實體欄位（None 表示全部）
+            
+        Returns:
+            (使用者實體列表, 下一頁的 keyset 欄位值；沒有下一頁時為 None)
+        """
+        return self.user_repository.find_page(limit, after=after, sort=sort, fields=fields)
+    
+    def export_users(self, batch_size: int = 1000, fields: Optional[Sequence[str]] = None) -> Iterator[User]:
+        """
+        串流匯出所有使用者
+        
+        Args:
+            batch_size: 每次從資料庫取回的筆數
+            fields: 只載入這些實體欄位（None 表示全部）
+            
+        Yields:
+            使用者實體
+        """
+        return self.user_repository.stream_all(batch_size=batch_size, fields=fields)
+    
+    def get_users_by_ids(self, user_ids: List[int], fields: Optional[Sequence[str]] = None) -> Dict[int, User]:
+        """
+        根據多個 ID 查詢使用者
+        
+        Args:
+            user_ids: 使用者 ID 列表
+            fields: 只載入這些實體欄位（None 表示全部）
+            
+        Returns:
+            以使用者 ID 為鍵的使用者實體字典（不存在的 ID 不會出現在結果中）
+        """
+        return {user.id: user for user in self.user_repository.find_by_ids(user_ids, fields=fields)}
+    
+    def get_changes(
+        self,
+        limit: int,
+        updated_after: Optional[Dict[str, Any]],
+        deleted_after: Optional[Dict[str, Any]],
+        until: datetime
+    ) -> Tuple[
+        Tuple[List[User], Optional[Dict[str, Any]]],
+        Tuple[List[Tuple[int, datetime]], Optional[Dict[str, Any]]]
+    ]:
+        """
+        查詢指定位置之後的使用者異動（新增/修改與刪除分開回傳）
+        
+        Args:
+            limit: 各類異動的最多筆數
+            updated_after: 上次同步的新增/修改位置
+            deleted_after: 上次同步的刪除位置
+            until: 只回傳此時間之前的異動
+            
+        Returns:
+            (新增/修改的查詢結果, 刪除的查詢結果)，格式同 find_updated_since / find_deleted_since
+        """
+        updated = self.user_repository.find_updated_since(limit, after=updated_after, until=until)
+        deleted = self.user_repository.find_deleted_since(limit, after=deleted_after, until=until)
+        return updated, deleted
+    
+    def get_user_version(self, user_id: int) -> Optional[datetime]:
+        """
+        查詢使用者的版本（updated_at），用於條件式請求
+        
+        Args:
+            user_id: 使用者 ID
+            
+        Returns:
+            使用者的 updated_at，如果不存在則回傳 None
+        """
+        return self.user_repository.find_version(user_id)
@@ -3,30 +3,44 @@ user_repository_impl.py - User Repository 實作
 使用 SQLAlchemy 實作 User Repository 介面
 """
 
-from typing import Optional, List
-from sqlalchemy.orm import Session
+import time
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple, Iterator, Sequence
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, load_only
 from sqlalchemy.exc import IntegrityError
 
 from src.core.db.base import BaseRepository
 from src.contexts.user.infra.schema.user import User as UserSchema
+from src.contexts.user.infra.schema.user_tombstone import UserTombstone as UserTombstoneSchema
 from src.contexts.user.domain.entities.user import User as UserEntity
 from src.contexts.user.domain.entities.value_objects import Email, PasswordHash
 from src.contexts.user.domain.repositories.user_repository import UserRepository
 from src.contexts.user.domain.errors import EmailAlreadyExistsError
 from src.core.logger.logger import logger
+from src.core.tracing import tracer
 
 
+@tracer.traced_methods
 class UserRepositoryImpl(BaseRepository[UserSchema], UserRepository):
     """
     User Repository 實作
     
     繼承 BaseRepository 和實作 UserRepository 介面
     負責 User 實體的資料存取
+    公開方法各自記錄一個 span（UserRepositoryImpl.<方法>），其中的 SQL 為子 span
     """
     
+    # 分頁排序方式對應的 keyset 欄位（created_at 排序需搭配 ix_users_created_at_id 索引）
+    PAGE_SORT_KEYS = {
+        "id": ("id",),
+        "created_at": ("created_at", "id")
+    }
+    
     def __init__(self):
         """初始化 User Repository"""
         super().__init__(UserSchema)
+        self.tombstones = BaseRepository(UserTombstoneSchema)
     
     def save(self, user: UserEntity) -> UserEntity:
         """
@@ -38,6 +52,7 @@ class UserRepositoryImpl(BaseRepository[UserSchema], UserRepository):
         Returns:
             儲存後的使用者實體（包含生成的 ID）
         """
+        started = time.perf_counter()
         with self.get_session() as session:
             try:
                 if user.id == 0:
@@ -49,7 +64,7 @@ class UserRepositoryImpl(BaseRepository[UserSchema], UserRepository):
                     # 更新實體的 ID
                     user.id = user_schema.id
                     
-                    logger.db_info(f"Insert success table={self.table_name} id={user.id}")
+                    logger.db_info("Insert success table=%s id=%s", self.table_name, user.id, latency_ms=self._elapsed_ms(started))
                 else:
                     # 更新使用者
                     user_schema = session.query(UserSchema).filter_by(id=user.id).first()
@@ -57,7 +72,7 @@ class UserRepositoryImpl(BaseRepository[UserSchema], UserRepository):
                         self._update_schema_from_entity(user_schema, user)
                         session.flush()
                         
-                        logger.db_info(f"Update success table={self.table_name} id={user.id}")
+                        logger.db_info("Update success table=%s id=%s", self.table_name, user.id, latency_ms=self._elapsed_ms(started))
                     else:
                         raise ValueError(f"User with id {user.id} not found")
                 
@@ -71,64 +86,115 @@ class UserRepositoryImpl(BaseRepository[UserSchema], UserRepository):
                 else:
                     raise
     
-    def find_by_id(self, user_id: int) -> Optional[UserEntity]:
+    def find_by_id(self, user_id: int, fields: Optional[Sequence[str]] = None) -> Optional[UserEntity]:
         """
         根據 ID 查詢使用者
         
         Args:
             user_id: 使用者 ID
+            fields: 只載入這些實體欄位（None 表示全部）
             
         Returns:
             找到的使用者實體，如果不存在則回傳 None
         """
+        started = time.perf_counter()
         with self.get_session() as session:
-            user_schema = session.query(UserSchema).filter_by(id=user_id).first()
+            user_schema = session.query(UserSchema).options(*self._projection(fields)).filter_by(id=user_id).first()
             
             if user_schema:
-                logger.db_info(f"Fetch by id={user_id} table={self.table_name} result=found")
+                logger.db_info("Fetch by id=%s table=%s result=found", user_id, self.table_name, latency_ms=self._elapsed_ms(started))
                 return self._schema_to_entity(user_schema)
             else:
-                logger.db_info(f"Fetch by id={user_id} table={self.table_name} result=not_found")
+                logger.db_info("Fetch by id=%s table=%s result=not_found", user_id, self.table_name, latency_ms=self._elapsed_ms(started))
                 return None
     
-    def find_by_username(self, username: str) -> Optional[UserEntity]:
+    def find_version(self, user_id: int) -> Optional[datetime]:
+        """
+        只查詢使用者的版本（updated_at）
+        
+        搭配 ix_users_id_updated_at 索引，PostgreSQL 可以用 index-only scan 完成查詢
+        
+        Args:
+            user_id: 使用者 ID
+            
+        Returns:
+            使用者的 updated_at，如果不存在則回傳 None
+        """
+        started = time.perf_counter()
+        with self.get_session() as session:
+            version = session.query(UserSchema.updated_at).filter(UserSchema.id == user_id).scalar()
+            logger.db_info("Fetch version id=%s table=%s result=%s", user_id, self.table_name, 'found' if version else 'not_found', latency_ms=self._elapsed_ms(started))
+            return version
+    
+    def find_by_ids(self, user_ids: List[int], fields: Optional[Sequence[str]] = None) -> List[UserEntity]:
+        """
+        根據多個 ID 一次查詢使用者（單一 IN 查詢）
+        
+        Args:
+            user_ids: 使用者 ID 列表
+            fields: 只載入這些實體欄位（None 表示全部）
+            
+        Returns:
+            找到的使用者實體列表（不保證順序）
+        """
+        if not user_ids:
+            return []
+        
+        started = time.perf_counter()
+        with self.get_session() as session:
+            user_schemas = (
+                session.query(UserSchema)
+                .options(*self._projection(fields))
+                .filter(UserSchema.id.in_(user_ids))
+                .all()
+            )
+            users = [self._schema_to_entity(schema) for schema in user_schemas]
+            
+            logger.db_info("Fetch by ids count=%s table=%s found=%s", len(user_ids), self.table_name, len(users), latency_ms=self._elapsed_ms(started))
+            return users
+    
+    def find_by_username(self, username: str, fields: Optional[Sequence[str]] = None) -> Optional[UserEntity]:
         """
         根據使用者名稱查詢使用者
         
         Args:
             username: 使用者名稱
+            fields: 只載入這些實體欄位（None 表示全部）
             
         Returns:
             找到的使用者實體，如果不存在則回傳 None
         """
+        started = time.perf_counter()
         with self.get_session() as session:
-            user_schema = session.query(UserSchema).filter_by(username=username).first()
+            user_schema = session.query(UserSchema).options(*self._projection(fields)).filter_by(username=username).first()
             
             if user_schema:
-                logger.db_info(f"Fetch by username={username} table={self.table_name} result=found")
+                logger.db_info("Fetch by username=%s table=%s result=found", username, self.table_name, latency_ms=self._elapsed_ms(started))
                 return self._schema_to_entity(user_schema)
             else:
-                logger.db_info(f"Fetch by username={username} table={self.table_name} result=not_found")
+                logger.db_info("Fetch by username=%s table=%s result=not_found", username, self.table_name, latency_ms=self._elapsed_ms(started))
                 return None
     
-    def find_by_email(self, email: str) -> Optional[UserEntity]:
+    def find_by_email(self, email: str, fields: Optional[Sequence[str]] = None) -> Optional[UserEntity]:
         """
         根據電子郵件查詢使用者
         
         Args:
             email: 電子郵件地址
+            fields: 只載入這些實體欄位（None 表示全部）
             
         Returns:
             找到的使用者實體，如果不存在則回傳 None
         """
+        started = time.perf_counter()
         with self.get_session() as session:
-            user_schema = session.query(UserSchema).filter_by(email=email).first()
+            user_schema = session.query(UserSchema).options(*self._projection(fields)).filter_by(email=email).first()
             
             if user_schema:
-                logger.db_info(f"Fetch by email={email} table={self.table_name} result=found")
+                logger.db_info("Fetch by email=%s table=%s result=found", email, self.table_name, latency_ms=self._elapsed_ms(started))
                 return self._schema_to_entity(user_schema)
             else:
-                logger.db_info(f"Fetch by email={email} table={self.table_name} result=not_found")
+                logger.db_info("Fetch by email=%s table=%s result=not_found", email, self.table_name, latency_ms=self._elapsed_ms(started))
                 return None
     
     def find_all(self, limit: Optional[int] = None, offset: Optional[int] = None) -> List[UserEntity]:
@@ -142,6 +208,7 @@ class UserRepositoryImpl(BaseRepository[UserSchema], UserRepository):
         Returns:
             使用者實體列表
         """
+        started = time.perf_counter()
         with self.get_session() as session:
             query = session.query(UserSchema)
             
@@ -153,9 +220,106 @@ class UserRepositoryImpl(BaseRepository[UserSchema], UserRepository):
             user_schemas = query.all()
             users = [self._schema_to_entity(schema) for schema in user_schemas]
             
-            logger.db_info(f"Query table={self.table_name} filters=None count={len(users)}")
+            logger.db_info("Query table=%s filters=None count=%s", self.table_name, len(users), latency_ms=self._elapsed_ms(started))
             return users
     
+    def find_page(
+        self,
+        limit: int,
+        after: Optional[Dict[str, Any]] = None,
+        sort: str = "id",
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[UserEntity], Optional[Dict[str, Any]]]:
+        """
+        游標式（keyset）分頁查詢使用者
+        
+        Args:
+            limit: 每頁筆數
+            after: 上一頁最後一筆的 keyset 欄位值（第一頁為 None）
+            sort: 排序方式，"id" 或 "created_at"
+            fields: 只載入這些實體欄位（None 表示全部）
+            
+        Returns:
+            (使用者實體列表, 下一頁的 keyset 欄位值；沒有下一頁時為 None)
+            
+        Raises:
+            ValueError: 不支援的排序方式
+        """
+        order_by = self.PAGE_SORT_KEYS.get(sort)
+        if order_by is None:
+            raise ValueError(f"Unsupported sort: {sort}")
+        
+        return self.paginate(
+            limit,
+            after=after,
+            order_by=order_by,
+            mapper=self._schema_to_entity,
+            options=self._projection(fields, order_by)
+        )
+    
+    def find_updated_since(
+        self,
+        limit: int,
+        after: Optional[Dict[str, Any]] = None,
+        until: Optional[datetime] = None
+    ) -> Tuple[List[UserEntity], Optional[Dict[str, Any]]]:
+        """
+        依 (updated_at, id) 順序查詢在指定位置之後被新增或修改的使用者
+        
+        Args:
+            limit: 最多筆數
+            after: 上次同步的位置 {"updated_at": ..., "id": ...}
+            until: 只回傳 updated_at 不晚於此時間的資料
+            
+        Returns:
+            (使用者實體列表, 還有更多資料時為最後一筆的位置，否則為 None)
+        """
+        return self.paginate(
+            limit,
+            after=after,
+            order_by=("updated_at", "id"),
+            mapper=self._schema_to_entity,
+            criteria=[UserSchema.updated_at <= until] if until else None
+        )
+    
+    def find_deleted_since(
+        self,
+        limit: int,
+        after: Optional[Dict[str, Any]] = None,
+        until: Optional[datetime] = None
+    ) -> Tuple[List[Tuple[int, datetime]], Optional[Dict[str, Any]]]:
+        """
+        依 (deleted_at, user_id) 順序查詢在指定位置之後被刪除的使用者
+        
+        Args:
+            limit: 最多筆數
+            after: 上次同步的位置 {"deleted_at": ..., "user_id": ...}
+            until: 只回傳 deleted_at 不晚於此時間的資料
+            
+        Returns:
+            ((使用者 ID, 刪除時間) 列表, 還有更多資料時為最後一筆的位置，否則為 None)
+        """
+        return self.tombstones.paginate(
+            limit,
+            after=after,
+            order_by=("deleted_at", "user_id"),
+            mapper=lambda tombstone: (tombstone.user_id, tombstone.deleted_at),
+            criteria=[UserTombstoneSchema.deleted_at <= until] if until else None
+        )
+    
+    def stream_all(self, batch_size: int = 1000, fields: Optional[Sequence[str]] = None) -> Iterator[UserEntity]:
+        """
+        依 ID 順序串流所有使用者（伺服器端游標）
+        
+        Args:
+            batch_size: 每次從資料庫取回的筆數
+            fields: 只載入這些實體欄位（None 表示全部）
+            
+        Yields:
+            使用者實體
+        """
+        return self.stream(batch_size=batch_size, mapper=self._schema_to_entity, options=self._projection(fields))
+    
     def find_by_role(self, role: str, limit: Optional[int] = None, offset: Optional[int] = None) -> List[UserEntity]:
         """
         根據角色查詢使用者
@@ -171,7 +335,7 @@ class UserRepositoryImpl(BaseRepository[UserSchema], UserRepository):
             使用者實體列表
         """
         # 由於簡化的 schema 沒有 role 欄位，回傳空列表
-        logger.db_info(f"Query by role={role} table={self.table_name} count=0 (role not supported in simplified schema)")
+        logger.db_info("Query by role=%s table=%s count=0 (role not supported in simplified schema)", role, self.table_name)
         return []
     
     def find_active_users(self, limit: Optional[int] = None, offset: Optional[int] = None) -> List[UserEntity]:
@@ -197,9 +361,10 @@ class UserRepositoryImpl(BaseRepository[UserSchema], UserRepository):
         Returns:
             使用者總數
         """
+        started = time.perf_counter()
         with self.get_session() as session:
             count = session.query(UserSchema).count()
-            logger.db_info(f"Count table={self.table_name} filters=None count={count}")
+            logger.db_info("Count table=%s filters=None count=%s", self.table_name, count, latency_ms=self._elapsed_ms(started))
             return count
     
     def count_by_role(self, role: str) -> int:
@@ -215,7 +380,7 @@ class UserRepositoryImpl(BaseRepository[UserSchema], UserRepository):
             指定角色的使用者數量
         """
         # 由於簡化的 schema 沒有 role 欄位，回傳 0
-        logger.db_info(f"Count by role={role} table={self.table_name} count=0 (role not supported in simplified schema)")
+        logger.db_info("Count by role=%s table=%s count=0 (role not supported in simplified schema)", role, self.table_name)
         return 0
     
     def exists_by_username(self, username: str) -> bool:
@@ -228,9 +393,10 @@ class UserRepositoryImpl(BaseRepository[UserSchema], UserRepository):
         Returns:
             是否存在
         """
+        started = time.perf_counter()
         with self.get_session() as session:
             exists = session.query(UserSchema).filter_by(username=username).first() is not None
-            logger.db_info(f"Check username exists={exists} table={self.table_name} username={username}")
+            logger.db_info("Check username exists=%s table=%s username=%s", exists, self.table_name, username, latency_ms=self._elapsed_ms(started))
             return exists
     
     def exists_by_email(self, email: str) -> bool:
@@ -243,9 +409,10 @@ class UserRepositoryImpl(BaseRepository[UserSchema], UserRepository):
         Returns:
             是否存在
         """
+        started = time.perf_counter()
         with self.get_session() as session:
             exists = session.query(UserSchema).filter_by(email=email).first() is not None
-            logger.db_info(f"Check email exists={exists} table={self.table_name} email={email}")
+            logger.db_info("Check email exists=%s table=%s email=%s", exists, self.table_name, email, latency_ms=self._elapsed_ms(started))
             return exists
     
     def delete(self, user_id: int) -> bool:
@@ -258,16 +425,19 @@ class UserRepositoryImpl(BaseRepository[UserSchema], UserRepository):
         Returns:
             是否刪除成功
         """
+        started = time.perf_counter()
         with self.get_session() as session:
             user_schema = session.query(UserSchema).filter_by(id=user_id).first()
             if user_schema:
                 session.delete(user_schema)
+                # 同一個 transaction 內寫入刪除紀錄
+                session.merge(UserTombstoneSchema(user_id=user_id))
                 session.flush()
                 
-                logger.db_info(f"Delete success table={self.table_name} id={user_id}")
+                logger.db_info("Delete success table=%s id=%s", self.table_name, user_id, latency_ms=self._elapsed_ms(started))
                 return True
             else:
-                logger.db_info(f"Delete failed table={self.table_name} id={user_id} reason=not_found")
+                logger.db_info("Delete failed table=%s id=%s reason=not_found", self.table_name, user_id, latency_ms=self._elapsed_ms(started))
                 return False
     
     def _entity_to_schema(self, user: UserEntity) -> UserSchema:
@@ -288,23 +458,49 @@ class UserRepositoryImpl(BaseRepository[UserSchema], UserRepository):
             created_at=user.created_at
         )
     
+    def _projection(self, fields: Optional[Sequence[str]], required: Sequence[str] = ("id",)) -> list:
+        """
+        建立欄位投影的查詢選項
+        
+        Args:
+            fields: 要載入的實體欄位（None 表示全部）
+            required: 一律載入的欄位（主鍵、排序欄位）
+            
+        Returns:
+            查詢選項列表（不投影時為空列表）
+        """
+        if fields is None:
+            return []
+        
+        columns = UserSchema.__table__.columns
+        names = dict.fromkeys([*required, *(name for name in fields if name in columns)])
+        return [load_only(*(getattr(UserSchema, name) for name in names), raiseload=True)]
+    
     def _schema_to_entity(self, user_schema: UserSchema) -> UserEntity:
         """
         將 ORM Schema 轉換為 Domain 實體
         
+        欄位投影時只讀取已載入的欄位，未載入的欄位為 None（不會觸發額外查詢）
+        
         Args:
             user_schema: ORM Schema
             
         Returns:
             Domain 實體
         """
+        unloaded = inspect(user_schema).unloaded
+        
+        def value(name: str):
+            return None if name in unloaded else getattr(user_schema, name)
+        
+        password_hash = value("password_hash")
         return UserEntity(
             id=user_schema.id,
-            username=user_schema.username,
-            email=Email(user_schema.email),
-            password_hash=PasswordHash(user_schema.password_hash) if user_schema.password_hash else None,
-            created_at=user_schema.created_at,
-            updated_at=user_schema.created_at,  # 簡化 schema 沒有 updated_at
+            username=value("username"),
+            email=Email(value("email")),
+            password_hash=PasswordHash(password_hash) if password_hash else None,
+            created_at=value("created_at"),
+            updated_at=value("updated_at"),
             is_active=True,  # 簡化 schema 沒有 is_active，預設為 True
             is_verified=False,  # 簡化 schema 沒有 is_verified，預設為 False
             role="user"  # 簡化 schema 沒有 role，預設為 "user"
@@ -4,7 +4,9 @@ user context schema 模組
 """
 
 from .user import User
+from .user_tombstone import UserTombstone
 
 __all__ = [
-    "User"
+    "User",
+    "UserTombstone"
 ]
@@ -4,7 +4,7 @@ user.py - User ORM 模型
 符合指定的 schema 規格
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
 from sqlalchemy.sql import func
 from src.core.db.connection import Base
 
@@ -20,10 +20,21 @@ class User(Base):
       username VARCHAR(100) NOT NULL UNIQUE,
       password_hash TEXT,
       email VARCHAR(100),
-      created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+      created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+      updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     )
+    
+    updated_at 由 ORM 在每次 UPDATE 時自動更新，供 GET /users/changes 增量同步使用
     """
     __tablename__ = "users"
+    __table_args__ = (
+        # GET /users?sort=created_at 的 keyset 分頁索引
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # GET /users/changes 的 keyset 索引
+        Index("ix_users_updated_at_id", "updated_at", "id"),
+        # ETag 版本查詢（只讀索引即可取得 updated_at）
+        Index("ix_users_id_updated_at", "id", "updated_at"),
+    )
     
     # 主鍵
     id = Column(Integer, primary_key=True, index=True)
@@ -35,6 +46,7 @@ class User(Base):
     
     # 時間戳記
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
     def __repr__(self):
         return f"<User(id={self.id}, username='{self.username}', email='{self.email}')>"
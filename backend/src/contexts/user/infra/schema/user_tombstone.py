@@ -0,0 +1,31 @@
+"""
+user_tombstone.py - User Tombstone ORM 模型
+記錄已刪除的使用者，供增量同步回報刪除
+"""
+
+from sqlalchemy import Column, Integer, DateTime, Index
+from sqlalchemy.sql import func
+from src.core.db.connection import Base
+
+
+class UserTombstone(Base):
+    """
+    使用者刪除紀錄模型
+    
+    對應資料表：user_tombstones
+    user_tombstones (
+      user_id INTEGER PRIMARY KEY,
+      deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """
+    __tablename__ = "user_tombstones"
+    __table_args__ = (
+        # GET /users/changes 的 keyset 索引
+        Index("ix_user_tombstones_deleted_at_user_id", "deleted_at", "user_id"),
+    )
+    
+    user_id = Column(Integer, primary_key=True, autoincrement=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<UserTombstone(user_id={self.user_id}, deleted_at='{self.deleted_at}')>"
@@ -3,7 +3,7 @@ api_config.py - API 相關設定
 管理 API 相關設定 (host, port, 路由等)
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -38,6 +38,8 @@ class APIConfig(BaseSettings):
     # 請求設定
     max_request_size: int = Field(default=10485760, env="API_MAX_REQUEST_SIZE")  # 10MB
     request_timeout: int = Field(default=30, env="API_REQUEST_TIMEOUT")  # 30 秒
+    # 依路徑前綴覆寫請求期限（秒，0 表示不限制），例如串流匯出需要較長時間
+    route_timeouts: Dict[str, int] = Field(default={"/users/export": 600, "/admin/profile": 0}, env="API_ROUTE_TIMEOUTS")
     
     # 回應設定
     response_timeout: int = Field(default=30, env="API_RESPONSE_TIMEOUT")  # 30 秒
@@ -46,12 +48,64 @@ class APIConfig(BaseSettings):
     default_page_size: int = Field(default=20, env="API_DEFAULT_PAGE_SIZE")
     max_page_size: int = Field(default=100, env="API_MAX_PAGE_SIZE")
     
+    # 匯出設定（串流匯出時每次從資料庫取回的筆數）
+    export_batch_size: int = Field(default=1000, env="API_EXPORT_BATCH_SIZE")
+    
+    # 增量同步設定（GET /users/changes 只回傳此秒數之前的異動，需大於最長的寫入 transaction）
+    sync_safety_lag_seconds: int = Field(default=5, env="API_SYNC_SAFETY_LAG_SECONDS")
+    
+    # 批次請求設定（POST /batch）
+    batch_max_requests: int = Field(default=20, env="API_BATCH_MAX_REQUESTS")
+    batch_max_concurrency: int = Field(default=4, env="API_BATCH_MAX_CONCURRENCY")
+    
+    # 回應壓縮設定（小於 compression_min_size 位元組的回應不壓縮，brotli 需另外安裝 brotli 套件）
+    compression_enabled: bool = Field(default=True, env="API_COMPRESSION_ENABLED")
+    compression_min_size: int = Field(default=1024, env="API_COMPRESSION_MIN_SIZE")
+    compression_gzip_level: int = Field(default=6, env="API_COMPRESSION_GZIP_LEVEL")
+    compression_brotli_quality: int = Field(default=5, env="API_COMPRESSION_BROTLI_QUALITY")
+    
     # 快取設定
     cache_ttl: int = Field(default=300, env="API_CACHE_TTL")  # 5 分鐘
+    # 使用者資料的 Cache-Control（預設允許用戶端快取，但每次都以 ETag 重新驗證）
+    user_cache_control: str = Field(default="private, no-cache", env="API_USER_CACHE_CONTROL")
+    
+    # Server-Timing header（各階段耗時）：server_timing 為 true 時所有回應都帶，
+    # 否則只回傳給 admin 角色，或 X-Server-Timing-Token header 等於 server_timing_token 的請求
+    server_timing: bool = Field(default=False, env="API_SERVER_TIMING")
+    server_timing_token: str = Field(default="", env="API_SERVER_TIMING_TOKEN")
     
     # 其他設定
     enable_metrics: bool = Field(default=True, env="API_ENABLE_METRICS")
+    # 指標端點（Prometheus 文字格式）：需要 admin 角色，或 Authorization: Bearer <metrics_token>
+    # （Prometheus 的 authorization.credentials；留空表示只允許 admin）
+    metrics_url: str = Field(default="/metrics", env="API_METRICS_URL")
+    metrics_token: str = Field(default="", env="API_METRICS_TOKEN")
+    # 多個 uvicorn worker 時設定為共用目錄，各 worker 每 metrics_flush_interval 秒寫入一次，/metrics 合併輸出
+    metrics_multiproc_dir: str = Field(default="", env="API_METRICS_MULTIPROC_DIR")
+    metrics_flush_interval: float = Field(default=5, env="API_METRICS_FLUSH_INTERVAL")  # 秒
     enable_tracing: bool = Field(default=False, env="API_ENABLE_TRACING")
+    # 追蹤設定（沒有上游 traceparent 時依比例取樣；exporter 為 file 或 otlp）
+    tracing_service_name: str = Field(default="base-api", env="API_TRACING_SERVICE_NAME")
+    tracing_sample_ratio: float = Field(default=1.0, env="API_TRACING_SAMPLE_RATIO")
+    tracing_exporter: str = Field(default="file", env="API_TRACING_EXPORTER")
+    tracing_file: str = Field(default="logs/traces.jsonl", env="API_TRACING_FILE")
+    tracing_endpoint: str = Field(default="http://localhost:4318/v1/traces", env="API_TRACING_ENDPOINT")
+    tracing_queue_size: int = Field(default=2048, env="API_TRACING_QUEUE_SIZE")
+    tracing_batch_size: int = Field(default=512, env="API_TRACING_BATCH_SIZE")
+    tracing_flush_interval: float = Field(default=2.0, env="API_TRACING_FLUSH_INTERVAL")  # 秒
+    # 事件迴圈監控：每 loop_watchdog_interval 秒量測一次延遲，
+    # 超過 loop_block_threshold_ms 未回應時輸出阻塞中的路由與呼叫位置
+    enable_loop_watchdog: bool = Field(default=True, env="API_ENABLE_LOOP_WATCHDOG")
+    loop_watchdog_interval: float = Field(default=0.1, env="API_LOOP_WATCHDOG_INTERVAL")  # 秒
+    loop_block_threshold_ms: float = Field(default=100, env="API_LOOP_BLOCK_THRESHOLD_MS")
+    # 取樣分析：GET /admin/profile 的秒數上限與預設取樣間隔；
+    # auto_profile_threshold_ms 大於 0 時自動分析超過門檻的請求，結果存到 profile_dir（保留 profile_max_files 個）
+    profile_max_seconds: int = Field(default=60, env="API_PROFILE_MAX_SECONDS")
+    profile_interval_ms: float = Field(default=5, env="API_PROFILE_INTERVAL_MS")
+    auto_profile_threshold_ms: float = Field(default=0, env="API_AUTO_PROFILE_THRESHOLD_MS")
+    auto_profile_interval_ms: float = Field(default=10, env="API_AUTO_PROFILE_INTERVAL_MS")
+    profile_dir: str = Field(default="logs/profiles", env="API_PROFILE_DIR")
+    profile_max_files: int = Field(default=100, env="API_PROFILE_MAX_FILES")
     
     @property
     def base_url(self) -> str:
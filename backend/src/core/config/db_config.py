@@ -3,7 +3,7 @@ db_config.py - 資料庫相關設定
 管理 PostgreSQL 資料庫連線設定
 """
 
-from typing import Optional
+from typing import Dict, Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -31,6 +31,22 @@ class DatabaseConfig(BaseSettings):
     echo: bool = Field(default=False, env="DB_ECHO")
     echo_pool: bool = Field(default=False, env="DB_ECHO_POOL")
     
+    # 連線預設的 statement_timeout（毫秒，0 表示不限制）；請求剩餘時間較短時才另外以 SET LOCAL 縮短
+    statement_timeout: int = Field(default=10000, env="DB_STATEMENT_TIMEOUT")
+    
+    # SQL 統計與慢查詢日誌（依 fingerprint 統計，GET /admin/queries 查詢前 N 名；slow_query_ms 為 0 表示不輸出慢查詢日誌）
+    query_stats_enabled: bool = Field(default=True, env="DB_QUERY_STATS_ENABLED")
+    slow_query_ms: float = Field(default=200, env="DB_SLOW_QUERY_MS")
+    query_stats_max_fingerprints: int = Field(default=500, env="DB_QUERY_STATS_MAX_FINGERPRINTS")
+    
+    # 每個請求的 SQL 數量上限（超過時輸出 WARN），同一個 fingerprint 在一個請求中執行 query_repeat_threshold 次視為 N+1
+    query_budget: int = Field(default=10, env="DB_QUERY_BUDGET")
+    query_repeat_threshold: int = Field(default=5, env="DB_QUERY_REPEAT_THRESHOLD")
+    # 依路由樣板覆寫上限（0 表示不檢查），串流匯出與批次請求本來就會執行大量 SQL
+    route_query_budgets: Dict[str, int] = Field(default={"/users/export": 0, "/batch": 0}, env="DB_ROUTE_QUERY_BUDGETS")
+    # 在回應 header 回傳 SQL 數量（X-DB-Queries），正式環境建議關閉
+    query_headers: bool = Field(default=False, env="DB_QUERY_HEADERS")
+    
     @property
     def database_url(self) -> str:
         """
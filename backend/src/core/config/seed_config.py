@@ -45,6 +45,11 @@ class SeedConfig(BaseSettings):
     # 是否覆蓋現有資料
     overwrite_existing: bool = Field(default=False, env="SEED_OVERWRITE_EXISTING")
     
+    # 大量匯入設定
+    bulk_batch_size: int = Field(default=5000, env="SEED_BULK_BATCH_SIZE")
+    hash_workers: int = Field(default=0, env="SEED_HASH_WORKERS")  # 0 = CPU 核心數
+    progress_interval: float = Field(default=5.0, env="SEED_PROGRESS_INTERVAL")  # 秒
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
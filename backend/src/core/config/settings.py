@@ -46,6 +46,28 @@ class Settings(BaseSettings):
     # 日誌設定
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
     log_format: str = Field(default="json", env="LOG_FORMAT")
+    # 日誌分類開關（只影響 INFO 與 DEBUG，可在執行期間透過 /admin/logging 調整）
+    log_api_enabled: bool = Field(default=True, env="LOG_API_ENABLED")
+    log_db_enabled: bool = Field(default=True, env="LOG_DB_ENABLED")
+    log_infra_enabled: bool = Field(default=True, env="LOG_INFRA_ENABLED")
+    log_access_enabled: bool = Field(default=True, env="LOG_ACCESS_ENABLED")
+    # 日誌取樣：分類內的 INFO/DEBUG 日誌每個訊息樣板每秒保留 rate_limit 筆，超過的以 ratio 機率保留，
+    # latency_ms 不小於 slow_ms 的事件一律保留，每 summary_interval 秒輸出一次數量摘要（分類留空表示不取樣）
+    log_sample_categories: str = Field(default="DB", env="LOG_SAMPLE_CATEGORIES")
+    log_sample_rate_limit: float = Field(default=10, env="LOG_SAMPLE_RATE_LIMIT")
+    log_sample_ratio: float = Field(default=0.01, env="LOG_SAMPLE_RATIO")
+    log_sample_slow_ms: float = Field(default=500, env="LOG_SAMPLE_SLOW_MS")
+    log_sample_summary_interval: float = Field(default=60, env="LOG_SAMPLE_SUMMARY_INTERVAL")  # 秒
+    # 非阻塞輸出：日誌放進有上限的佇列，由背景執行緒批次寫入（overflow：drop 或 block）
+    log_async: bool = Field(default=True, env="LOG_ASYNC")
+    log_queue_size: int = Field(default=10000, env="LOG_QUEUE_SIZE")
+    log_overflow: str = Field(default="drop", env="LOG_OVERFLOW")
+    log_batch_size: int = Field(default=256, env="LOG_BATCH_SIZE")
+    log_flush_interval: float = Field(default=0.2, env="LOG_FLUSH_INTERVAL")  # 秒
+    # 檔案輸出（留空表示只輸出到 stdout），超過大小時輪替
+    log_file: str = Field(default="", env="LOG_FILE")
+    log_file_max_bytes: int = Field(default=10485760, env="LOG_FILE_MAX_BYTES")  # 10MB
+    log_file_backup_count: int = Field(default=5, env="LOG_FILE_BACKUP_COUNT")
     
     # 其他設定
     redis_url: Optional[str] = Field(default=None, env="REDIS_URL")
@@ -0,0 +1,34 @@
+"""
+core context - 請求範圍的執行環境
+以 contextvars 在中介軟體、路由、資料庫與外部呼叫之間傳遞請求資訊
+"""
+
+from .deadline import set_deadline, reset_deadline, get_remaining, check_deadline, release_deadline
+from .request_context import (
+    RequestContext,
+    SubRequestContext,
+    start_request,
+    end_request,
+    get_request_context,
+    bind_request,
+    add_request_timing,
+    request_stage,
+    sub_request_context
+)
+
+__all__ = [
+    "set_deadline",
+    "reset_deadline",
+    "get_remaining",
+    "check_deadline",
+    "release_deadline",
+    "RequestContext",
+    "SubRequestContext",
+    "start_request",
+    "end_request",
+    "get_request_context",
+    "bind_request",
+    "add_request_timing",
+    "request_stage",
+    "sub_request_context"
+]
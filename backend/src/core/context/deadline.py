@@ -0,0 +1,118 @@
+"""
+deadline.py - 請求期限
+以 contextvars 保存目前請求的截止時間，讓資料庫（statement_timeout）與
+外部呼叫（AI 服務）依剩餘時間設定逾時
+
+期限只在兩種地方生效：
+- 請求限制中介軟體的 CancelScope：只能在 await 點取消，路由中的同步呼叫（DB、bcrypt）會先執行完
+- check_deadline()：資料庫會話開始與 AI 呼叫前檢查，已超過期限時拋出 RequestTimeoutException
+寫入提交後（release_deadline）期限即解除，已提交的請求一定會回傳處理結果，不會回傳 504
+"""
+
+import asyncio
+import math
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Optional
+
+from src.shared.errors.system_error.timeout_error import RequestTimeoutException
+
+
+class _Deadline:
+    """目前請求的期限狀態（複製到執行緒池或子 task 的 context 仍指向同一個物件）"""
+
+    __slots__ = ("expires", "cancel_scope", "loop")
+
+    def __init__(self, expires: Optional[float], cancel_scope: Any, loop: Optional[asyncio.AbstractEventLoop]):
+        self.expires = expires
+        self.cancel_scope = cancel_scope
+        self.loop = loop
+
+
+_deadline: ContextVar[Optional[_Deadline]] = ContextVar("request_deadline", default=None)
+
+
+def set_deadline(timeout: Optional[float], cancel_scope: Any = None) -> Token:
+    """
+    設定目前 context 的截止時間
+
+    Args:
+        timeout: 從現在起算的秒數，None 或 0 表示沒有期限
+        cancel_scope: 以期限取消請求的 anyio.CancelScope（release_deadline 時解除）
+
+    Returns:
+        用於 reset_deadline 的 Token
+    """
+    if not timeout:
+        return _deadline.set(None)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    return _deadline.set(_Deadline(time.monotonic() + timeout, cancel_scope, loop))
+
+
+def reset_deadline(token: Token):
+    """
+    還原 set_deadline 之前的截止時間
+
+    Args:
+        token: set_deadline 回傳的 Token
+    """
+    _deadline.reset(token)
+
+
+def get_remaining() -> Optional[float]:
+    """
+    取得剩餘時間
+
+    Returns:
+        剩餘秒數（可能為負數），沒有期限時為 None
+    """
+    deadline = _deadline.get()
+    if deadline is None or deadline.expires is None:
+        return None
+    return deadline.expires - time.monotonic()
+
+
+def check_deadline(operation: str = "Request") -> Optional[float]:
+    """
+    檢查期限是否已過
+
+    Args:
+        operation: 錯誤訊息中的操作名稱
+
+    Returns:
+        剩餘秒數，沒有期限時為 None
+
+    Raises:
+        RequestTimeoutException: 已超過期限
+    """
+    remaining = get_remaining()
+    if remaining is not None and remaining <= 0:
+        raise RequestTimeoutException(f"{operation} exceeded the request deadline")
+    return remaining
+
+
+def release_deadline():
+    """
+    解除目前請求的期限（資料庫寫入提交後呼叫）
+
+    之後的 check_deadline 不再拋出例外，中介軟體也不再以期限取消請求；
+    可在執行緒池中呼叫，CancelScope 會在事件迴圈中調整
+    """
+    deadline = _deadline.get()
+    if deadline is None or deadline.expires is None:
+        return
+    deadline.expires = None
+    cancel_scope = deadline.cancel_scope
+    if cancel_scope is None:
+        return
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is deadline.loop or deadline.loop is None:
+        cancel_scope.deadline = math.inf
+    else:
+        deadline.loop.call_soon_threadsafe(setattr, cancel_scope, "deadline", math.inf)
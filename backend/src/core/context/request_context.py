@@ -0,0 +1,261 @@
+"""
+request_context.py - 請求範圍的日誌上下文
+以 contextvars 保存目前請求的 request id、累積的欄位與各階段耗時，
+請求結束時由中介軟體輸出一行存取日誌
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Iterator, Optional
+
+
+class RequestContext:
+    """
+    單一請求的日誌上下文
+
+    中介軟體、路由、Use Case 與資料庫在處理請求時把資訊寫進同一個物件，
+    請求結束時一次輸出；contextvars 複製到執行緒池或子 task 時仍指向同一個物件
+    """
+
+    def __init__(self, request_id: str, method: str, path: str):
+        """
+        初始化請求上下文
+
+        Args:
+            request_id: 請求 ID
+            method: HTTP 方法
+            path: 請求路徑
+        """
+        self.request_id = request_id
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.status: Optional[int] = None
+        self.fields: Dict[str, Any] = {}
+        self.timings: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        # SQL fingerprint -> 本次請求執行次數（N+1 偵測）
+        self.query_counts: Dict[str, int] = {}
+
+    def bind(self, **fields: Any):
+        """
+        加入欄位（None 值略過，同名欄位以後者為準）
+
+        Args:
+            **fields: 欄位
+        """
+        for key, value in fields.items():
+            if value is not None:
+                self.fields[key] = value
+
+    def add_timing(self, stage: str, elapsed_ms: float):
+        """
+        累加階段耗時
+
+        Args:
+            stage: 階段名稱
+            elapsed_ms: 耗時（毫秒）
+        """
+        self.timings[stage] = self.timings.get(stage, 0.0) + elapsed_ms
+
+    def incr(self, counter: str, amount: int = 1):
+        """
+        累加計數
+
+        Args:
+            counter: 計數名稱
+            amount: 增加量
+        """
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def record_query(self, fingerprint: str, elapsed_ms: float, statements: int = 1):
+        """
+        記錄一次 SQL 執行（一次往返，executemany 時包含多個 statement）
+
+        Args:
+            fingerprint: SQL fingerprint
+            elapsed_ms: 耗時（毫秒）
+            statements: statement 數量
+        """
+        self.incr("db_queries", statements)
+        self.incr("db_round_trips")
+        self.add_timing("db", elapsed_ms)
+        self.query_counts[fingerprint] = self.query_counts.get(fingerprint, 0) + 1
+
+    def elapsed_ms(self) -> float:
+        """
+        取得請求開始至今的耗時
+
+        Returns:
+            耗時（毫秒）
+        """
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self) -> str:
+        """
+        產生 Server-Timing header（各階段耗時與目前為止的總耗時，單位毫秒）
+
+        Returns:
+            例如 auth;dur=0.4, db;dur=3.1;desc="3 queries", password_hash;dur=251.0, serialize;dur=0.2, total;dur=258.3
+        """
+        metrics = []
+        for stage, elapsed_ms in self.timings.items():
+            metric = f"{stage};dur={elapsed_ms:.1f}"
+            if stage == "db":
+                queries = self.counters.get("db_queries", 0)
+                metric += f';desc="{queries} {"query" if queries == 1 else "queries"}"'
+            metrics.append(metric)
+        metrics.append(f"total;dur={self.elapsed_ms():.1f}")
+        return ", ".join(metrics)
+
+    def to_fields(self) -> Dict[str, Any]:
+        """
+        產生存取日誌的欄位
+
+        Returns:
+            依 request_id、status、latency_ms、各階段耗時、計數、累積欄位的順序排列的欄位
+        """
+        fields: Dict[str, Any] = {
+            "request_id": self.request_id,
+            "status": self.status,
+            "latency_ms": round(self.elapsed_ms(), 1)
+        }
+        for stage, elapsed_ms in self.timings.items():
+            fields[f"{stage}_ms"] = round(elapsed_ms, 1)
+        fields.update(self.counters)
+        for key, value in self.fields.items():
+            fields.setdefault(key, value)
+        return fields
+
+
+class SubRequestContext(RequestContext):
+    """
+    批次子請求的日誌上下文
+
+    耗時、計數與 SQL 記入外層請求（存取日誌與 SQL 數量上限以整個批次計算），
+    bind 的欄位只留在子請求，不會覆寫外層請求的欄位（例如各子請求的 username）
+    """
+
+    def __init__(self, parent: RequestContext):
+        """
+        初始化子請求上下文
+
+        Args:
+            parent: 外層請求的上下文
+        """
+        super().__init__(parent.request_id, parent.method, parent.path)
+        self.parent = parent
+        self.timings = parent.timings
+        self.counters = parent.counters
+        self.query_counts = parent.query_counts
+
+
+_request_context: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+
+# 中介軟體同時把 RequestContext 放進 ASGI scope 的 key：
+# contextvars 無法從其他執行緒讀取，診斷工具改從堆疊中的 scope 找到正在處理的請求
+SCOPE_KEY = "base.request_context"
+
+
+def start_request(request_id: str, method: str, path: str) -> Token:
+    """
+    建立目前請求的上下文
+
+    Args:
+        request_id: 請求 ID
+        method: HTTP 方法
+        path: 請求路徑
+
+    Returns:
+        用於 end_request 的 Token
+    """
+    return _request_context.set(RequestContext(request_id, method, path))
+
+
+def end_request(token: Token):
+    """
+    結束目前請求的上下文
+
+    Args:
+        token: start_request 回傳的 Token
+    """
+    _request_context.reset(token)
+
+
+def get_request_context() -> Optional[RequestContext]:
+    """
+    取得目前請求的上下文
+
+    Returns:
+        RequestContext，不在請求中時為 None
+    """
+    return _request_context.get()
+
+
+def bind_request(**fields: Any):
+    """
+    將欄位加入目前請求的存取日誌（不在請求中時略過）
+
+    Args:
+        **fields: 欄位
+    """
+    context = _request_context.get()
+    if context is not None:
+        context.bind(**fields)
+
+
+def add_request_timing(stage: str, elapsed_ms: float):
+    """
+    將事後取得的耗時記入目前請求的階段（不在請求中時略過）
+
+    Args:
+        stage: 階段名稱
+        elapsed_ms: 耗時（毫秒）
+    """
+    context = _request_context.get()
+    if context is not None:
+        context.add_timing(stage, elapsed_ms)
+
+
+@contextmanager
+def sub_request_context() -> Iterator[None]:
+    """
+    在區塊內以子請求上下文取代目前的請求上下文（見 SubRequestContext，不在請求中時不做任何事）
+
+    Yields:
+        None
+    """
+    parent = _request_context.get()
+    if parent is None:
+        yield
+        return
+
+    token = _request_context.set(SubRequestContext(parent))
+    try:
+        yield
+    finally:
+        _request_context.reset(token)
+
+
+@contextmanager
+def request_stage(stage: str) -> Iterator[None]:
+    """
+    記錄一個處理階段的耗時，結果以 <stage>_ms 出現在存取日誌
+
+    Args:
+        stage: 階段名稱
+
+    Yields:
+        None
+    """
+    context = _request_context.get()
+    if context is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        context.add_timing(stage, (time.perf_counter() - started) * 1000)
@@ -13,7 +13,10 @@ from .connection import (
     Base
 )
 from .base import BaseRepository
+from .bulk_loader import BulkLoader, BulkLoadResult
 from .init_db import init_db, DatabaseInitializer
+from .query_stats import QueryStats, query_stats, fingerprint
+from .query_budget import QueryRecorder, count_queries, assert_max_queries
 
 __all__ = [
     "DatabaseConnection",
@@ -24,6 +27,14 @@ __all__ = [
     "get_async_session",
     "Base",
     "BaseRepository",
+    "BulkLoader",
+    "BulkLoadResult",
     "init_db",
-    "DatabaseInitializer"
+    "DatabaseInitializer",
+    "QueryStats",
+    "query_stats",
+    "fingerprint",
+    "QueryRecorder",
+    "count_queries",
+    "assert_max_queries"
 ]
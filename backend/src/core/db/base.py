@@ -3,13 +3,16 @@ base.py - 提供 BaseRepository, Session 管理
 定義統一的 CRUD 模板和會話管理
 """
 
-from typing import TypeVar, Generic, Type, Optional, List, Dict, Any
+import time
+from datetime import datetime
+from typing import TypeVar, Generic, Type, Optional, List, Dict, Any, Callable, Sequence, Tuple, Iterator
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, tuple_
 
 from src.core.db.connection import get_session
 from src.core.logger.logger import logger
+from src.shared.errors.domain_error.validation_error import ValidationError
 
 # 泛型類型變數
 T = TypeVar('T')
@@ -54,12 +57,12 @@ class BaseRepository(Generic[T]):
                 
                 # 記錄成功日誌
                 entity_id = getattr(entity, 'id', 'unknown')
-                logger.db_info(f"Insert success table={self.table_name} id={entity_id}")
+                logger.db_info("Insert success table=%s id=%s", self.table_name, entity_id)
                 
                 return entity
                 
             except SQLAlchemyError as e:
-                logger.db_error(f"Insert failed table={self.table_name} error={type(e).__name__}")
+                logger.db_error("Insert failed table=%s error=%s", self.table_name, type(e).__name__)
                 raise
     
     def get_by_id(self, id: Any) -> Optional[T]:
@@ -77,14 +80,14 @@ class BaseRepository(Generic[T]):
                 entity = session.query(self.model).filter_by(id=id).first()
                 
                 if entity:
-                    logger.db_info(f"Fetch by id={id} table={self.table_name} result=found")
+                    logger.db_info("Fetch by id=%s table=%s result=found", id, self.table_name)
                 else:
-                    logger.db_info(f"Fetch by id={id} table={self.table_name} result=not_found")
+                    logger.db_info("Fetch by id=%s table=%s result=not_found", id, self.table_name)
                 
                 return entity
                 
             except SQLAlchemyError as e:
-                logger.db_error(f"Fetch by id failed table={self.table_name} id={id} error={type(e).__name__}")
+                logger.db_error("Fetch by id failed table=%s id=%s error=%s", self.table_name, id, type(e).__name__)
                 raise
     
     def list(self, filters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, offset: Optional[int] = None) -> List[T]:
@@ -104,13 +107,7 @@ class BaseRepository(Generic[T]):
                 query = session.query(self.model)
                 
                 # 應用過濾條件
-                if filters:
-                    for key, value in filters.items():
-                        if hasattr(self.model, key):
-                            if isinstance(value, list):
-                                query = query.filter(getattr(self.model, key).in_(value))
-                            else:
-                                query = query.filter(getattr(self.model, key) == value)
+                query = self._apply_filters(query, filters)
                 
                 # 應用分頁
                 if offset:
@@ -121,13 +118,122 @@ class BaseRepository(Generic[T]):
                 entities = query.all()
                 
                 # 記錄查詢日誌
-                filter_str = str(filters) if filters else "None"
-                logger.db_info(f"Query table={self.table_name} filters={filter_str} count={len(entities)}")
+                logger.db_info("Query table=%s filters=%s count=%s", self.table_name, filters or None, len(entities))
                 
                 return entities
                 
             except SQLAlchemyError as e:
-                logger.db_error(f"Query failed table={self.table_name} error={type(e).__name__}")
+                logger.db_error("Query failed table=%s error=%s", self.table_name, type(e).__name__)
+                raise
+    
+    def paginate(
+        self,
+        limit: int,
+        after: Optional[Dict[str, Any]] = None,
+        order_by: Sequence[str] = ("id",),
+        filters: Optional[Dict[str, Any]] = None,
+        mapper: Optional[Callable[[T], Any]] = None,
+        criteria: Optional[Sequence[Any]] = None,
+        options: Optional[Sequence[Any]] = None
+    ) -> Tuple[List[Any], Optional[Dict[str, Any]]]:
+        """
+        游標式（keyset）分頁查詢
+        
+        以 WHERE (order_by...) > (after...) ORDER BY order_by LIMIT n 取代 OFFSET，
+        搭配對應的索引時，每一頁的成本與頁數深度無關
+        
+        Args:
+            limit: 每頁筆數
+            after: 上一頁最後一筆的 keyset 欄位值（第一頁為 None）
+            order_by: 排序欄位，最後一個欄位必須唯一（通常為 id）
+            filters: 過濾條件字典
+            mapper: 在 session 內將 ORM 物件轉換為其他型別（如 Domain 實體）
+            criteria: 額外的 SQLAlchemy 條件（例如範圍條件）
+            options: 查詢選項（例如 load_only 欄位投影）
+            
+        Returns:
+            (本頁資料, 下一頁的 keyset 欄位值；沒有下一頁時為 None)
+        """
+        with get_session() as session:
+            try:
+                columns = [getattr(self.model, name) for name in order_by]
+                query = self._apply_filters(session.query(self.model), filters)
+                if criteria:
+                    query = query.filter(*criteria)
+                if options:
+                    query = query.options(*options)
+                
+                if after:
+                    values = [self._coerce_keyset_value(column, after.get(name)) for name, column in zip(order_by, columns)]
+                    if len(columns) == 1:
+                        query = query.filter(columns[0] > values[0])
+                    else:
+                        query = query.filter(tuple_(*columns) > tuple_(*values))
+                
+                # 多取一筆用來判斷是否還有下一頁
+                rows = query.order_by(*columns).limit(limit + 1).all()
+                has_more = len(rows) > limit
+                rows = rows[:limit]
+                
+                next_key = None
+                if has_more and rows:
+                    next_key = {name: getattr(rows[-1], name) for name in order_by}
+                
+                logger.db_info(
+                    "Page table=%s order_by=%s limit=%s count=%s has_more=%s",
+                    self.table_name, ",".join(order_by), limit, len(rows), has_more
+                )
+                
+                items = [mapper(row) for row in rows] if mapper else rows
+                return items, next_key
+                
+            except SQLAlchemyError as e:
+                logger.db_error("Page query failed table=%s error=%s", self.table_name, type(e).__name__)
+                raise
+    
+    def stream(
+        self,
+        batch_size: int = 1000,
+        order_by: Sequence[str] = ("id",),
+        filters: Optional[Dict[str, Any]] = None,
+        mapper: Optional[Callable[[T], Any]] = None,
+        options: Optional[Sequence[Any]] = None
+    ) -> Iterator[Any]:
+        """
+        以伺服器端游標逐筆串流查詢結果
+        
+        使用 yield_per（隱含 stream_results），資料庫每次只傳回 batch_size 筆；
+        session 的 identity map 為弱參照，已產出且不再使用的 ORM 物件會被回收，
+        記憶體用量與資料表大小無關
+        
+        注意：迭代期間會持有一條資料庫連線，呼叫端應完整迭代或關閉產生器
+        
+        Args:
+            batch_size: 每次從資料庫取回的筆數
+            order_by: 排序欄位
+            filters: 過濾條件字典
+            mapper: 將 ORM 物件轉換為其他型別（如 Domain 實體）
+            options: 查詢選項（例如 load_only 欄位投影）
+            
+        Yields:
+            ORM 物件，或 mapper 轉換後的結果
+        """
+        with get_session() as session:
+            count = 0
+            try:
+                query = self._apply_filters(session.query(self.model), filters)
+                query = query.order_by(*[getattr(self.model, name) for name in order_by])
+                if options:
+                    query = query.options(*options)
+                
+                for row in query.yield_per(batch_size):
+                    yield mapper(row) if mapper else row
+                    count += 1
+                
+                logger.db_info("Stream table=%s batch_size=%s count=%s", self.table_name, batch_size, count)
+                
+            except SQLAlchemyError as e:
+                logger.db_error("Stream failed table=%s count=%s error=%s", self.table_name, count, type(e).__name__)
                 raise
     
     def update(self, entity: T) -> T:
@@ -151,13 +257,13 @@ class BaseRepository(Generic[T]):
                 
                 # 記錄成功日誌
                 entity_id = getattr(merged_entity, 'id', 'unknown')
-                logger.db_info(f"Update success table={self.table_name} id={entity_id}")
+                logger.db_info("Update success table=%s id=%s", self.table_name, entity_id)
                 
                 return merged_entity
                 
             except SQLAlchemyError as e:
                 entity_id = getattr(entity, 'id', 'unknown')
-                logger.db_error(f"Update failed table={self.table_name} id={entity_id} error={type(e).__name__}")
+                logger.db_error("Update failed table=%s id=%s error=%s", self.table_name, entity_id, type(e).__name__)
                 raise
     
     def delete(self, id: Any) -> bool:
@@ -180,14 +286,14 @@ class BaseRepository(Generic[T]):
                     session.delete(entity)
                     session.flush()
                     
-                    logger.db_info(f"Delete success table={self.table_name} id={id}")
+                    logger.db_info("Delete success table=%s id=%s", self.table_name, id)
                     return True
                 else:
-                    logger.db_info(f"Delete failed table={self.table_name} id={id} reason=not_found")
+                    logger.db_info("Delete failed table=%s id=%s reason=not_found", self.table_name, id)
                     return False
                     
             except SQLAlchemyError as e:
-                logger.db_error(f"Delete failed table={self.table_name} id={id} error={type(e).__name__}")
+                logger.db_error("Delete failed table=%s id=%s error=%s", self.table_name, id, type(e).__name__)
                 raise
     
     def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
@@ -205,24 +311,17 @@ class BaseRepository(Generic[T]):
                 query = session.query(self.model)
                 
                 # 應用過濾條件
-                if filters:
-                    for key, value in filters.items():
-                        if hasattr(self.model, key):
-                            if isinstance(value, list):
-                                query = query.filter(getattr(self.model, key).in_(value))
-                            else:
-                                query = query.filter(getattr(self.model, key) == value)
+                query = self._apply_filters(query, filters)
                 
                 count = query.count()
                 
                 # 記錄查詢日誌
-                filter_str = str(filters) if filters else "None"
-                logger.db_info(f"Count table={self.table_name} filters={filter_str} count={count}")
+                logger.db_info("Count table=%s filters=%s count=%s", self.table_name, filters or None, count)
                 
                 return count
                 
             except SQLAlchemyError as e:
-                logger.db_error(f"Count failed table={self.table_name} error={type(e).__name__}")
+                logger.db_error("Count failed table=%s error=%s", self.table_name, type(e).__name__)
                 raise
     
     def exists(self, filters: Dict[str, Any]) -> bool:
@@ -237,6 +336,70 @@ class BaseRepository(Generic[T]):
         """
         return self.count(filters) > 0
     
+    def _apply_filters(self, query, filters: Optional[Dict[str, Any]]):
+        """
+        套用過濾條件（list 值使用 IN，其餘使用等號）
+        
+        Args:
+            query: SQLAlchemy 查詢
+            filters: 過濾條件字典
+            
+        Returns:
+            套用條件後的查詢
+        """
+        if filters:
+            for key, value in filters.items():
+                if hasattr(self.model, key):
+                    if isinstance(value, list):
+                        query = query.filter(getattr(self.model, key).in_(value))
+                    else:
+                        query = query.filter(getattr(self.model, key) == value)
+        return query
+    
+    @staticmethod
+    def _coerce_keyset_value(column, value: Any) -> Any:
+        """
+        將游標中的 keyset 值轉回欄位型別（游標經 JSON 編碼後 datetime 會變成字串）
+        
+        Args:
+            column: ORM 欄位
+            value: 游標中的值
+            
+        Returns:
+            轉換後的值
+            
+        Raises:
+            ValidationError: 值為 None 或無法轉換為欄位型別（游標被竄改）
+        """
+        if value is None:
+            raise ValidationError("Invalid pagination cursor")
+        if isinstance(value, str):
+            try:
+                python_type = column.type.python_type
+            except NotImplementedError:
+                return value
+            try:
+                if python_type is datetime:
+                    return datetime.fromisoformat(value)
+                if python_type is int:
+                    return int(value)
+            except ValueError:
+                raise ValidationError("Invalid pagination cursor")
+        return value
+    
+    @staticmethod
+    def _elapsed_ms(started: float) -> float:
+        """
+        計算從 started 到現在的毫秒數（供 Repository 日誌的 latency_ms 使用）
+        
+        Args:
+            started: time.perf_counter() 的起始值
+            
+        Returns:
+            經過的毫秒數（小數一位）
+        """
+        return round((time.perf_counter() - started) * 1000, 1)
+    
     def get_session(self):
         """
         取得資料庫會話 context manager (用於複雜查詢)
@@ -0,0 +1,334 @@
+"""
+bulk_loader.py - 大量資料匯入工具
+以批次方式寫入資料表：PostgreSQL 使用 COPY，其他資料庫使用 executemany
+明文密碼在 process pool 中平行雜湊
+"""
+
+import csv
+import io
+import json
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import bcrypt
+from sqlalchemy import Engine, Table, text
+
+from src.core.config import settings
+from src.core.logger.logger import logger
+
+
+def _hash_passwords(passwords: List[str], rounds: int) -> List[str]:
+    """
+    在子行程中執行的 bcrypt 雜湊（必須為模組層級函數才能被 pickle）
+
+    以整批密碼為單位送進子行程，減少行程間傳遞的次數
+
+    Args:
+        passwords: 明文密碼列表
+        rounds: bcrypt rounds
+
+    Returns:
+        雜湊後的密碼字串列表（順序與輸入相同）
+    """
+    return [
+        bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+        for password in passwords
+    ]
+
+
+@dataclass
+class BulkLoadResult:
+    """批次匯入結果統計"""
+    table: str
+    inserted: int = 0
+    invalid: int = 0
+    hashed: int = 0
+    batches: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """每秒寫入筆數"""
+        return self.inserted / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class BulkLoader:
+    """
+    大量資料匯入器
+
+    流程（每批）：
+    1. 驗證欄位：只保留資料表存在的欄位，缺少必填欄位的資料計為 invalid
+    2. 若資料帶有明文 password 且沒有 password_hash，送進 process pool 雜湊
+    3. 以 COPY（PostgreSQL）或 executemany 寫入，每批一個 transaction
+
+    雜湊與寫入以管線方式進行：寫入第 N 批時，第 N+1 批的密碼已在背景雜湊
+    """
+
+    PASSWORD_FIELD = "password"
+    PASSWORD_HASH_FIELD = "password_hash"
+
+    def __init__(
+        self,
+        engine: Engine,
+        schema_class: Any,
+        hash_workers: Optional[int] = None,
+        bcrypt_rounds: Optional[int] = None,
+        progress_interval: Optional[float] = None
+    ):
+        """
+        初始化 BulkLoader
+
+        Args:
+            engine: 同步資料庫引擎
+            schema_class: ORM 模型類別
+            hash_workers: 雜湊用的行程數，0 或 None 代表使用 CPU 核心數
+            bcrypt_rounds: bcrypt rounds，預設取自安全設定
+            progress_interval: 進度日誌間隔（秒）
+        """
+        self.engine = engine
+        self.table: Table = schema_class.__table__
+        self.hash_workers = hash_workers or settings.seed.hash_workers or os.cpu_count() or 1
+        self.bcrypt_rounds = bcrypt_rounds or settings.security.bcrypt_rounds
+        self.progress_interval = progress_interval if progress_interval is not None else settings.seed.progress_interval
+
+        self._columns = {column.name for column in self.table.columns}
+        self._required_columns = {
+            column.name for column in self.table.columns
+            if not column.nullable
+            and not column.primary_key
+            and column.default is None
+            and column.server_default is None
+        }
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def load(self, batches: Iterable[List[Dict[str, Any]]]) -> BulkLoadResult:
+        """
+        匯入所有批次
+
+        Args:
+            batches: 資料批次迭代器（例如 iter_seed_batches 的結果）
+
+        Returns:
+            BulkLoadResult: 匯入結果統計
+        """
+        result = BulkLoadResult(table=self.table.name)
+        started_at = time.perf_counter()
+        last_report = started_at
+        pending: Optional[Tuple[List[Dict[str, Any]], List[Tuple[List[int], Future]]]] = None
+
+        try:
+            for batch in batches:
+                rows, invalid = self._prepare_batch(batch)
+                result.invalid += invalid
+                hash_jobs = self._submit_hash_jobs(rows)
+                result.hashed += sum(len(indexes) for indexes, _ in hash_jobs)
+
+                # 寫入上一批（此時這一批的密碼正在背景雜湊）
+                if pending is not None:
+                    result.inserted += self._write_batch(*pending)
+                    result.batches += 1
+                pending = (rows, hash_jobs)
+
+                now = time.perf_counter()
+                if now - last_report >= self.progress_interval:
+                    self._report_progress(result, now - started_at)
+                    last_report = now
+
+            if pending is not None:
+                result.inserted += self._write_batch(*pending)
+                result.batches += 1
+
+            if result.inserted and "id" in self._columns:
+                self._sync_id_sequence()
+
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+        result.elapsed = time.perf_counter() - started_at
+        logger.db_info(
+            f"Bulk load completed table={result.table} inserted={result.inserted} "
+            f"invalid={result.invalid} hashed={result.hashed} batches={result.batches} "
+            f"elapsed={result.elapsed:.2f}s rate={result.rows_per_second:.0f}/s"
+        )
+        return result
+
+    def _prepare_batch(self, batch: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        驗證並整理一批資料
+
+        Args:
+            batch: 原始資料
+
+        Returns:
+            (可寫入的資料列, 無效筆數)
+        """
+        rows = []
+        invalid = 0
+
+        for record in batch:
+            if not isinstance(record, dict):
+                invalid += 1
+                continue
+
+            row = {key: value for key, value in record.items() if key in self._columns}
+
+            # 如果 JSON 中的 id 為 null，移除它讓資料庫自動生成
+            if row.get("id", 0) is None:
+                del row["id"]
+
+            password = record.get(self.PASSWORD_FIELD)
+            if password and not row.get(self.PASSWORD_HASH_FIELD) and self.PASSWORD_HASH_FIELD in self._columns:
+                row[self.PASSWORD_FIELD] = password
+
+            missing = [column for column in self._required_columns if row.get(column) is None]
+            if missing:
+                invalid += 1
+                if invalid <= 5:
+                    logger.db_error("Bulk load skipped invalid record table=%s missing=%s", self.table.name, missing)
+                continue
+
+            rows.append(row)
+
+        return rows, invalid
+
+    def _submit_hash_jobs(self, rows: List[Dict[str, Any]]) -> List[Tuple[List[int], Future]]:
+        """
+        將需要雜湊的密碼分成 hash_workers 份送進 process pool
+
+        Args:
+            rows: 整理後的資料列
+
+        Returns:
+            (資料列索引列表, Future) 列表
+        """
+        indexes = []
+        passwords = []
+        for index, row in enumerate(rows):
+            password = row.pop(self.PASSWORD_FIELD, None)
+            if password is not None:
+                indexes.append(index)
+                passwords.append(password)
+
+        if not passwords:
+            return []
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.hash_workers)
+
+        chunk_size = -(-len(passwords) // self.hash_workers)
+        return [
+            (
+                indexes[start:start + chunk_size],
+                self._executor.submit(_hash_passwords, passwords[start:start + chunk_size], self.bcrypt_rounds)
+            )
+            for start in range(0, len(passwords), chunk_size)
+        ]
+
+    def _write_batch(self, rows: List[Dict[str, Any]], hash_jobs: List[Tuple[List[int], Future]]) -> int:
+        """
+        等待雜湊完成後寫入一批資料
+
+        Args:
+            rows: 資料列
+            hash_jobs: 雜湊工作
+
+        Returns:
+            寫入筆數
+        """
+        for indexes, future in hash_jobs:
+            for index, password_hash in zip(indexes, future.result()):
+                rows[index][self.PASSWORD_HASH_FIELD] = password_hash
+
+        if not rows:
+            return 0
+
+        # 欄位組合不同的資料列需分開寫入，避免缺少的欄位被寫成 NULL 而略過 server default
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for row in rows:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+
+        with self.engine.begin() as conn:
+            for columns, group in groups.items():
+                if self._supports_copy(conn):
+                    self._copy_rows(conn, columns, group)
+                else:
+                    conn.execute(self.table.insert(), group)
+
+        return len(rows)
+
+    @staticmethod
+    def _supports_copy(conn) -> bool:
+        """
+        檢查連線是否支援 COPY FROM STDIN（PostgreSQL + psycopg2）
+
+        Args:
+            conn: SQLAlchemy 連線
+
+        Returns:
+            是否支援 COPY
+        """
+        if conn.dialect.name != "postgresql":
+            return False
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            return hasattr(cursor, "copy_expert")
+        finally:
+            cursor.close()
+
+    def _copy_rows(self, conn, columns: Tuple[str, ...], rows: List[Dict[str, Any]]):
+        """
+        使用 PostgreSQL COPY 寫入資料列
+
+        Args:
+            conn: SQLAlchemy 連線
+            columns: 欄位名稱
+            rows: 資料列
+        """
+        buffer = io.StringIO()
+        # QUOTE_NONNUMERIC：字串加引號、None 不加引號，COPY CSV 因此能區分 NULL 與空字串
+        writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC, lineterminator="\n")
+        for row in rows:
+            writer.writerow([
+                json.dumps(row[column]) if isinstance(row[column], (dict, list)) else row[column]
+                for column in columns
+            ])
+        buffer.seek(0)
+
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.copy_expert(
+                f'COPY "{self.table.name}" ({column_list}) FROM STDIN WITH (FORMAT csv)',
+                buffer
+            )
+        finally:
+            cursor.close()
+
+    def _sync_id_sequence(self):
+        """明確寫入 id 後，將 PostgreSQL 序列同步到目前最大值"""
+        with self.engine.begin() as conn:
+            if conn.dialect.name != "postgresql":
+                return
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{self.table.name}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM \"{self.table.name}\"), 1))"
+            ))
+
+    def _report_progress(self, result: BulkLoadResult, elapsed: float):
+        """
+        輸出匯入進度
+
+        Args:
+            result: 目前的統計
+            elapsed: 已經過秒數
+        """
+        rate = result.inserted / elapsed if elapsed > 0 else 0.0
+        logger.db_info(
+            f"Bulk load progress table={result.table} inserted={result.inserted} "
+            f"invalid={result.invalid} elapsed={elapsed:.1f}s rate={rate:.0f}/s"
+        )
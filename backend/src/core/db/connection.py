@@ -3,15 +3,43 @@ connection.py - 建立資料庫連線
 提供資料庫引擎和會話管理
 """
 
-from sqlalchemy import create_engine, Engine
+import time
+
+from sqlalchemy import create_engine, event, Engine, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from typing import Generator, AsyncGenerator
+from typing import Generator, AsyncGenerator, Optional
 from contextlib import contextmanager, asynccontextmanager
 
 from src.core.config import settings
+from src.core.context.deadline import check_deadline, release_deadline
 from src.core.logger.logger import logger
+from src.core.tracing import SPAN_KIND_CLIENT, tracer
+from src.core.db.query_budget import record_query, record_round_trip
+from src.core.db.query_stats import query_stats
+from src.core.metrics.instruments import (
+    registry,
+    DB_POOL_CHECKOUTS,
+    DB_POOL_WAIT,
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_OVERFLOW,
+    DB_POOL_SIZE
+)
+from src.shared.errors.system_error.timeout_error import DatabaseTimeoutException
+
+# PostgreSQL 的 query_canceled（statement_timeout 觸發時的錯誤碼）
+QUERY_CANCELED_SQLSTATE = "57014"
+
+# SQL span 記錄的 statement 長度上限
+MAX_TRACED_STATEMENT_LENGTH = 2000
+
+# 內部 statement（SET LOCAL statement_timeout）的 execution option，不記入 SQL 數量與 query_stats
+INTERNAL_STATEMENT_OPTION = "internal_statement"
+
+# 會寫入資料的 statement（交易提交後解除請求期限）
+_WRITE_VERBS = ("INSERT", "UPDATE", "DELETE")
 
 # 建立 Base 類別
 Base = declarative_base()
@@ -34,6 +62,9 @@ class DatabaseConnection:
     def _create_engines(self):
         """建立資料庫引擎"""
         try:
+            # 連線預設的 statement_timeout 在建立連線時設定，不必每個交易多一次 SET
+            statement_timeout = settings.database.statement_timeout
+            
             # 同步引擎
             self._engine = create_engine(
                 settings.database.database_url,
@@ -42,7 +73,8 @@ class DatabaseConnection:
                 pool_timeout=settings.database.pool_timeout,
                 pool_recycle=settings.database.pool_recycle,
                 echo=settings.database.echo,
-                echo_pool=settings.database.echo_pool
+                echo_pool=settings.database.echo_pool,
+                connect_args={"options": f"-c statement_timeout={statement_timeout}"} if statement_timeout else {}
             )
             
             # 異步引擎
@@ -53,9 +85,18 @@ class DatabaseConnection:
                 pool_timeout=settings.database.pool_timeout,
                 pool_recycle=settings.database.pool_recycle,
                 echo=settings.database.echo,
-                echo_pool=settings.database.echo_pool
+                echo_pool=settings.database.echo_pool,
+                connect_args={"server_settings": {"statement_timeout": str(statement_timeout)}} if statement_timeout else {}
             )
             
+            if registry.enabled:
+                self._instrument_pool()
+            self._instrument_statements(self._engine)
+            self._instrument_statements(self._async_engine.sync_engine)
+            if tracer.enabled:
+                self._instrument_tracing(self._engine)
+                self._instrument_tracing(self._async_engine.sync_engine)
+            
             # 會話工廠
             self._session_factory = sessionmaker(bind=self._engine)
             self._async_session_factory = async_sessionmaker(bind=self._async_engine)
@@ -63,14 +104,141 @@ class DatabaseConnection:
             self._initialized = True
             
             logger.db_info(
-                f"Connection established host={settings.database.host} "
-                f"db={settings.database.name}"
+                "Connection established host=%s db=%s",
+                settings.database.host, settings.database.name
             )
             
         except Exception as e:
-            logger.db_error(f"Connection failed - {str(e)}")
+            logger.db_error("Connection failed - %s", e)
             raise
     
+    def _instrument_pool(self):
+        """註冊連線池指標（取出次數，以及輸出 /metrics 時的使用量）"""
+        event.listen(self._engine, "checkout", lambda *args: DB_POOL_CHECKOUTS.inc())
+        event.listen(self._async_engine.sync_engine, "checkout", lambda *args: DB_POOL_CHECKOUTS.inc())
+        
+        def collect_pool_usage():
+            checked_out = overflow = size = 0
+            for pool in (self._engine.pool, self._async_engine.sync_engine.pool):
+                # SQLite 等使用的連線池沒有大小限制，不提供這些數值
+                if not hasattr(pool, "checkedout"):
+                    continue
+                checked_out += pool.checkedout()
+                overflow += max(pool.overflow(), 0)
+                size += pool.size()
+            DB_POOL_CHECKED_OUT.set(checked_out)
+            DB_POOL_OVERFLOW.set(overflow)
+            DB_POOL_SIZE.set(size)
+        
+        registry.add_collector(collect_pool_usage)
+    
+    @staticmethod
+    def _instrument_statements(engine: Engine):
+        """
+        為每個 SQL statement 計時，記入目前請求的 SQL 數量（N+1 偵測）與 query_stats（慢查詢輸出 WARN 日誌）
+        
+        標記 INTERNAL_STATEMENT_OPTION 的內部 statement 不計入，正式環境（PostgreSQL）的 SQL 數量與 SQLite 測試一致；
+        含寫入的交易送出 COMMIT 時解除請求期限（release_deadline），已提交的請求不會再被中介軟體以 504 取消
+        
+        Args:
+            engine: 同步引擎（異步引擎傳入 sync_engine）
+        """
+        stats_enabled = settings.database.query_stats_enabled
+        
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("query_started", []).append(time.perf_counter())
+        
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            started = conn.info.get("query_started")
+            if started and context is not None and context.execution_options.get(INTERNAL_STATEMENT_OPTION):
+                started.pop()
+            elif started:
+                elapsed_ms = (time.perf_counter() - started.pop()) * 1000
+                record_query(
+                    query_stats.fingerprint_of(statement),
+                    elapsed_ms,
+                    len(parameters) if executemany and parameters else 1
+                )
+                if stats_enabled:
+                    query_stats.record(statement, parameters, executemany, elapsed_ms)
+            if statement.lstrip()[:6].upper() in _WRITE_VERBS:
+                conn.info["wrote"] = True
+        
+        def commit(conn):
+            record_round_trip()
+            if conn.info.pop("wrote", False):
+                release_deadline()
+        
+        def rollback(conn):
+            record_round_trip()
+            conn.info.pop("wrote", None)
+        
+        def handle_error(exception_context):
+            connection = exception_context.connection
+            started = connection.info.get("query_started") if connection is not None else None
+            if started and exception_context.statement:
+                elapsed_ms = (time.perf_counter() - started.pop()) * 1000
+                record_query(query_stats.fingerprint_of(exception_context.statement), elapsed_ms)
+                if stats_enabled:
+                    query_stats.record(
+                        exception_context.statement,
+                        exception_context.parameters,
+                        exception_context.execution_context.executemany if exception_context.execution_context else False,
+                        elapsed_ms,
+                        failed=True
+                    )
+        
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", after_cursor_execute)
+        event.listen(engine, "handle_error", handle_error)
+        # COMMIT / ROLLBACK 不經過 cursor，但同樣是一次資料庫往返
+        event.listen(engine, "commit", commit)
+        event.listen(engine, "rollback", rollback)
+    
+    @staticmethod
+    def _instrument_tracing(engine: Engine):
+        """
+        為每個 SQL statement 記錄一個 span（父 span 為目前的 Repository 方法）
+        
+        Args:
+            engine: 同步引擎（異步引擎傳入 sync_engine）
+        """
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            words = statement.split(None, 1)
+            operation = words[0].upper() if words else "SQL"
+            span = tracer.start_span(
+                f"SQL {operation}",
+                SPAN_KIND_CLIENT,
+                {
+                    "db.system": engine.dialect.name,
+                    "db.operation": operation,
+                    "db.name": settings.database.name,
+                    # 只記錄參數化後的 SQL（不含參數值），過長時截斷
+                    "db.statement": statement[:MAX_TRACED_STATEMENT_LENGTH],
+                    "db.executemany": executemany or None
+                }
+            )
+            conn.info.setdefault("trace_spans", []).append(span)
+        
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            spans = conn.info.get("trace_spans")
+            if spans:
+                span = spans.pop()
+                if cursor.rowcount is not None and cursor.rowcount >= 0:
+                    span.set_attribute("db.rows", cursor.rowcount)
+                span.end()
+        
+        def handle_error(exception_context):
+            spans = exception_context.connection.info.get("trace_spans") if exception_context.connection else None
+            if spans:
+                span = spans.pop()
+                span.record_exception(exception_context.original_exception)
+                span.end()
+        
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", after_cursor_execute)
+        event.listen(engine, "handle_error", handle_error)
+    
     def get_engine(self) -> Engine:
         """
         取得同步資料庫引擎
@@ -104,13 +272,21 @@ class DatabaseConnection:
         if not self._initialized:
             self._create_engines()
         
+        timeout_sql = self._statement_timeout_sql()
         session = self._session_factory()
         try:
+            # 先取得連線，等待連線池的時間記入指標
+            started = time.perf_counter()
+            session.connection()
+            DB_POOL_WAIT.observe(time.perf_counter() - started)
+            if timeout_sql:
+                session.execute(text(timeout_sql), execution_options={INTERNAL_STATEMENT_OPTION: True})
             yield session
             session.commit()
         except Exception as e:
             session.rollback()
-            logger.db_error(f"Transaction rollback - {str(e)}")
+            logger.db_error("Transaction rollback - %s", e)
+            self._raise_if_timeout(e)
             raise
         finally:
             session.close()
@@ -126,17 +302,61 @@ class DatabaseConnection:
         if not self._initialized:
             self._create_engines()
         
+        timeout_sql = self._statement_timeout_sql()
         session = self._async_session_factory()
         try:
+            # 先取得連線，等待連線池的時間記入指標
+            started = time.perf_counter()
+            await session.connection()
+            DB_POOL_WAIT.observe(time.perf_counter() - started)
+            if timeout_sql:
+                await session.execute(text(timeout_sql), execution_options={INTERNAL_STATEMENT_OPTION: True})
             yield session
             await session.commit()
         except Exception as e:
             await session.rollback()
-            logger.db_error(f"Transaction rollback - {str(e)}")
+            logger.db_error("Transaction rollback - %s", e)
+            self._raise_if_timeout(e)
             raise
         finally:
             await session.close()
     
+    def _statement_timeout_sql(self) -> Optional[str]:
+        """
+        依目前請求的剩餘時間產生 statement_timeout 設定
+        
+        SET LOCAL 只作用於本次 transaction，連線歸還連線池後不會殘留；
+        剩餘時間不短於連線預設的 statement_timeout（DB_STATEMENT_TIMEOUT）時不另外設定，省下一次往返
+        
+        Returns:
+            SET LOCAL 語句，沒有請求期限、剩餘時間不短於連線預設值或不是 PostgreSQL 時為 None
+            
+        Raises:
+            RequestTimeoutException: 請求已超過期限
+        """
+        remaining = check_deadline("Database session")
+        if remaining is None or self._engine.dialect.name != "postgresql":
+            return None
+        remaining_ms = max(1, int(remaining * 1000))
+        default_ms = settings.database.statement_timeout
+        if default_ms and remaining_ms >= default_ms:
+            return None
+        return f"SET LOCAL statement_timeout = {remaining_ms}"
+    
+    @staticmethod
+    def _raise_if_timeout(error: Exception):
+        """
+        將 statement_timeout 造成的查詢取消轉換為 DatabaseTimeoutException
+        
+        Args:
+            error: 資料庫操作的例外
+            
+        Raises:
+            DatabaseTimeoutException: 查詢因逾時被取消
+        """
+        if isinstance(error, DBAPIError) and getattr(error.orig, "pgcode", None) == QUERY_CANCELED_SQLSTATE:
+            raise DatabaseTimeoutException("Database statement timed out") from error
+    
     def close(self):
         """關閉資料庫連線"""
         if self._engine:
@@ -8,12 +8,13 @@ import sys
 import importlib
 from pathlib import Path
 from typing import List, Dict, Any
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, text, inspect
 from sqlalchemy.exc import SQLAlchemyError
 
 from src.core.config import settings
 from src.core.logger.logger import logger
 from src.core.db.connection import get_engine
+from src.shared.utils.seed_loader import SEED_FILE_EXTENSIONS
 
 
 class DatabaseInitializer:
@@ -50,7 +51,7 @@ class DatabaseInitializer:
             return True
             
         except Exception as e:
-            logger.db_error(f"Database initialization failed - {str(e)}")
+            logger.db_error("Database initialization failed - %s", e)
             return False
     
     def _create_database_if_not_exists(self):
@@ -73,14 +74,14 @@ class DatabaseInitializer:
                     # 建立資料庫
                     conn.execute(text("COMMIT"))  # 結束當前事務
                     conn.execute(text(f"CREATE DATABASE {db_config.name}"))
-                    logger.db_info(f"Database {db_config.name} created")
+                    logger.db_info("Database %s created", db_config.name)
                 else:
-                    logger.db_info(f"Database {db_config.name} already exists")
+                    logger.db_info("Database %s already exists", db_config.name)
             
             postgres_engine.dispose()
             
         except SQLAlchemyError as e:
-            logger.db_error(f"Failed to create database - {str(e)}")
+            logger.db_error("Failed to create database - %s", e)
             raise
     
     def _create_tables(self):
@@ -104,12 +105,83 @@ class DatabaseInitializer:
             from src.core.db.connection import Base
             Base.metadata.create_all(bind=self.engine)
             
+            # 既有資料表不會被 create_all 補上新增的欄位與索引
+            self._add_missing_columns(Base.metadata)
+            self._create_missing_indexes(Base.metadata)
+            
             logger.db_info("All tables created successfully")
             
         except Exception as e:
-            logger.db_error(f"Failed to create tables - {str(e)}")
+            logger.db_error("Failed to create tables - %s", e)
             raise
     
+    def _add_missing_columns(self, metadata):
+        """
+        為既有資料表補上 schema 中新增的欄位
+        
+        只處理可直接新增的欄位：可為 NULL，或有 server default（既有資料列會填入預設值）
+        
+        Args:
+            metadata: SQLAlchemy MetaData
+        """
+        inspector = inspect(self.engine)
+        dialect = self.engine.dialect
+        
+        for table in metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                
+                if not column.nullable and column.server_default is None:
+                    logger.db_error(
+                        "Cannot add column table=%s column=%s reason=not_null_without_server_default",
+                        table.name, column.name
+                    )
+                    continue
+                
+                ddl = f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column.type.compile(dialect=dialect)}'
+                backfill = None
+                if column.server_default is not None:
+                    default = column.server_default.arg
+                    if isinstance(default, str):
+                        # 字串預設值為常值
+                        ddl += f" DEFAULT '{default}'"
+                    elif dialect.name == "sqlite":
+                        # SQLite 的 ADD COLUMN 不接受非常數預設值（func.now()、text(...)）：
+                        # 新增可為 NULL 的欄位後以預設表達式回填既有資料列
+                        backfill = f'UPDATE "{table.name}" SET "{column.name}" = {default.compile(dialect=dialect)}'
+                    else:
+                        ddl += f" DEFAULT {default.compile(dialect=dialect)}"
+                if not column.nullable and backfill is None:
+                    ddl += " NOT NULL"
+                
+                with self.engine.begin() as conn:
+                    conn.execute(text(ddl))
+                    if backfill:
+                        conn.execute(text(backfill))
+                if backfill:
+                    logger.db_info(
+                        "Column added table=%s column=%s nullable=true reason=sqlite_non_constant_default",
+                        table.name, column.name
+                    )
+                else:
+                    logger.db_info("Column added table=%s column=%s", table.name, column.name)
+    
+    def _create_missing_indexes(self, metadata):
+        """
+        為既有資料表補建 schema 中新增的索引
+        
+        Args:
+            metadata: SQLAlchemy MetaData
+        """
+        for table in metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=self.engine, checkfirst=True)
+    
     def _scan_schema_modules(self) -> List[str]:
         """
         掃描所有 context 的 schema 模組
@@ -134,7 +206,7 @@ class DatabaseInitializer:
                             module_name = f"src.contexts.{context_dir.name}.infra.schema.{schema_file.stem}"
                             schema_modules.append(module_name)
         
-        logger.db_info(f"Found {len(schema_modules)} schema modules")
+        logger.db_info("Found %s schema modules", len(schema_modules))
         return schema_modules
     
     def _import_schema_module(self, module_path: str):
@@ -147,9 +219,9 @@ class DatabaseInitializer:
         try:
             importlib.import_module(module_path)
             context_name = module_path.split('.')[2]  # 提取 context 名稱
-            logger.db_info(f"Schema module imported: {module_path} (context={context_name})")
+            logger.db_info("Schema module imported: %s (context=%s)", module_path, context_name)
         except Exception as e:
-            logger.db_error(f"Failed to import schema module {module_path} - {str(e)}")
+            logger.db_error("Failed to import schema module %s - %s", module_path, e)
             raise
     
     def _import_seed_data(self):
@@ -169,7 +241,7 @@ class DatabaseInitializer:
             logger.db_info("All seed data imported successfully")
             
         except Exception as e:
-            logger.db_error(f"Failed to import seed data - {str(e)}")
+            logger.db_error("Failed to import seed data - %s", e)
             raise
     
     def _scan_seed_data_directories(self) -> List[Dict[str, str]]:
@@ -189,84 +261,85 @@ class DatabaseInitializer:
             if context_dir.is_dir():
                 seed_data_dir = context_dir / "infra" / "seed" / "data"
                 if seed_data_dir.exists():
-                    # 掃描 data 目錄中的 JSON 檔案
-                    json_files = list(seed_data_dir.glob("*.json"))
+                    # 掃描 data 目錄中的 JSON / NDJSON 檔案（同名檔案只取一次）
+                    json_files = sorted({
+                        f.stem
+                        for extension in SEED_FILE_EXTENSIONS
+                        for f in seed_data_dir.glob(f"*{extension}")
+                    })
                     if json_files:
                         seed_directories.append({
                             "context": context_dir.name,
                             "seed_dir": str(seed_data_dir),
-                            "json_files": [f.stem for f in json_files]
+                            "json_files": json_files
                         })
         
-        logger.db_info(f"Found {len(seed_directories)} seed data directories")
+        logger.db_info("Found %s seed data directories", len(seed_directories))
         return seed_directories
     
     def _import_seed_data_from_directory(self, seed_info: Dict[str, str]):
         """
         從目錄匯入 seed 資料
         
+        以串流方式分批讀取 JSON / NDJSON，並交由 BulkLoader 寫入，
+        不會把整個檔案或所有 ORM 物件同時放在記憶體中
+        
         Args:
             seed_info: seed 目錄資訊
         """
         try:
-            from src.shared.utils.seed_loader import load_seed_data
+            from src.shared.utils.seed_loader import iter_seed_batches
             from src.core.db.connection import get_session
+            from src.core.db.bulk_loader import BulkLoader
             
             context_name = seed_info["context"]
             seed_dir = seed_info["seed_dir"]
             json_files = seed_info["json_files"]
             
-            logger.db_info(f"Processing seed data for context: {context_name}")
+            logger.db_info("Processing seed data for context: %s", context_name)
             
-            with get_session() as session:
-                for table_name in json_files:
-                    try:
-                        # 載入 seed 資料
-                        seed_data = load_seed_data(table_name, seed_dir)
-                        if not seed_data:
-                            logger.db_info(f"No seed data found for {table_name}")
-                            continue
-                        
-                        # 獲取對應的 Schema 類別
-                        schema_class = self._get_schema_class_by_table_name(table_name, context_name)
-                        if not schema_class:
-                            logger.db_info(f"No schema class found for table: {table_name}")
-                            continue
-                        
-                        # 檢查現有資料
+            for table_name in json_files:
+                try:
+                    # 獲取對應的 Schema 類別
+                    schema_class = self._get_schema_class_by_table_name(table_name, context_name)
+                    if not schema_class:
+                        logger.db_info("No schema class found for table: %s", table_name)
+                        continue
+                    
+                    # 檢查現有資料
+                    with get_session() as session:
                         try:
-                            existing_count = session.query(schema_class).count()
-                            if existing_count > 0:
-                                logger.db_info(f"Seed skipped for {table_name} - {existing_count} records already exist")
-                                continue
+                            has_rows = session.query(schema_class).first() is not None
                         except Exception:
+                            session.rollback()
                             # 表不存在，先創建表
-                            logger.db_info(f"Table for {table_name} does not exist, creating...")
+                            logger.db_info("Table for %s does not exist, creating...", table_name)
                             schema_class.metadata.create_all(bind=self.engine)
-                            logger.db_info(f"Table for {table_name} created successfully")
-                        
-                        # 轉換為 Schema 物件並插入
-                        schema_objects = []
-                        for data in seed_data:
-                            # 如果 JSON 中沒有 id 欄位，移除它讓資料庫自動生成
-                            if 'id' in data and data['id'] is None:
-                                data = {k: v for k, v in data.items() if k != 'id'}
-                            schema_obj = schema_class(**data)
-                            schema_objects.append(schema_obj)
-                        
-                        # 批量插入
-                        session.add_all(schema_objects)
-                        session.commit()
-                        
-                        logger.db_info(f"Seed data imported for {table_name} - {len(schema_objects)} records created")
-                        
-                    except Exception as e:
-                        session.rollback()
-                        logger.db_error(f"Failed to import seed data for {table_name}: {str(e)}")
-                        raise
+                            logger.db_info("Table for %s created successfully", table_name)
+                            has_rows = False
+                    
+                    if has_rows:
+                        logger.db_info("Seed skipped for %s - records already exist", table_name)
+                        continue
+                    
+                    # 串流讀取並批次寫入
+                    loader = BulkLoader(self.engine, schema_class)
+                    result = loader.load(
+                        iter_seed_batches(table_name, seed_dir, settings.seed.bulk_batch_size)
+                    )
+                    
+                    if not result.inserted:
+                        logger.db_info("No seed data found for %s", table_name)
+                        continue
+                    
+                    logger.db_info("Seed data imported for %s - %s records created", table_name, result.inserted)
+                    
+                except Exception as e:
+                    logger.db_error("Failed to import seed data for %s: %s", table_name, e)
+                    raise
                         
         except Exception as e:
-            logger.db_error(f"Failed to process seed data for context {context_name}: {str(e)}")
+            logger.db_error("Failed to process seed data for context %s: %s", context_name, e)
             raise
     
     def _get_schema_class_by_table_name(self, table_name: str, context_name: str):
@@ -299,11 +372,11 @@ class DatabaseInitializer:
             if class_name and hasattr(schema_module, class_name):
                 return getattr(schema_module, class_name)
             
-            logger.db_info(f"No mapping found for table: {table_name}")
+            logger.db_info("No mapping found for table: %s", table_name)
             return None
             
         except Exception as e:
-            logger.db_error(f"Failed to get schema class for {table_name}: {str(e)}")
+            logger.db_error("Failed to get schema class for %s: %s", table_name, e)
             return None
     
     def _import_seed_module(self, module_path: str):
@@ -323,12 +396,12 @@ class DatabaseInitializer:
             elif hasattr(module, 'run_seed'):
                 # 向後兼容舊的 run_seed 函數
                 module.run_seed()
-                logger.db_info(f"Seed data imported (context={context_name}) - using legacy run_seed")
+                logger.db_info("Seed data imported (context=%s) - using legacy run_seed", context_name)
             else:
-                logger.db_info(f"Seed module {module_path} has no seed provider function, skipping")
+                logger.db_info("Seed module %s has no seed provider function, skipping", module_path)
                 
         except Exception as e:
-            logger.db_error(f"Failed to import seed module {module_path} - {str(e)}")
+            logger.db_error("Failed to import seed module %s - %s", module_path, e)
             raise
     
     def _process_seed_provider(self, seed_provider, context_name: str):
@@ -344,11 +417,11 @@ class DatabaseInitializer:
             
             # 獲取 seed 資訊
             seed_info = seed_provider.get_seed_info()
-            logger.db_info(f"Processing seed for context={context_name}: {seed_info}")
+            logger.db_info("Processing seed for context=%s: %s", context_name, seed_info)
             
             # 驗證 seed 資料
             if not seed_provider.validate_seed_data():
-                logger.db_error(f"Seed data validation failed for context={context_name}")
+                logger.db_error("Seed data validation failed for context=%s", context_name)
                 return
             
             with get_session() as session:
@@ -359,18 +432,18 @@ class DatabaseInitializer:
                 try:
                     existing_count = session.query(schema_class).count()
                     if existing_count > 0:
-                        logger.db_info(f"Seed skipped for {context_name} - {existing_count} records already exist")
+                        logger.db_info("Seed skipped for %s - %s records already exist", context_name, existing_count)
                         return
                 except Exception:
                     # 表不存在，先創建表
-                    logger.db_info(f"Table for {context_name} does not exist, creating...")
+                    logger.db_info("Table for %s does not exist, creating...", context_name)
                     schema_class.metadata.create_all(bind=self.engine)
-                    logger.db_info(f"Table for {context_name} created successfully")
+                    logger.db_info("Table for %s created successfully", context_name)
                 
                 # 獲取 seed 資料
                 seed_data = seed_provider.get_seed_data()
                 if not seed_data:
-                    logger.db_info(f"No seed data found for {context_name}")
+                    logger.db_info("No seed data found for %s", context_name)
                     return
                 
                 # 轉換為 Schema 物件
@@ -380,10 +453,10 @@ class DatabaseInitializer:
                 session.add_all(schema_objects)
                 session.commit()
                 
-                logger.db_info(f"Seed data imported for {context_name} - {len(schema_objects)} records created")
+                logger.db_info("Seed data imported for %s - %s records created", context_name, len(schema_objects))
                 
         except Exception as e:
-            logger.db_error(f"Failed to process seed provider for {context_name} - {str(e)}")
+            logger.db_error("Failed to process seed provider for %s - %s", context_name, e)
             raise
 
 
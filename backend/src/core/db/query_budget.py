@@ -0,0 +1,247 @@
+"""
+query_budget.py - 每個請求的 SQL 數量
+由引擎事件把每次 SQL 記入目前請求的上下文（存取日誌的 db_queries / db_round_trips / db_ms），
+請求結束時檢查 SQL 數量上限與重複的 fingerprint（N+1），並提供測試用的計數工具
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.core.config import settings
+from src.core.context.request_context import RequestContext, get_request_context
+from src.core.logger.logger import logger
+
+# 同一個路由的同一種警告在這個間隔內只輸出一次（秒）
+WARNING_INTERVAL = 60.0
+
+
+class QueryRecorder:
+    """
+    SQL 計數器（測試用）
+
+    TestClient 在另一個執行緒執行應用程式，contextvars 不會帶到測試程式，
+    因此計數器註冊在全域列表，所有執行緒的 SQL 都會記入
+    """
+
+    def __init__(self):
+        """初始化計數器"""
+        self.queries: List[Tuple[str, float]] = []
+        self.round_trips = 0
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        """SQL 執行次數"""
+        return len(self.queries)
+
+    def fingerprints(self) -> Dict[str, int]:
+        """
+        各 fingerprint 的執行次數
+
+        Returns:
+            fingerprint -> 次數
+        """
+        counts: Dict[str, int] = {}
+        for fingerprint, _ in self.queries:
+            counts[fingerprint] = counts.get(fingerprint, 0) + 1
+        return counts
+
+    def add(self, fingerprint: str, elapsed_ms: float):
+        """
+        記錄一次 SQL 執行
+
+        Args:
+            fingerprint: SQL fingerprint
+            elapsed_ms: 耗時（毫秒）
+        """
+        with self._lock:
+            self.queries.append((fingerprint, elapsed_ms))
+            self.round_trips += 1
+
+    def add_round_trip(self):
+        """記錄一次沒有 SQL 的往返（COMMIT / ROLLBACK）"""
+        with self._lock:
+            self.round_trips += 1
+
+
+_recorders: List[QueryRecorder] = []
+
+
+def record_query(fingerprint: str, elapsed_ms: float, statements: int = 1):
+    """
+    記錄一次 SQL 執行（由引擎的 after_cursor_execute 事件呼叫）
+
+    Args:
+        fingerprint: SQL fingerprint
+        elapsed_ms: 耗時（毫秒）
+        statements: statement 數量（executemany 時為參數列數）
+    """
+    request_context = get_request_context()
+    if request_context is not None:
+        request_context.record_query(fingerprint, elapsed_ms, statements)
+    for recorder in _recorders:
+        recorder.add(fingerprint, elapsed_ms)
+
+
+def record_round_trip():
+    """記錄一次 COMMIT / ROLLBACK 往返"""
+    request_context = get_request_context()
+    if request_context is not None:
+        request_context.incr("db_round_trips")
+    for recorder in _recorders:
+        recorder.add_round_trip()
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryRecorder]:
+    """
+    計算區塊內執行的 SQL（測試用）
+
+    範例：
+        with count_queries() as queries:
+            client.post("/users/register", json=payload)
+        assert queries.count == 3
+
+    Yields:
+        QueryRecorder
+    """
+    recorder = QueryRecorder()
+    _recorders.append(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorders.remove(recorder)
+
+
+@contextmanager
+def assert_max_queries(limit: int, repeat_limit: Optional[int] = None) -> Iterator[QueryRecorder]:
+    """
+    確認區塊內執行的 SQL 不超過上限（測試用）
+
+    範例：
+        with assert_max_queries(3):
+            client.post("/users/register", json=payload)
+
+    Args:
+        limit: SQL 數量上限
+        repeat_limit: 同一個 fingerprint 的次數上限，None 表示不檢查
+
+    Yields:
+        QueryRecorder
+
+    Raises:
+        AssertionError: 超過上限（訊息列出各 fingerprint 的次數）
+    """
+    with count_queries() as recorder:
+        yield recorder
+
+    repeated = {
+        fingerprint: count
+        for fingerprint, count in recorder.fingerprints().items()
+        if repeat_limit is not None and count > repeat_limit
+    }
+    if recorder.count > limit or repeated:
+        details = "\n".join(
+            f"  {count}x {fingerprint}" for fingerprint, count in recorder.fingerprints().items()
+        )
+        raise AssertionError(
+            f"Expected at most {limit} queries"
+            f"{f' and {repeat_limit} per fingerprint' if repeat_limit is not None else ''}, "
+            f"got {recorder.count}:\n{details}"
+        )
+
+
+def budget_for(route: str) -> int:
+    """
+    取得路由的 SQL 數量上限
+
+    Args:
+        route: 路由樣板（例如 /users/{user_id}）
+
+    Returns:
+        上限，0 表示不檢查
+    """
+    return settings.database.route_query_budgets.get(route, settings.database.query_budget)
+
+
+_last_warned: Dict[Tuple[str, str], float] = {}
+
+
+def check_query_budget(request_context: RequestContext, route: str):
+    """
+    請求結束時檢查 SQL 數量上限與 N+1（超過時輸出 WARN，同一路由同一種警告每 WARNING_INTERVAL 秒最多一次）
+
+    Args:
+        request_context: 請求上下文
+        route: 路由樣板
+    """
+    budget = budget_for(route)
+    if budget <= 0 or not request_context.query_counts:
+        return
+
+    queries = request_context.counters.get("db_queries", 0)
+    if queries > budget and _should_warn(route, "budget"):
+        logger.warn(
+            "Query budget exceeded %s %s queries=%s budget=%s",
+            request_context.method,
+            route,
+            queries,
+            budget,
+            context="DB",
+            route=route,
+            queries=queries,
+            budget=budget,
+            fingerprints=_top_fingerprints(request_context.query_counts)
+        )
+
+    threshold = settings.database.query_repeat_threshold
+    if threshold <= 0:
+        return
+    for fingerprint, count in request_context.query_counts.items():
+        if count >= threshold and _should_warn(route, fingerprint):
+            logger.warn(
+                "Possible N+1 in %s %s: same query executed %s times - %s",
+                request_context.method,
+                route,
+                count,
+                fingerprint,
+                context="DB",
+                route=route,
+                repeated=count
+            )
+
+
+def _should_warn(route: str, kind: str) -> bool:
+    """
+    檢查警告是否已在 WARNING_INTERVAL 秒內輸出過
+
+    Args:
+        route: 路由樣板
+        kind: 警告種類（budget 或 fingerprint）
+
+    Returns:
+        True 如果要輸出
+    """
+    now = time.monotonic()
+    key = (route, kind)
+    last = _last_warned.get(key)
+    if last is not None and now - last < WARNING_INTERVAL:
+        return False
+    _last_warned[key] = now
+    return True
+
+
+def _top_fingerprints(query_counts: Dict[str, int], limit: int = 5) -> Dict[str, int]:
+    """
+    執行次數最多的 fingerprint
+
+    Args:
+        query_counts: fingerprint -> 次數
+        limit: 數量
+
+    Returns:
+        fingerprint -> 次數
+    """
+    return dict(sorted(query_counts.items(), key=lambda item: item[1], reverse=True)[:limit])
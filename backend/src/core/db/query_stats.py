@@ -0,0 +1,293 @@
+"""
+query_stats.py - SQL 統計與慢查詢紀錄
+將每個 statement 正規化為 fingerprint（字面值與參數換成 ?），依 fingerprint 統計次數、總耗時與 p95，
+超過門檻的 statement 連同參數型別（不含參數值）與來源 Repository 方法輸出 WARN 日誌
+"""
+
+import re
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from src.core.config import settings
+from src.core.logger.logger import logger
+
+# 超過上限的 fingerprint 合併計入這個 key，避免動態組出的 SQL 讓統計無限成長
+OTHER_FINGERPRINT = "(other)"
+
+# 每個 fingerprint 保留最近幾次的耗時用於計算 p95
+RECENT_SAMPLES = 512
+
+# 每個 fingerprint 記錄的來源數量上限
+MAX_SOURCES = 5
+
+# 參數超過這個數量時只輸出各型別的數量（例如 IN 清單）
+MAX_PARAMETER_SHAPES = 20
+
+SORT_KEYS = ("total_ms", "p95_ms", "max_ms", "count", "slow_count")
+
+_COMMENTS = re.compile(r"/\*.*?\*/|--[^\n]*", re.S)
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\?|(?<![:\w]):\w+|\$\d+")
+_NUMBER = re.compile(r"(?<![\w.])\d+(?:\.\d+)?\b")
+_REPEATED_PLACEHOLDERS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_REPEATED_ROWS = re.compile(r"(\(\?\+?\))(?:\s*,\s*\(\?\+?\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """
+    將 SQL 正規化為 fingerprint
+
+    - 移除註解、合併空白
+    - 字串與數字字面值、各種參數佔位符（%(name)s、%s、?、:name、$1）換成 ?
+    - IN 清單與多列 VALUES 不論長度都合併為 (?+)
+
+    Args:
+        statement: 送到資料庫的 SQL
+
+    Returns:
+        fingerprint
+    """
+    normalized = _COMMENTS.sub(" ", statement)
+    normalized = _STRING_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _REPEATED_PLACEHOLDERS.sub("(?+)", normalized)
+    normalized = _REPEATED_ROWS.sub(r"\1, ...", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def parameter_shapes(parameters: Any, executemany: bool = False) -> Any:
+    """
+    取得參數的型別（不含參數值，避免個資進入日誌）
+
+    Args:
+        parameters: DBAPI 參數（dict、tuple，或 executemany 時為列表）
+        executemany: 是否為批次執行
+
+    Returns:
+        型別描述，例如 {"id_1": "int"}、["str", "int"]、{"rows": 500, "row": {...}}
+    """
+    if executemany and isinstance(parameters, (list, tuple)):
+        return {"rows": len(parameters), "row": parameter_shapes(parameters[0]) if parameters else None}
+    if isinstance(parameters, dict):
+        if len(parameters) > MAX_PARAMETER_SHAPES:
+            return _count_types(parameters.values())
+        return {key: _type_name(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if len(parameters) > MAX_PARAMETER_SHAPES:
+            return _count_types(parameters)
+        return [_type_name(value) for value in parameters]
+    return _type_name(parameters)
+
+
+def _type_name(value: Any) -> str:
+    """參數值的型別名稱（None 為 null）"""
+    return "null" if value is None else type(value).__name__
+
+
+def _count_types(values) -> Dict[str, int]:
+    """各型別的參數數量"""
+    counts: Dict[str, int] = {}
+    for value in values:
+        name = _type_name(value)
+        counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
+def find_source() -> Optional[str]:
+    """
+    從呼叫堆疊找出執行 SQL 的 Repository 方法
+
+    Returns:
+        例如 UserRepositoryImpl.find_by_id，找不到時為 None
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        if "repositories" in code.co_filename:
+            return getattr(code, "co_qualname", code.co_name)
+        frame = frame.f_back
+    return None
+
+
+class FingerprintStats:
+    """單一 fingerprint 的統計"""
+
+    __slots__ = ("count", "total_ms", "max_ms", "slow_count", "error_count", "recent", "sources")
+
+    def __init__(self):
+        """初始化統計"""
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.slow_count = 0
+        self.error_count = 0
+        self.recent: Deque[float] = deque(maxlen=RECENT_SAMPLES)
+        self.sources: List[str] = []
+
+    def to_dict(self, fingerprint_text: str) -> Dict[str, Any]:
+        """
+        輸出統計
+
+        Args:
+            fingerprint_text: fingerprint
+
+        Returns:
+            fingerprint、count、total_ms、mean_ms、p95_ms（最近 RECENT_SAMPLES 次）、max_ms、slow_count、error_count、sources
+        """
+        recent = sorted(self.recent)
+        p95 = recent[min(len(recent) - 1, int(len(recent) * 0.95))] if recent else 0.0
+        return {
+            "fingerprint": fingerprint_text,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 1),
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p95_ms": round(p95, 2),
+            "max_ms": round(self.max_ms, 2),
+            "slow_count": self.slow_count,
+            "error_count": self.error_count,
+            "sources": list(self.sources)
+        }
+
+
+class QueryStats:
+    """
+    SQL 統計（每個 worker 行程各自累計）
+
+    - record 由 SQLAlchemy 的 after_cursor_execute / handle_error 事件呼叫
+    - fingerprint 結果以原始 SQL 快取（SQLAlchemy 的編譯快取讓同一種查詢產生相同字串）
+    - 新的 fingerprint 與慢查詢才查找來源 Repository 方法，一般查詢不走訪呼叫堆疊
+    """
+
+    def __init__(self, slow_query_ms: float, max_fingerprints: int = 500, max_cached_statements: int = 2048):
+        """
+        初始化 SQL 統計
+
+        Args:
+            slow_query_ms: 慢查詢門檻（毫秒），0 表示不輸出慢查詢日誌
+            max_fingerprints: 追蹤的 fingerprint 數量上限
+            max_cached_statements: fingerprint 快取的 SQL 數量上限
+        """
+        self.slow_query_ms = slow_query_ms
+        self.max_fingerprints = max_fingerprints
+        self.max_cached_statements = max_cached_statements
+        self._lock = threading.Lock()
+        self._stats: Dict[str, FingerprintStats] = {}
+        self._fingerprints: Dict[str, str] = {}
+        self._since = time.time()
+
+    def fingerprint_of(self, statement: str) -> str:
+        """
+        取得 SQL 的 fingerprint（有快取）
+
+        Args:
+            statement: SQL
+
+        Returns:
+            fingerprint
+        """
+        result = self._fingerprints.get(statement)
+        if result is None:
+            result = fingerprint(statement)
+            if len(self._fingerprints) >= self.max_cached_statements:
+                self._fingerprints.clear()
+            self._fingerprints[statement] = result
+        return result
+
+    def record(self, statement: str, parameters: Any, executemany: bool, elapsed_ms: float, failed: bool = False):
+        """
+        記錄一次 statement 執行
+
+        Args:
+            statement: SQL
+            parameters: DBAPI 參數
+            executemany: 是否為批次執行
+            elapsed_ms: 耗時（毫秒）
+            failed: 是否執行失敗
+        """
+        fingerprint_text = key = self.fingerprint_of(statement)
+        slow = 0 < self.slow_query_ms <= elapsed_ms
+
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    key = OTHER_FINGERPRINT
+                    stats = self._stats.get(key)
+                if stats is None:
+                    stats = self._stats[key] = FingerprintStats()
+            is_new = stats.count == 0
+            stats.count += 1
+            stats.total_ms += elapsed_ms
+            stats.recent.append(elapsed_ms)
+            if elapsed_ms > stats.max_ms:
+                stats.max_ms = elapsed_ms
+            if slow:
+                stats.slow_count += 1
+            if failed:
+                stats.error_count += 1
+
+        source = None
+        if is_new or slow:
+            source = find_source()
+            if source is not None and source not in stats.sources and len(stats.sources) < MAX_SOURCES:
+                with self._lock:
+                    if source not in stats.sources:
+                        stats.sources.append(source)
+
+        if slow:
+            fields = {"failed": True} if failed else {}
+            logger.db_warn(
+                "Slow query %.1fms %s",
+                elapsed_ms,
+                fingerprint_text,
+                latency_ms=round(elapsed_ms, 1),
+                source=source,
+                params=parameter_shapes(parameters, executemany),
+                **fields
+            )
+
+    def top(self, limit: int = 20, sort_by: str = "total_ms") -> Dict[str, Any]:
+        """
+        取得前 N 個 fingerprint
+
+        Args:
+            limit: 數量
+            sort_by: 排序欄位（total_ms、p95_ms、max_ms、count、slow_count）
+
+        Returns:
+            since（統計開始的 Unix 時間）、statements（總執行次數）、slow_query_ms、fingerprints
+
+        Raises:
+            ValueError: sort_by 不在允許的欄位中
+        """
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort_by} (allowed: {', '.join(SORT_KEYS)})")
+
+        with self._lock:
+            rows = [stats.to_dict(key) for key, stats in self._stats.items()]
+            since = self._since
+        rows.sort(key=lambda row: row[sort_by], reverse=True)
+        return {
+            "since": since,
+            "statements": sum(row["count"] for row in rows),
+            "slow_query_ms": self.slow_query_ms,
+            "fingerprints": rows[:limit]
+        }
+
+    def reset(self):
+        """清除統計"""
+        with self._lock:
+            self._stats = {}
+            self._since = time.time()
+
+
+# 全域 SQL 統計
+query_stats = QueryStats(
+    slow_query_ms=settings.database.slow_query_ms,
+    max_fingerprints=settings.database.query_stats_max_fingerprints
+)
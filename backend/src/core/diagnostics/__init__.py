@@ -0,0 +1,18 @@
+"""
+core diagnostics - 執行期診斷
+監控事件迴圈阻塞並從執行中的堆疊找出阻塞的呼叫位置，以及不需外部工具的取樣分析
+"""
+
+from .loop_watchdog import LoopWatchdog, loop_watchdog
+from .profiler import Profile, ProfileStore, RequestProfiler, SamplingProfiler, request_profiler, sampling_profiler
+
+__all__ = [
+    "LoopWatchdog",
+    "loop_watchdog",
+    "Profile",
+    "ProfileStore",
+    "RequestProfiler",
+    "SamplingProfiler",
+    "request_profiler",
+    "sampling_profiler"
+]
@@ -0,0 +1,186 @@
+"""
+loop_watchdog.py - 事件迴圈延遲監控
+在事件迴圈中定期 sleep 量測延遲（實際醒來時間與預期的差）並記錄為指標；
+背景執行緒發現事件迴圈超過門檻仍未回應時，讀取事件迴圈執行緒的堆疊，
+輸出正在處理的路由與阻塞的呼叫位置（例如 bcrypt.checkpw 或 session.query(...).first()）
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from src.core.config import settings
+from src.core.diagnostics.stacks import (
+    describe_frame,
+    find_request,
+    frame_location,
+    frame_name,
+    is_project_frame,
+    thread_frame,
+    walk_stack
+)
+from src.core.logger.logger import logger
+from src.core.metrics.instruments import EVENT_LOOP_BLOCKS, EVENT_LOOP_LAG
+
+# 同一個路由與阻塞位置在這個間隔內只輸出一次警告（秒）
+WARNING_INTERVAL = 60.0
+
+# 日誌中保留的專案內 frame 數量（由內而外）
+STACK_DEPTH = 8
+
+
+class LoopWatchdog:
+    """
+    事件迴圈延遲監控
+
+    - 量測用的 task 每 interval 秒醒來一次，延遲寫入 event_loop_lag_seconds
+    - 背景執行緒每 threshold / 4 檢查一次心跳，事件迴圈超過 threshold 未醒來時擷取一次堆疊：
+      阻塞中的事件迴圈執行緒正停在同步呼叫上，最內層的專案 frame 就是阻塞的位置
+    - 每個 worker 行程各自監控自己的事件迴圈
+    """
+
+    def __init__(self, interval: float, threshold_ms: float):
+        """
+        初始化監控
+
+        Args:
+            interval: 量測間隔（秒）
+            threshold_ms: 阻塞門檻（毫秒）
+        """
+        self.interval = interval
+        self.threshold = threshold_ms / 1000
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        # 量測 task 預期醒來的時間（perf_counter），None 表示尚未開始
+        self._expected: Optional[float] = None
+        self._captured_for: Optional[float] = None
+        self._last_warned: Dict[Tuple[Optional[str], str], float] = {}
+
+    def start(self):
+        """
+        在目前的事件迴圈啟動監控（需在事件迴圈中呼叫，例如 lifespan）
+        """
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._stopping.clear()
+        self._task = asyncio.get_running_loop().create_task(self._measure())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self):
+        """停止監控"""
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+        self._expected = None
+
+    async def _measure(self):
+        """量測事件迴圈延遲（在事件迴圈中執行）"""
+        while True:
+            self._expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - self._expected)
+            EVENT_LOOP_LAG.observe(lag)
+
+    def _watch(self):
+        """檢查事件迴圈是否阻塞（在背景執行緒執行）"""
+        while not self._stopping.wait(self.threshold / 4):
+            expected = self._expected
+            if expected is None or expected == self._captured_for:
+                continue
+            blocked = time.perf_counter() - expected
+            if blocked >= self.threshold:
+                # 每次阻塞只擷取一次（以預期醒來時間識別）
+                self._captured_for = expected
+                self._report(blocked)
+
+    def _report(self, blocked: float):
+        """
+        擷取事件迴圈執行緒的堆疊並輸出警告
+
+        Args:
+            blocked: 目前為止的阻塞時間（秒）
+        """
+        frames = walk_stack(thread_frame(self._loop_thread_id))
+        if not frames:
+            return
+        request_context, route = find_request(frames)
+        project_frames = [frame for frame in frames if is_project_frame(frame)]
+        # 最內層的專案 frame 是阻塞的呼叫位置；完全在第三方套件中時使用最內層的 frame
+        culprit = project_frames[-1] if project_frames else frames[-1]
+        location = frame_location(culprit)
+
+        if request_context is None:
+            label = None
+            EVENT_LOOP_BLOCKS.inc("none")
+        else:
+            # 路由尚未比對完成時（例如在中介軟體中阻塞）使用實際路徑輸出日誌
+            label = route or request_context.path
+            EVENT_LOOP_BLOCKS.inc(route or "unmatched")
+        if not self._should_warn(label, location):
+            return
+
+        logger.infra_warn(
+            "Event loop blocked >%.0fms%s at %s",
+            blocked * 1000,
+            f" in {request_context.method} {label}" if request_context is not None else "",
+            describe_frame(culprit),
+            blocked_ms=round(blocked * 1000, 1),
+            route=label,
+            request_id=request_context.request_id if request_context is not None else None,
+            frame=frame_name(culprit),
+            location=location,
+            innermost=describe_frame(frames[-1]) if frames[-1] is not culprit else None,
+            stack=_format_stack(project_frames)
+        )
+
+    def _should_warn(self, route: Optional[str], location: str) -> bool:
+        """
+        檢查同一個路由與阻塞位置的警告是否已在 WARNING_INTERVAL 秒內輸出過
+
+        Args:
+            route: 路由樣板
+            location: 阻塞位置
+
+        Returns:
+            True 如果要輸出
+        """
+        now = time.monotonic()
+        key = (route, location)
+        last = self._last_warned.get(key)
+        if last is not None and now - last < WARNING_INTERVAL:
+            return False
+        self._last_warned[key] = now
+        return True
+
+
+def _format_stack(frames: List) -> List[str]:
+    """
+    由內而外列出專案內的 frame
+
+    Args:
+        frames: 由外而內的專案 frame 列表
+
+    Returns:
+        例如 ["PasswordHash.verify (src/contexts/user/domain/entities.py:88)", ...]
+    """
+    return [f"{frame_name(frame)} ({frame_location(frame)})" for frame in reversed(frames[-STACK_DEPTH:])]
+
+
+# 全域事件迴圈監控（由應用程式的 lifespan 啟動）
+loop_watchdog = LoopWatchdog(
+    interval=settings.api.loop_watchdog_interval,
+    threshold_ms=settings.api.loop_block_threshold_ms
+)
@@ -0,0 +1,541 @@
+"""
+profiler.py - 取樣分析器
+背景執行緒定期讀取所有執行緒的堆疊（sys._current_frames），彙整為 collapsed stacks
+（每行「執行緒;外層函式;...;內層函式 次數」，可直接交給 flamegraph.pl、speedscope 或 inferno 產生火焰圖），
+不需要在容器中安裝或附加外部工具
+
+- 指定時間的分析：GET /admin/profile 在目前的 worker 取樣 N 秒
+- 自動分析：持續取樣處理中的請求，超過延遲門檻的請求將取樣結果存到 API_PROFILE_DIR
+"""
+
+import asyncio
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from types import CodeType, FrameType
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+from src.core.config import settings
+from src.core.context.request_context import RequestContext
+from src.core.diagnostics.stacks import find_request, is_idle, short_filename, walk_stack
+from src.core.logger.logger import logger
+
+PROFILE_PREFIX = "profile-"
+PROFILE_SUFFIX = ".json"
+
+# 儲存的分析結果 ID 只接受這些字元（對應檔名，避免路徑穿越）
+_VALID_PROFILE_ID = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+# 等待寫入的自動分析結果上限（寫入跟不上時丟棄新的結果）
+WRITE_QUEUE_SIZE = 100
+
+# 函式標籤快取（code object -> 標籤），每個函式只格式化一次
+_labels: Dict[CodeType, str] = {}
+
+
+def _label(code: CodeType) -> str:
+    """
+    函式的標籤，例如 BaseModel.model_validate (pydantic/main.py)
+
+    collapsed stacks 以 ; 分隔 frame，因此標籤中的 ; 換成 :；不含行號，同一個函式的樣本合併計算
+
+    Args:
+        code: code object
+
+    Returns:
+        標籤
+    """
+    label = _labels.get(code)
+    if label is None:
+        name = getattr(code, "co_qualname", code.co_name)
+        label = _labels[code] = f"{name} ({short_filename(code.co_filename)})".replace(";", ":")
+    return label
+
+
+def collapse(frames: List[FrameType], thread_name: str) -> str:
+    """
+    將堆疊轉為 collapsed stacks 的一行（不含次數）
+
+    Args:
+        frames: 由外而內的 frame 列表
+        thread_name: 執行緒名稱（作為最外層的 frame，區分事件迴圈與執行緒池）
+
+    Returns:
+        以 ; 分隔的函式標籤
+    """
+    return ";".join([thread_name.replace(";", ":")] + [_label(frame.f_code) for frame in frames])
+
+
+class Profile:
+    """
+    一次分析的結果（collapsed stack -> 樣本數）
+    """
+
+    def __init__(self, interval: float, started: float, metadata: Optional[Dict[str, Any]] = None):
+        """
+        初始化分析結果
+
+        Args:
+            interval: 取樣間隔（秒）
+            started: 開始時間（Unix 秒）
+            metadata: 附加資訊（例如自動分析的請求路由與耗時）
+        """
+        self.interval = interval
+        self.started = started
+        self.duration = 0.0
+        self.samples = 0
+        self.stacks: Dict[str, int] = {}
+        self.metadata = metadata or {}
+
+    def add(self, stack: str, count: int = 1):
+        """
+        加入樣本
+
+        Args:
+            stack: collapsed stack
+            count: 樣本數
+        """
+        self.stacks[stack] = self.stacks.get(stack, 0) + count
+        self.samples += count
+
+    def collapsed(self) -> str:
+        """
+        輸出 collapsed stacks（依樣本數由多到少）
+
+        Returns:
+            每行「stack 次數」
+        """
+        rows = sorted(self.stacks.items(), key=lambda item: item[1], reverse=True)
+        return "".join(f"{stack} {count}\n" for stack, count in rows)
+
+    def summary(self, limit: int = 30) -> Dict[str, Any]:
+        """
+        依函式彙整：self 為位於最內層的樣本數（函式本身耗時），total 為出現在堆疊中的樣本數（含呼叫的函式）
+
+        Args:
+            limit: 回傳的函式數量
+
+        Returns:
+            started、duration_s、interval_ms、samples、metadata、functions（依 self 排序）
+        """
+        self_counts: Dict[str, int] = {}
+        total_counts: Dict[str, int] = {}
+        for stack, count in self.stacks.items():
+            # 第一個元素是執行緒名稱
+            frames = stack.split(";")[1:]
+            if not frames:
+                continue
+            self_counts[frames[-1]] = self_counts.get(frames[-1], 0) + count
+            for frame in set(frames):
+                total_counts[frame] = total_counts.get(frame, 0) + count
+
+        samples = self.samples or 1
+        functions = [
+            {
+                "function": function,
+                "self": self_counts.get(function, 0),
+                "total": total,
+                "self_pct": round(self_counts.get(function, 0) * 100 / samples, 1),
+                "total_pct": round(total * 100 / samples, 1)
+            }
+            for function, total in total_counts.items()
+        ]
+        functions.sort(key=lambda row: (row["self"], row["total"]), reverse=True)
+        return {
+            "started": self.started,
+            "duration_s": round(self.duration, 3),
+            "interval_ms": round(self.interval * 1000, 2),
+            "samples": self.samples,
+            "metadata": self.metadata,
+            "functions": functions[:limit]
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        輸出可儲存的內容
+
+        Returns:
+            interval、started、duration、samples、metadata、stacks
+        """
+        return {
+            "interval": self.interval,
+            "started": self.started,
+            "duration": self.duration,
+            "samples": self.samples,
+            "metadata": self.metadata,
+            "stacks": self.stacks
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Profile":
+        """
+        由 to_dict 的內容還原
+
+        Args:
+            data: to_dict 的內容
+
+        Returns:
+            Profile
+        """
+        profile = cls(data["interval"], data["started"], data.get("metadata"))
+        profile.duration = data["duration"]
+        profile.samples = data["samples"]
+        profile.stacks = data["stacks"]
+        return profile
+
+
+def _thread_names() -> Dict[int, str]:
+    """執行緒 ID -> 名稱"""
+    return {thread.ident: thread.name for thread in threading.enumerate() if thread.ident is not None}
+
+
+def sample_threads(exclude: int) -> List[Tuple[str, List[FrameType]]]:
+    """
+    讀取所有非閒置執行緒的堆疊
+
+    Args:
+        exclude: 不取樣的執行緒 ID（取樣執行緒自身）
+
+    Returns:
+        [(執行緒名稱, 由外而內的 frame 列表)]
+    """
+    names = None
+    stacks = []
+    for thread_id, frame in sys._current_frames().items():
+        if thread_id == exclude or is_idle(frame):
+            continue
+        if names is None:
+            names = _thread_names()
+        stacks.append((names.get(thread_id, f"thread-{thread_id}"), walk_stack(frame)))
+    return stacks
+
+
+class SamplingProfiler:
+    """
+    指定時間的取樣分析（同一個 worker 同時只能進行一次）
+
+    取樣執行緒每 interval 秒讀取一次所有執行緒的堆疊，閒置的執行緒（等待 I/O 或工作）不計入
+    """
+
+    def __init__(self):
+        """初始化分析器"""
+        self._lock = threading.Lock()
+
+    async def profile(self, seconds: float, interval: float) -> Profile:
+        """
+        在背景執行緒取樣指定秒數（事件迴圈在期間照常處理請求）
+
+        Args:
+            seconds: 分析秒數
+            interval: 取樣間隔（秒）
+
+        Returns:
+            Profile
+
+        Raises:
+            RuntimeError: 已有分析正在進行
+        """
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already running in this worker")
+        try:
+            profile = Profile(interval, time.time())
+            stopping = threading.Event()
+            sampler = threading.Thread(
+                target=self._sample, args=(profile, interval, stopping), name="profiler", daemon=True
+            )
+            started = time.perf_counter()
+            sampler.start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                stopping.set()
+                sampler.join()
+            profile.duration = time.perf_counter() - started
+            return profile
+        finally:
+            self._lock.release()
+
+    @staticmethod
+    def _sample(profile: Profile, interval: float, stopping: threading.Event):
+        """
+        取樣直到 stopping 被設定（在取樣執行緒執行）
+
+        Args:
+            profile: 寫入的分析結果
+            interval: 取樣間隔（秒）
+            stopping: 停止事件
+        """
+        own_id = threading.get_ident()
+        while not stopping.wait(interval):
+            for thread_name, frames in sample_threads(own_id):
+                profile.add(collapse(frames, thread_name))
+
+
+class ProfileStore:
+    """
+    自動分析結果的存放區（每個結果一個 JSON 檔，所有 worker 共用目錄，超過上限時刪除最舊的）
+
+    - save 只把結果放進有上限的佇列，由寫入執行緒編碼、寫檔並刪除舊檔，事件迴圈不做檔案 I/O
+    - list / get 會讀檔，async 路由中以 run_in_threadpool 呼叫
+    """
+
+    def __init__(self, directory: str, max_files: int):
+        """
+        初始化存放區
+
+        Args:
+            directory: 目錄
+            max_files: 保留的檔案數量上限
+        """
+        self.directory = directory
+        self.max_files = max_files
+        self.dropped = 0
+        self._queue: "queue.Queue[Tuple[str, Profile]]" = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def save(self, profile: Profile, request_id: str) -> Optional[str]:
+        """
+        排入寫入佇列（不等待，第一次呼叫時啟動寫入執行緒）
+
+        Args:
+            profile: 分析結果（排入後不可再修改）
+            request_id: 請求 ID
+
+        Returns:
+            分析結果 ID（檔案稍後才會出現），佇列已滿時為 None
+        """
+        profile_id = f"{int(profile.started * 1000)}-{os.getpid()}-{request_id}"
+        try:
+            self._queue.put_nowait((profile_id, profile))
+        except queue.Full:
+            self.dropped += 1
+            return None
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._write_loop, name="profile-writer", daemon=True)
+                    self._writer.start()
+        return profile_id
+
+    def join(self):
+        """等待佇列中的分析結果寫完"""
+        self._queue.join()
+
+    def write(self, profile_id: str, profile: Profile):
+        """
+        寫入分析結果並刪除超過上限的舊檔案（在寫入執行緒執行）
+
+        Args:
+            profile_id: 分析結果 ID
+            profile: 分析結果
+
+        Raises:
+            OSError: 無法建立目錄或寫入檔案
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(profile_id)
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as profile_file:
+            profile_file.write(orjson.dumps(profile.to_dict()))
+        os.replace(temporary, path)
+        self._prune()
+
+    def _write_loop(self):
+        """寫入迴圈（在寫入執行緒執行）"""
+        while True:
+            profile_id, profile = self._queue.get()
+            try:
+                self.write(profile_id, profile)
+            except OSError as e:
+                logger.infra_error(
+                    "Failed to save request profile: %s", e, directory=self.directory, profile_id=profile_id
+                )
+            finally:
+                self._queue.task_done()
+
+    def list(self) -> List[Dict[str, Any]]:
+        """
+        列出所有分析結果（新的在前，不含堆疊）
+
+        Returns:
+            [{"id", "started", "duration", "samples", "metadata"}]
+        """
+        profiles = []
+        for profile_id in self._ids():
+            profile = self.get(profile_id)
+            if profile is not None:
+                profiles.append({
+                    "id": profile_id,
+                    "started": profile.started,
+                    "duration": profile.duration,
+                    "samples": profile.samples,
+                    "metadata": profile.metadata
+                })
+        return profiles
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        """
+        讀取分析結果
+
+        Args:
+            profile_id: 分析結果 ID
+
+        Returns:
+            Profile，不存在或 ID 格式不符時為 None
+        """
+        if not _VALID_PROFILE_ID.match(profile_id):
+            return None
+        try:
+            with open(self._path(profile_id), "rb") as profile_file:
+                return Profile.from_dict(orjson.loads(profile_file.read()))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _path(self, profile_id: str) -> str:
+        """分析結果的檔案路徑"""
+        return os.path.join(self.directory, f"{PROFILE_PREFIX}{profile_id}{PROFILE_SUFFIX}")
+
+    def _ids(self) -> List[str]:
+        """所有分析結果 ID（新的在前）"""
+        try:
+            filenames = os.listdir(self.directory)
+        except OSError:
+            return []
+        ids = [
+            filename[len(PROFILE_PREFIX):-len(PROFILE_SUFFIX)]
+            for filename in filenames
+            if filename.startswith(PROFILE_PREFIX) and filename.endswith(PROFILE_SUFFIX)
+        ]
+        # ID 以固定位數的毫秒時間開頭，字串排序即為時間排序
+        ids.sort(reverse=True)
+        return ids
+
+    def _prune(self):
+        """刪除超過上限的舊檔案"""
+        for profile_id in self._ids()[self.max_files:]:
+            try:
+                os.remove(self._path(profile_id))
+            except OSError:
+                pass
+
+
+class RequestProfiler:
+    """
+    自動分析慢請求
+
+    - 中介軟體在請求開始時呼叫 track、結束時呼叫 finish
+    - 有處理中的請求時，取樣執行緒每 interval 秒讀取所有執行緒的堆疊，依堆疊中的 ASGI scope 歸屬到請求
+      （同 loop watchdog；在執行緒池執行的同步函式堆疊中沒有 scope，不會計入）
+    - finish 時耗時超過 threshold_ms 的請求交給存放區寫入（不在事件迴圈寫檔）並輸出 WARN，其餘直接丟棄
+    """
+
+    def __init__(self, interval: float, threshold_ms: float, store: ProfileStore):
+        """
+        初始化自動分析
+
+        Args:
+            interval: 取樣間隔（秒）
+            threshold_ms: 延遲門檻（毫秒），0 表示不啟用
+            store: 存放區
+        """
+        self.interval = interval
+        self.threshold_ms = threshold_ms
+        self.store = store
+        self._active: Dict[RequestContext, Profile] = {}
+        self._sampler: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # 取樣間隔以 Event.wait 等待，其他分析看到的是閒置執行緒
+        self._idle = threading.Event()
+
+    @property
+    def enabled(self) -> bool:
+        """是否啟用"""
+        return self.threshold_ms > 0
+
+    def track(self, request_context: RequestContext):
+        """
+        開始收集請求的樣本（第一次呼叫時啟動取樣執行緒）
+
+        Args:
+            request_context: 請求上下文
+        """
+        self._active[request_context] = Profile(self.interval, time.time())
+        if self._sampler is None:
+            with self._lock:
+                if self._sampler is None:
+                    self._sampler = threading.Thread(target=self._sample, name="request-profiler", daemon=True)
+                    self._sampler.start()
+
+    def finish(self, request_context: RequestContext, route: Optional[str], elapsed_ms: float) -> Optional[str]:
+        """
+        結束收集，超過門檻時儲存
+
+        Args:
+            request_context: 請求上下文
+            route: 路由樣板
+            elapsed_ms: 請求耗時（毫秒）
+
+        Returns:
+            分析結果 ID，未超過門檻、沒有樣本或寫入佇列已滿時為 None
+        """
+        profile = self._active.pop(request_context, None)
+        if profile is None or elapsed_ms < self.threshold_ms or not profile.samples:
+            return None
+
+        profile.duration = elapsed_ms / 1000
+        profile.metadata = {
+            "request_id": request_context.request_id,
+            "method": request_context.method,
+            "path": request_context.path,
+            "route": route,
+            "status": request_context.status
+        }
+        profile_id = self.store.save(profile, request_context.request_id)
+        if profile_id is None:
+            logger.infra_warn(
+                "Slow request profile dropped (write queue full) %s %s %.0fms",
+                request_context.method,
+                route or request_context.path,
+                elapsed_ms,
+                latency_ms=round(elapsed_ms, 1),
+                dropped=self.store.dropped
+            )
+            return None
+
+        logger.infra_warn(
+            "Slow request profiled %s %s %.0fms",
+            request_context.method,
+            route or request_context.path,
+            elapsed_ms,
+            latency_ms=round(elapsed_ms, 1),
+            samples=profile.samples,
+            profile_id=profile_id
+        )
+        return profile_id
+
+    def _sample(self):
+        """取樣處理中的請求（在取樣執行緒執行）"""
+        own_id = threading.get_ident()
+        while not self._idle.wait(self.interval):
+            if not self._active:
+                continue
+            for thread_name, frames in sample_threads(own_id):
+                request_context, _ = find_request(frames)
+                profile = self._active.get(request_context) if request_context is not None else None
+                if profile is not None:
+                    profile.add(collapse(frames, thread_name))
+
+
+# 全域分析器
+sampling_profiler = SamplingProfiler()
+request_profiler = RequestProfiler(
+    interval=settings.api.auto_profile_interval_ms / 1000,
+    threshold_ms=settings.api.auto_profile_threshold_ms,
+    store=ProfileStore(settings.api.profile_dir, settings.api.profile_max_files)
+)
@@ -0,0 +1,180 @@
+"""
+stacks.py - 執行中堆疊的解析
+從其他執行緒讀取某個執行緒目前的 frame，找出專案內的呼叫位置與正在處理的請求
+"""
+
+import linecache
+import os
+import sys
+import sysconfig
+from types import FrameType
+from typing import Any, List, Optional, Tuple
+
+from src.core.context.request_context import SCOPE_KEY, RequestContext
+
+# 專案根目錄（backend/），其下除了第三方套件以外的檔案視為專案程式碼
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+_LIBRARY_PATHS = tuple(
+    {path for path in (sysconfig.get_paths().get("purelib"), sysconfig.get_paths().get("stdlib")) if path}
+)
+
+# 閒置中的執行緒停留的函式（事件迴圈等待 I/O、執行緒池等待工作、背景執行緒等待事件）
+IDLE_FUNCTIONS = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get")
+}
+
+
+def thread_frame(thread_id: int) -> Optional[FrameType]:
+    """
+    取得執行緒目前執行中的 frame
+
+    Args:
+        thread_id: 執行緒 ID（threading.get_ident()）
+
+    Returns:
+        最內層的 frame，執行緒不存在時為 None
+    """
+    return sys._current_frames().get(thread_id)
+
+
+def walk_stack(frame: Optional[FrameType]) -> List[FrameType]:
+    """
+    由外而內列出 frame（await 中的 coroutine 也在 f_back 鏈上）
+
+    Args:
+        frame: 最內層的 frame
+
+    Returns:
+        frame 列表，第一個為最外層
+    """
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+
+def is_project_frame(frame: FrameType) -> bool:
+    """
+    檢查 frame 是否為專案程式碼（排除標準函式庫與第三方套件）
+
+    Args:
+        frame: frame
+
+    Returns:
+        True 如果檔案位於專案目錄下
+    """
+    filename = frame.f_code.co_filename
+    return (
+        filename.startswith(PROJECT_ROOT)
+        and "site-packages" not in filename
+        and not filename.startswith(_LIBRARY_PATHS)
+    )
+
+
+def is_idle(frame: FrameType) -> bool:
+    """
+    檢查最內層的 frame 是否為閒置等待（見 IDLE_FUNCTIONS）
+
+    Args:
+        frame: 最內層的 frame
+
+    Returns:
+        True 如果執行緒正在等待工作或 I/O
+    """
+    code = frame.f_code
+    return (os.path.basename(code.co_filename), code.co_name) in IDLE_FUNCTIONS
+
+
+def short_filename(filename: str) -> str:
+    """
+    縮短檔案路徑：專案檔案相對於專案根目錄，第三方套件與標準函式庫相對於安裝目錄
+
+    Args:
+        filename: 完整路徑
+
+    Returns:
+        例如 src/core/db/connection.py、sqlalchemy/orm/query.py、json/encoder.py
+    """
+    if "site-packages" in filename:
+        return filename.rsplit("site-packages" + os.sep, 1)[-1]
+    for path in _LIBRARY_PATHS:
+        if filename.startswith(path):
+            return os.path.relpath(filename, path)
+    if filename.startswith(PROJECT_ROOT):
+        return os.path.relpath(filename, PROJECT_ROOT)
+    return filename
+
+
+def frame_name(frame: FrameType) -> str:
+    """
+    frame 的函式名稱（含類別，例如 PasswordHash.verify）
+
+    Args:
+        frame: frame
+
+    Returns:
+        名稱
+    """
+    code = frame.f_code
+    return getattr(code, "co_qualname", code.co_name)
+
+
+def frame_location(frame: FrameType) -> str:
+    """
+    frame 的位置，例如 src/contexts/user/domain/entities.py:88
+
+    Args:
+        frame: frame
+
+    Returns:
+        縮短後的路徑與行號（見 short_filename）
+    """
+    return f"{short_filename(frame.f_code.co_filename)}:{frame.f_lineno}"
+
+
+def describe_frame(frame: FrameType) -> str:
+    """
+    frame 的一行描述：名稱、位置與正在執行的原始碼
+
+    Args:
+        frame: frame
+
+    Returns:
+        例如 PasswordHash.verify (src/contexts/user/domain/entities.py:88) bcrypt.checkpw(...)
+    """
+    line = linecache.getline(frame.f_code.co_filename, frame.f_lineno).strip()
+    description = f"{frame_name(frame)} ({frame_location(frame)})"
+    return f"{description} {line}" if line else description
+
+
+def find_request(frames: List[FrameType]) -> Tuple[Optional[RequestContext], Optional[str]]:
+    """
+    從堆疊找出正在處理的請求
+
+    contextvars 無法從其他執行緒讀取，因此改讀 ASGI 各層 frame 中的 scope（中介軟體把 RequestContext
+    放在 scope[SCOPE_KEY]）；BaseHTTPMiddleware 以子 task 執行後續的應用程式，堆疊不一定包含最外層的中介軟體，
+    但每一層都持有同一個 scope。只展開有 scope 變數的 frame 的 locals
+
+    Args:
+        frames: 由外而內的 frame 列表
+
+    Returns:
+        (RequestContext, 路由樣板)，不在請求中或路由尚未比對時對應的值為 None
+    """
+    for frame in reversed(frames):
+        code = frame.f_code
+        if "scope" not in code.co_varnames and "scope" not in code.co_freevars:
+            continue
+        scope: Any = frame.f_locals.get("scope")
+        if not isinstance(scope, dict):
+            continue
+        request_context = scope.get(SCOPE_KEY)
+        if isinstance(request_context, RequestContext):
+            return request_context, getattr(scope.get("route"), "path", None)
+    return None, None
@@ -4,5 +4,7 @@ core/logger - 統一日誌系統
 """
 
 from .logger import Logger
+from .handlers import QueueLogHandler
+from .formatters import TextFormatter, JSONFormatter
 
-__all__ = ["Logger"]
+__all__ = ["Logger", "QueueLogHandler", "TextFormatter", "JSONFormatter"]
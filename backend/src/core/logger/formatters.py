@@ -0,0 +1,137 @@
+"""
+formatters.py - 日誌格式
+text：人類閱讀用的 `[context] message key=value` 格式
+json：每行一個 JSON 物件（orjson 編碼），欄位名稱固定，
+日誌收集端不需要再以正規表示式解析
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+import orjson
+
+# Logger 透過 extra 放進 LogRecord 的屬性
+RECORD_CONTEXT = "log_context"
+RECORD_FIELDS = "log_fields"
+RECORD_METHOD = "log_method"
+RECORD_PATH = "log_path"
+
+LOG_FORMAT_TEXT = "text"
+LOG_FORMAT_JSON = "json"
+
+# JSON 輸出中排在前面的固定欄位（其餘欄位依呼叫端傳入的順序接在後面）
+JSON_LEADING_FIELDS = ("request_id", "method", "path", "status", "latency_ms", "user_id")
+
+
+class TextFormatter(logging.Formatter):
+    """
+    文字格式
+
+    範例：2024-01-01 12:00:00 [INFO] BaseProject: [DB] Fetch by id=1 table=users request_id=3f2a...
+    """
+
+    def __init__(self):
+        """初始化文字格式"""
+        super().__init__('%(asctime)s [%(levelname)s] %(name)s: %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        """
+        組合 [context] message key=value
+
+        Args:
+            record: 日誌紀錄
+
+        Returns:
+            格式化後的日誌
+        """
+        message = record.message
+        context = getattr(record, RECORD_CONTEXT, None)
+        if context:
+            message = f"[{context}] {message}"
+        fields = getattr(record, RECORD_FIELDS, None)
+        if fields:
+            message = f"{message} " + " ".join(f"{key}={value}" for key, value in fields.items())
+        record.message = message
+        return super().formatMessage(record)
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    JSON 格式（每行一個物件）
+
+    固定欄位：ts（UTC ISO 8601）、level、context、request_id、method、path、status、latency_ms、user_id、msg，
+    沒有值的欄位不輸出；其他呼叫端傳入的欄位接在後面
+
+    範例：{"ts":"2024-01-01T12:00:00.123Z","level":"INFO","context":"Access","request_id":"3f2a...","method":"GET",
+    "path":"/users/me","status":200,"latency_ms":4.2,"user_id":"1","msg":"GET /users/me","auth_ms":0.3}
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        將紀錄編碼為 JSON
+
+        Args:
+            record: 日誌紀錄
+
+        Returns:
+            JSON 字串
+        """
+        fields: Dict[str, Any] = dict(getattr(record, RECORD_FIELDS, None) or {})
+        method = getattr(record, RECORD_METHOD, None)
+        if method is not None:
+            fields.setdefault("method", method)
+            fields.setdefault("path", getattr(record, RECORD_PATH, None))
+
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds")[:-6] + "Z",
+            "level": record.levelname,
+            "context": getattr(record, RECORD_CONTEXT, None)
+        }
+        for key in JSON_LEADING_FIELDS:
+            value = fields.pop(key, None)
+            if value is not None:
+                entry[key] = value
+        entry["msg"] = record.getMessage()
+        entry.update(fields)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        if entry["context"] is None:
+            del entry["context"]
+        return _dumps(entry)
+
+
+def _dumps(entry: Dict[str, Any]) -> str:
+    """
+    編碼 JSON（無法編碼的值以 str() 輸出）
+
+    Args:
+        entry: 日誌內容
+
+    Returns:
+        JSON 字串
+    """
+    return orjson.dumps(entry, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+def build_formatter(log_format: str) -> logging.Formatter:
+    """
+    依 LOG_FORMAT 建立日誌格式
+
+    Args:
+        log_format: text 或 json
+
+    Returns:
+        logging.Formatter
+
+    Raises:
+        ValueError: 不支援的格式
+    """
+    log_format = log_format.lower()
+    if log_format == LOG_FORMAT_JSON:
+        return JSONFormatter()
+    if log_format == LOG_FORMAT_TEXT:
+        return TextFormatter()
+    raise ValueError(f"Unknown log format: {log_format} (allowed: {LOG_FORMAT_TEXT}, {LOG_FORMAT_JSON})")
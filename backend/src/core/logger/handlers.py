@@ -0,0 +1,273 @@
+"""
+handlers.py - 非阻塞日誌處理器
+日誌呼叫只把紀錄放進有上限的佇列，由背景執行緒批次格式化並寫入 stdout（以及選用的輪替檔案），
+事件迴圈不會因為輸出端（例如壓力下的容器日誌驅動）變慢而被阻塞
+"""
+
+import logging
+import queue
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional
+
+OVERFLOW_DROP = "drop"
+OVERFLOW_BLOCK = "block"
+
+# drop 模式下保留給 WARNING 以上紀錄的佇列空間比例（INFO/DEBUG 只能使用其餘的空間）
+WARNING_HEADROOM_RATIO = 0.1
+
+
+class QueueLogHandler(logging.Handler):
+    """
+    佇列日誌處理器
+
+    - emit 只把紀錄放進佇列，實際輸出由 LogWriterThread 負責
+    - 佇列滿時依 overflow 處理：
+      - drop：不等待，直接丟棄紀錄並依等級計數；佇列保留 WARNING_HEADROOM_RATIO 的空間給 WARNING 以上的紀錄，
+        INFO/DEBUG 大量湧入時不會擠掉警告與錯誤
+      - block：等待最多 block_timeout 秒，仍然滿則丟棄並計數
+    - 丟棄數量可由 stats() 取得，寫入執行緒也會在輸出中補一行丟棄摘要（含各等級的數量）
+    """
+
+    def __init__(
+        self,
+        targets: List[logging.Handler],
+        max_queue_size: int = 10000,
+        overflow: str = OVERFLOW_DROP,
+        block_timeout: float = 1.0,
+        batch_size: int = 256,
+        flush_interval: float = 0.2
+    ):
+        """
+        初始化佇列日誌處理器並啟動寫入執行緒
+
+        Args:
+            targets: 實際輸出的處理器（StreamHandler、RotatingFileHandler）
+            max_queue_size: 佇列上限
+            overflow: 佇列滿時的處理方式（drop 或 block）
+            block_timeout: 等待佇列空位的秒數
+            batch_size: 每次寫入的最大紀錄數
+            flush_interval: 沒有新紀錄時等待的秒數（同時也是關閉時的檢查間隔）
+
+        Raises:
+            ValueError: overflow 不是 drop 或 block
+        """
+        if overflow not in (OVERFLOW_DROP, OVERFLOW_BLOCK):
+            raise ValueError(f"Unknown log overflow policy: {overflow} (allowed: {OVERFLOW_DROP}, {OVERFLOW_BLOCK})")
+
+        super().__init__()
+        self.queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=max_queue_size)
+        self.max_queue_size = max_queue_size
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        # INFO/DEBUG 可使用的佇列長度（drop 模式）
+        self.low_level_limit = max_queue_size - max(1, int(max_queue_size * WARNING_HEADROOM_RATIO))
+        self.dropped = 0
+        self.dropped_by_level: Dict[str, int] = {}
+        self._unreported: Dict[str, int] = {}
+        self._dropped_lock = threading.Lock()
+        self.writer = LogWriterThread(self, targets, batch_size, flush_interval)
+        self.writer.start()
+
+    def emit(self, record: logging.LogRecord):
+        """
+        將紀錄放進佇列
+
+        Args:
+            record: 日誌紀錄
+        """
+        # 訊息在呼叫端組好（args 可能是之後會變動的物件），exc_info 先轉成文字
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+
+        try:
+            if self.overflow == OVERFLOW_BLOCK:
+                self.queue.put(record, timeout=self.block_timeout)
+            elif record.levelno < logging.WARNING and self.queue.qsize() >= self.low_level_limit:
+                self._drop(record)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self._drop(record)
+
+    def _drop(self, record: logging.LogRecord):
+        """
+        丟棄紀錄並依等級計數
+
+        Args:
+            record: 日誌紀錄
+        """
+        with self._dropped_lock:
+            self.dropped += 1
+            self.dropped_by_level[record.levelname] = self.dropped_by_level.get(record.levelname, 0) + 1
+            self._unreported[record.levelname] = self._unreported.get(record.levelname, 0) + 1
+
+    def take_dropped(self) -> Dict[str, int]:
+        """
+        取得並清除尚未回報的丟棄數量（供寫入執行緒輸出摘要）
+
+        Returns:
+            上次回報後各等級丟棄的紀錄數（沒有丟棄時為空 dict）
+        """
+        with self._dropped_lock:
+            dropped, self._unreported = self._unreported, {}
+        return dropped
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        取得佇列統計
+
+        Returns:
+            queued（目前佇列長度）、max_queue_size、written、dropped、dropped_by_level（等級 -> 數量）、batches
+        """
+        with self._dropped_lock:
+            dropped_by_level = dict(self.dropped_by_level)
+        return {
+            "queued": self.queue.qsize(),
+            "max_queue_size": self.max_queue_size,
+            "written": self.writer.written,
+            "dropped": self.dropped,
+            "dropped_by_level": dropped_by_level,
+            "batches": self.writer.batches
+        }
+
+    def close(self):
+        """停止寫入執行緒（會先寫完佇列中的紀錄）並關閉輸出處理器"""
+        self.writer.stop()
+        super().close()
+
+
+class LogWriterThread(threading.Thread):
+    """
+    日誌寫入執行緒
+
+    每次從佇列取出最多 batch_size 筆紀錄，格式化後一次寫入每個輸出並 flush 一次
+    """
+
+    def __init__(
+        self,
+        handler: QueueLogHandler,
+        targets: List[logging.Handler],
+        batch_size: int,
+        flush_interval: float
+    ):
+        """
+        初始化寫入執行緒
+
+        Args:
+            handler: 所屬的佇列處理器
+            targets: 實際輸出的處理器
+            batch_size: 每次寫入的最大紀錄數
+            flush_interval: 等待新紀錄的秒數
+        """
+        super().__init__(name="log-writer", daemon=True)
+        self.handler = handler
+        self.targets = targets
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.batches = 0
+        self._stopping = threading.Event()
+
+    def run(self):
+        """寫入迴圈"""
+        while not (self._stopping.is_set() and self.handler.queue.empty()):
+            batch = self._next_batch()
+            dropped = self.handler.take_dropped()
+            if dropped:
+                levels = " ".join(f"{level}={count}" for level, count in sorted(dropped.items()))
+                batch.append(logging.makeLogRecord({
+                    "name": "Logger",
+                    "levelno": logging.WARNING,
+                    "levelname": "WARNING",
+                    "msg": f"[Logger] Dropped {sum(dropped.values())} log records (queue full) {levels}",
+                    "created": time.time()
+                }))
+            if batch:
+                self._write(batch)
+
+    def stop(self, timeout: float = 5.0):
+        """
+        停止寫入（寫完佇列中的紀錄後結束）
+
+        Args:
+            timeout: 等待執行緒結束的秒數
+        """
+        self._stopping.set()
+        if self.is_alive():
+            self.join(timeout)
+        for target in self.targets:
+            target.close()
+
+    def _next_batch(self) -> List[logging.LogRecord]:
+        """
+        取出下一批紀錄
+
+        Returns:
+            紀錄列表（等待 flush_interval 秒仍沒有紀錄時為空）
+        """
+        try:
+            batch = [self.handler.queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.handler.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: List[logging.LogRecord]):
+        """
+        將一批紀錄寫入每個輸出
+
+        Args:
+            batch: 紀錄列表
+        """
+        for target in self.targets:
+            records = [record for record in batch if record.levelno >= target.level]
+            if not records:
+                continue
+            target.acquire()
+            try:
+                if isinstance(target, RotatingFileHandler):
+                    # 檔案輸出逐筆檢查是否需要輪替（delay 模式下輪替後需重新開檔）
+                    for record in records:
+                        if target.shouldRollover(record):
+                            target.doRollover()
+                        if target.stream is None:
+                            target.stream = target._open()
+                        target.stream.write(target.format(record) + target.terminator)
+                else:
+                    target.stream.write(
+                        "".join(target.format(record) + target.terminator for record in records)
+                    )
+                target.flush()
+            except Exception:
+                target.handleError(batch[0])
+            finally:
+                target.release()
+        self.written += len(batch)
+        self.batches += 1
+
+
+def build_file_handler(path: str, max_bytes: int, backup_count: int) -> Optional[RotatingFileHandler]:
+    """
+    建立輪替檔案輸出
+
+    Args:
+        path: 檔案路徑（空字串表示不輸出到檔案）
+        max_bytes: 單一檔案大小上限
+        backup_count: 保留的舊檔數量
+
+    Returns:
+        RotatingFileHandler，path 為空時為 None
+    """
+    if not path:
+        return None
+    return RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
@@ -3,9 +3,25 @@ Logger - 統一日誌系統
 遵循 Logger 等級規範，提供統一的日誌格式和行為
 """
 
+import atexit
 import logging
 import sys
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+from src.core.config import settings
+from src.core.context.request_context import RequestContext, get_request_context
+from src.core.logger.formatters import (
+    RECORD_CONTEXT,
+    RECORD_FIELDS,
+    RECORD_METHOD,
+    RECORD_PATH,
+    build_formatter
+)
+from src.core.logger.handlers import QueueLogHandler, build_file_handler
+from src.core.logger.sampling import LogSampler
+
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+LEVEL_ALIASES = {"WARN": "WARNING"}
 
 
 class Logger:
@@ -18,6 +34,14 @@ class Logger:
     - WARN: 發生異常但系統仍可繼續運行。需追蹤改善。
     - ERROR: 發生錯誤，導致請求或流程失敗。必須回應錯誤給用戶或進行 rollback。
     - CRITICAL: 系統無法運行，需立即介入處理。
+    
+    LOG_SAMPLE_CATEGORIES 中的分類（預設 DB）的 INFO/DEBUG 日誌會依訊息樣板限速與機率取樣，
+    並定期輸出各事件的數量摘要
+    
+    請求進行中（有 RequestContext）時：
+    - api_info / api_error 的欄位累積到請求上下文，請求結束時以一行存取日誌輸出
+    - 其他 INFO 日誌（Use Case、DB）降為 DEBUG，只有開啟 DEBUG 時才格式化與輸出
+    - WARN 以上的日誌立即輸出，並帶上 request_id
     """
     
     def __init__(self, name: str = "BaseProject", level: str = "INFO"):
@@ -29,93 +53,276 @@ class Logger:
             level: 日誌等級 (DEBUG, INFO, WARN, ERROR, CRITICAL)
         """
         self.logger = logging.getLogger(name)
-        self.logger.setLevel(getattr(logging, level.upper()))
+        self.set_level(level)
+        
+        # 日誌分類開關（只影響 INFO 與 DEBUG），可在執行期間透過 /admin/logging 調整
+        self.categories: Dict[str, bool] = {
+            "API": settings.log_api_enabled,
+            "DB": settings.log_db_enabled,
+            "Infra": settings.log_infra_enabled,
+            "Access": settings.log_access_enabled
+        }
+        
+        # 高頻率事件取樣（LOG_SAMPLE_CATEGORIES 留空表示不取樣）
+        sample_categories = [category.strip() for category in settings.log_sample_categories.split(",") if category.strip()]
+        self.sampler: Optional[LogSampler] = LogSampler(
+            sample_categories,
+            rate_limit=settings.log_sample_rate_limit,
+            ratio=settings.log_sample_ratio,
+            slow_ms=settings.log_sample_slow_ms,
+            summary_interval=settings.log_sample_summary_interval
+        ) if sample_categories else None
         
         # 避免重複添加 handler
         if not self.logger.handlers:
             self._setup_handler()
     
     def _setup_handler(self):
-        """設定日誌處理器"""
-        handler = logging.StreamHandler(sys.stdout)
-        formatter = logging.Formatter(
-            '%(asctime)s [%(levelname)s] %(name)s: %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
+        """
+        設定日誌處理器
+        
+        輸出到 stdout（LOG_FILE 有設定時同時寫入輪替檔案），格式依 LOG_FORMAT（text 或 json）；
+        LOG_ASYNC 開啟時改由佇列與背景執行緒批次寫入，日誌呼叫不會阻塞在輸出上
+        """
+        formatter = build_formatter(settings.log_format)
+        targets = [logging.StreamHandler(sys.stdout)]
+        file_handler = build_file_handler(
+            settings.log_file,
+            settings.log_file_max_bytes,
+            settings.log_file_backup_count
+        )
+        if file_handler is not None:
+            targets.append(file_handler)
+        for target in targets:
+            target.setFormatter(formatter)
+        
+        if not settings.log_async:
+            for target in targets:
+                self.logger.addHandler(target)
+            return
+        
+        handler = QueueLogHandler(
+            targets,
+            max_queue_size=settings.log_queue_size,
+            overflow=settings.log_overflow,
+            batch_size=settings.log_batch_size,
+            flush_interval=settings.log_flush_interval
         )
-        handler.setFormatter(formatter)
         self.logger.addHandler(handler)
+        # 結束時寫完佇列中的日誌
+        atexit.register(handler.close)
+    
+    def pipeline_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        取得非阻塞輸出的佇列統計
+        
+        Returns:
+            queued、max_queue_size、written、dropped、dropped_by_level、batches，未啟用 LOG_ASYNC 時為 None
+        """
+        for handler in self.logger.handlers:
+            if isinstance(handler, QueueLogHandler):
+                return handler.stats()
+        return None
+    
+    def is_enabled(self, context: Optional[str] = None, level: int = logging.INFO) -> bool:
+        """
+        檢查日誌是否會輸出（呼叫端準備日誌內容的成本較高時先檢查）
+        
+        Args:
+            context: 日誌分類（API、DB、Infra、Access）
+            level: 日誌等級
+            
+        Returns:
+            True 如果會輸出
+        """
+        if level < logging.WARNING:
+            if not self.categories.get(context, True):
+                return False
+            if level == logging.INFO and not self._is_sampled(context) and get_request_context() is not None:
+                level = logging.DEBUG
+        return self.logger.isEnabledFor(level)
+    
+    def set_level(self, level: str):
+        """
+        調整日誌等級（執行期間生效）
+        
+        Args:
+            level: 日誌等級 (DEBUG, INFO, WARN, ERROR, CRITICAL)
+            
+        Raises:
+            ValueError: 不支援的日誌等級
+        """
+        level_name = LEVEL_ALIASES.get(level.upper(), level.upper())
+        if level_name not in LEVELS:
+            raise ValueError(f"Unknown log level: {level} (allowed: {', '.join(LEVELS)})")
+        self.logger.setLevel(getattr(logging, level_name))
+    
+    def set_category(self, category: str, enabled: bool):
+        """
+        開關日誌分類（只影響 INFO 與 DEBUG，WARN 以上一律輸出）
+        
+        Args:
+            category: 日誌分類（API、DB、Infra、Access）
+            enabled: 是否輸出
+            
+        Raises:
+            ValueError: 不支援的日誌分類
+        """
+        if category not in self.categories:
+            raise ValueError(f"Unknown log category: {category} (allowed: {', '.join(self.categories)})")
+        self.categories[category] = enabled
     
-    def debug(self, message: str, context: Optional[str] = None, **kwargs):
+    def get_state(self) -> Dict[str, Any]:
+        """
+        取得目前的日誌設定
+        
+        Returns:
+            level 與各分類的開關
+        """
+        return {
+            "level": logging.getLevelName(self.logger.level),
+            "categories": dict(self.categories)
+        }
+    
+    def debug(self, message: str, *args: Any, context: Optional[str] = None, **kwargs):
         """
         DEBUG 等級日誌
         
         使用情境：開發/除錯用，顯示詳細內部狀態。不在生產環境開啟。
         範例：Query SQL 原始語句、DTO 轉換細節
         """
-        log_message = self._format_message(message, context, **kwargs)
-        self.logger.debug(log_message)
+        self._log(logging.DEBUG, message, args, context, kwargs)
     
-    def info(self, message: str, context: Optional[str] = None, **kwargs):
+    def info(self, message: str, *args: Any, context: Optional[str] = None, **kwargs):
         """
         INFO 等級日誌
         
         使用情境：一般正常流程事件，對系統行為的摘要紀錄。
         範例：API 被呼叫、DB 成功連線、Repository CRUD 成功
+        
+        請求進行中時降為 DEBUG，請求的摘要由存取日誌提供；取樣的分類（LOG_SAMPLE_CATEGORIES）除外，
+        由取樣器決定是否以 INFO 輸出
         """
-        log_message = self._format_message(message, context, **kwargs)
-        self.logger.info(log_message)
+        self._log(logging.INFO, message, args, context, kwargs)
     
-    def warn(self, message: str, context: Optional[str] = None, **kwargs):
+    def warn(self, message: str, *args: Any, context: Optional[str] = None, **kwargs):
         """
         WARN 等級日誌
         
         使用情境：發生異常但系統仍可繼續運行。需追蹤改善。
         範例：外部 API 回傳非 200，但 fallback 成功；快取失效，改走 DB
         """
-        log_message = self._format_message(message, context, **kwargs)
-        self.logger.warning(log_message)
+        self._log(logging.WARNING, message, args, context, kwargs)
     
-    def error(self, message: str, context: Optional[str] = None, **kwargs):
+    def error(self, message: str, *args: Any, context: Optional[str] = None, **kwargs):
         """
         ERROR 等級日誌
         
         使用情境：發生錯誤，導致請求或流程失敗。必須回應錯誤給用戶或進行 rollback。
         範例：JWT 驗證失敗、DB transaction rollback、外部 API timeout
         """
-        log_message = self._format_message(message, context, **kwargs)
-        self.logger.error(log_message)
+        self._log(logging.ERROR, message, args, context, kwargs)
     
-    def critical(self, message: str, context: Optional[str] = None, **kwargs):
+    def critical(self, message: str, *args: Any, context: Optional[str] = None, **kwargs):
         """
         CRITICAL 等級日誌
         
         使用情境：系統無法運行，需立即介入處理。
         範例：DB 完全無法連線、設定檔遺失、系統崩潰
         """
-        log_message = self._format_message(message, context, **kwargs)
-        self.logger.critical(log_message)
+        self._log(logging.CRITICAL, message, args, context, kwargs)
     
-    def _format_message(self, message: str, context: Optional[str] = None, **kwargs) -> str:
+    def _log(
+        self,
+        level: int,
+        message: str,
+        args: Tuple[Any, ...],
+        context: Optional[str],
+        kwargs: Dict[str, Any],
+        method: Optional[str] = None,
+        path: Optional[str] = None
+    ):
         """
-        格式化日誌訊息
+        輸出日誌：先檢查等級與分類，需要輸出時才交給 formatter
+        
+        message 可使用 %s 佔位符，args 的格式化延後到確定輸出時才進行，
+        例如 logger.db_info("Fetch by id=%s table=%s", user_id, table_name)；
+        context 與額外參數以結構化欄位放進 LogRecord，由 text 或 json formatter 組合
         
         Args:
-            message: 主要訊息
+            level: 日誌等級
+            message: 主要訊息（可含 %s 佔位符）
+            args: 佔位符的值
             context: 上下文 (如 API, Infra, DB)
-            **kwargs: 額外的參數
+            kwargs: 額外的參數
+            method: HTTP 方法（API 與存取日誌）
+            path: 請求路徑（API 與存取日誌）
+        """
+        if not self.is_enabled(context, level):
+            return
+        if level < logging.WARNING and self._is_sampled(context):
+            # 取樣的分類（例如 Repository 的 DB 事件）在降級之前先交給取樣器：
+            # 保留的事件以原本的等級輸出，其餘只計入摘要
+            if not self._sample(context, message, kwargs):
+                return
+        elif level == logging.INFO and get_request_context() is not None:
+            level = logging.DEBUG
+        self.logger.log(level, message, *args, extra={
+            RECORD_CONTEXT: context,
+            RECORD_FIELDS: self._with_request_id(kwargs),
+            RECORD_METHOD: method,
+            RECORD_PATH: path
+        })
+    
+    def _is_sampled(self, context: Optional[str]) -> bool:
+        """
+        檢查日誌分類是否由取樣器決定輸出（不受請求中 INFO 降為 DEBUG 的影響）
+        
+        Args:
+            context: 日誌分類
             
         Returns:
-            格式化後的日誌訊息
+            True 如果啟用了取樣且分類需要取樣
+        """
+        return self.sampler is not None and self.sampler.applies_to(context)
+    
+    def _sample(self, context: str, message: str, kwargs: Dict[str, Any]) -> bool:
         """
-        if context:
-            message = f"[{context}] {message}"
+        依訊息樣板取樣，摘要間隔到時輸出各事件的數量
         
-        if kwargs:
-            # 將額外參數格式化為 key=value 的形式
-            extra_info = " ".join([f"{k}={v}" for k, v in kwargs.items()])
-            message = f"{message} {extra_info}"
+        Args:
+            context: 上下文 (如 DB)
+            message: 未格式化的主要訊息（作為事件的樣板）
+            kwargs: 額外的參數
+            
+        Returns:
+            True 如果這筆日誌要輸出
+        """
+        keep = self.sampler.should_log(f"[{context}] {message}", kwargs)
+        summary = self.sampler.take_summary()
+        if summary is not None:
+            self.logger.info("Sampled log summary", extra={
+                RECORD_CONTEXT: "Logger",
+                RECORD_FIELDS: summary,
+                RECORD_METHOD: None,
+                RECORD_PATH: None
+            })
+        return keep
+    
+    def _with_request_id(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        請求進行中時在額外參數加上 request_id
         
-        return message
+        Args:
+            kwargs: 額外的參數
+            
+        Returns:
+            額外的參數
+        """
+        request_context = get_request_context()
+        if request_context is None or "request_id" in kwargs:
+            return kwargs
+        return {**kwargs, "request_id": request_context.request_id}
     
     # API 層專用方法
     def api_info(self, method: str, path: str, user_id: Optional[str] = None, **kwargs):
@@ -123,63 +330,110 @@ class Logger:
         API 層 INFO 日誌
         
         範例：INFO [API] POST /users user_id=123
+        
+        請求進行中時只把欄位累積到存取日誌
         """
-        message = f"{method} {path}"
+        if not self.categories["API"]:
+            return
+        request_context = get_request_context()
+        if request_context is not None:
+            request_context.bind(user_id=user_id, **kwargs)
+            return
         if user_id:
             kwargs["user_id"] = user_id
-        self.info(message, context="API", **kwargs)
+        self._log(logging.INFO, f"{method} {path}", (), "API", kwargs, method=method, path=path)
     
     def api_error(self, error_code: str, error_message: str, **kwargs):
         """
         API 層 ERROR 日誌
         
         範例：ERROR [API] InvalidTokenError - Invalid JWT token
+        
+        請求進行中時記錄第一個錯誤到存取日誌（error_code、error），由存取日誌依狀態碼決定等級
         """
+        request_context = get_request_context()
+        if request_context is not None:
+            request_context.fields.setdefault("error_code", error_code)
+            request_context.fields.setdefault("error", error_message)
+            return
         message = f"{error_code} - {error_message}"
         self.error(message, context="API", **kwargs)
     
+    def access(self, request_context: RequestContext):
+        """
+        請求存取日誌（每個請求一行）
+        
+        狀態碼 5xx 為 ERROR、4xx 為 WARN，其餘為 INFO
+        
+        範例：INFO [Access] GET /users/me request_id=3f2a... status=200 latency_ms=4.2 auth_ms=0.3 user_id=1
+        """
+        status = request_context.status or 0
+        level = logging.ERROR if status >= 500 else logging.WARNING if status >= 400 else logging.INFO
+        if level < logging.WARNING and not self.categories["Access"]:
+            return
+        if not self.logger.isEnabledFor(level):
+            return
+        self.logger.log(level, "%s %s", request_context.method, request_context.path, extra={
+            RECORD_CONTEXT: "Access",
+            RECORD_FIELDS: request_context.to_fields(),
+            RECORD_METHOD: request_context.method,
+            RECORD_PATH: request_context.path
+        })
+    
     # Infra 層專用方法
-    def infra_info(self, message: str, **kwargs):
+    def infra_info(self, message: str, *args: Any, **kwargs):
         """
         Infra 層 INFO 日誌
         
         範例：INFO [Infra] Call External API /payments status=200
         """
-        self.info(message, context="Infra", **kwargs)
+        self.info(message, *args, context="Infra", **kwargs)
     
-    def infra_warn(self, message: str, **kwargs):
+    def infra_warn(self, message: str, *args: Any, **kwargs):
         """
         Infra 層 WARN 日誌
         
         範例：WARN [Infra] Cache miss for key=user:123, fallback to DB
         """
-        self.warn(message, context="Infra", **kwargs)
+        self.warn(message, *args, context="Infra", **kwargs)
     
-    def infra_error(self, message: str, **kwargs):
+    def infra_error(self, message: str, *args: Any, **kwargs):
         """
         Infra 層 ERROR 日誌
         
         範例：ERROR [Infra] Call External API /payments timeout
         """
-        self.error(message, context="Infra", **kwargs)
+        self.error(message, *args, context="Infra", **kwargs)
     
     # DB 層專用方法
-    def db_info(self, message: str, **kwargs):
+    def db_info(self, message: str, *args: Any, **kwargs):
         """
         DB 層 INFO 日誌
         
         範例：INFO [DB] Connection established host=localhost db=base_project
+        
+        熱路徑請使用 %s 佔位符（logger.db_info("Fetch by id=%s", user_id)），
+        DB 分類關閉或等級不足時不做任何字串處理；
+        Repository 事件請帶 latency_ms，取樣時不小於 LOG_SAMPLE_SLOW_MS 的事件一律保留
+        """
+        self.info(message, *args, context="DB", **kwargs)
+    
+    def db_warn(self, message: str, *args: Any, **kwargs):
+        """
+        DB 層 WARN 日誌
+        
+        範例：WARN [DB] Slow query 350.2ms SELECT users.id FROM users WHERE users.id = ?
         """
-        self.info(message, context="DB", **kwargs)
+        self.warn(message, *args, context="DB", **kwargs)
     
-    def db_error(self, message: str, **kwargs):
+    def db_error(self, message: str, *args: Any, **kwargs):
         """
         DB 層 ERROR 日誌
         
         範例：ERROR [DB] Transaction rollback table=users id=123 error=DuplicateKey
         """
-        self.error(message, context="DB", **kwargs)
+        self.error(message, *args, context="DB", **kwargs)
 
 
 # 全域 Logger 實例
-logger = Logger()
+logger = Logger(level=settings.log_level)
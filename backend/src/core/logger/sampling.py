@@ -0,0 +1,141 @@
+"""
+sampling.py - 日誌取樣
+高頻率的成功事件（例如 Repository 的每次查詢）依訊息樣板限速並機率取樣，
+錯誤與慢操作一律保留，並定期輸出每種事件的數量摘要
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# 超過上限的樣板合併計入這個 key，避免未使用佔位符的訊息讓統計無限成長
+OTHER_EVENTS_KEY = "(other)"
+
+
+class LogSampler:
+    """
+    日誌取樣器
+
+    以訊息樣板（context 加上未格式化的 message，例如 "[DB] Fetch by id=%s table=%s"）區分事件：
+    - 每個樣板每秒最多保留 rate_limit 筆（token bucket，允許 rate_limit 筆的突發）
+    - 超過限速的事件以 ratio 的機率保留
+    - 帶有 latency_ms 且不小於 slow_ms 的事件一律保留（WARN 以上由 Logger 直接保留，不經過取樣）
+    - 每 summary_interval 秒可由 take_summary 取得各樣板的 seen / logged / dropped 數量
+    """
+
+    def __init__(
+        self,
+        categories: Iterable[str],
+        rate_limit: float,
+        ratio: float,
+        slow_ms: float,
+        summary_interval: float,
+        max_keys: int = 1000,
+        rand: Callable[[], float] = random.random
+    ):
+        """
+        初始化取樣器
+
+        Args:
+            categories: 要取樣的日誌分類（例如 DB）
+            rate_limit: 每個樣板每秒保留的筆數
+            ratio: 超過限速後保留的機率（0 到 1）
+            slow_ms: 慢操作門檻（毫秒）
+            summary_interval: 摘要間隔（秒）
+            max_keys: 追蹤的樣板數量上限
+            rand: 亂數函式（0 到 1）
+        """
+        self.categories = frozenset(categories)
+        self.rate_limit = rate_limit
+        self.ratio = ratio
+        self.slow_ms = slow_ms
+        self.summary_interval = summary_interval
+        self.max_keys = max_keys
+        self._rand = rand
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, list] = {}
+        self._counts: Dict[str, list] = {}
+        self._summary_started = time.monotonic()
+
+    def applies_to(self, context: Optional[str]) -> bool:
+        """
+        檢查日誌分類是否需要取樣
+
+        Args:
+            context: 日誌分類
+
+        Returns:
+            True 如果需要取樣
+        """
+        return context in self.categories
+
+    def should_log(self, key: str, fields: Dict[str, Any]) -> bool:
+        """
+        決定事件是否輸出，並累計統計
+
+        Args:
+            key: 訊息樣板
+            fields: 額外的參數（用於判斷慢操作）
+
+        Returns:
+            True 如果要輸出
+        """
+        now = time.monotonic()
+        latency_ms = fields.get("latency_ms")
+        slow = isinstance(latency_ms, (int, float)) and latency_ms >= self.slow_ms
+
+        with self._lock:
+            if key not in self._buckets and len(self._buckets) >= self.max_keys:
+                key = OTHER_EVENTS_KEY
+
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.rate_limit, now]
+            else:
+                bucket[0] = min(self.rate_limit, bucket[0] + (now - bucket[1]) * self.rate_limit)
+                bucket[1] = now
+
+            if slow:
+                keep = True
+            elif bucket[0] >= 1:
+                bucket[0] -= 1
+                keep = True
+            else:
+                keep = self._rand() < self.ratio
+
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0, 0]
+            counts[0] += 1
+            if keep:
+                counts[1] += 1
+        return keep
+
+    def take_summary(self) -> Optional[Dict[str, Any]]:
+        """
+        摘要間隔已到時取得並清除統計
+
+        Returns:
+            interval_s 與 events（樣板 -> seen / logged / dropped），間隔未到或沒有丟棄任何事件時為 None
+        """
+        now = time.monotonic()
+        if now - self._summary_started < self.summary_interval:
+            return None
+
+        with self._lock:
+            if now - self._summary_started < self.summary_interval:
+                return None
+            interval = now - self._summary_started
+            counts, self._counts = self._counts, {}
+            self._summary_started = now
+
+        if not any(seen > logged for seen, logged in counts.values()):
+            return None
+        return {
+            "interval_s": round(interval, 1),
+            "events": {
+                key: {"seen": seen, "logged": logged, "dropped": seen - logged}
+                for key, (seen, logged) in counts.items()
+            }
+        }
@@ -0,0 +1,60 @@
+"""
+core metrics - 應用程式指標
+行程內的 Counter / Gauge / Histogram 與 Prometheus 文字格式輸出，支援合併多個 uvicorn worker
+"""
+
+from .registry import (
+    PROMETHEUS_CONTENT_TYPE,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry
+)
+from .multiprocess import MultiprocessStore
+from .instruments import (
+    registry,
+    HTTP_REQUESTS,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_FLIGHT,
+    HTTP_CONDITIONAL_REQUESTS,
+    EVENT_LOOP_LAG,
+    EVENT_LOOP_BLOCKS,
+    DB_POOL_CHECKOUTS,
+    DB_POOL_WAIT,
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_OVERFLOW,
+    DB_POOL_SIZE,
+    PASSWORD_HASH_DURATION,
+    JWT_VERIFICATIONS,
+    AI_REQUEST_DURATION,
+    AI_TOKENS,
+    get_multiprocess_store,
+    render_metrics
+)
+
+__all__ = [
+    "PROMETHEUS_CONTENT_TYPE",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "MultiprocessStore",
+    "registry",
+    "HTTP_REQUESTS",
+    "HTTP_REQUEST_DURATION",
+    "HTTP_REQUESTS_IN_FLIGHT",
+    "HTTP_CONDITIONAL_REQUESTS",
+    "EVENT_LOOP_LAG",
+    "EVENT_LOOP_BLOCKS",
+    "DB_POOL_CHECKOUTS",
+    "DB_POOL_WAIT",
+    "DB_POOL_CHECKED_OUT",
+    "DB_POOL_OVERFLOW",
+    "DB_POOL_SIZE",
+    "PASSWORD_HASH_DURATION",
+    "JWT_VERIFICATIONS",
+    "AI_REQUEST_DURATION",
+    "AI_TOKENS",
+    "get_multiprocess_store",
+    "render_metrics"
+]
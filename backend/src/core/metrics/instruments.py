@@ -0,0 +1,129 @@
+"""
+instruments.py - 應用程式指標
+集中定義各層使用的指標（名稱、標籤、bucket），以及 /metrics 的輸出
+"""
+
+from typing import Optional
+
+from src.core.config import settings
+from src.core.metrics.multiprocess import MultiprocessStore
+from src.core.metrics.registry import MetricsRegistry
+
+# 全域註冊表（API_ENABLE_METRICS=false 時所有更新直接返回）
+registry = MetricsRegistry(enabled=settings.api.enable_metrics)
+
+# HTTP
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status",
+    ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method, route template and status",
+    ("method", "route", "status")
+)
+HTTP_REQUESTS_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being processed"
+)
+HTTP_CONDITIONAL_REQUESTS = registry.counter(
+    "http_conditional_requests_total",
+    "Requests with If-None-Match by result (hit = 304 Not Modified)",
+    ("result",)
+)
+
+# 事件迴圈
+EVENT_LOOP_LAG = registry.histogram(
+    "event_loop_lag_seconds",
+    "Delay between when the loop watchdog was due to wake and when it ran",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+EVENT_LOOP_BLOCKS = registry.counter(
+    "event_loop_blocks_total",
+    "Event loop stalls over the block threshold by route template being served",
+    ("route",)
+)
+
+# 資料庫連線池
+DB_POOL_CHECKOUTS = registry.counter(
+    "db_pool_checkouts_total",
+    "Connections checked out from the database pool"
+)
+DB_POOL_WAIT = registry.histogram(
+    "db_pool_wait_seconds",
+    "Time a session waited to obtain a pooled connection",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0)
+)
+DB_POOL_CHECKED_OUT = registry.gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out from the database pool"
+)
+DB_POOL_OVERFLOW = registry.gauge(
+    "db_pool_overflow_connections",
+    "Connections currently open beyond the pool size"
+)
+DB_POOL_SIZE = registry.gauge(
+    "db_pool_size_connections",
+    "Configured database pool size"
+)
+
+# 認證
+PASSWORD_HASH_DURATION = registry.histogram(
+    "password_hash_duration_seconds",
+    "bcrypt hashing and verification time by operation",
+    ("operation",),
+    buckets=(0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0)
+)
+JWT_VERIFICATIONS = registry.counter(
+    "jwt_verifications_total",
+    "JWT verifications by result",
+    ("result",)
+)
+
+# AI 服務
+AI_REQUEST_DURATION = registry.histogram(
+    "ai_request_duration_seconds",
+    "AI model call latency by model, operation and outcome",
+    ("model", "operation", "outcome"),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+)
+AI_TOKENS = registry.counter(
+    "ai_tokens_total",
+    "AI tokens used by model and type (prompt, completion)",
+    ("model", "type")
+)
+
+# 多行程模式（API_METRICS_MULTIPROC_DIR 有設定時，合併所有 uvicorn worker 的指標）
+_store: Optional[MultiprocessStore] = None
+
+
+def get_multiprocess_store() -> Optional[MultiprocessStore]:
+    """
+    取得多行程存放區（第一次使用時建立並啟動定期寫入）
+
+    Returns:
+        MultiprocessStore，未設定 API_METRICS_MULTIPROC_DIR 時為 None
+    """
+    global _store
+    if _store is None and settings.api.metrics_multiproc_dir:
+        _store = MultiprocessStore(
+            settings.api.metrics_multiproc_dir,
+            registry,
+            settings.api.metrics_flush_interval
+        )
+        _store.start()
+    return _store
+
+
+def render_metrics() -> bytes:
+    """
+    輸出 Prometheus 文字格式（多行程模式下合併所有 worker）
+
+    Returns:
+        文字格式內容
+    """
+    store = get_multiprocess_store()
+    if store is None:
+        return registry.render()
+    return registry.render(store.read_all())
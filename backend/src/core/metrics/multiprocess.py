@@ -0,0 +1,121 @@
+"""
+multiprocess.py - 多行程指標合併
+每個 uvicorn worker 定期把自己的指標 snapshot 寫到共用目錄（metrics-<pid>.json），
+/metrics 讀取所有 worker 的 snapshot 合併後輸出
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from src.core.metrics.registry import MetricsRegistry
+
+SNAPSHOT_PREFIX = "metrics-"
+SNAPSHOT_SUFFIX = ".json"
+
+
+class MultiprocessStore:
+    """
+    多行程 snapshot 存放區
+
+    - counter 與 histogram 保留已結束 worker 的數值（與單一行程重新啟動前的累積值一致）
+    - gauge（例如處理中的請求數、連線池使用量）只計入仍存活的 worker
+    """
+
+    def __init__(self, directory: str, registry: MetricsRegistry, flush_interval: float):
+        """
+        初始化存放區
+
+        Args:
+            directory: 共用目錄（所有 worker 相同）
+            registry: 本行程的註冊表
+            flush_interval: 寫入 snapshot 的間隔（秒）
+        """
+        self.directory = directory
+        self.registry = registry
+        self.flush_interval = flush_interval
+        self._flusher: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def path(self) -> str:
+        """本行程的 snapshot 路徑（fork 後 pid 會改變，因此每次重新計算）"""
+        return os.path.join(self.directory, f"{SNAPSHOT_PREFIX}{os.getpid()}{SNAPSHOT_SUFFIX}")
+
+    def write(self):
+        """寫入本行程的 snapshot（先寫暫存檔再取代，讀取端不會讀到寫一半的檔案）"""
+        path = self.path
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as snapshot_file:
+            json.dump(self.registry.snapshot(), snapshot_file, separators=(",", ":"))
+        os.replace(temporary, path)
+
+    def read_all(self) -> List[Dict[str, Dict[str, Any]]]:
+        """
+        寫入本行程最新的 snapshot 後讀取所有 worker 的 snapshot
+
+        Returns:
+            snapshot 列表（已結束 worker 的 gauge 已移除）
+        """
+        self.write()
+        snapshots = []
+        for filename in os.listdir(self.directory):
+            if not (filename.startswith(SNAPSHOT_PREFIX) and filename.endswith(SNAPSHOT_SUFFIX)):
+                continue
+            try:
+                pid = int(filename[len(SNAPSHOT_PREFIX):-len(SNAPSHOT_SUFFIX)])
+                with open(os.path.join(self.directory, filename), encoding="utf-8") as snapshot_file:
+                    snapshot = json.load(snapshot_file)
+            except (ValueError, OSError):
+                continue
+            if not _is_alive(pid):
+                snapshot = {name: metric for name, metric in snapshot.items() if metric["type"] != "gauge"}
+            snapshots.append(snapshot)
+        return snapshots
+
+    def start(self):
+        """啟動定期寫入 snapshot 的背景執行緒"""
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        self._stopping.clear()
+        self._flusher = threading.Thread(target=self._run, name="metrics-flusher", daemon=True)
+        self._flusher.start()
+
+    def stop(self):
+        """停止背景執行緒並寫入最後一次 snapshot"""
+        self._stopping.set()
+        if self._flusher is not None:
+            self._flusher.join(self.flush_interval + 1)
+        self.write()
+
+    def _run(self):
+        """定期寫入 snapshot"""
+        while not self._stopping.wait(self.flush_interval):
+            try:
+                self.write()
+            except OSError:
+                # 磁碟暫時無法寫入時略過這一次
+                pass
+
+
+def _is_alive(pid: int) -> bool:
+    """
+    檢查行程是否存活
+
+    Args:
+        pid: 行程 ID
+
+    Returns:
+        True 如果行程存在
+    """
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,388 @@
+"""
+registry.py - 行程內指標
+Counter、Gauge、Histogram 與指標註冊表，輸出 Prometheus 文字格式（text/plain; version=0.0.4）
+"""
+
+import bisect
+import math
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 延遲類指標的預設 bucket（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+class Metric:
+    """
+    指標基底類別
+
+    每個指標一把鎖，更新只做一次 dict 查詢與數值運算；
+    註冊表停用時（API_ENABLE_METRICS=false）更新直接返回
+    """
+
+    type = "untyped"
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        初始化指標
+
+        Args:
+            registry: 所屬的註冊表
+            name: 指標名稱
+            documentation: 說明
+            labelnames: 標籤名稱
+        """
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[LabelValues, Any] = {}
+
+    def _key(self, labelvalues: Sequence[Any]) -> LabelValues:
+        """
+        檢查並轉換標籤值
+
+        Args:
+            labelvalues: 標籤值（順序同 labelnames）
+
+        Returns:
+            標籤值 tuple
+
+        Raises:
+            ValueError: 標籤數量不符
+        """
+        if len(labelvalues) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labelvalues)}")
+        return tuple(str(value) for value in labelvalues)
+
+    def samples(self) -> List[Tuple[LabelValues, Any]]:
+        """
+        取得目前的值
+
+        Returns:
+            (標籤值, 值) 列表
+        """
+        with self._lock:
+            return [(key, _copy_value(value)) for key, value in self._values.items()]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        匯出可序列化的狀態（供多行程合併）
+
+        Returns:
+            type、help、labelnames 與 samples
+        """
+        return {
+            "type": self.type,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "samples": [[list(key), value] for key, value in self.samples()]
+        }
+
+
+class Counter(Metric):
+    """只增不減的計數"""
+
+    type = "counter"
+
+    def inc(self, *labelvalues: Any, amount: float = 1.0):
+        """
+        增加計數
+
+        Args:
+            *labelvalues: 標籤值
+            amount: 增加量
+        """
+        if not self.registry.enabled:
+            return
+        key = self._key(labelvalues)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    """可增可減的數值（多行程模式下加總所有存活的 worker）"""
+
+    type = "gauge"
+
+    def set(self, value: float, *labelvalues: Any):
+        """
+        設定數值
+
+        Args:
+            value: 數值
+            *labelvalues: 標籤值
+        """
+        if not self.registry.enabled:
+            return
+        key = self._key(labelvalues)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, *labelvalues: Any, amount: float = 1.0):
+        """
+        增加數值
+
+        Args:
+            *labelvalues: 標籤值
+            amount: 增加量
+        """
+        if not self.registry.enabled:
+            return
+        key = self._key(labelvalues)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, *labelvalues: Any, amount: float = 1.0):
+        """
+        減少數值
+
+        Args:
+            *labelvalues: 標籤值
+            amount: 減少量
+        """
+        self.inc(*labelvalues, amount=-amount)
+
+
+class Histogram(Metric):
+    """分布統計（bucket 計數、總和、次數）"""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        """
+        初始化分布統計
+
+        Args:
+            registry: 所屬的註冊表
+            name: 指標名稱
+            documentation: 說明
+            labelnames: 標籤名稱
+            buckets: bucket 上限（遞增，+Inf 會自動加上）
+        """
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(float(bound) for bound in buckets)
+
+    def observe(self, value: float, *labelvalues: Any):
+        """
+        記錄一次觀測值
+
+        Args:
+            value: 觀測值
+            *labelvalues: 標籤值
+        """
+        if not self.registry.enabled:
+            return
+        key = self._key(labelvalues)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [各 bucket 的計數（不累積，最後一格為 +Inf）, 總和, 次數]
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        匯出可序列化的狀態
+
+        Returns:
+            type、help、labelnames、buckets 與 samples
+        """
+        snapshot = super().snapshot()
+        snapshot["buckets"] = list(self.buckets)
+        return snapshot
+
+
+class MetricsRegistry:
+    """
+    指標註冊表
+
+    - counter / gauge / histogram 建立並註冊指標（同名指標只建立一次）
+    - add_collector 註冊輸出前執行的函式，用於更新由外部狀態決定的 Gauge（例如連線池使用量）
+    - render 將一份或多份（多行程）snapshot 合併後輸出 Prometheus 文字格式
+    """
+
+    def __init__(self, enabled: bool = True):
+        """
+        初始化註冊表
+
+        Args:
+            enabled: 是否記錄指標
+        """
+        self.enabled = enabled
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """建立或取得 Counter"""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """建立或取得 Gauge"""
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """建立或取得 Histogram"""
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def _register(self, metric_class, name: str, documentation: str, labelnames: Sequence[str], **kwargs) -> Any:
+        """
+        註冊指標
+
+        Raises:
+            ValueError: 同名指標的類型不同
+        """
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(self, name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"Metric {name} is already registered as {metric.type}")
+            return metric
+
+    def add_collector(self, collector: Callable[[], None]):
+        """
+        註冊輸出前執行的函式
+
+        Args:
+            collector: 無參數的函式
+        """
+        self._collectors.append(collector)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        執行 collector 後匯出所有指標的狀態
+
+        Returns:
+            指標名稱 -> 狀態
+        """
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception:
+                # 指標收集失敗不應影響輸出其他指標
+                pass
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    def render(self, snapshots: Optional[List[Dict[str, Dict[str, Any]]]] = None) -> bytes:
+        """
+        輸出 Prometheus 文字格式
+
+        Args:
+            snapshots: 要合併輸出的 snapshot（多行程模式），None 表示只輸出本行程
+
+        Returns:
+            文字格式內容
+        """
+        merged = merge_snapshots(snapshots if snapshots is not None else [self.snapshot()])
+        lines: List[str] = []
+        for name in sorted(merged):
+            metric = merged[name]
+            lines.append(f"# HELP {name} {_escape_help(metric['help'])}")
+            lines.append(f"# TYPE {name} {metric['type']}")
+            labelnames = metric["labelnames"]
+            for labelvalues, value in sorted(metric["samples"], key=lambda sample: sample[0]):
+                if metric["type"] == "histogram":
+                    counts, total, count = value
+                    cumulative = 0
+                    for bound, bucket_count in zip(list(metric["buckets"]) + [math.inf], counts):
+                        cumulative += bucket_count
+                        lines.append(
+                            f"{name}_bucket{_labels(labelnames, labelvalues, ('le', _format_value(bound)))} {cumulative}"
+                        )
+                    lines.append(f"{name}_sum{_labels(labelnames, labelvalues)} {_format_value(total)}")
+                    lines.append(f"{name}_count{_labels(labelnames, labelvalues)} {count}")
+                else:
+                    lines.append(f"{name}{_labels(labelnames, labelvalues)} {_format_value(value)}")
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def merge_snapshots(snapshots: List[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """
+    合併多份 snapshot（counter、gauge 相加，histogram 逐 bucket 相加）
+
+    Args:
+        snapshots: snapshot 列表
+
+    Returns:
+        合併後的 snapshot
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot.items():
+            target = merged.get(name)
+            if target is None:
+                target = merged[name] = {**metric, "samples": {}}
+            samples = target["samples"]
+            for labelvalues, value in metric["samples"]:
+                key = tuple(labelvalues)
+                current = samples.get(key)
+                if current is None:
+                    samples[key] = _copy_value(value)
+                elif metric["type"] == "histogram":
+                    current[0] = [left + right for left, right in zip(current[0], value[0])]
+                    current[1] += value[1]
+                    current[2] += value[2]
+                else:
+                    samples[key] = current + value
+    for metric in merged.values():
+        metric["samples"] = list(metric["samples"].items())
+    return merged
+
+
+def _copy_value(value: Any) -> Any:
+    """複製 histogram 狀態（其他值為不可變的數字）"""
+    if isinstance(value, list):
+        return [list(value[0]), value[1], value[2]]
+    return value
+
+
+def _labels(labelnames: Sequence[str], labelvalues: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    """組合 {name="value",...}"""
+    pairs = list(zip(labelnames, labelvalues))
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + "}"
+
+
+def _escape_label(value: str) -> str:
+    """跳脫標籤值中的反斜線、雙引號與換行"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _escape_help(value: str) -> str:
+    """跳脫說明中的反斜線與換行"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    """以 Prometheus 格式輸出數值"""
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
@@ -5,8 +5,16 @@ core middleware - 核心中介軟體
 
 from .auth import AuthMiddleware
 from .jwt_middleware import JWTMiddleware
+from .compression import CompressionMiddleware
+from .limits import RequestLimitsMiddleware
+from .request_context import RequestContextMiddleware
+from .tracing import TracingMiddleware
 
 __all__ = [
     "AuthMiddleware",
-    "JWTMiddleware"
+    "JWTMiddleware",
+    "CompressionMiddleware",
+    "RequestLimitsMiddleware",
+    "RequestContextMiddleware",
+    "TracingMiddleware"
 ]
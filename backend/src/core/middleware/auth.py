@@ -3,17 +3,165 @@ auth.py - 認證中介軟體
 驗證 JWT，攔截未授權請求
 """
 
-from fastapi import Request, HTTPException
-from fastapi.responses import JSONResponse
+import hmac
+
+from fastapi import Request, Response, HTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Callable, Dict, Any
+from typing import Callable, Dict, Any, Optional, Tuple
 # 不在模組載入時導入 jwt_handler，而是在運行時動態獲取
+from src.shared.api.json_codec import FastJSONResponse
+from src.shared.api.static_responses import StaticResponse
 from src.shared.errors.system_error.auth_error import (
+    AuthError,
     MissingTokenError,
     InvalidTokenError,
     ExpiredTokenError
 )
+from src.core.config import settings
+from src.core.context.request_context import request_stage
 from src.core.logger.logger import logger
+from src.core.tracing import tracer
+
+
+# 不需要認證的路徑（精確匹配或前綴匹配）
+# /batch 會自行驗證一次，再依各子請求的路徑決定是否需要認證
+# 指標端點需要認證：Prometheus 以 API_METRICS_TOKEN 抓取（見 has_metrics_token），其餘請求需 admin 角色
+DEFAULT_EXCLUDED_PATHS = [
+    "/",
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+    "/health",
+    "/users/register",
+    "/users/login",
+    "/batch"
+]
+
+# 認證錯誤不應被快取
+AUTH_ERROR_CACHE_CONTROL = "no-store"
+
+# 常見的認證錯誤回應在模組載入時預先編碼（未登入的大量請求不需要每次序列化）
+_AUTH_ERROR_RESPONSES: Dict[Tuple[type, str], StaticResponse] = {
+    (type(error), error.message): StaticResponse.json(
+        error.to_dict(),
+        status_code=error.status_code,
+        cache_control=AUTH_ERROR_CACHE_CONTROL
+    )
+    for error in (
+        MissingTokenError("Missing Authorization header"),
+        MissingTokenError("Invalid Authorization header format"),
+        MissingTokenError("Missing JWT token"),
+        InvalidTokenError("Invalid JWT token"),
+        ExpiredTokenError("JWT token has expired")
+    )
+}
+
+# 認證中介軟體的未預期錯誤回應
+_INTERNAL_ERROR_RESPONSE = StaticResponse.json(
+    {
+        "data": None,
+        "error": {
+            "code": "InternalServerError",
+            "message": "Internal server error",
+            "details": None
+        }
+    },
+    status_code=500,
+    cache_control=AUTH_ERROR_CACHE_CONTROL
+)
+
+
+def auth_error_response(error: AuthError) -> Response:
+    """
+    取得認證錯誤的回應
+    
+    Args:
+        error: 認證錯誤
+        
+    Returns:
+        預先編碼的回應；沒有對應的預先編碼回應（例如帶有 details）時即時編碼
+    """
+    if error.details is None:
+        response = _AUTH_ERROR_RESPONSES.get((type(error), error.message))
+        if response is not None:
+            return response
+    
+    return FastJSONResponse(
+        status_code=error.status_code,
+        content=error.to_dict(),
+        headers={"Cache-Control": AUTH_ERROR_CACHE_CONTROL}
+    )
+
+
+def is_excluded_path(path: str, excluded_paths: list = None) -> bool:
+    """
+    檢查路徑是否不需要認證
+    
+    Args:
+        path: 請求路徑
+        excluded_paths: 不需要認證的路徑列表，預設為 DEFAULT_EXCLUDED_PATHS
+        
+    Returns:
+        True 如果路徑被排除，False 如果需要認證
+    """
+    # 精確匹配或前綴匹配
+    for excluded in excluded_paths if excluded_paths is not None else DEFAULT_EXCLUDED_PATHS:
+        if path == excluded or path.startswith(excluded + "/"):
+            return True
+    return False
+
+
+def has_metrics_token(authorization_header: Optional[str]) -> bool:
+    """
+    檢查 Authorization header 是否為指標抓取用的 token（Bearer <API_METRICS_TOKEN>）
+    
+    Args:
+        authorization_header: Authorization header 內容
+        
+    Returns:
+        True 如果已設定 token 且相符
+    """
+    expected = settings.api.metrics_token
+    if not expected or not authorization_header:
+        return False
+    scheme, _, token = authorization_header.partition(" ")
+    if scheme.lower() != "bearer":
+        return False
+    return hmac.compare_digest(token.strip().encode("utf-8"), expected.encode("utf-8"))
+
+
+def authenticate_header(authorization_header: str) -> Dict[str, Any]:
+    """
+    驗證 Authorization header 並取得使用者資訊
+    
+    Args:
+        authorization_header: Authorization header 內容
+        
+    Returns:
+        使用者資訊字典
+        
+    Raises:
+        MissingTokenError: 缺少 Token
+        InvalidTokenError: Token 無效
+        ExpiredTokenError: Token 過期
+    """
+    # 創建新的 JWT handler 實例，確保使用最新的配置
+    from src.core.security.jwt.jwt_handler import JWTHandler
+    jwt_handler = JWTHandler()
+    
+    # 提取 JWT Token
+    token = jwt_handler.get_token_from_header(authorization_header)
+    
+    # 驗證 JWT Token
+    payload = jwt_handler.verify(token)
+    
+    # 回傳使用者資訊
+    return {
+        "user_id": payload.get("sub"),
+        "roles": payload.get("roles", []),
+        "iat": payload.get("iat"),
+        "exp": payload.get("exp")
+    }
 
 
 class AuthMiddleware(BaseHTTPMiddleware):
@@ -36,17 +184,9 @@ class AuthMiddleware(BaseHTTPMiddleware):
             excluded_paths: 不需要認證的路徑列表
         """
         super().__init__(app)
-        self.excluded_paths = excluded_paths or [
-            "/",
-            "/docs",
-            "/redoc", 
-            "/openapi.json",
-            "/health",
-            "/users/register",
-            "/users/login"
-        ]
+        self.excluded_paths = excluded_paths or DEFAULT_EXCLUDED_PATHS
     
-    async def dispatch(self, request: Request, call_next: Callable) -> JSONResponse:
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """
         中介軟體主要邏輯
         
@@ -55,12 +195,17 @@ class AuthMiddleware(BaseHTTPMiddleware):
             call_next: 下一個中介軟體或路由處理器
             
         Returns:
-            JSONResponse: 回應結果
+            Response: 回應結果
         """
         # 檢查是否為排除的路徑
         if self._is_excluded_path(request.url.path):
             return await call_next(request)
         
+        # 指標端點帶有抓取 token 時不驗證 JWT（其餘請求照常驗證，由路由確認 admin 角色）
+        if request.url.path == settings.api.metrics_url and has_metrics_token(request.headers.get("Authorization")):
+            request.state.metrics_scraper = True
+            return await call_next(request)
+        
         try:
             # 記錄 API 請求
             logger.api_info(
@@ -70,7 +215,8 @@ class AuthMiddleware(BaseHTTPMiddleware):
             )
             
             # 驗證 JWT
-            user_info = await self._authenticate(request)
+            with request_stage("auth"), tracer.span("AuthMiddleware.authenticate"):
+                user_info = await self._authenticate(request)
             
             # 將使用者資訊存到 request.state
             request.state.user = user_info
@@ -85,26 +231,13 @@ class AuthMiddleware(BaseHTTPMiddleware):
             logger.api_error(e.code, e.message)
             
             # 回傳統一的錯誤格式
-            return JSONResponse(
-                status_code=e.status_code,
-                content=e.to_dict()
-            )
+            return auth_error_response(e)
         except Exception as e:
             # 記錄未預期的錯誤
             logger.error(f"Unexpected error in auth middleware: {str(e)}")
             
             # 回傳通用錯誤
-            return JSONResponse(
-                status_code=500,
-                content={
-                    "data": None,
-                    "error": {
-                        "code": "InternalServerError",
-                        "message": "Internal server error",
-                        "details": None
-                    }
-                }
-            )
+            return _INTERNAL_ERROR_RESPONSE
     
     def _is_excluded_path(self, path: str) -> bool:
         """
@@ -116,11 +249,7 @@ class AuthMiddleware(BaseHTTPMiddleware):
         Returns:
             True 如果路徑被排除，False 如果需要認證
         """
-        # 精確匹配或前綴匹配
-        for excluded in self.excluded_paths:
-            if path == excluded or path.startswith(excluded + "/"):
-                return True
-        return False
+        return is_excluded_path(path, self.excluded_paths)
     
     async def _authenticate(self, request: Request) -> Dict[str, Any]:
         """
@@ -137,26 +266,8 @@ class AuthMiddleware(BaseHTTPMiddleware):
             InvalidTokenError: Token 無效
             ExpiredTokenError: Token 過期
         """
-        # 創建新的 JWT handler 實例，確保使用最新的配置
-        from src.core.security.jwt.jwt_handler import JWTHandler
-        jwt_handler = JWTHandler()
-        
         # 取得 Authorization header
-        authorization_header = request.headers.get("Authorization")
-        
-        # 提取 JWT Token
-        token = jwt_handler.get_token_from_header(authorization_header)
-        
-        # 驗證 JWT Token
-        payload = jwt_handler.verify(token)
-        
-        # 回傳使用者資訊
-        return {
-            "user_id": payload.get("sub"),
-            "roles": payload.get("roles", []),
-            "iat": payload.get("iat"),
-            "exp": payload.get("exp")
-        }
+        return authenticate_header(request.headers.get("Authorization"))
     
     def _get_request_info(self, request: Request) -> Dict[str, Any]:
         """
@@ -0,0 +1,195 @@
+"""
+compression.py - 回應壓縮中介軟體
+依 Accept-Encoding 以 brotli（已安裝時）或 gzip 壓縮回應，
+小於門檻的回應不壓縮；串流回應（NDJSON、SSE）逐區塊壓縮並立即送出
+"""
+
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
+from src.shared.api.compression import (
+    NO_BODY_STATUS_CODES,
+    StreamCompressor,
+    compress,
+    is_compressible,
+    negotiate_encoding,
+    weak_etag
+)
+
+
+class CompressionMiddleware:
+    """
+    回應壓縮中介軟體（純 ASGI）
+
+    - 已帶有 Content-Encoding 的回應（例如預先壓縮的 StaticResponse）直接送出
+    - 有 Content-Length 的回應：小於 minimum_size 不壓縮，否則收齊後一次壓縮
+    - 沒有 Content-Length 的串流回應：逐區塊壓縮並 flush
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: Optional[int] = None,
+        gzip_level: Optional[int] = None,
+        brotli_quality: Optional[int] = None
+    ):
+        """
+        初始化壓縮中介軟體
+
+        Args:
+            app: ASGI 應用程式
+            minimum_size: 壓縮門檻（位元組），預設取自 API 設定
+            gzip_level: gzip 壓縮等級，預設取自 API 設定
+            brotli_quality: brotli 壓縮等級，預設取自 API 設定
+        """
+        self.app = app
+        self.minimum_size = minimum_size if minimum_size is not None else settings.api.compression_min_size
+        self.levels = {
+            "gzip": gzip_level if gzip_level is not None else settings.api.compression_gzip_level,
+            "br": brotli_quality if brotli_quality is not None else settings.api.compression_brotli_quality
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        ASGI 進入點
+
+        Args:
+            scope: ASGI scope
+            receive: ASGI receive
+            send: ASGI send
+        """
+        if scope["type"] != "http" or scope.get("method") == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, encoding, self.levels[encoding], self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """單一回應的壓縮狀態"""
+
+    PASSTHROUGH = "passthrough"
+    BUFFER = "buffer"
+    STREAM = "stream"
+
+    def __init__(self, send: Send, encoding: str, level: int, minimum_size: int):
+        """
+        初始化
+
+        Args:
+            send: 原始的 ASGI send
+            encoding: 壓縮格式
+            level: 壓縮等級
+            minimum_size: 壓縮門檻（位元組）
+        """
+        self._send = send
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.start_message: Optional[Message] = None
+        self.mode: Optional[str] = None
+        self.buffer = bytearray()
+        self.compressor: Optional[StreamCompressor] = None
+
+    async def send(self, message: Message) -> None:
+        """
+        攔截回應訊息
+
+        Args:
+            message: ASGI 訊息
+        """
+        if message["type"] == "http.response.start":
+            # 等到第一個 body 訊息才能決定是否壓縮
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.mode is None:
+            self.mode = self._choose_mode(body, more_body)
+            if self.mode == self.PASSTHROUGH:
+                await self._send(self.start_message)
+            elif self.mode == self.STREAM:
+                self.compressor = StreamCompressor(self.encoding, self.level)
+                headers = self._compressed_headers()
+                del headers["Content-Length"]
+                await self._send(self.start_message)
+
+        if self.mode == self.PASSTHROUGH:
+            await self._send(message)
+
+        elif self.mode == self.BUFFER:
+            self.buffer.extend(body)
+            if not more_body:
+                compressed = compress(bytes(self.buffer), self.encoding, self.level)
+                headers = self._compressed_headers()
+                headers["Content-Length"] = str(len(compressed))
+                await self._send(self.start_message)
+                await self._send({"type": "http.response.body", "body": compressed})
+
+        elif self.mode == self.STREAM:
+            chunk = self.compressor.compress(body) if body else b""
+            if not more_body:
+                chunk += self.compressor.finish()
+            if chunk or not more_body:
+                await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    def _choose_mode(self, body: bytes, more_body: bool) -> str:
+        """
+        依回應 headers 與第一個區塊決定處理方式
+
+        Args:
+            body: 第一個區塊
+            more_body: 是否還有後續區塊
+
+        Returns:
+            PASSTHROUGH、BUFFER 或 STREAM
+        """
+        headers = Headers(raw=self.start_message["headers"])
+        status = self.start_message["status"]
+
+        if (
+            status < 200
+            or status in NO_BODY_STATUS_CODES
+            or "content-encoding" in headers
+            or not is_compressible(headers.get("content-type"))
+        ):
+            return self.PASSTHROUGH
+
+        content_length = headers.get("content-length")
+        if content_length is not None:
+            return self.BUFFER if int(content_length) >= self.minimum_size else self.PASSTHROUGH
+
+        if not more_body:
+            return self.BUFFER if len(body) >= self.minimum_size else self.PASSTHROUGH
+
+        return self.STREAM
+
+    def _compressed_headers(self) -> MutableHeaders:
+        """
+        設定壓縮後的回應 headers
+
+        Returns:
+            start 訊息的 headers
+        """
+        headers = MutableHeaders(scope=self.start_message)
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag:
+            headers["ETag"] = weak_etag(etag)
+        return headers
@@ -0,0 +1,165 @@
+"""
+limits.py - 請求限制中介軟體
+限制請求內容大小、請求處理期限與每次回應寫入的時間，
+避免過大或過慢的用戶端長時間佔用 worker 與資料庫連線
+"""
+
+import math
+from typing import Dict, Optional
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
+from src.core.context.deadline import set_deadline, reset_deadline
+from src.core.logger.logger import logger
+from src.shared.api.json_codec import FastJSONResponse
+from src.shared.errors.base_error.base_error import BaseError
+from src.shared.errors.system_error.payload_too_large_error import PayloadTooLargeError
+from src.shared.errors.system_error.timeout_error import RequestTimeoutException
+
+
+class RequestLimitsMiddleware:
+    """
+    請求限制中介軟體（純 ASGI）
+
+    - 請求內容：Content-Length 超過 max_request_size 直接回傳 413；
+      沒有 Content-Length（chunked）時邊接收邊計算，超過時立即回傳 413，不會先緩衝整個內容
+    - 處理期限：每個請求在 request_timeout 秒內（可依路徑覆寫）必須開始回應，否則回傳 504；
+      期限透過 contextvars 傳遞給資料庫（statement_timeout）與 AI 呼叫。
+      路由是 async def 並在事件迴圈上直接執行同步的資料庫與 bcrypt 呼叫，CancelScope 只能在 await 點取消，
+      同步呼叫中的期限由 check_deadline() 與 statement_timeout 負責；
+      交易寫入提交後期限即解除（release_deadline），已提交的請求不會回傳 504
+    - 回應寫入：回應開始後改由 response_timeout 限制每次寫入，讀取過慢的用戶端會被中斷
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_request_size: Optional[int] = None,
+        request_timeout: Optional[float] = None,
+        response_timeout: Optional[float] = None,
+        route_timeouts: Optional[Dict[str, float]] = None
+    ):
+        """
+        初始化請求限制中介軟體
+
+        Args:
+            app: ASGI 應用程式
+            max_request_size: 請求內容上限（位元組），預設取自 API 設定
+            request_timeout: 請求處理期限（秒），預設取自 API 設定
+            response_timeout: 每次回應寫入的期限（秒），預設取自 API 設定
+            route_timeouts: 依路徑前綴覆寫的處理期限（秒，0 表示不限制），預設取自 API 設定
+        """
+        self.app = app
+        self.max_request_size = max_request_size if max_request_size is not None else settings.api.max_request_size
+        self.request_timeout = request_timeout if request_timeout is not None else settings.api.request_timeout
+        self.response_timeout = response_timeout if response_timeout is not None else settings.api.response_timeout
+        self.route_timeouts = route_timeouts if route_timeouts is not None else settings.api.route_timeouts
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        ASGI 進入點
+
+        Args:
+            scope: ASGI scope
+            receive: ASGI receive
+            send: ASGI send
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_request_size:
+            await self._send_error(scope, receive, send, self._too_large_error())
+            return
+
+        timeout = self._timeout_for(scope["path"])
+        cancel_scope = anyio.CancelScope(deadline=anyio.current_time() + timeout if timeout else math.inf)
+        received = 0
+        response_started = False
+        rejected = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, rejected
+            message = await receive()
+            if message["type"] == "http.request" and not rejected:
+                received += len(message.get("body", b""))
+                if received > self.max_request_size and not response_started:
+                    # 立即回應 413，之後讓應用程式視為用戶端已斷線
+                    rejected = True
+                    await self._send_error(scope, receive, send, self._too_large_error())
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            if rejected:
+                # 已回傳 413，忽略應用程式之後的回應
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+                # 回應已開始，不再以處理期限取消，改由 response_timeout 限制每次寫入
+                cancel_scope.deadline = math.inf
+            with anyio.fail_after(self.response_timeout or math.inf):
+                await send(message)
+
+        token = set_deadline(timeout, cancel_scope)
+        try:
+            with cancel_scope:
+                await self.app(scope, limited_receive, guarded_send)
+        except TimeoutError:
+            logger.api_error("ResponseTimeout", f"{scope['method']} {scope['path']} - client too slow to read the response")
+            raise
+        except Exception:
+            if not rejected:
+                raise
+        finally:
+            reset_deadline(token)
+
+        if cancel_scope.cancel_called and not response_started:
+            logger.api_error("RequestTimeout", f"{scope['method']} {scope['path']} - exceeded {timeout}s")
+            await self._send_error(
+                scope, receive, send,
+                RequestTimeoutException(f"Request exceeded the {timeout:g}s deadline")
+            )
+
+    def _timeout_for(self, path: str) -> float:
+        """
+        取得路徑的處理期限（最長的前綴覆寫優先）
+
+        Args:
+            path: 請求路徑
+
+        Returns:
+            期限秒數，0 表示不限制
+        """
+        matched = None
+        for prefix in self.route_timeouts:
+            if (path == prefix or path.startswith(prefix.rstrip("/") + "/")) and (matched is None or len(prefix) > len(matched)):
+                matched = prefix
+        return self.route_timeouts[matched] if matched is not None else self.request_timeout
+
+    def _too_large_error(self) -> PayloadTooLargeError:
+        """建立請求內容過大錯誤"""
+        return PayloadTooLargeError(f"Request body exceeds {self.max_request_size} bytes")
+
+    @staticmethod
+    async def _send_error(scope: Scope, receive: Receive, send: Send, error: BaseError):
+        """
+        以統一格式回傳錯誤
+
+        Args:
+            scope: ASGI scope
+            receive: ASGI receive
+            send: ASGI send
+            error: 錯誤
+        """
+        response = FastJSONResponse(
+            status_code=error.status_code,
+            content=error.to_dict(),
+            headers={"Connection": "close"} if isinstance(error, PayloadTooLargeError) else None
+        )
+        await response(scope, receive, send)
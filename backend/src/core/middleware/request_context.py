@@ -0,0 +1,140 @@
+"""
+request_context.py - 請求上下文中介軟體
+為每個請求建立日誌上下文與 request id，請求結束時輸出一行存取日誌
+"""
+
+import hmac
+import re
+import time
+import uuid
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
+from src.core.context.request_context import SCOPE_KEY, start_request, end_request, get_request_context
+from src.core.db.query_budget import check_query_budget
+from src.core.diagnostics.profiler import request_profiler
+from src.core.logger.logger import logger
+from src.core.metrics.instruments import HTTP_REQUESTS, HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT
+
+REQUEST_ID_HEADER = "X-Request-ID"
+DB_QUERIES_HEADER = "X-DB-Queries"
+SERVER_TIMING_HEADER = "Server-Timing"
+SERVER_TIMING_TOKEN_HEADER = "X-Server-Timing-Token"
+ADMIN_ROLE = "admin"
+
+# 沿用用戶端或上游 proxy 傳入的 request id 時，只接受長度合理的英數字
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class RequestContextMiddleware:
+    """
+    請求上下文中介軟體（純 ASGI，放在最外層）
+
+    - request id：沿用 X-Request-ID header，沒有或格式不符時產生新的，並回傳在回應 header
+    - 請求處理期間各層的 api_info / api_error 累積到上下文，不各自輸出
+    - 回應送完（或處理失敗）時輸出一行存取日誌，包含狀態碼、總耗時與各階段耗時
+    - 同時記錄請求數、延遲分布與處理中的請求數指標（route 標籤為路由樣板，避免路徑參數造成標籤爆量）
+    - 請求結束時檢查 SQL 數量上限與 N+1；DB_QUERY_HEADERS 開啟時在回應 header 回傳回應開始前的 SQL 數量
+    - Server-Timing：回應開始時輸出目前為止的各階段耗時（API_SERVER_TIMING，或 admin 角色 / 除錯 token）
+    - 自動分析（API_AUTO_PROFILE_THRESHOLD_MS）：超過門檻的請求儲存取樣結果，存取日誌帶上 profile_id
+    """
+
+    def __init__(self, app: ASGIApp):
+        """
+        初始化請求上下文中介軟體
+
+        Args:
+            app: ASGI 應用程式
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        ASGI 進入點
+
+        Args:
+            scope: ASGI scope
+            receive: ASGI receive
+            send: ASGI send
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        request_id = request_headers.get(REQUEST_ID_HEADER)
+        if not request_id or not _VALID_REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+        timing_requested = settings.api.server_timing or _has_timing_token(request_headers)
+
+        token = start_request(request_id, scope["method"], scope["path"])
+        request_context = get_request_context()
+        scope[SCOPE_KEY] = request_context
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                request_context.status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers[REQUEST_ID_HEADER] = request_id
+                if settings.database.query_headers:
+                    headers[DB_QUERIES_HEADER] = str(request_context.counters.get("db_queries", 0))
+                if timing_requested or _is_admin(scope):
+                    headers.append(SERVER_TIMING_HEADER, request_context.server_timing())
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        if request_profiler.enabled:
+            request_profiler.track(request_context)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        except BaseException:
+            if request_context.status is None:
+                request_context.status = 500
+            raise
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            elapsed = time.perf_counter() - started
+            route = getattr(scope.get("route"), "path", None)
+            labels = (scope["method"], route or "unmatched", request_context.status)
+            HTTP_REQUESTS.inc(*labels)
+            HTTP_REQUEST_DURATION.observe(elapsed, *labels)
+            if route is not None:
+                check_query_budget(request_context, route)
+            if request_profiler.enabled:
+                request_context.bind(profile_id=request_profiler.finish(request_context, route, elapsed * 1000))
+            logger.access(request_context)
+            end_request(token)
+
+
+def _has_timing_token(headers: Headers) -> bool:
+    """
+    檢查請求是否帶有正確的 Server-Timing 除錯 token
+
+    Args:
+        headers: 請求 headers
+
+    Returns:
+        True 如果已設定 token 且相符
+    """
+    expected = settings.api.server_timing_token
+    provided = headers.get(SERVER_TIMING_TOKEN_HEADER)
+    if not expected or not provided:
+        return False
+    return hmac.compare_digest(provided.encode("utf-8"), expected.encode("utf-8"))
+
+
+def _is_admin(scope: Scope) -> bool:
+    """
+    檢查認證中介軟體是否已確認使用者為 admin 角色
+
+    Args:
+        scope: ASGI scope（request.state 保存在 scope["state"]）
+
+    Returns:
+        True 如果使用者具有 admin 角色
+    """
+    user_info = (scope.get("state") or {}).get("user")
+    return bool(user_info) and ADMIN_ROLE in (user_info.get("roles") or [])
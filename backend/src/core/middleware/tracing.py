@@ -0,0 +1,66 @@
+"""
+tracing.py - 追蹤中介軟體
+為每個請求建立 server span，沿用上游的 W3C traceparent，並把 trace id 寫入存取日誌
+"""
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.context.request_context import bind_request
+from src.core.tracing import SPAN_KIND_SERVER, TRACEPARENT_HEADER, parse_traceparent, tracer
+from src.core.tracing.tracer import STATUS_ERROR
+
+
+class TracingMiddleware:
+    """
+    追蹤中介軟體（純 ASGI，放在請求上下文中介軟體之內）
+
+    - 有合法的 traceparent 時成為上游 span 的子 span 並沿用取樣決定，否則開始新的 trace
+    - 認證、Use Case、Repository、SQL 等 span 都在這個 span 之下
+    - span 名稱在請求結束後改為「方法 路由樣板」（例如 GET /users/{user_id}），避免路徑參數讓名稱爆量
+    """
+
+    def __init__(self, app: ASGIApp):
+        """
+        初始化追蹤中介軟體
+
+        Args:
+            app: ASGI 應用程式
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        ASGI 進入點
+
+        Args:
+            scope: ASGI scope
+            receive: ASGI receive
+            send: ASGI send
+        """
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        parent = parse_traceparent(Headers(scope=scope).get(TRACEPARENT_HEADER))
+        attributes = {"http.method": method, "http.target": scope["path"]}
+
+        with tracer.span(method, SPAN_KIND_SERVER, attributes, parent=parent) as span:
+            if span.sampled:
+                bind_request(trace_id=span.trace_id)
+
+            async def send_with_status(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.status_code = STATUS_ERROR
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route is not None:
+                    span.name = f"{method} {route}"
+                    span.set_attribute("http.route", route)
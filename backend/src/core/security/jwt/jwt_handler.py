@@ -9,6 +9,7 @@ import os
 import time
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
+from src.core.metrics.instruments import JWT_VERIFICATIONS
 from src.shared.errors.system_error.auth_error import (
     MissingTokenError,
     InvalidTokenError,
@@ -97,10 +98,13 @@ class JWTHandler:
                 self.secret_key, 
                 algorithms=[self.algorithm]
             )
+            JWT_VERIFICATIONS.inc("valid")
             return payload
         except jwt.ExpiredSignatureError:
+            JWT_VERIFICATIONS.inc("expired")
             raise ExpiredTokenError("JWT token has expired")
         except jwt.InvalidTokenError:
+            JWT_VERIFICATIONS.inc("invalid")
             raise InvalidTokenError("Invalid JWT token")
     
     def verify(self, token: str) -> Dict[str, Any]:
@@ -119,6 +123,7 @@ class JWTHandler:
             ExpiredTokenError: Token 過期
         """
         if not token:
+            JWT_VERIFICATIONS.inc("missing")
             raise MissingTokenError("Missing Authorization header")
         
         return self.decode(token)
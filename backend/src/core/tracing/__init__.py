@@ -0,0 +1,34 @@
+"""
+core tracing - 分散式追蹤
+span 巢狀記錄（中介軟體、Use Case、Repository、SQL、外部呼叫），支援 W3C traceparent 傳遞、
+取樣，以 OTLP/JSON 匯出到檔案或 collector
+"""
+
+from .propagation import TRACEPARENT_HEADER, SpanContext, parse_traceparent, format_traceparent
+from .tracer import (
+    SPAN_KIND_INTERNAL,
+    SPAN_KIND_SERVER,
+    SPAN_KIND_CLIENT,
+    Span,
+    Tracer
+)
+from .exporters import BatchSpanProcessor, FileSpanExporter, OTLPHttpSpanExporter, encode_otlp
+from .provider import build_tracer, tracer
+
+__all__ = [
+    "TRACEPARENT_HEADER",
+    "SpanContext",
+    "parse_traceparent",
+    "format_traceparent",
+    "SPAN_KIND_INTERNAL",
+    "SPAN_KIND_SERVER",
+    "SPAN_KIND_CLIENT",
+    "Span",
+    "Tracer",
+    "BatchSpanProcessor",
+    "FileSpanExporter",
+    "OTLPHttpSpanExporter",
+    "encode_otlp",
+    "build_tracer",
+    "tracer"
+]
@@ -0,0 +1,77 @@
+"""
+collector.py - 本機 OTLP/HTTP collector 替身
+接收 POST /v1/traces 的 OTLP/JSON，逐行附加到檔案，供沒有 OpenTelemetry Collector 的開發環境使用
+
+執行：python -m src.core.tracing.collector --port 4318 --output logs/collector-traces.jsonl
+"""
+
+import argparse
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import orjson
+
+TRACES_PATH = "/v1/traces"
+
+
+def make_handler(output_path: str) -> type:
+    """
+    建立將收到的 trace 寫入檔案的 request handler
+
+    Args:
+        output_path: 輸出檔案路徑
+
+    Returns:
+        BaseHTTPRequestHandler 子類別
+    """
+
+    class TraceHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path != TRACES_PATH:
+                self.send_error(404)
+                return
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            try:
+                # 重新編碼成單行，確保每一行是一個完整的 ExportTraceServiceRequest
+                line = orjson.dumps(orjson.loads(body)) + b"\n"
+            except orjson.JSONDecodeError:
+                self.send_error(400, "Only OTLP/JSON is supported")
+                return
+            with open(output_path, "ab") as trace_file:
+                trace_file.write(line)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, format, *args):
+            # 不輸出每個請求的存取紀錄
+            pass
+
+    return TraceHandler
+
+
+def main():
+    """啟動 collector 替身"""
+    parser = argparse.ArgumentParser(description="Local OTLP/HTTP (JSON) trace collector stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4318)
+    parser.add_argument("--output", default="logs/collector-traces.jsonl")
+    args = parser.parse_args()
+
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.output))
+    print(f"Collecting traces on http://{args.host}:{args.port}{TRACES_PATH} -> {args.output}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
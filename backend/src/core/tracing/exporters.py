@@ -0,0 +1,245 @@
+"""
+exporters.py - span 匯出
+將 span 編碼為 OTLP/JSON（ExportTraceServiceRequest），寫入檔案或送到 OTLP/HTTP collector，
+由背景執行緒批次處理，請求處理路徑只把 span 放進佇列
+"""
+
+import os
+import queue
+import threading
+import time
+import urllib.request
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+from src.core.tracing.tracer import Span
+
+EXPORTER_FILE = "file"
+EXPORTER_OTLP = "otlp"
+
+SCOPE_NAME = "src.core.tracing"
+
+
+def encode_otlp(spans: List[Span], resource_attributes: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    編碼為 OTLP/JSON 的 ExportTraceServiceRequest
+
+    Args:
+        spans: 已結束的 span
+        resource_attributes: 資源屬性（例如 service.name）
+
+    Returns:
+        可序列化的 dict
+    """
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _encode_attributes(resource_attributes)},
+            "scopeSpans": [{
+                "scope": {"name": SCOPE_NAME},
+                "spans": [_encode_span(span) for span in spans]
+            }]
+        }]
+    }
+
+
+def _encode_span(span: Span) -> Dict[str, Any]:
+    """編碼單一 span（OTLP/JSON 的 ID 為十六進位字串，時間為字串形式的奈秒）"""
+    encoded = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": span.kind,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": _encode_attributes(span.attributes),
+        "status": {"code": span.status_code}
+    }
+    if span.parent_span_id:
+        encoded["parentSpanId"] = span.parent_span_id
+    if span.status_message:
+        encoded["status"]["message"] = span.status_message
+    if span.events:
+        encoded["events"] = [
+            {
+                "timeUnixNano": str(event["time_ns"]),
+                "name": event["name"],
+                "attributes": _encode_attributes(event["attributes"])
+            }
+            for event in span.events
+        ]
+    return encoded
+
+
+def _encode_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """編碼屬性為 OTLP 的 KeyValue 列表"""
+    return [{"key": key, "value": _encode_value(value)} for key, value in attributes.items()]
+
+
+def _encode_value(value: Any) -> Dict[str, Any]:
+    """編碼屬性值為 OTLP 的 AnyValue"""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class FileSpanExporter:
+    """每批 span 以一行 OTLP/JSON 附加到檔案（與 OpenTelemetry Collector 的 file exporter 格式相同）"""
+
+    def __init__(self, path: str, resource_attributes: Dict[str, Any]):
+        """
+        初始化檔案匯出器
+
+        Args:
+            path: 檔案路徑
+            resource_attributes: 資源屬性
+        """
+        self.path = path
+        self.resource_attributes = resource_attributes
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans: List[Span]):
+        """
+        寫入一批 span
+
+        Args:
+            spans: 已結束的 span
+        """
+        line = orjson.dumps(encode_otlp(spans, self.resource_attributes), default=str) + b"\n"
+        with open(self.path, "ab") as trace_file:
+            trace_file.write(line)
+
+
+class OTLPHttpSpanExporter:
+    """以 OTLP/HTTP（JSON 編碼）送到 collector 的 /v1/traces"""
+
+    def __init__(self, endpoint: str, resource_attributes: Dict[str, Any], timeout: float = 5.0):
+        """
+        初始化 OTLP/HTTP 匯出器
+
+        Args:
+            endpoint: collector 的 traces URL（例如 http://localhost:4318/v1/traces）
+            resource_attributes: 資源屬性
+            timeout: 每次送出的逾時（秒）
+        """
+        self.endpoint = endpoint
+        self.resource_attributes = resource_attributes
+        self.timeout = timeout
+
+    def export(self, spans: List[Span]):
+        """
+        送出一批 span
+
+        Args:
+            spans: 已結束的 span
+
+        Raises:
+            OSError: 連線失敗或 collector 回傳錯誤狀態
+        """
+        request = urllib.request.Request(
+            self.endpoint,
+            data=orjson.dumps(encode_otlp(spans, self.resource_attributes), default=str),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class BatchSpanProcessor:
+    """
+    批次 span 處理器
+
+    - on_end 只把 span 放進有上限的佇列，佇列滿時丟棄並計數（追蹤資料不應拖慢請求）
+    - 背景執行緒在第一個 span 進來後 flush_interval 秒，或累積 batch_size 筆時匯出一次
+    """
+
+    def __init__(self, exporter: Any, max_queue_size: int = 2048, batch_size: int = 512, flush_interval: float = 2.0):
+        """
+        初始化處理器並啟動匯出執行緒
+
+        Args:
+            exporter: 匯出器（需有 export(spans) 方法）
+            max_queue_size: 佇列上限
+            batch_size: 每次匯出的最大 span 數
+            flush_interval: 匯出間隔（秒）
+        """
+        self.exporter = exporter
+        self.queue: "queue.Queue[Optional[Span]]" = queue.Queue(maxsize=max_queue_size)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.failed = 0
+        self._worker = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._worker.start()
+
+    def on_end(self, span: Span):
+        """
+        接收已結束的 span
+
+        Args:
+            span: 已結束的取樣 span
+        """
+        try:
+            self.queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        取得處理器狀態
+
+        Returns:
+            queued（佇列中）、dropped（佇列滿丟棄）、failed（匯出失敗）的 span 數
+        """
+        return {"queued": self.queue.qsize(), "dropped": self.dropped, "failed": self.failed}
+
+    def shutdown(self):
+        """匯出剩餘的 span 並停止執行緒"""
+        self.queue.put(None)
+        self._worker.join(self.flush_interval + 5)
+
+    def _run(self):
+        """批次匯出迴圈"""
+        # 延遲導入：logger 在 span 匯出失敗時才需要
+        from src.core.logger.logger import logger
+
+        stopping = False
+        failing = False
+        while not stopping:
+            batch: List[Span] = []
+            try:
+                # 收到第一個 span 後最多再等 flush_interval 秒湊成一批
+                item = self.queue.get()
+                deadline = time.monotonic() + self.flush_interval
+                while True:
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+                    remaining = deadline - time.monotonic()
+                    if len(batch) >= self.batch_size or remaining <= 0:
+                        break
+                    item = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                pass
+
+            if not batch:
+                continue
+            try:
+                self.exporter.export(batch)
+                if failing:
+                    logger.infra_info("Span export recovered failed_spans=%s", self.failed)
+                failing = False
+            except Exception as e:
+                self.failed += len(batch)
+                # collector 停機時只在第一次失敗輸出，避免每個間隔都產生一筆警告
+                if not failing:
+                    logger.infra_warn("Span export failed spans=%s - %s", len(batch), e)
+                failing = True
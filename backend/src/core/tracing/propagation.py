@@ -0,0 +1,61 @@
+"""
+propagation.py - W3C Trace Context 傳遞
+解析與產生 traceparent header（version-trace_id-parent_id-flags）
+"""
+
+import re
+from typing import NamedTuple, Optional
+
+TRACEPARENT_HEADER = "traceparent"
+
+# 00-<32 hex trace id>-<16 hex span id>-<2 hex flags>（未來版本可能在後面加欄位）
+_TRACEPARENT = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})(-.*)?$")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+_SAMPLED_FLAG = 0x01
+
+
+class SpanContext(NamedTuple):
+    """跨行程傳遞的 span 識別資訊"""
+
+    trace_id: str
+    span_id: str
+    sampled: bool
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[SpanContext]:
+    """
+    解析 traceparent header
+
+    Args:
+        value: header 內容
+
+    Returns:
+        SpanContext，格式不符或 ID 全為 0 時為 None
+    """
+    if not value:
+        return None
+    match = _TRACEPARENT.match(value.strip().lower())
+    if match is None:
+        return None
+    version, trace_id, span_id, flags, rest = match.groups()
+    # ff 是保留的無效版本；00 版不允許後面有其他欄位
+    if version == "ff" or (version == "00" and rest):
+        return None
+    if trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+        return None
+    return SpanContext(trace_id, span_id, bool(int(flags, 16) & _SAMPLED_FLAG))
+
+
+def format_traceparent(span_context: SpanContext) -> str:
+    """
+    產生 traceparent header（用於呼叫下游服務）
+
+    Args:
+        span_context: 目前的 span 識別資訊
+
+    Returns:
+        header 內容
+    """
+    flags = _SAMPLED_FLAG if span_context.sampled else 0
+    return f"00-{span_context.trace_id}-{span_context.span_id}-{flags:02x}"
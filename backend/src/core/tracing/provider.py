@@ -0,0 +1,57 @@
+"""
+provider.py - 全域追蹤器
+依 APIConfig 的追蹤設定建立 Tracer 與匯出管線
+"""
+
+import atexit
+
+from src.core.config import settings
+from src.core.config.api_config import APIConfig
+from src.core.tracing.exporters import (
+    EXPORTER_FILE,
+    EXPORTER_OTLP,
+    BatchSpanProcessor,
+    FileSpanExporter,
+    OTLPHttpSpanExporter
+)
+from src.core.tracing.tracer import Tracer
+
+
+def build_tracer(config: APIConfig) -> Tracer:
+    """
+    建立追蹤器
+
+    Args:
+        config: API 設定
+
+    Returns:
+        Tracer（enable_tracing 為 False 時不建立匯出管線）
+
+    Raises:
+        ValueError: tracing_exporter 不是 file 或 otlp
+    """
+    if not config.enable_tracing:
+        return Tracer(enabled=False)
+
+    resource_attributes = {"service.name": config.tracing_service_name, "service.version": config.version_info}
+    if config.tracing_exporter == EXPORTER_FILE:
+        exporter = FileSpanExporter(config.tracing_file, resource_attributes)
+    elif config.tracing_exporter == EXPORTER_OTLP:
+        exporter = OTLPHttpSpanExporter(config.tracing_endpoint, resource_attributes)
+    else:
+        raise ValueError(
+            f"Unknown tracing exporter: {config.tracing_exporter} (allowed: {EXPORTER_FILE}, {EXPORTER_OTLP})"
+        )
+
+    processor = BatchSpanProcessor(
+        exporter,
+        max_queue_size=config.tracing_queue_size,
+        batch_size=config.tracing_batch_size,
+        flush_interval=config.tracing_flush_interval
+    )
+    # 結束時匯出佇列中的 span
+    atexit.register(processor.shutdown)
+    return Tracer(enabled=True, sample_ratio=config.tracing_sample_ratio, processor=processor)
+
+
+tracer = build_tracer(settings.api)
@@ -0,0 +1,321 @@
+"""
+tracer.py - 追蹤 span
+以 contextvars 保存目前的 span，巢狀的 span 自動成為子 span；
+複製到執行緒池（run_in_threadpool）或子 task 時沿用同一條 trace
+"""
+
+import functools
+import inspect
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from src.core.tracing.propagation import SpanContext
+
+# OTLP 的 span 種類
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+# OTLP 的狀態碼
+STATUS_UNSET = 0
+STATUS_ERROR = 2
+
+
+class Span:
+    """
+    單一 span
+
+    未取樣的 span 仍有 trace_id / span_id（供子 span 與下游沿用取樣決定），但不記錄屬性也不匯出
+    """
+
+    __slots__ = (
+        "tracer", "name", "trace_id", "span_id", "parent_span_id", "kind", "sampled",
+        "start_ns", "end_ns", "attributes", "events", "status_code", "status_message"
+    )
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        trace_id: str,
+        span_id: str,
+        parent_span_id: Optional[str],
+        kind: int,
+        sampled: bool,
+        start_ns: Optional[int] = None
+    ):
+        """
+        初始化 span
+
+        Args:
+            tracer: 所屬的 Tracer
+            name: 名稱
+            trace_id: trace ID（32 位十六進位）
+            span_id: span ID（16 位十六進位）
+            parent_span_id: 父 span ID，根 span 為 None
+            kind: span 種類
+            sampled: 是否取樣
+            start_ns: 開始時間（Unix 奈秒），None 表示現在
+        """
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_span_id = parent_span_id
+        self.kind = kind
+        self.sampled = sampled
+        self.start_ns = start_ns if start_ns is not None else time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = {}
+        self.events: List[Dict[str, Any]] = []
+        self.status_code = STATUS_UNSET
+        self.status_message = ""
+
+    @property
+    def context(self) -> SpanContext:
+        """span 識別資訊"""
+        return SpanContext(self.trace_id, self.span_id, self.sampled)
+
+    def set_attribute(self, key: str, value: Any):
+        """
+        設定屬性（None 值略過）
+
+        Args:
+            key: 屬性名稱
+            value: 屬性值
+        """
+        if self.sampled and value is not None:
+            self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException):
+        """
+        記錄例外並將狀態設為錯誤
+
+        Args:
+            exc: 例外
+        """
+        if not self.sampled:
+            return
+        self.status_code = STATUS_ERROR
+        self.status_message = type(exc).__name__
+        self.events.append({
+            "name": "exception",
+            "time_ns": time.time_ns(),
+            "attributes": {"exception.type": type(exc).__name__, "exception.message": str(exc)}
+        })
+
+    def end(self, end_ns: Optional[int] = None):
+        """
+        結束 span 並交給匯出（重複呼叫無效）
+
+        Args:
+            end_ns: 結束時間（Unix 奈秒），None 表示現在
+        """
+        if self.end_ns is not None:
+            return
+        self.end_ns = end_ns if end_ns is not None else time.time_ns()
+        if self.sampled:
+            self.tracer.on_end(self)
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    追蹤器
+
+    - 根 span 依 sample_ratio 取樣（以 trace_id 決定，同一條 trace 的結果一致）；
+      有上游 traceparent 或父 span 時沿用其取樣決定
+    - 結束的取樣 span 交給 processor（背景批次匯出）
+    - enabled 為 False 時 span() 直接 yield None，traced() 不包裝函式
+    """
+
+    def __init__(self, enabled: bool, sample_ratio: float = 1.0, processor: Any = None):
+        """
+        初始化追蹤器
+
+        Args:
+            enabled: 是否啟用
+            sample_ratio: 根 span 的取樣比例（0 到 1）
+            processor: 接收結束 span 的處理器（需有 on_end(span) 方法）
+        """
+        self.enabled = enabled
+        self.sample_ratio = sample_ratio
+        self.processor = processor
+
+    def current_span(self) -> Optional[Span]:
+        """
+        取得目前的 span
+
+        Returns:
+            Span，不在 span 中時為 None
+        """
+        return _current_span.get()
+
+    def start_span(
+        self,
+        name: str,
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Optional[SpanContext] = None,
+        start_ns: Optional[int] = None
+    ) -> Span:
+        """
+        建立 span（不設為目前的 span，需自行呼叫 end；未啟用時為不記錄的 span）
+
+        Args:
+            name: 名稱
+            kind: span 種類
+            attributes: 屬性
+            parent: 父 span（例如上游的 traceparent），None 表示目前的 span
+            start_ns: 開始時間（Unix 奈秒）
+
+        Returns:
+            Span
+        """
+        if parent is None:
+            current = _current_span.get()
+            parent = current.context if current is not None else None
+
+        if parent is None:
+            trace_id = os.urandom(16).hex()
+            sampled = int(trace_id[16:], 16) < self.sample_ratio * (1 << 64)
+            parent_span_id = None
+        else:
+            trace_id, parent_span_id, sampled = parent
+        # 未啟用時回傳不記錄的 span，呼叫端不需另外判斷
+        sampled = sampled and self.enabled
+
+        span = Span(self, name, trace_id, os.urandom(8).hex(), parent_span_id, kind, sampled, start_ns)
+        if attributes and sampled:
+            for key, value in attributes.items():
+                span.set_attribute(key, value)
+        return span
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Optional[SpanContext] = None
+    ) -> Iterator[Optional[Span]]:
+        """
+        在 span 中執行（期間設為目前的 span，例外會記錄後重新拋出）
+
+        Args:
+            name: 名稱
+            kind: span 種類
+            attributes: 屬性
+            parent: 父 span，None 表示目前的 span
+
+        Yields:
+            Span，未啟用時為 None
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        span = self.start_span(name, kind, attributes, parent)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def record_span(self, name: str, duration: float, attributes: Optional[Dict[str, Any]] = None):
+        """
+        補記一個剛結束的子 span（用於只能事後取得耗時的地方，例如領域層的 bcrypt）
+
+        Args:
+            name: 名稱
+            duration: 耗時（秒）
+            attributes: 屬性
+        """
+        if not self.enabled or _current_span.get() is None:
+            return
+        end_ns = time.time_ns()
+        span = self.start_span(name, attributes=attributes, start_ns=end_ns - int(duration * 1e9))
+        span.end(end_ns)
+
+    def on_end(self, span: Span):
+        """
+        span 結束時交給 processor
+
+        Args:
+            span: 已結束的取樣 span
+        """
+        if self.processor is not None:
+            self.processor.on_end(span)
+
+    def traced(self, name: Optional[str] = None, kind: int = SPAN_KIND_INTERNAL) -> Callable:
+        """
+        以 span 包裝函式的裝飾器（支援一般函式、async 函式與 generator）
+
+        Args:
+            name: span 名稱，None 表示使用函式的 __qualname__
+            kind: span 種類
+
+        Returns:
+            裝飾器
+        """
+        def decorator(func: Callable) -> Callable:
+            if not self.enabled:
+                return func
+            span_name = name or func.__qualname__
+
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(span_name, kind):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            if inspect.isgeneratorfunction(func):
+                @functools.wraps(func)
+                def generator_wrapper(*args, **kwargs):
+                    # generator 在呼叫端的 context 中逐步執行，不設為目前的 span，只記錄整個迭代的耗時
+                    span = self.start_span(span_name, kind)
+                    try:
+                        yield from func(*args, **kwargs)
+                    except BaseException as e:
+                        if not isinstance(e, GeneratorExit):
+                            span.record_exception(e)
+                        raise
+                    finally:
+                        span.end()
+                return generator_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name, kind):
+                    return func(*args, **kwargs)
+            return wrapper
+
+        return decorator
+
+    def traced_methods(self, cls: type) -> type:
+        """
+        以 span 包裝類別自身定義的所有公開方法的類別裝飾器
+
+        Args:
+            cls: 類別
+
+        Returns:
+            同一個類別
+        """
+        if not self.enabled:
+            return cls
+        for attribute, value in list(vars(cls).items()):
+            if attribute.startswith("_") or not inspect.isfunction(value):
+                continue
+            setattr(cls, attribute, self.traced(f"{cls.__name__}.{attribute}")(value))
+        return cls
@@ -10,6 +10,11 @@ from .responses import (
     combine_responses,
     get_swagger_jwt_example
 )
+from .streaming import ndjson_response, NDJSON_MEDIA_TYPE
+from .etag import make_etag, etag_matches, not_modified_response, apply_cache_headers
+from .fields import parse_fields
+from .json_codec import FastJSONResponse, FastJSONRoute, envelope, envelope_response
+from .static_responses import StaticResponse
 
 __all__ = [
     "api_response",
@@ -17,5 +22,17 @@ __all__ = [
     "success_response",
     "error_response",
     "combine_responses",
-    "get_swagger_jwt_example"
+    "get_swagger_jwt_example",
+    "ndjson_response",
+    "NDJSON_MEDIA_TYPE",
+    "make_etag",
+    "etag_matches",
+    "not_modified_response",
+    "apply_cache_headers",
+    "parse_fields",
+    "FastJSONResponse",
+    "FastJSONRoute",
+    "envelope",
+    "envelope_response",
+    "StaticResponse"
 ]
@@ -0,0 +1,399 @@
+"""
+admin.py - 管理端點
+GET/PUT /admin/logging：在執行期間查詢與調整日誌等級、日誌分類開關（僅限 admin 角色）
+GET/DELETE /admin/queries：查詢與清除 SQL fingerprint 統計
+GET /admin/profile、/admin/profiles：在目前的 worker 取樣分析，與查詢自動分析的慢請求
+"""
+
+from typing import Literal
+
+from fastapi import APIRouter, Query, Request, Response
+from starlette.concurrency import run_in_threadpool
+
+from src.core.config import settings
+from src.core.db.query_stats import query_stats
+from src.core.diagnostics.profiler import Profile, request_profiler, sampling_profiler
+from src.core.logger.logger import logger
+from src.shared.api.api_wrapper import api_response_with_logging
+from src.shared.api.json_codec import FastJSONRoute
+from src.shared.api.responses import success_response, error_response, combine_responses
+from src.shared.dto.admin_dto import (
+    LoggingStateDTO,
+    UpdateLoggingDTO,
+    QueryStatsDTO,
+    ProfileSummaryDTO,
+    StoredProfileListDTO
+)
+from src.shared.errors.app_error.conflict_error import ConflictError
+from src.shared.errors.app_error.forbidden_error import ForbiddenError
+from src.shared.errors.domain_error.not_found_error import NotFoundError
+from src.shared.errors.domain_error.validation_error import ValidationError
+from src.shared.errors.system_error.auth_error import MissingTokenError
+
+ADMIN_ROLE = "admin"
+
+LOGGING_STATE_EXAMPLE = {
+    "level": "INFO",
+    "categories": {"API": True, "DB": False, "Infra": True, "Access": True}
+}
+
+QUERY_STATS_EXAMPLE = {
+    "since": 1760000000.0,
+    "statements": 5400,
+    "slow_query_ms": 200,
+    "fingerprints": [
+        {
+            "fingerprint": "SELECT users.id, users.username FROM users WHERE users.id = ?",
+            "count": 1200,
+            "total_ms": 840.2,
+            "mean_ms": 0.7,
+            "p95_ms": 1.9,
+            "max_ms": 12.4,
+            "slow_count": 0,
+            "error_count": 0,
+            "sources": ["UserRepositoryImpl.find_by_id"]
+        }
+    ]
+}
+
+COLLAPSED_MEDIA_TYPE = "text/plain"
+
+COLLAPSED_EXAMPLE = (
+    "MainThread;Server.serve (uvicorn/server.py);...;BaseModel.model_validate (pydantic/main.py) 42\n"
+    "MainThread;Server.serve (uvicorn/server.py);...;Query.first (sqlalchemy/orm/query.py) 17\n"
+)
+
+PROFILE_SUMMARY_EXAMPLE = {
+    "started": 1760000000.0,
+    "duration_s": 10.0,
+    "interval_ms": 5.0,
+    "samples": 500,
+    "metadata": {},
+    "functions": [
+        {
+            "function": "PasswordHash.verify (src/contexts/user/domain/entities/value_objects.py)",
+            "self": 210,
+            "total": 210,
+            "self_pct": 42.0,
+            "total_pct": 42.0
+        }
+    ]
+}
+
+ProfileFormat = Literal["collapsed", "summary"]
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["管理"],
+    route_class=FastJSONRoute,
+    responses=combine_responses(
+        error_response(401, "MissingTokenError", "Missing Authorization header", "未提供認證 Token"),
+        error_response(403, "ForbiddenError", "Admin role required", "需要 admin 角色"),
+        error_response(500, "InternalServerError", "Internal server error", "內部伺服器錯誤")
+    )
+)
+
+
+def require_admin(request: Request):
+    """
+    確認目前使用者具有 admin 角色
+
+    Args:
+        request: FastAPI Request 物件
+
+    Raises:
+        MissingTokenError: 沒有使用者資訊
+        ForbiddenError: 使用者不是 admin
+    """
+    user_info = getattr(request.state, "user", None)
+    if not user_info:
+        raise MissingTokenError("Missing Authorization header")
+    if ADMIN_ROLE not in (user_info.get("roles") or []):
+        raise ForbiddenError("Admin role required")
+
+
+def require_metrics_access(request: Request):
+    """
+    確認請求可以讀取指標：帶有抓取 token（由認證中介軟體確認）或具有 admin 角色
+
+    Args:
+        request: FastAPI Request 物件
+
+    Raises:
+        MissingTokenError: 沒有使用者資訊
+        ForbiddenError: 使用者不是 admin
+    """
+    if getattr(request.state, "metrics_scraper", False):
+        return
+    require_admin(request)
+
+
+@router.get(
+    "/logging",
+    summary="查詢日誌設定",
+    description="取得目前的日誌等級與各日誌分類的開關",
+    response_description="返回日誌等級與分類開關",
+    responses=success_response(LOGGING_STATE_EXAMPLE, "成功取得日誌設定")
+)
+async def get_logging(request: Request):
+    """
+    查詢日誌設定
+
+    **認證要求**: 需要 admin 角色
+    """
+    try:
+        require_admin(request)
+        return api_response_with_logging(LoggingStateDTO(**logger.get_state()), request)
+
+    except Exception as e:
+        logger.api_error("GetLoggingError", str(e))
+        return api_response_with_logging(e, request)
+
+
+@router.put(
+    "/logging",
+    summary="調整日誌設定",
+    description="在執行期間調整日誌等級與日誌分類開關，不需重新啟動（只影響目前的 worker 行程）",
+    response_description="返回調整後的日誌設定",
+    responses=combine_responses(
+        success_response(LOGGING_STATE_EXAMPLE, "調整成功"),
+        error_response(422, "ValidationError", "Unknown log category: SQL (allowed: API, DB, Infra, Access)", "等級或分類無效")
+    )
+)
+async def update_logging(request: Request, input_dto: UpdateLoggingDTO):
+    """
+    調整日誌設定
+
+    - **level**: 日誌等級（可選）
+    - **categories**: 要調整的分類開關（可選），例如 `{"DB": false}` 關閉 DB 的 INFO/DEBUG 日誌；
+      關閉後 Repository 熱路徑不做任何字串處理
+
+    **認證要求**: 需要 admin 角色
+    """
+    try:
+        require_admin(request)
+
+        try:
+            # 先驗證全部內容再套用，避免只套用一部分
+            categories = input_dto.categories or {}
+            unknown = [category for category in categories if category not in logger.categories]
+            if unknown:
+                raise ValueError(
+                    f"Unknown log category: {', '.join(unknown)} (allowed: {', '.join(logger.categories)})"
+                )
+            if input_dto.level is not None:
+                logger.set_level(input_dto.level)
+            for category, enabled in categories.items():
+                logger.set_category(category, enabled)
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+        state = logger.get_state()
+        # 設定變更一律留下紀錄（WARN 不受分類開關影響）
+        logger.warn("Logging settings updated", context="API", level=state["level"], **state["categories"])
+        return api_response_with_logging(LoggingStateDTO(**state), request)
+
+    except Exception as e:
+        logger.api_error("UpdateLoggingError", str(e))
+        return api_response_with_logging(e, request)
+
+
+@router.get(
+    "/queries",
+    summary="查詢 SQL 統計",
+    description="依 fingerprint（字面值與參數換成 ? 的 SQL）取得執行次數、總耗時、p95 與來源 Repository 方法的前 N 名"
+                "（只包含目前的 worker 行程）",
+    response_description="返回 SQL 統計",
+    responses=success_response(QUERY_STATS_EXAMPLE, "成功取得 SQL 統計")
+)
+async def get_queries(
+    request: Request,
+    limit: int = Query(20, ge=1, le=500, description="回傳的 fingerprint 數量"),
+    sort: Literal["total_ms", "p95_ms", "max_ms", "count", "slow_count"] = Query("total_ms", description="排序欄位")
+):
+    """
+    查詢 SQL 統計
+
+    - **limit**: 回傳的 fingerprint 數量
+    - **sort**: 排序欄位（total_ms 找出最耗資料庫時間的查詢，p95_ms / max_ms 找出最慢的查詢）
+
+    **認證要求**: 需要 admin 角色
+    """
+    try:
+        require_admin(request)
+        return api_response_with_logging(QueryStatsDTO(**query_stats.top(limit, sort)), request)
+
+    except Exception as e:
+        logger.api_error("GetQueryStatsError", str(e))
+        return api_response_with_logging(e, request)
+
+
+@router.delete(
+    "/queries",
+    summary="清除 SQL 統計",
+    description="清除目前 worker 行程的 SQL 統計，重新開始累計（例如部署或調整索引之後）",
+    response_description="返回清除後的 SQL 統計",
+    responses=success_response({**QUERY_STATS_EXAMPLE, "statements": 0, "fingerprints": []}, "清除成功")
+)
+async def reset_queries(request: Request):
+    """
+    清除 SQL 統計
+
+    **認證要求**: 需要 admin 角色
+    """
+    try:
+        require_admin(request)
+        query_stats.reset()
+        logger.warn("Query stats reset", context="API")
+        return api_response_with_logging(QueryStatsDTO(**query_stats.top()), request)
+
+    except Exception as e:
+        logger.api_error("ResetQueryStatsError", str(e))
+        return api_response_with_logging(e, request)
+
+
+def profile_response(profile: Profile, output_format: str, limit: int, request: Request, filename: str) -> Response:
+    """
+    輸出分析結果
+
+    Args:
+        profile: 分析結果
+        output_format: collapsed（火焰圖工具的輸入檔）或 summary（依函式彙整的 JSON）
+        limit: summary 回傳的函式數量
+        request: FastAPI Request 物件
+        filename: collapsed 的下載檔名
+
+    Returns:
+        Response
+    """
+    if output_format == "summary":
+        return api_response_with_logging(ProfileSummaryDTO(**profile.summary(limit)), request)
+    return Response(
+        profile.collapsed(),
+        media_type=COLLAPSED_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"}
+    )
+
+
+@router.get(
+    "/profile",
+    summary="取樣分析",
+    description="在處理這個請求的 worker 行程取樣所有執行緒的堆疊 N 秒（期間照常處理其他請求），"
+                "回傳 collapsed stacks（flamegraph.pl、speedscope、inferno 可直接產生火焰圖）或依函式彙整的摘要",
+    response_description="返回 collapsed stacks 或分析摘要",
+    responses=combine_responses(
+        {200: {"description": "collapsed stacks（format=collapsed）", "content": {"text/plain": {"example": COLLAPSED_EXAMPLE}}}},
+        success_response(PROFILE_SUMMARY_EXAMPLE, "分析摘要（format=summary）"),
+        error_response(409, "ConflictError", "A profile is already running in this worker", "目前的 worker 已有分析正在進行")
+    )
+)
+async def get_profile(
+    request: Request,
+    seconds: float = Query(10, gt=0, le=settings.api.profile_max_seconds, description="分析秒數"),
+    interval_ms: float = Query(settings.api.profile_interval_ms, ge=1, le=1000, description="取樣間隔（毫秒）"),
+    format: ProfileFormat = Query("collapsed", description="輸出格式"),
+    limit: int = Query(30, ge=1, le=500, description="summary 回傳的函式數量")
+):
+    """
+    取樣分析
+
+    - **seconds**: 分析秒數（上限 API_PROFILE_MAX_SECONDS）
+    - **interval_ms**: 取樣間隔，越短越精確但額外負擔越高
+    - **format**: `collapsed` 下載火焰圖工具的輸入檔，`summary` 回傳 self / total 樣本數最多的函式
+      （例如 pydantic 驗證、JSON 編碼、日誌格式化或 SQLAlchemy ORM 各佔多少時間）
+
+    多個 worker 時只分析處理這個請求的 worker；閒置等待中的執行緒不計入樣本
+
+    **認證要求**: 需要 admin 角色
+    """
+    try:
+        require_admin(request)
+        logger.warn("Profiling started", context="API", seconds=seconds, interval_ms=interval_ms)
+        try:
+            profile = await sampling_profiler.profile(seconds, interval_ms / 1000)
+        except RuntimeError as e:
+            raise ConflictError(str(e))
+        return profile_response(profile, format, limit, request, f"profile-{int(profile.started)}.collapsed")
+
+    except Exception as e:
+        logger.api_error("ProfileError", str(e))
+        return api_response_with_logging(e, request)
+
+
+@router.get(
+    "/profiles",
+    summary="查詢自動分析結果",
+    description="列出超過 API_AUTO_PROFILE_THRESHOLD_MS 而自動分析的請求（所有 worker 共用 API_PROFILE_DIR）",
+    response_description="返回自動分析結果列表",
+    responses=success_response(
+        {
+            "threshold_ms": 500,
+            "profiles": [
+                {
+                    "id": "1760000000000-4242-3f2a9c",
+                    "started": 1760000000.0,
+                    "duration": 1.2,
+                    "samples": 120,
+                    "metadata": {"request_id": "3f2a9c", "method": "POST", "path": "/users/login",
+                                 "route": "/users/login", "status": 200}
+                }
+            ]
+        },
+        "成功取得自動分析結果"
+    )
+)
+async def list_profiles(request: Request):
+    """
+    查詢自動分析結果
+
+    **認證要求**: 需要 admin 角色
+    """
+    try:
+        require_admin(request)
+        # 讀取目錄中的每個檔案，不在事件迴圈執行
+        profiles = await run_in_threadpool(request_profiler.store.list)
+        return api_response_with_logging(
+            StoredProfileListDTO(threshold_ms=request_profiler.threshold_ms, profiles=profiles),
+            request
+        )
+
+    except Exception as e:
+        logger.api_error("ListProfilesError", str(e))
+        return api_response_with_logging(e, request)
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    summary="取得自動分析結果",
+    description="取得一個自動分析結果的 collapsed stacks 或依函式彙整的摘要",
+    response_description="返回 collapsed stacks 或分析摘要",
+    responses=combine_responses(
+        {200: {"description": "collapsed stacks（format=collapsed）", "content": {"text/plain": {"example": COLLAPSED_EXAMPLE}}}},
+        success_response(PROFILE_SUMMARY_EXAMPLE, "分析摘要（format=summary）"),
+        error_response(404, "NotFoundError", "Profile not found: 1760000000000-4242-3f2a9c", "分析結果不存在")
+    )
+)
+async def get_stored_profile(
+    request: Request,
+    profile_id: str,
+    format: ProfileFormat = Query("collapsed", description="輸出格式"),
+    limit: int = Query(30, ge=1, le=500, description="summary 回傳的函式數量")
+):
+    """
+    取得自動分析結果
+
+    - **profile_id**: GET /admin/profiles 回傳的 ID
+    - **format**: `collapsed` 或 `summary`
+
+    **認證要求**: 需要 admin 角色
+    """
+    try:
+        require_admin(request)
+        profile = await run_in_threadpool(request_profiler.store.get, profile_id)
+        if profile is None:
+            raise NotFoundError(f"Profile not found: {profile_id}")
+        return profile_response(profile, format, limit, request, f"profile-{profile_id}.collapsed")
+
+    except Exception as e:
+        logger.api_error("GetProfileError", str(e))
+        return api_response_with_logging(e, request)
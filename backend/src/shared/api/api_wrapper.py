@@ -4,9 +4,10 @@ api_wrapper.py - API 回應包裝器
 """
 
 from typing import Any, Dict, Tuple, Optional
-from fastapi import Request
+from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 
+from src.shared.api.json_codec import FastJSONResponse, envelope_response
 from src.shared.errors.base_error.base_error import BaseError
 from src.shared.errors.domain_error.domain_error import DomainError
 from src.shared.errors.app_error.app_error import AppError
@@ -45,7 +46,7 @@ class APIResponse:
     
     def to_json_response(self) -> JSONResponse:
         """轉換為 FastAPI JSONResponse"""
-        return JSONResponse(
+        return FastJSONResponse(
             content=self.to_dict(),
             status_code=self.status_code
         )
@@ -139,16 +140,26 @@ def api_response(result: Any, request: Optional[Request] = None) -> Tuple[Dict[s
         return response_data, 200
 
 
-def api_response_with_logging(result: Any, request: Request) -> JSONResponse:
+def api_response_with_logging(
+    result: Any,
+    request: Request,
+    include: Any = None,
+    exclude: Any = None
+) -> Response:
     """
     帶日誌記錄的 API 回應包裝器（FastAPI 專用）
     
+    Pydantic 模型直接以 model_dump_json 序列化進回應格式，不經過中間的 dict；
+    其他資料以 orjson 編碼
+    
     Args:
         result: Use Case 執行結果或異常
         request: FastAPI Request 物件
+        include: 只輸出這些欄位（僅 Pydantic 模型適用，同 model_dump 的 include）
+        exclude: 不輸出這些欄位（僅 Pydantic 模型適用，同 model_dump 的 exclude）
         
     Returns:
-        JSONResponse: FastAPI JSONResponse 物件
+        Response: JSON 回應
     """
     # 記錄 API 進入日誌
     user_id = getattr(request.state, 'user_id', None)
@@ -169,15 +180,12 @@ def api_response_with_logging(result: Any, request: Request) -> JSONResponse:
         )
         
         # 錯誤回應
-        response_data = {
-            "data": None,
-            "error": {
-                "code": result.code,
-                "message": result.message if hasattr(result, 'message') else str(result)
-            }
+        error = {
+            "code": result.code,
+            "message": result.message if hasattr(result, 'message') else str(result)
         }
         
-        return JSONResponse(content=response_data, status_code=result.status_code)
+        return envelope_response(error=error, status_code=result.status_code)
     
     elif isinstance(result, Exception):
         # 記錄未預期錯誤日誌
@@ -189,35 +197,26 @@ def api_response_with_logging(result: Any, request: Request) -> JSONResponse:
         )
         
         # 未預期錯誤回應
-        response_data = {
-            "data": None,
-            "error": {
-                "code": "InternalServerError",
-                "message": "Internal server error"
-            }
+        error = {
+            "code": "InternalServerError",
+            "message": "Internal server error"
         }
         
-        return JSONResponse(content=response_data, status_code=500)
+        return envelope_response(error=error, status_code=500)
     
     else:
         # 成功回應
-        # 如果 result 是 Pydantic 模型，轉換為字典
-        if hasattr(result, 'model_dump'):
-            # Pydantic v2
-            data = result.model_dump()
+        if hasattr(result, 'model_dump_json'):
+            # Pydantic v2：直接序列化為 JSON
+            return envelope_response(result, include=include, exclude=exclude)
         elif hasattr(result, 'dict'):
             # Pydantic v1
-            data = result.dict()
+            data = result.dict(include=include, exclude=exclude)
         else:
             # 其他類型直接使用
             data = result
-            
-        response_data = {
-            "data": data,
-            "error": None
-        }
         
-        return JSONResponse(content=response_data, status_code=200)
+        return envelope_response(data)
 
 
 def handle_domain_error(error: DomainError, request: Optional[Request] = None) -> Tuple[Dict[str, Any], int]:
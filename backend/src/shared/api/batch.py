@@ -0,0 +1,362 @@
+"""
+batch.py - 批次請求端點
+POST /batch：一次 HTTP 請求執行多個子請求，減少行動網路上的往返次數
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+import anyio
+from fastapi import APIRouter, FastAPI, Request
+from starlette.middleware.exceptions import ExceptionMiddleware
+
+from src.core.config import settings
+from src.core.context.request_context import sub_request_context
+from src.core.logger.logger import logger
+from src.core.middleware.auth import is_excluded_path, authenticate_header
+from src.shared.api.api_wrapper import api_response_with_logging
+from src.shared.api.json_codec import FastJSONRoute, dumps, loads
+from src.shared.api.responses import success_response, error_response, combine_responses
+from src.shared.dto.batch_dto import (
+    BatchSubRequestDTO,
+    BatchRequestDTO,
+    BatchSubResponseDTO,
+    BatchResponseDTO
+)
+from src.shared.errors.domain_error.validation_error import ValidationError
+from src.shared.errors.system_error.auth_error import AuthError, MissingTokenError
+
+
+# 不允許在批次中呼叫的路徑（精確匹配或前綴匹配）：
+# 巢狀批次、串流回應、非 JSON 的文件與指標端點，以及管理端點（例如取樣分析會佔住批次的處理期限）
+BATCH_EXCLUDED_PATHS = [
+    "/batch",
+    "/users/export",
+    "/admin",
+    settings.api.metrics_url,
+    settings.api.openapi_url,
+    settings.api.docs_url,
+    settings.api.redoc_url
+]
+
+
+router = APIRouter(
+    tags=["批次請求"],
+    route_class=FastJSONRoute,
+    responses=error_response(500, "InternalServerError", "Internal server error", "內部伺服器錯誤")
+)
+
+
+class BatchDispatcher:
+    """
+    子請求分派器
+
+    子請求直接交給應用程式的路由器處理，不再經過 CORS、認證等中介軟體：
+    - 認證只在 /batch 進行一次，結果放進每個子請求的 request.state.user
+    - 路由的例外處理器（HTTPException、RequestValidationError）仍然生效
+    - 子請求以 task 在目前的事件迴圈中執行（depends_on 的子請求等待前者完成），進行中的數量以 batch_max_concurrency 限制
+    - 路由中的 DB 與 bcrypt 為同步呼叫，子請求只會在 await 點（例如外部 AI 呼叫）交錯，實際上大致依序執行：
+      批次節省的是往返次數與重複的 JWT 驗證，不會縮短子請求本身的處理時間
+    - 每個子請求有自己的日誌上下文（見 sub_request_context），欄位不會覆寫 /batch 的存取日誌，耗時與 SQL 數量仍記入 /batch
+    """
+
+    def __init__(self, app: FastAPI, max_concurrency: int):
+        """
+        初始化分派器
+
+        Args:
+            app: FastAPI 應用程式實例
+            max_concurrency: 進行中的子請求上限
+        """
+        self.app = app
+        self.dispatch_app = ExceptionMiddleware(
+            app.router,
+            handlers={
+                key: handler for key, handler in app.exception_handlers.items()
+                if key not in (500, Exception)
+            }
+        )
+        self.limiter = anyio.CapacityLimiter(max(1, max_concurrency))
+
+    async def run(
+        self,
+        request: Request,
+        sub_requests: List[BatchSubRequestDTO],
+        user_info: Optional[Dict[str, Any]],
+        auth_error: Optional[AuthError]
+    ) -> List[BatchSubResponseDTO]:
+        """
+        執行所有子請求
+
+        Args:
+            request: 外層的 /batch 請求
+            sub_requests: 子請求列表
+            user_info: 認證成功時的使用者資訊
+            auth_error: 認證失敗時的錯誤
+
+        Returns:
+            子請求結果（順序與請求相同）
+        """
+        results: List[Optional[BatchSubResponseDTO]] = [None] * len(sub_requests)
+        finished = [asyncio.Event() for _ in sub_requests]
+
+        async def run_one(index: int, sub_request: BatchSubRequestDTO):
+            try:
+                for dependency in sub_request.depends_on:
+                    await finished[dependency].wait()
+
+                failed = [
+                    dependency for dependency in sub_request.depends_on
+                    if results[dependency] is None or results[dependency].status >= 400
+                ]
+                if failed:
+                    results[index] = BatchSubResponseDTO(
+                        status=424,
+                        error={
+                            "code": "FailedDependencyError",
+                            "message": f"Dependent request(s) failed: {failed}",
+                            "details": None
+                        }
+                    )
+                else:
+                    results[index] = await self._dispatch(request, sub_request, user_info, auth_error)
+            finally:
+                finished[index].set()
+
+        await asyncio.gather(*(run_one(index, sub_request) for index, sub_request in enumerate(sub_requests)))
+        return results
+
+    async def _dispatch(
+        self,
+        request: Request,
+        sub_request: BatchSubRequestDTO,
+        user_info: Optional[Dict[str, Any]],
+        auth_error: Optional[AuthError]
+    ) -> BatchSubResponseDTO:
+        """
+        執行單一子請求
+
+        Args:
+            request: 外層的 /batch 請求
+            sub_request: 子請求
+            user_info: 認證成功時的使用者資訊
+            auth_error: 認證失敗時的錯誤
+
+        Returns:
+            子請求結果
+        """
+        path, _, query_string = sub_request.path.partition("?")
+
+        if not is_excluded_path(path):
+            error = auth_error or (None if user_info else MissingTokenError("Missing Authorization header"))
+            if error is not None:
+                return BatchSubResponseDTO(status=error.status_code, error=error.to_dict()["error"])
+
+        body = b"" if sub_request.body is None else dumps(sub_request.body)
+        headers = [(b"content-length", str(len(body)).encode("latin-1"))]
+        if body:
+            headers.append((b"content-type", b"application/json"))
+        authorization = request.headers.get("Authorization")
+        if authorization:
+            headers.append((b"authorization", authorization.encode("latin-1")))
+
+        scope = {
+            "type": "http",
+            "asgi": request.scope.get("asgi", {"version": "3.0"}),
+            "http_version": request.scope.get("http_version", "1.1"),
+            "method": sub_request.method,
+            "scheme": request.scope.get("scheme", "http"),
+            "server": request.scope.get("server"),
+            "client": request.scope.get("client"),
+            "root_path": request.scope.get("root_path", ""),
+            "path": path,
+            "raw_path": path.encode("utf-8"),
+            "query_string": query_string.encode("utf-8"),
+            "headers": headers,
+            "app": self.app,
+            "state": {"user": user_info} if user_info else {}
+        }
+
+        async with self.limiter:
+            with sub_request_context():
+                status, response_body = await self._call(scope, body)
+
+        return self._to_sub_response(status, response_body)
+
+    async def _call(self, scope: Dict[str, Any], body: bytes) -> Tuple[int, bytes]:
+        """
+        以 ASGI 介面呼叫路由器並收集回應
+
+        Args:
+            scope: 子請求的 ASGI scope
+            body: 請求內容
+
+        Returns:
+            (HTTP 狀態碼, 回應內容)
+        """
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+        status = 500
+        chunks: List[bytes] = []
+
+        async def receive():
+            return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        try:
+            await self.dispatch_app(scope, receive, send)
+        except Exception as e:
+            logger.api_error("BatchSubRequestError", f"{scope['method']} {scope['path']} - {type(e).__name__}: {e}")
+            return 500, b""
+
+        return status, b"".join(chunks)
+
+    @staticmethod
+    def _to_sub_response(status: int, body: bytes) -> BatchSubResponseDTO:
+        """
+        將子請求的回應轉換為統一格式
+
+        Args:
+            status: HTTP 狀態碼
+            body: 回應內容
+
+        Returns:
+            子請求結果
+        """
+        try:
+            payload = loads(body) if body else None
+        except ValueError:
+            payload = body.decode("utf-8", errors="replace")
+
+        # 一般路由已回傳 {"data", "error"} 格式
+        if isinstance(payload, dict) and set(payload) == {"data", "error"}:
+            return BatchSubResponseDTO(status=status, data=payload["data"], error=payload["error"])
+
+        if status >= 500:
+            return BatchSubResponseDTO(
+                status=status,
+                error={"code": "InternalServerError", "message": "Internal server error", "details": None}
+            )
+
+        if status >= 400:
+            # FastAPI 預設的例外處理器回傳 {"detail": ...}
+            detail = payload.get("detail") if isinstance(payload, dict) else payload
+            code, message = ("ValidationError", "Invalid input data") if status == 422 else ("HTTPError", "Request failed")
+            return BatchSubResponseDTO(
+                status=status,
+                error={
+                    "code": code,
+                    "message": detail if isinstance(detail, str) else message,
+                    "details": None if isinstance(detail, str) else {"detail": detail}
+                }
+            )
+
+        return BatchSubResponseDTO(status=status, data=payload)
+
+
+def get_batch_dispatcher(app: FastAPI) -> BatchDispatcher:
+    """
+    取得應用程式的子請求分派器（第一次使用時建立）
+
+    Args:
+        app: FastAPI 應用程式實例
+
+    Returns:
+        BatchDispatcher
+    """
+    dispatcher = getattr(app.state, "batch_dispatcher", None)
+    if dispatcher is None:
+        dispatcher = BatchDispatcher(app, settings.api.batch_max_concurrency)
+        app.state.batch_dispatcher = dispatcher
+    return dispatcher
+
+
+def _validate_batch(input_dto: BatchRequestDTO):
+    """
+    驗證批次請求
+
+    Args:
+        input_dto: 批次請求輸入 DTO
+
+    Raises:
+        ValidationError: 子請求數量、路徑或相依關係無效
+    """
+    if not input_dto.requests:
+        raise ValidationError("requests must not be empty")
+    if len(input_dto.requests) > settings.api.batch_max_requests:
+        raise ValidationError(f"Too many requests, maximum is {settings.api.batch_max_requests}")
+
+    for index, sub_request in enumerate(input_dto.requests):
+        path = sub_request.path.partition("?")[0]
+        if not path.startswith("/"):
+            raise ValidationError(f"requests[{index}].path must start with '/'")
+        if is_excluded_path(path, BATCH_EXCLUDED_PATHS):
+            raise ValidationError(f"requests[{index}].path {path} is not allowed in a batch")
+        if any(dependency < 0 or dependency >= index for dependency in sub_request.depends_on):
+            raise ValidationError(f"requests[{index}].depends_on must reference earlier requests")
+
+
+@router.post(
+    "/batch",
+    summary="批次請求",
+    description="一次 HTTP 往返執行多個子請求，只認證一次；子請求在伺服器端大致依序處理，節省的是往返次數",
+    response_description="依請求順序返回每個子請求的狀態碼與 {data, error}",
+    responses=combine_responses(
+        success_response(
+            {
+                "responses": [
+                    {"status": 200, "data": {"id": 1, "username": "alice", "email": "alice@example.com"}, "error": None},
+                    {
+                        "status": 404,
+                        "data": None,
+                        "error": {"code": "UserNotFoundError", "message": "User with id 999 not found", "details": None}
+                    }
+                ]
+            },
+            "批次執行完成（各子請求的結果需個別檢查 status）"
+        ),
+        error_response(422, "ValidationError", "Too many requests, maximum is 20", "批次請求格式錯誤")
+    )
+)
+async def batch(request: Request, input_dto: BatchRequestDTO):
+    """
+    批次請求
+
+    在一次 HTTP 往返中執行多個 API 呼叫，例如 App 啟動時一次取得 `/users/me` 與其他資料。
+    子請求在伺服器端大致依序處理（DB 與密碼雜湊為同步呼叫），總耗時約為各子請求耗時的總和，節省的是網路往返。
+
+    - **requests**: 子請求列表（最多 `API_BATCH_MAX_REQUESTS` 個）
+      - **method**: HTTP 方法
+      - **path**: 路徑，可含查詢字串
+      - **body**: JSON 請求內容（可選）
+      - **depends_on**: 必須先成功完成的子請求索引（可選），相依的子請求失敗時回傳 424
+
+    **認證**: Authorization header 只驗證一次；需要認證的子請求在驗證失敗時各自回傳 401，
+    `/users/login`、`/users/register` 等公開端點不受影響。
+    """
+    try:
+        logger.api_info("POST", "/batch", count=str(len(input_dto.requests)))
+
+        _validate_batch(input_dto)
+
+        # 只驗證一次 JWT
+        user_info, auth_error = None, None
+        authorization = request.headers.get("Authorization")
+        if authorization:
+            try:
+                user_info = authenticate_header(authorization)
+            except AuthError as e:
+                auth_error = e
+
+        responses = await get_batch_dispatcher(request.app).run(request, input_dto.requests, user_info, auth_error)
+
+        return api_response_with_logging(BatchResponseDTO(responses=responses), request)
+
+    except Exception as e:
+        logger.api_error("BatchError", str(e))
+        return api_response_with_logging(e, request)
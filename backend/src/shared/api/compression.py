@@ -0,0 +1,168 @@
+"""
+compression.py - 回應壓縮工具
+Accept-Encoding 協商、brotli（已安裝時）/ gzip 壓縮與串流壓縮器
+"""
+
+import zlib
+from typing import Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli 為選用依賴，未安裝時只使用 gzip
+    brotli = None
+
+
+# 可壓縮的 Content-Type（前綴比對），另外所有 +json / +xml 類型也會壓縮
+COMPRESSIBLE_MEDIA_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml"
+)
+
+# 不壓縮的狀態碼（沒有內容）
+NO_BODY_STATUS_CODES = (204, 304)
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """
+    伺服器支援的壓縮格式（依偏好排序）
+
+    Returns:
+        壓縮格式列表
+    """
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    依 Accept-Encoding 選擇壓縮格式
+
+    選擇 q 值最高的格式，q 值相同時偏好 brotli；q=0 表示不接受
+
+    Args:
+        accept_encoding: Accept-Encoding header
+
+    Returns:
+        "br"、"gzip"，或 None（不壓縮）
+    """
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            weights[coding] = quality
+
+    best, best_quality = None, 0.0
+    for coding in supported_encodings():
+        quality = weights.get(coding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    """
+    檢查 Content-Type 是否值得壓縮
+
+    Args:
+        content_type: Content-Type header
+
+    Returns:
+        是否可壓縮
+    """
+    if not content_type:
+        return False
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith(COMPRESSIBLE_MEDIA_TYPES) or media_type.endswith(("+json", "+xml"))
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    """
+    壓縮完整的回應內容
+
+    Args:
+        body: 回應內容
+        encoding: "br" 或 "gzip"
+        level: 壓縮等級（brotli quality 或 gzip level）
+
+    Returns:
+        壓縮後的內容
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(body) + compressor.flush()
+
+
+def weak_etag(etag: str) -> str:
+    """
+    將 ETag 轉為弱 ETag（壓縮後的內容與原始內容不是同一份位元組）
+
+    Args:
+        etag: ETag
+
+    Returns:
+        弱 ETag
+    """
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+class StreamCompressor:
+    """
+    串流壓縮器
+
+    每個區塊壓縮後立即 flush，用戶端收到每個區塊時都能完整解壓縮
+    （NDJSON 的每一行、SSE 的每個事件不會卡在壓縮緩衝區）
+    """
+
+    def __init__(self, encoding: str, level: int):
+        """
+        初始化串流壓縮器
+
+        Args:
+            encoding: "br" 或 "gzip"
+            level: 壓縮等級
+        """
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=level)
+        else:
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        """
+        壓縮一個區塊並 flush
+
+        Args:
+            chunk: 原始區塊
+
+        Returns:
+            壓縮後的區塊
+        """
+        if self.encoding == "br":
+            return self._compressor.process(chunk) + self._compressor.flush()
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        """
+        結束壓縮串流
+
+        Returns:
+            剩餘的壓縮資料
+        """
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
@@ -0,0 +1,108 @@
+"""
+etag.py - 條件式請求工具
+產生強 ETag、比對 If-None-Match，並回傳 304 Not Modified
+"""
+
+import re
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+from src.core.metrics.instruments import HTTP_CONDITIONAL_REQUESTS
+
+NOT_MODIFIED_STATUS = 304
+
+# If-None-Match 中的一個 entity-tag（引號內可以有 ','，例如 "user[id,email]-1-..."）
+_ENTITY_TAG = re.compile(r'(?:W/)?("[^"]*")')
+
+
+def make_etag(resource: str, resource_id: Any, version: datetime) -> str:
+    """
+    以資源版本產生強 ETag
+
+    版本來自資料列的 updated_at，任何欄位變更都會更新版本；
+    resource 區分同一筆資料的不同表示（例如 /users/{id} 與 /users/me）
+
+    Args:
+        resource: 表示方式名稱
+        resource_id: 資源 ID
+        version: 資源版本（updated_at）
+
+    Returns:
+        ETag 字串（含雙引號）
+    """
+    micros = int(version.timestamp() * 1_000_000)
+    return f'"{resource}-{resource_id}-{micros:x}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    檢查請求的 If-None-Match 是否符合目前的 ETag（依 RFC 9110 使用弱比較）
+
+    Args:
+        request: FastAPI Request 物件
+        etag: 目前的 ETag
+
+    Returns:
+        是否符合
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+
+    matched = _if_none_match_contains(if_none_match, etag)
+    HTTP_CONDITIONAL_REQUESTS.inc("hit" if matched else "miss")
+    return matched
+
+
+def _if_none_match_contains(if_none_match: str, etag: str) -> bool:
+    """
+    檢查 If-None-Match 的標籤列表是否包含 ETag
+
+    Args:
+        if_none_match: If-None-Match header
+        etag: 目前的 ETag
+
+    Returns:
+        是否包含
+    """
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque_tag = etag[2:] if etag.startswith("W/") else etag
+    return any(candidate == opaque_tag for candidate in _ENTITY_TAG.findall(if_none_match))
+
+
+def not_modified_response(etag: str, cache_control: Optional[str] = None) -> Response:
+    """
+    建立 304 Not Modified 回應（無內容）
+
+    Args:
+        etag: 目前的 ETag
+        cache_control: Cache-Control header
+
+    Returns:
+        Response
+    """
+    response = Response(status_code=NOT_MODIFIED_STATUS)
+    return apply_cache_headers(response, etag, cache_control)
+
+
+def apply_cache_headers(response: Response, etag: Optional[str], cache_control: Optional[str] = None) -> Response:
+    """
+    為回應加上 ETag 與 Cache-Control
+
+    Args:
+        response: 回應物件
+        etag: ETag（None 時不加）
+        cache_control: Cache-Control header（None 時不加）
+
+    Returns:
+        同一個回應物件
+    """
+    if etag:
+        response.headers["ETag"] = etag
+    if cache_control:
+        response.headers["Cache-Control"] = cache_control
+    return response
@@ -0,0 +1,48 @@
+"""
+fields.py - 稀疏欄位（sparse fieldsets）工具
+解析 ?fields= 查詢參數，讓用戶端只取回需要的欄位
+"""
+
+from typing import List, Optional, Sequence
+
+from src.shared.errors.domain_error.validation_error import ValidationError
+
+
+def parse_fields(
+    raw_fields: Optional[str],
+    allowed: Sequence[str],
+    required: Sequence[str] = ("id",)
+) -> Optional[List[str]]:
+    """
+    解析以逗號分隔的欄位列表
+
+    回傳的欄位依 allowed 的順序排列並一律包含 required，
+    同一組欄位不論請求順序都得到相同結果（可用於 ETag 等快取鍵）
+
+    Args:
+        raw_fields: 例如 "username,email"
+        allowed: 可選擇的欄位
+        required: 一律回傳的欄位（例如主鍵）
+
+    Returns:
+        欄位列表，未提供或為空字串時為 None（表示全部欄位）
+
+    Raises:
+        ValidationError: 含有不支援的欄位
+    """
+    if raw_fields is None:
+        return None
+
+    requested = {part.strip() for part in raw_fields.split(",") if part.strip()}
+    if not requested:
+        return None
+
+    unknown = sorted(requested.difference(allowed))
+    if unknown:
+        raise ValidationError(
+            f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(allowed)})",
+            details={"allowed": list(allowed)}
+        )
+
+    requested.update(required)
+    return [field for field in allowed if field in requested]
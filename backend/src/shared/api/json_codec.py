@@ -0,0 +1,179 @@
+"""
+json_codec.py - 快速 JSON 編解碼
+以 orjson 編碼回應、解析請求內容，
+並將 DTO 直接序列化進 {"data", "error"} 回應格式，不經過中間的 dict
+"""
+
+from typing import Any, Dict, Mapping, Optional, Callable
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+import orjson
+from pydantic import BaseModel
+
+from src.core.context.request_context import request_stage
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def _default(value: Any) -> Any:
+    """
+    處理 JSON 無法直接編碼的型別
+
+    Args:
+        value: 要編碼的值
+
+    Returns:
+        可編碼的值
+
+    Raises:
+        TypeError: 不支援的型別
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """
+    將值編碼為 JSON 位元組（UTF-8，不跳脫非 ASCII 字元）
+
+    Args:
+        value: 要編碼的值
+
+    Returns:
+        JSON 位元組
+    """
+    return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def loads(data: Any) -> Any:
+    """
+    解析 JSON
+
+    Args:
+        data: JSON 位元組或字串
+
+    Returns:
+        解析結果
+
+    Raises:
+        orjson.JSONDecodeError: JSON 格式錯誤（json.JSONDecodeError 的子類別）
+    """
+    return orjson.loads(data)
+
+
+def envelope(
+    data: Any = None,
+    error: Optional[Dict[str, Any]] = None,
+    include: Any = None,
+    exclude: Any = None
+) -> bytes:
+    """
+    產生 {"data": ..., "error": ...} 回應內容
+
+    data 為 Pydantic 模型時以 model_dump_json 直接產生 JSON 位元組再組合，
+    不先轉成 dict；耗時記入請求的 serialize 階段
+
+    Args:
+        data: 回應資料（Pydantic 模型、dict 或其他可編碼的值）
+        error: 錯誤資訊
+        include: 只輸出這些欄位（僅 Pydantic 模型適用，同 model_dump 的 include）
+        exclude: 不輸出這些欄位（僅 Pydantic 模型適用，同 model_dump 的 exclude）
+
+    Returns:
+        JSON 位元組
+    """
+    with request_stage("serialize"):
+        if isinstance(data, BaseModel):
+            data_json = data.model_dump_json(include=include, exclude=exclude).encode("utf-8")
+        else:
+            data_json = dumps(data)
+        return b'{"data":' + data_json + b',"error":' + dumps(error) + b"}"
+
+
+def envelope_response(
+    data: Any = None,
+    error: Optional[Dict[str, Any]] = None,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+    include: Any = None,
+    exclude: Any = None
+) -> Response:
+    """
+    建立 {"data", "error"} 格式的 JSON 回應
+
+    Args:
+        data: 回應資料
+        error: 錯誤資訊
+        status_code: HTTP 狀態碼
+        headers: 額外的回應 headers
+        include: 只輸出這些欄位（僅 Pydantic 模型適用）
+        exclude: 不輸出這些欄位（僅 Pydantic 模型適用）
+
+    Returns:
+        Response
+    """
+    return Response(
+        content=envelope(data, error, include=include, exclude=exclude),
+        status_code=status_code,
+        headers=headers,
+        media_type=JSON_MEDIA_TYPE
+    )
+
+
+class FastJSONResponse(JSONResponse):
+    """以 orjson 編碼內容的 JSONResponse（可作為 FastAPI 的 default_response_class）"""
+
+    def render(self, content: Any) -> bytes:
+        """
+        編碼回應內容
+
+        Args:
+            content: 回應內容
+
+        Returns:
+            JSON 位元組
+        """
+        with request_stage("serialize"):
+            return dumps(content)
+
+
+class FastJSONRequest(Request):
+    """以 orjson 解析請求內容的 Request"""
+
+    async def json(self) -> Any:
+        """
+        解析 JSON 請求內容（結果會快取）
+
+        Returns:
+            解析結果
+        """
+        if not hasattr(self, "_json"):
+            self._json = loads(await self.body())
+        return self._json
+
+
+class FastJSONRoute(APIRoute):
+    """
+    以 FastJSONRequest 處理請求的路由類別
+
+    使用方式：APIRouter(route_class=FastJSONRoute)
+    """
+
+    def get_route_handler(self) -> Callable:
+        """
+        包裝 FastAPI 的路由處理器，改用 FastJSONRequest 解析請求內容
+
+        Returns:
+            路由處理器
+        """
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            return await original_route_handler(FastJSONRequest(request.scope, request.receive))
+
+        return route_handler
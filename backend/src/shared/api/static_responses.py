@@ -0,0 +1,160 @@
+"""
+static_responses.py - 預先編碼的回應
+內容固定的回應（根路徑、健康檢查、OpenAPI 文件、常見錯誤）只編碼一次，
+之後每次請求直接送出同一份位元組與 headers
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import Receive, Scope, Send
+
+from src.core.config import settings
+from src.shared.api.compression import compress, is_compressible, negotiate_encoding, weak_etag
+from src.shared.api.etag import NOT_MODIFIED_STATUS, etag_matches
+from src.shared.api.json_codec import JSON_MEDIA_TYPE, dumps
+
+# 預先壓縮只做一次，使用最高壓縮等級
+STATIC_COMPRESSION_LEVELS = {"gzip": 9, "br": 11}
+
+
+class StaticResponse(Response):
+    """
+    不可變的預先編碼回應
+
+    - 內容與 headers（含 Content-Length、Cache-Control、ETag）在建立時計算一次
+    - 同一個實例可重複回傳；送出時複製 header 列表，
+      中介軟體（例如 CORS）加上的 header 不會累積到共用的實例上
+    - 設定 ETag 時，符合 If-None-Match 的請求可透過 for_request 取得同樣預先建立的 304
+    - 超過壓縮門檻時，依 Accept-Encoding 送出壓縮版本；每種壓縮格式只壓縮一次並快取
+    """
+
+    def __init__(
+        self,
+        body: bytes,
+        status_code: int = 200,
+        media_type: Optional[str] = JSON_MEDIA_TYPE,
+        cache_control: Optional[str] = None,
+        etag: Optional[str] = None
+    ):
+        """
+        建立預先編碼回應
+
+        Args:
+            body: 回應內容
+            status_code: HTTP 狀態碼
+            media_type: Content-Type
+            cache_control: Cache-Control header
+            etag: ETag header（None 表示不加，也不支援 304）
+        """
+        self.etag = etag
+        self.cache_control = cache_control
+
+        headers = {}
+        if cache_control:
+            headers["Cache-Control"] = cache_control
+        if etag:
+            headers["ETag"] = etag
+
+        super().__init__(content=body, status_code=status_code, headers=headers, media_type=media_type)
+        self.compressible = (
+            settings.api.compression_enabled
+            and status_code == 200
+            and len(body) >= settings.api.compression_min_size
+            and is_compressible(media_type)
+        )
+        if self.compressible:
+            self.headers.add_vary_header("Accept-Encoding")
+        self._variants: Dict[str, Tuple[bytes, List[Tuple[bytes, bytes]]]] = {}
+        self.not_modified = (
+            StaticResponse(b"", status_code=NOT_MODIFIED_STATUS, media_type=None, cache_control=cache_control, etag=etag)
+            if etag and status_code == 200 else None
+        )
+
+    @classmethod
+    def json(
+        cls,
+        payload: Any,
+        status_code: int = 200,
+        cache_control: Optional[str] = None,
+        etag: bool = False
+    ) -> "StaticResponse":
+        """
+        將 JSON 內容編碼為預先編碼回應
+
+        Args:
+            payload: 回應內容
+            status_code: HTTP 狀態碼
+            cache_control: Cache-Control header
+            etag: 是否以內容雜湊產生 ETag
+
+        Returns:
+            StaticResponse
+        """
+        body = dumps(payload)
+        return cls(
+            body,
+            status_code=status_code,
+            cache_control=cache_control,
+            etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"' if etag else None
+        )
+
+    def for_request(self, request: Request) -> Response:
+        """
+        依條件式請求選擇回應
+
+        Args:
+            request: FastAPI Request 物件
+
+        Returns:
+            If-None-Match 符合時為 304，否則為自己
+        """
+        if self.not_modified is not None and etag_matches(request, self.etag):
+            return self.not_modified
+        return self
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        送出回應（不執行 background task，headers 以副本送出）
+
+        Args:
+            scope: ASGI scope
+            receive: ASGI receive
+            send: ASGI send
+        """
+        body, raw_headers = self.body, self.raw_headers
+        if self.compressible:
+            encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+            if encoding is not None:
+                body, raw_headers = self._compressed_variant(encoding)
+
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": list(raw_headers)
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    def _compressed_variant(self, encoding: str) -> Tuple[bytes, List[Tuple[bytes, bytes]]]:
+        """
+        取得壓縮版本（第一次使用時壓縮並快取）
+
+        Args:
+            encoding: "br" 或 "gzip"
+
+        Returns:
+            (壓縮後的內容, headers)
+        """
+        variant = self._variants.get(encoding)
+        if variant is None:
+            body = compress(self.body, encoding, STATIC_COMPRESSION_LEVELS[encoding])
+            headers = MutableHeaders(raw=list(self.raw_headers))
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            if self.etag:
+                headers["ETag"] = weak_etag(self.etag)
+            variant = (body, headers.raw)
+            self._variants[encoding] = variant
+        return variant
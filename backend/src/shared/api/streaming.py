@@ -0,0 +1,96 @@
+"""
+streaming.py - 串流回應工具
+將大量資料以 NDJSON 串流回傳，不在記憶體中組出完整回應
+"""
+
+from typing import AsyncIterator, Iterable, Iterator, Optional, Set
+
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _next_chunk(items: Iterator[BaseModel], chunk_size: int, include: Optional[Set[str]] = None) -> Optional[bytes]:
+    """
+    從迭代器取出最多 chunk_size 筆資料並序列化為 NDJSON
+
+    Args:
+        items: 資料迭代器
+        chunk_size: 每個區塊的最大筆數
+        include: 只輸出這些欄位（None 表示全部）
+
+    Returns:
+        NDJSON 位元組，迭代器結束時為 None
+    """
+    lines = []
+    for item in items:
+        lines.append(item.model_dump_json(include=include))
+        if len(lines) >= chunk_size:
+            break
+
+    if not lines:
+        return None
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+async def _iter_ndjson(
+    items: Iterable[BaseModel],
+    chunk_size: int,
+    include: Optional[Set[str]] = None
+) -> AsyncIterator[bytes]:
+    """
+    在執行緒池中逐區塊產生 NDJSON
+
+    每送出一個區塊才讀取下一個區塊，因此用戶端接收得慢時不會繼續向資料庫取資料；
+    用戶端中斷時會關閉來源迭代器，釋放其持有的資料庫連線
+
+    Args:
+        items: 資料迭代器（可為同步的資料庫串流）
+        chunk_size: 每個區塊的最大筆數
+        include: 只輸出這些欄位（None 表示全部）
+
+    Yields:
+        NDJSON 位元組區塊
+    """
+    iterator = iter(items)
+    try:
+        while True:
+            chunk = await run_in_threadpool(_next_chunk, iterator, chunk_size, include)
+            if chunk is None:
+                break
+            yield chunk
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await run_in_threadpool(close)
+
+
+def ndjson_response(
+    items: Iterable[BaseModel],
+    chunk_size: int = 500,
+    filename: Optional[str] = None,
+    include: Optional[Set[str]] = None
+) -> StreamingResponse:
+    """
+    建立 NDJSON 串流回應
+
+    Args:
+        items: Pydantic 模型迭代器，每筆輸出為一行 JSON
+        chunk_size: 每次寫入 socket 的最大筆數
+        filename: 下載檔名（設定後加上 Content-Disposition）
+        include: 只輸出這些欄位（None 表示全部，例如 ?fields= 稀疏欄位）
+
+    Returns:
+        StreamingResponse
+    """
+    headers = {}
+    if filename:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    return StreamingResponse(
+        _iter_ndjson(items, chunk_size, include),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers=headers
+    )
@@ -3,10 +3,39 @@ shared dto - 共用 DTO
 提供跨 context 的共用資料傳輸物件
 """
 
+from .pagination_dto import PaginationDTO, encode_cursor, decode_cursor, validate_keyset
+from .batch_dto import BatchSubRequestDTO, BatchRequestDTO, BatchSubResponseDTO, BatchResponseDTO
+from .admin_dto import (
+    LoggingStateDTO,
+    UpdateLoggingDTO,
+    QueryFingerprintDTO,
+    QueryStatsDTO,
+    ProfileFunctionDTO,
+    ProfileSummaryDTO,
+    StoredProfileDTO,
+    StoredProfileListDTO
+)
+
 # 未來會包含：
-# - PaginationDTO
 # - StandardResponseDTO
 # - FilterDTO
 # - SortDTO
 
-__all__ = []
+__all__ = [
+    "PaginationDTO",
+    "encode_cursor",
+    "decode_cursor",
+    "validate_keyset",
+    "BatchSubRequestDTO",
+    "BatchRequestDTO",
+    "BatchSubResponseDTO",
+    "BatchResponseDTO",
+    "LoggingStateDTO",
+    "UpdateLoggingDTO",
+    "QueryFingerprintDTO",
+    "QueryStatsDTO",
+    "ProfileFunctionDTO",
+    "ProfileSummaryDTO",
+    "StoredProfileDTO",
+    "StoredProfileListDTO"
+]
@@ -0,0 +1,124 @@
+"""
+admin_dto.py - 管理端點 DTO
+定義 /admin/logging、/admin/queries 與 /admin/profile 的輸入和輸出格式
+"""
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class LoggingStateDTO(BaseModel):
+    """
+    日誌設定輸出 DTO
+
+    對應規格：
+    { "level": "INFO", "categories": { "API": true, "DB": false, "Infra": true, "Access": true } }
+    """
+    level: str = Field(..., description="日誌等級")
+    categories: Dict[str, bool] = Field(..., description="各日誌分類是否輸出（只影響 INFO 與 DEBUG）")
+
+
+class UpdateLoggingDTO(BaseModel):
+    """
+    日誌設定更新輸入 DTO（未提供的欄位維持不變）
+
+    對應規格：
+    { "level": "DEBUG", "categories": { "DB": false } }
+    """
+    level: Optional[str] = Field(None, description="日誌等級（DEBUG、INFO、WARN、ERROR、CRITICAL）")
+    categories: Optional[Dict[str, bool]] = Field(None, description="要調整的日誌分類（API、DB、Infra、Access）")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "level": "INFO",
+                "categories": {"DB": False}
+            }
+        }
+
+
+class QueryFingerprintDTO(BaseModel):
+    """
+    單一 SQL fingerprint 的統計
+
+    對應規格：
+    { "fingerprint": "SELECT ... WHERE users.id = ?", "count": 120, "total_ms": 84.2, "mean_ms": 0.7,
+      "p95_ms": 1.9, "max_ms": 12.4, "slow_count": 0, "error_count": 0, "sources": ["UserRepositoryImpl.find_by_id"] }
+    """
+    fingerprint: str = Field(..., description="正規化後的 SQL（字面值與參數換成 ?）")
+    count: int = Field(..., description="執行次數")
+    total_ms: float = Field(..., description="總耗時（毫秒）")
+    mean_ms: float = Field(..., description="平均耗時（毫秒）")
+    p95_ms: float = Field(..., description="最近 512 次的 p95 耗時（毫秒）")
+    max_ms: float = Field(..., description="最大耗時（毫秒）")
+    slow_count: int = Field(..., description="超過慢查詢門檻的次數")
+    error_count: int = Field(..., description="執行失敗的次數")
+    sources: List[str] = Field(..., description="執行這個 SQL 的 Repository 方法")
+
+
+class QueryStatsDTO(BaseModel):
+    """
+    SQL 統計輸出 DTO
+
+    對應規格：
+    { "since": 1760000000.0, "statements": 5400, "slow_query_ms": 200, "fingerprints": [ ... ] }
+    """
+    since: float = Field(..., description="統計開始時間（Unix 秒）")
+    statements: int = Field(..., description="統計期間的 SQL 總執行次數")
+    slow_query_ms: float = Field(..., description="慢查詢門檻（毫秒）")
+    fingerprints: List[QueryFingerprintDTO] = Field(..., description="依排序欄位排列的前 N 個 fingerprint")
+
+
+class ProfileFunctionDTO(BaseModel):
+    """
+    取樣分析中單一函式的樣本數
+
+    對應規格：
+    { "function": "BaseModel.model_validate (pydantic/main.py)", "self": 40, "total": 55, "self_pct": 8.0, "total_pct": 11.0 }
+    """
+    function: str = Field(..., description="函式與所在檔案")
+    self: int = Field(..., description="函式位於堆疊最內層的樣本數（函式本身的耗時）")
+    total: int = Field(..., description="函式出現在堆疊中的樣本數（含呼叫的函式）")
+    self_pct: float = Field(..., description="self 佔全部樣本的百分比")
+    total_pct: float = Field(..., description="total 佔全部樣本的百分比")
+
+
+class ProfileSummaryDTO(BaseModel):
+    """
+    取樣分析摘要輸出 DTO
+
+    對應規格：
+    { "started": 1760000000.0, "duration_s": 10.0, "interval_ms": 5.0, "samples": 500, "metadata": {}, "functions": [ ... ] }
+    """
+    started: float = Field(..., description="開始時間（Unix 秒）")
+    duration_s: float = Field(..., description="分析時間（自動分析時為請求耗時，秒）")
+    interval_ms: float = Field(..., description="取樣間隔（毫秒）")
+    samples: int = Field(..., description="樣本數（每個非閒置執行緒每次取樣計一次）")
+    metadata: Dict[str, Any] = Field(..., description="附加資訊（自動分析時為請求的 request_id、method、path、route、status）")
+    functions: List[ProfileFunctionDTO] = Field(..., description="依 self 樣本數排列的前 N 個函式")
+
+
+class StoredProfileDTO(BaseModel):
+    """
+    已儲存的自動分析結果
+
+    對應規格：
+    { "id": "1760000000000-4242-3f2a...", "started": 1760000000.0, "duration": 1.2, "samples": 120, "metadata": { ... } }
+    """
+    id: str = Field(..., description="分析結果 ID")
+    started: float = Field(..., description="請求開始時間（Unix 秒）")
+    duration: float = Field(..., description="請求耗時（秒）")
+    samples: int = Field(..., description="樣本數")
+    metadata: Dict[str, Any] = Field(..., description="請求的 request_id、method、path、route、status")
+
+
+class StoredProfileListDTO(BaseModel):
+    """
+    已儲存的自動分析結果列表輸出 DTO
+
+    對應規格：
+    { "threshold_ms": 500, "profiles": [ ... ] }
+    """
+    threshold_ms: float = Field(..., description="自動分析的延遲門檻（毫秒），0 表示未啟用")
+    profiles: List[StoredProfileDTO] = Field(..., description="分析結果（新的在前）")
@@ -0,0 +1,73 @@
+"""
+batch_dto.py - 批次請求 DTO
+定義 POST /batch 的輸入和輸出格式
+"""
+
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class BatchSubRequestDTO(BaseModel):
+    """
+    批次中的單一子請求
+
+    對應規格：
+    { "method": "GET", "path": "/users/me", "body": null, "depends_on": [] }
+    """
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = Field("GET", description="HTTP 方法")
+    path: str = Field(..., description="請求路徑（可含查詢字串），例如 /users?ids=1,2")
+    body: Optional[Any] = Field(None, description="JSON 請求內容")
+    depends_on: List[int] = Field(default_factory=list, description="必須先完成的子請求索引（只能引用前面的子請求）")
+
+
+class BatchRequestDTO(BaseModel):
+    """
+    批次請求輸入 DTO
+
+    對應規格：
+    {
+      "requests": [
+        { "method": "GET", "path": "/users/me" },
+        { "method": "GET", "path": "/users?ids=2,3" }
+      ]
+    }
+    """
+    requests: List[BatchSubRequestDTO] = Field(..., description="子請求列表")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "requests": [
+                    {"method": "GET", "path": "/users/me"},
+                    {"method": "GET", "path": "/users?ids=2,3"}
+                ]
+            }
+        }
+
+
+class BatchSubResponseDTO(BaseModel):
+    """
+    單一子請求的結果
+
+    對應規格：
+    { "status": 200, "data": {...}, "error": null }
+    """
+    status: int = Field(..., description="子請求的 HTTP 狀態碼")
+    data: Optional[Any] = Field(None, description="子請求回應的 data")
+    error: Optional[Dict[str, Any]] = Field(None, description="子請求回應的 error")
+
+
+class BatchResponseDTO(BaseModel):
+    """
+    批次請求輸出 DTO（結果順序與請求順序相同）
+
+    對應規格：
+    {
+      "responses": [
+        { "status": 200, "data": { "id": 1, "username": "alice" }, "error": null },
+        { "status": 404, "data": null, "error": { "code": "UserNotFoundError", "message": "..." } }
+      ]
+    }
+    """
+    responses: List[BatchSubResponseDTO] = Field(default_factory=list, description="子請求結果")
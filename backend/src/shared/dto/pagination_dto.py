@@ -0,0 +1,113 @@
+"""
+pagination_dto.py - 分頁 DTO
+定義游標式（keyset）分頁的共用回應格式與游標編碼
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+from src.shared.errors.domain_error.validation_error import ValidationError
+
+# 分頁項目的泛型類型變數
+T = TypeVar('T')
+
+
+class PaginationDTO(BaseModel, Generic[T]):
+    """
+    游標式分頁輸出 DTO
+
+    對應規格：
+    {
+      "items": [...],
+      "next_cursor": "eyJzIjoiaWQiLCJrIjp7ImlkIjoyMH19",   // 沒有下一頁時為 null
+      "has_more": true,
+      "limit": 20
+    }
+    """
+    items: List[T] = Field(default_factory=list, description="本頁資料")
+    next_cursor: Optional[str] = Field(None, description="下一頁的游標（不透明字串），沒有下一頁時為 null")
+    has_more: bool = Field(False, description="是否還有下一頁")
+    limit: int = Field(..., description="每頁筆數")
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """
+    將游標內容編碼為不透明字串
+
+    Args:
+        payload: 游標內容（keyset 欄位值等）
+
+    Returns:
+        URL-safe base64 字串
+    """
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    解碼游標字串
+
+    Args:
+        cursor: encode_cursor 產生的字串
+
+    Returns:
+        游標內容
+
+    Raises:
+        ValidationError: 游標格式錯誤
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError, binascii.Error):
+        raise ValidationError("Invalid pagination cursor")
+
+    if not isinstance(payload, dict):
+        raise ValidationError("Invalid pagination cursor")
+    return payload
+
+
+def validate_keyset(keyset: Any, fields: Dict[str, type], message: str = "Invalid pagination cursor") -> Dict[str, Any]:
+    """
+    檢查游標中的 keyset 欄位值（游標來自用戶端，可能被竄改）
+
+    Args:
+        keyset: 游標中的 keyset 內容
+        fields: 排序欄位 -> 型別（int 或 datetime；datetime 在游標中為 ISO 8601 字串）
+        message: 驗證失敗時的錯誤訊息
+
+    Returns:
+        只包含排序欄位的 keyset
+
+    Raises:
+        ValidationError: 不是物件、缺少排序欄位或欄位值型別不符
+    """
+    if not isinstance(keyset, dict):
+        raise ValidationError(message)
+
+    for name, field_type in fields.items():
+        value = keyset.get(name)
+        if field_type is int:
+            valid = isinstance(value, int) and not isinstance(value, bool)
+        elif field_type is datetime:
+            valid = isinstance(value, str) and _is_iso_datetime(value)
+        else:
+            valid = isinstance(value, field_type)
+        if not valid:
+            raise ValidationError(message)
+    return {name: keyset[name] for name in fields}
+
+
+def _is_iso_datetime(value: str) -> bool:
+    """檢查字串是否為 ISO 8601 時間"""
+    try:
+        datetime.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
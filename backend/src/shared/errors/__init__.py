@@ -25,7 +25,9 @@ from .system_error import (
     ConfigurationException,
     ServiceUnavailableException,
     ExternalAPITimeoutException,
-    DatabaseTimeoutException
+    DatabaseTimeoutException,
+    RequestTimeoutException,
+    PayloadTooLargeError
 )
 
 __all__ = [
@@ -54,5 +56,7 @@ __all__ = [
     "ConfigurationException",
     "ServiceUnavailableException",
     "ExternalAPITimeoutException",
-    "DatabaseTimeoutException"
+    "DatabaseTimeoutException",
+    "RequestTimeoutException",
+    "PayloadTooLargeError"
 ]
@@ -0,0 +1,46 @@
+"""
+PayloadTooLargeError - 請求內容過大錯誤
+用於請求內容超過上限的情況
+狀態碼：413 Payload Too Large
+"""
+
+from typing import Any, Dict, Optional
+from .system_error import SystemError
+
+
+class PayloadTooLargeError(SystemError):
+    """
+    請求內容過大錯誤
+    
+    用途：請求內容超過 API_MAX_REQUEST_SIZE
+    狀態碼：413 Payload Too Large
+    
+    範例：
+    {
+        "data": null,
+        "error": {
+            "code": "PayloadTooLargeError",
+            "message": "Request body exceeds 10485760 bytes",
+            "details": null
+        }
+    }
+    """
+    
+    def __init__(
+        self,
+        message: str,
+        details: Optional[Dict[str, Any]] = None
+    ):
+        """
+        初始化請求內容過大錯誤
+        
+        Args:
+            message: 人類可讀的錯誤訊息
+            details: 可選的詳細資訊，用於 debug
+        """
+        super().__init__(message, details)
+    
+    @property
+    def status_code(self) -> int:
+        """HTTP 狀態碼：413 Payload Too Large"""
+        return 413
@@ -54,3 +54,8 @@ class ExternalAPITimeoutException(TimeoutError):
 class DatabaseTimeoutException(TimeoutError):
     """資料庫操作逾時錯誤"""
     pass
+
+
+class RequestTimeoutException(TimeoutError):
+    """請求處理超過期限錯誤"""
+    pass
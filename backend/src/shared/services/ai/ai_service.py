@@ -3,6 +3,7 @@ ai_service.py - AI 服務核心實現
 使用 LangChain 和 OpenAI 提供 AI 對話功能
 """
 
+import time
 import uuid
 from typing import Optional, List, Dict, Any, AsyncIterator
 from langchain_openai import ChatOpenAI
@@ -10,7 +11,11 @@ from langchain.schema import SystemMessage, HumanMessage, AIMessage
 from langchain.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
 
 from src.core.config import settings
+from src.core.context.deadline import check_deadline
+from src.core.context.request_context import add_request_timing, request_stage
 from src.core.logger.logger import logger
+from src.core.metrics.instruments import AI_REQUEST_DURATION, AI_TOKENS
+from src.core.tracing import SPAN_KIND_CLIENT, TRACEPARENT_HEADER, Span, format_traceparent, tracer
 from .models import (
     ChatMessage,
     ChatRequest,
@@ -41,7 +46,8 @@ class AIService:
         model: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
-        streaming: bool = False
+        streaming: bool = False,
+        span: Optional[Span] = None
     ) -> ChatOpenAI:
         """
         取得 LangChain ChatOpenAI 實例
@@ -51,10 +57,20 @@ class AIService:
             temperature: 溫度參數
             max_tokens: 最大 token 數
             streaming: 是否使用串流
+            span: 這次呼叫的 span（啟用追蹤時以 traceparent header 傳給下游，讓對方的 span 接在同一條 trace）
             
         Returns:
             ChatOpenAI 實例
+            
+        Raises:
+            RequestTimeoutException: 請求已超過期限
         """
+        # 在請求中呼叫時，逾時不超過請求的剩餘時間（請求逾時時進行中的呼叫會被取消）
+        request_timeout = self.config.request_timeout
+        remaining = check_deadline("AI request")
+        if remaining is not None:
+            request_timeout = min(request_timeout, remaining)
+        
         return ChatOpenAI(
             model=model or self.config.default_model,
             temperature=temperature if temperature is not None else self.config.default_temperature,
@@ -62,8 +78,9 @@ class AIService:
             openai_api_key=self.config.openai_api_key,
             openai_api_base=self.config.openai_api_base,
             streaming=streaming,
-            request_timeout=self.config.request_timeout,
-            max_retries=self.config.max_retries
+            request_timeout=request_timeout,
+            max_retries=self.config.max_retries,
+            default_headers=_trace_headers(span)
         )
     
     async def chat(
@@ -94,9 +111,6 @@ class AIService:
                        model=model or self.config.default_model,
                        has_history=conversation_id is not None)
             
-            # 取得 LLM 實例
-            llm = self._get_llm(model, temperature, max_tokens, streaming=False)
-            
             # 準備訊息
             messages = []
             
@@ -119,7 +133,24 @@ class AIService:
             messages.append(HumanMessage(content=message))
             
             # 調用 LLM
-            response = await llm.ainvoke(messages)
+            model_name = model or self.config.default_model
+            started = time.perf_counter()
+            with tracer.span("AIService.chat", SPAN_KIND_CLIENT, {"ai.model": model_name}) as span:
+                # 取得 LLM 實例（帶上這個 span 的 traceparent）
+                llm = self._get_llm(model, temperature, max_tokens, streaming=False, span=span)
+                try:
+                    with request_stage("ai"):
+                        response = await llm.ainvoke(messages)
+                except BaseException:
+                    AI_REQUEST_DURATION.observe(time.perf_counter() - started, model_name, "chat", "error")
+                    raise
+                AI_REQUEST_DURATION.observe(time.perf_counter() - started, model_name, "chat", "success")
+                token_usage = (getattr(response, "response_metadata", None) or {}).get("token_usage") or {}
+                AI_TOKENS.inc(model_name, "prompt", amount=token_usage.get("prompt_tokens") or 0)
+                AI_TOKENS.inc(model_name, "completion", amount=token_usage.get("completion_tokens") or 0)
+                if span is not None:
+                    span.set_attribute("ai.prompt_tokens", token_usage.get("prompt_tokens"))
+                    span.set_attribute("ai.completion_tokens", token_usage.get("completion_tokens"))
             
             # 取得回應內容
             response_content = response.content
@@ -208,24 +239,38 @@ class AIService:
         try:
             logger.info("Processing streaming chat request")
             
-            # 取得 LLM 實例（啟用串流）
-            llm = self._get_llm(model, temperature, max_tokens, streaming=True)
-            
             # 準備訊息
             messages = []
             if system_prompt:
                 messages.append(SystemMessage(content=system_prompt))
             messages.append(HumanMessage(content=message))
             
-            # 串流調用
+            # 串流調用（耗時包含用戶端接收各片段的時間）
+            model_name = model or self.config.default_model
+            started = time.perf_counter()
+            # async generator 在呼叫端的 context 中逐步執行，span 不設為目前的 span
+            span = tracer.start_span("AIService.stream_chat", SPAN_KIND_CLIENT, {"ai.model": model_name})
+            outcome = "error"
             full_response = ""
-            async for chunk in llm.astream(messages):
-                if chunk.content:
-                    full_response += chunk.content
-                    yield StreamResponse(
-                        content=chunk.content,
-                        is_final=False
-                    )
+            try:
+                # 取得 LLM 實例（啟用串流，帶上這個 span 的 traceparent）
+                llm = self._get_llm(model, temperature, max_tokens, streaming=True, span=span)
+                async for chunk in llm.astream(messages):
+                    if chunk.content:
+                        full_response += chunk.content
+                        yield StreamResponse(
+                            content=chunk.content,
+                            is_final=False
+                        )
+                outcome = "success"
+            except Exception as e:
+                span.record_exception(e)
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                AI_REQUEST_DURATION.observe(elapsed, model_name, "stream", outcome)
+                add_request_timing("ai", elapsed * 1000)
+                span.end()
             
             # 發送最後一個片段
             yield StreamResponse(
@@ -450,6 +495,21 @@ class AIService:
         return PromptTemplates.get_all_templates()
 
 
+def _trace_headers(span: Optional[Span]) -> Optional[Dict[str, str]]:
+    """
+    產生呼叫下游時的 traceparent header
+
+    Args:
+        span: 目前呼叫的 span
+
+    Returns:
+        {"traceparent": ...}，未啟用追蹤時為 None
+    """
+    if span is None or not tracer.enabled:
+        return None
+    return {TRACEPARENT_HEADER: format_traceparent(span.context)}
+
+
 # 全域 AI Service 實例
 ai_service = AIService()
 
@@ -5,6 +5,9 @@ shared utils - 共用工具函數
 
 from .seed_loader import (
     load_seed_data,
+    find_seed_file,
+    iter_seed_records,
+    iter_seed_batches,
     get_all_seed_files,
     get_available_tables,
     load_all_seed_data,
@@ -14,6 +17,9 @@ from .seed_loader import (
 
 __all__ = [
     "load_seed_data",
+    "find_seed_file",
+    "iter_seed_records",
+    "iter_seed_batches",
     "get_all_seed_files", 
     "get_available_tables",
     "load_all_seed_data",
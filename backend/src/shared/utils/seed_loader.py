@@ -6,11 +6,19 @@ seed_loader.py - Seed 資料載入工具
 import os
 import json
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator, IO
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# 支援的 seed 檔案副檔名（依優先順序）
+SEED_FILE_EXTENSIONS = (".ndjson", ".jsonl", ".json")
+
+# 串流讀取時每次讀入的字元數
+_READ_CHUNK_SIZE = 1 << 16
+# 區塊結尾被截斷的 token 最長字元數（-Infinity、\uXXXX 跳脫字元）
+_MAX_TRUNCATED_TOKEN = 9
+
 
 def load_seed_data(table_name: str, seed_dir: str) -> List[Dict[str, Any]]:
     """
@@ -59,6 +67,200 @@ def load_seed_data(table_name: str, seed_dir: str) -> List[Dict[str, Any]]:
         return []
 
 
+def find_seed_file(table_name: str, seed_dir: str) -> Optional[Path]:
+    """
+    尋找指定表的 seed 檔案（支援 .ndjson / .jsonl / .json）
+    
+    Args:
+        table_name: 表名（對應檔案名稱）
+        seed_dir: seed 資料夾路徑
+        
+    Returns:
+        Optional[Path]: 找到的檔案路徑，不存在則回傳 None
+    """
+    seed_path = Path(seed_dir)
+    for extension in SEED_FILE_EXTENSIONS:
+        candidate = seed_path / f"{table_name}{extension}"
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def iter_seed_records(table_name: str, seed_dir: str) -> Iterator[Dict[str, Any]]:
+    """
+    以串流方式逐筆讀取 seed 資料
+    
+    與 load_seed_data 不同，此函數不會一次把整個檔案載入記憶體：
+    - .ndjson / .jsonl：每行一筆 JSON 物件
+    - .json：頂層為陣列時逐一解析陣列元素；頂層為物件時沿用 load_seed_data 的格式規則
+    
+    Args:
+        table_name: 表名（對應檔案名稱）
+        seed_dir: seed 資料夾路徑
+        
+    Yields:
+        Dict[str, Any]: 單筆 seed 資料
+    """
+    seed_file = find_seed_file(table_name, seed_dir)
+    if seed_file is None:
+        logger.warning(f"Seed file not found for table '{table_name}' in {seed_dir}")
+        return
+    
+    with open(seed_file, 'r', encoding='utf-8') as f:
+        if seed_file.suffix in (".ndjson", ".jsonl"):
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    logger.error(f"Invalid JSON at {seed_file}:{line_number}: {e}")
+                    raise
+            return
+        
+        first_char = _peek_first_char(f)
+        if first_char == "[":
+            yield from _iter_json_array(f)
+        elif first_char:
+            # 頂層為物件（可能包含 metadata），檔案通常很小，直接沿用既有規則
+            yield from load_seed_data(table_name, seed_dir)
+
+
+def iter_seed_batches(table_name: str, seed_dir: str, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """
+    以固定批次大小串流讀取 seed 資料
+    
+    Args:
+        table_name: 表名（對應檔案名稱）
+        seed_dir: seed 資料夾路徑
+        batch_size: 每批筆數
+        
+    Yields:
+        List[Dict[str, Any]]: 一批 seed 資料
+    """
+    batch: List[Dict[str, Any]] = []
+    for record in iter_seed_records(table_name, seed_dir):
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _peek_first_char(f: IO[str]) -> str:
+    """
+    讀取檔案第一個非空白字元並將讀取位置移回該字元
+    
+    Args:
+        f: 文字檔案物件
+        
+    Returns:
+        第一個非空白字元，空檔案回傳空字串
+    """
+    while True:
+        position = f.tell()
+        char = f.read(1)
+        if not char:
+            return ""
+        if char == "\ufeff" or char.isspace():
+            continue
+        f.seek(position)
+        return char
+
+
+def _iter_json_array(f: IO[str]) -> Iterator[Any]:
+    """
+    逐一解析頂層 JSON 陣列的元素，只保留一個讀取區塊在記憶體中
+    
+    與 json.load 相同，元素之間必須以 ',' 分隔，且不接受多餘的 ','
+    
+    Args:
+        f: 讀取位置停在 '[' 的文字檔案物件
+        
+    Yields:
+        陣列中的每個元素
+        
+    Raises:
+        ValueError: JSON 格式錯誤（訊息包含檔案中的字元位置）
+    """
+    decoder = json.JSONDecoder()
+    buffer = f.read(_READ_CHUNK_SIZE)
+    position = buffer.index("[") + 1
+    # 已捨棄的字元數，buffer 中的位置加上此值即為檔案中的位置
+    discarded = 0
+    # 剛讀到 '['（可以直接遇到 ']'）、剛讀到 ','（必須是元素）、剛讀完元素（必須是 ',' 或 ']'）
+    expecting = "first"
+    
+    while True:
+        # 跳過空白
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n":
+                position += 1
+            if position < len(buffer):
+                break
+            chunk = f.read(_READ_CHUNK_SIZE)
+            if not chunk:
+                raise ValueError(f"Unterminated JSON array at offset {discarded + position}")
+            discarded += len(buffer)
+            buffer, position = chunk, 0
+        
+        char = buffer[position]
+        if expecting == "separator":
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' at offset {discarded + position}")
+            position += 1
+            expecting = "value"
+            continue
+        if char == "]":
+            if expecting == "first":
+                return
+            raise ValueError(f"Unexpected ']' after ',' at offset {discarded + position}")
+        if char == ",":
+            raise ValueError(f"Unexpected ',' at offset {discarded + position}")
+        
+        # 解析一個元素，資料不足（或恰好停在區塊結尾）時補讀下一個區塊
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+                if end < len(buffer):
+                    break
+                chunk = f.read(_READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+            except json.JSONDecodeError as e:
+                # 錯誤發生在區塊結尾（元素被截斷）才補讀，否則是格式錯誤，不再讀取整個檔案
+                chunk = f.read(_READ_CHUNK_SIZE) if _is_truncated(buffer, e) else ""
+                if not chunk:
+                    raise ValueError(f"{e.msg} at offset {discarded + e.pos}") from e
+            discarded += position
+            buffer = buffer[position:] + chunk
+            position = 0
+        
+        yield value
+        expecting = "separator"
+        position = end
+
+
+def _is_truncated(buffer: str, error: json.JSONDecodeError) -> bool:
+    """
+    判斷解析錯誤是否只是因為元素在區塊結尾被截斷
+    
+    Args:
+        buffer: 目前的讀取區塊
+        error: 解析錯誤
+        
+    Returns:
+        錯誤位置之後只剩一個未完成的 token（例如 tru、-、\\u12）或字串尚未結束時為 True
+    """
+    if error.msg.startswith("Unterminated string"):
+        return True
+    return len(buffer) - error.pos <= _MAX_TRUNCATED_TOKEN
+
+
 def get_all_seed_files(seed_dir: str) -> List[Path]:
     """
     獲取指定目錄下所有 seed JSON 文件
@@ -0,0 +1,47 @@
+"""
+conftest.py - 使用者 API 整合測試的共用 fixture
+以 SQLite 測試資料庫取代全域資料庫連線，透過 TestClient 呼叫完整的中介軟體與路由
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import main
+from src.core.db.connection import Base, DatabaseConnection, db_connection
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """
+    建立 SQLite 測試資料庫（SQL 一樣經過 statement 計數）
+
+    Yields:
+        同步引擎
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'integration.db'}")
+    Base.metadata.create_all(engine)
+    DatabaseConnection._instrument_statements(engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture
+def client(engine):
+    """
+    以測試資料庫取代全域資料庫連線
+
+    Yields:
+        TestClient
+    """
+    original = (db_connection._engine, db_connection._session_factory, db_connection._initialized)
+    db_connection._engine = engine
+    db_connection._session_factory = sessionmaker(bind=engine)
+    db_connection._initialized = True
+    try:
+        yield TestClient(main.app)
+    finally:
+        db_connection._engine, db_connection._session_factory, db_connection._initialized = original
@@ -0,0 +1,76 @@
+"""
+helpers.py - 使用者 API 整合測試的共用函數
+註冊使用者、產生 Authorization header 與直接寫入測試資料
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
+
+from src.contexts.user.infra.schema.user import User
+from src.core.security.jwt.jwt_handler import JWTHandler
+from src.tests.conftest import get_test_user_data
+
+
+def register(client: TestClient, prefix: str = "budget") -> dict:
+    """
+    註冊一個測試使用者
+
+    Args:
+        client: TestClient
+        prefix: 使用者名稱前綴
+
+    Returns:
+        註冊回應的 data
+    """
+    response = client.post("/users/register", json=get_test_user_data(prefix))
+    assert response.status_code == 200, response.text
+    return response.json()["data"]
+
+
+def auth_headers(user_id: int, roles: Optional[List[str]] = None) -> dict:
+    """
+    產生測試使用者的 Authorization header
+
+    Args:
+        user_id: 使用者 ID
+        roles: token 中的角色，預設為 ["user"]
+
+    Returns:
+        headers
+    """
+    return {"Authorization": f"Bearer {JWTHandler().encode(str(user_id), roles or ['user'])}"}
+
+
+def add_users(engine: Engine, count: int, prefix: str = "user") -> List[int]:
+    """
+    直接寫入測試使用者（不經過註冊 API，省下 bcrypt 的時間）
+
+    created_at 由 Python 端指定且每兩筆相同（測試 keyset 的 id 排序）；
+    SQLite 的 CURRENT_TIMESTAMP 沒有小數秒，與綁定參數的字串格式不同，無法正確比較
+
+    Args:
+        engine: 測試資料庫引擎
+        count: 使用者數量
+        prefix: 使用者名稱前綴
+
+    Returns:
+        依序建立的使用者 ID
+    """
+    started = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    with Session(engine) as session:
+        users = [
+            User(
+                username=f"{prefix}{index}",
+                email=f"{prefix}{index}@example.com",
+                created_at=started + timedelta(seconds=index // 2),
+                updated_at=started + timedelta(seconds=index // 2)
+            )
+            for index in range(count)
+        ]
+        session.add_all(users)
+        session.commit()
+        return [user.id for user in users]
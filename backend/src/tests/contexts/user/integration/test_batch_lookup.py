@@ -0,0 +1,57 @@
+"""
+test_batch_lookup.py - 以 ID 批次查詢使用者的測試
+檢查 GET /users?ids= 回傳存在的使用者與不存在的 ID、數量上限與格式錯誤
+"""
+
+import pytest
+
+from src.core.config import settings
+from src.core.db.query_budget import assert_max_queries
+from src.tests.contexts.user.integration.helpers import add_users, auth_headers
+
+
+def test_ids_returns_users_and_missing(client, engine):
+    """存在的使用者以 ID 為鍵回傳，不存在的 ID 列在 missing，重複的 ID 只查詢一次"""
+    user_ids = add_users(engine, 3)
+    ids = f"{user_ids[2]},{user_ids[0]},99999,{user_ids[0]}"
+
+    with assert_max_queries(1):
+        response = client.get("/users", params={"ids": ids}, headers=auth_headers(user_ids[0]))
+
+    assert response.status_code == 200, response.text
+    data = response.json()["data"]
+    assert sorted(data["users"]) == sorted(str(user_id) for user_id in (user_ids[0], user_ids[2]))
+    assert data["users"][str(user_ids[2])]["username"] == "user2"
+    assert data["missing"] == [99999]
+
+
+def test_ids_sparse_fields(client, engine):
+    """?fields= 同樣作用於批次查詢的每位使用者"""
+    user_ids = add_users(engine, 2)
+
+    response = client.get(
+        "/users",
+        params={"ids": ",".join(map(str, user_ids)), "fields": "username"},
+        headers=auth_headers(user_ids[0])
+    )
+
+    assert response.status_code == 200, response.text
+    users = response.json()["data"]["users"]
+    assert users[str(user_ids[1])] == {"id": user_ids[1], "username": "user1"}
+
+
+def test_ids_over_cap(client):
+    """超過 max_page_size 個 ID 回傳 422"""
+    ids = ",".join(str(user_id) for user_id in range(1, settings.api.max_page_size + 2))
+
+    response = client.get("/users", params={"ids": ids}, headers=auth_headers(1))
+
+    assert response.status_code == 422, response.text
+
+
+@pytest.mark.parametrize("ids", ["", "1,abc", "0", "-3", "1;2"])
+def test_ids_bad_input(client, ids):
+    """空值、非整數與非正整數回傳 422"""
+    response = client.get("/users", params={"ids": ids}, headers=auth_headers(1))
+
+    assert response.status_code == 422, response.text
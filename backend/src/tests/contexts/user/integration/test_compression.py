@@ -0,0 +1,98 @@
+"""
+test_compression.py - 回應壓縮測試
+檢查 Accept-Encoding 協商、壓縮門檻、串流回應逐區塊壓縮，以及壓縮後改為弱 ETag
+"""
+
+import gzip
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.responses import JSONResponse
+
+from src.core.middleware.compression import CompressionMiddleware
+from src.shared.api.compression import negotiate_encoding, supported_encodings
+from src.tests.contexts.user.integration.helpers import add_users, auth_headers
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    (None, None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("GZIP;q=0.5, identity", "gzip"),
+    ("gzip;q=0", None),
+    ("*", supported_encodings()[0]),
+    ("*, gzip;q=0", "br" if "br" in supported_encodings() else None),
+])
+def test_negotiate_encoding(accept_encoding, expected):
+    """選擇 q 值最高的已支援格式，q=0 表示不接受"""
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+def test_large_json_response_is_gzipped(client, engine):
+    """超過門檻的 JSON 回應以 gzip 壓縮，並加上 Vary: Accept-Encoding"""
+    user_ids = add_users(engine, 60)
+    headers = {**auth_headers(user_ids[0]), "Accept-Encoding": "gzip"}
+
+    with client.stream("GET", "/users", params={"limit": 100}, headers=headers) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert int(response.headers["Content-Length"]) == len(raw)
+    body = json.loads(gzip.decompress(raw))
+    assert [item["id"] for item in body["data"]["items"]] == user_ids
+
+
+def test_identity_is_not_compressed(client, engine):
+    """用戶端不接受壓縮時原樣回傳"""
+    user_ids = add_users(engine, 60)
+    headers = {**auth_headers(user_ids[0]), "Accept-Encoding": "identity"}
+
+    response = client.get("/users", params={"limit": 100}, headers=headers)
+
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+    assert len(response.json()["data"]["items"]) == 60
+
+
+def test_small_response_is_not_compressed(client, engine):
+    """小於門檻的回應不壓縮（壓縮效益小於成本）"""
+    user_id = add_users(engine, 1)[0]
+    headers = {**auth_headers(user_id), "Accept-Encoding": "gzip"}
+
+    response = client.get(f"/users/{user_id}", headers=headers)
+
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+
+
+def test_ndjson_stream_is_gzipped(client, engine):
+    """沒有 Content-Length 的串流回應逐區塊壓縮，解壓縮後內容完整"""
+    user_ids = add_users(engine, 50)
+    headers = {**auth_headers(user_ids[0]), "Accept-Encoding": "gzip"}
+
+    with client.stream("GET", "/users/export", headers=headers) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    rows = [json.loads(line) for line in gzip.decompress(raw).decode("utf-8").splitlines()]
+    assert [row["id"] for row in rows] == user_ids
+
+
+def test_compressed_etag_is_weak():
+    """壓縮後內容與未壓縮時不同，強 ETag 改為弱 ETag（If-None-Match 以弱比較，仍可取得 304）"""
+    async def app(scope, receive, send):
+        await JSONResponse({"payload": "x" * 64}, headers={"ETag": '"user-1-abc"'})(scope, receive, send)
+
+    client = TestClient(CompressionMiddleware(app, minimum_size=1))
+
+    compressed = client.get("/", headers={"Accept-Encoding": "gzip"})
+    plain = client.get("/", headers={"Accept-Encoding": "identity"})
+
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.headers["ETag"] == 'W/"user-1-abc"'
+    assert plain.headers["ETag"] == '"user-1-abc"'
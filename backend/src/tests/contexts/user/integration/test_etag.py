@@ -0,0 +1,78 @@
+"""
+test_etag.py - 使用者查詢的條件式請求測試
+檢查 ETag / If-None-Match：資料未變更回傳 304，資料、欄位組合或 token 角色不同時回傳 200
+"""
+
+from src.tests.contexts.user.integration.helpers import add_users, auth_headers
+
+
+def test_get_user_etag_and_not_modified(client, engine):
+    """回應帶有 ETag 與 Cache-Control，帶入相同的 ETag 時回傳沒有內容的 304"""
+    user_id = add_users(engine, 1)[0]
+    headers = auth_headers(user_id)
+
+    response = client.get(f"/users/{user_id}", headers=headers)
+    etag = response.headers["ETag"]
+
+    assert response.status_code == 200, response.text
+    assert etag.startswith('"') and etag.endswith('"')
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    not_modified = client.get(f"/users/{user_id}", headers={**headers, "If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+
+
+def test_if_none_match_list_and_weak_comparison(client, engine):
+    """If-None-Match 可以是標籤列表，且以弱比較比對（W/ 前綴視為相同）"""
+    user_id = add_users(engine, 1)[0]
+    headers = auth_headers(user_id)
+    etag = client.get(f"/users/{user_id}", headers=headers).headers["ETag"]
+
+    response = client.get(f"/users/{user_id}", headers={**headers, "If-None-Match": f'"stale", W/{etag}'})
+
+    assert response.status_code == 304
+
+
+def test_etag_changes_after_update(client, engine):
+    """修改資料後舊的 ETag 不再相符"""
+    user_id = add_users(engine, 1)[0]
+    headers = auth_headers(user_id)
+    etag = client.get(f"/users/{user_id}", headers=headers).headers["ETag"]
+
+    updated = client.put(f"/users/{user_id}/email", json={"new_email": "etag.changed@example.com"}, headers=headers)
+    assert updated.status_code == 200, updated.text
+
+    response = client.get(f"/users/{user_id}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["data"]["email"] == "etag.changed@example.com"
+
+
+def test_sparse_fields_have_their_own_etag(client, engine):
+    """不同的 ?fields= 是不同的表示方式，ETag 不同；同一組欄位（含 ','）可以取得 304"""
+    user_id = add_users(engine, 1)[0]
+    headers = auth_headers(user_id)
+    full = client.get("/users/me", headers=headers).headers["ETag"]
+    partial = client.get("/users/me", params={"fields": "id,email"}, headers=headers).headers["ETag"]
+
+    assert full != partial
+    response = client.get("/users/me", params={"fields": "id,email"}, headers={**headers, "If-None-Match": partial})
+    assert response.status_code == 304
+    response = client.get("/users/me", headers={**headers, "If-None-Match": partial})
+    assert response.status_code == 200
+
+
+def test_me_etag_changes_with_token_roles(client, engine):
+    """/users/me 的回應隨 token 角色而不同，角色變更後不會拿到舊角色的 304"""
+    user_id = add_users(engine, 1)[0]
+    etag = client.get("/users/me", headers=auth_headers(user_id)).headers["ETag"]
+
+    response = client.get(
+        "/users/me",
+        headers={**auth_headers(user_id, ["admin", "user"]), "If-None-Match": etag}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
@@ -0,0 +1,51 @@
+"""
+test_export.py - 使用者 NDJSON 匯出測試
+檢查 GET /users/export 依 ID 順序每行輸出一位使用者，並支援 ?fields= 稀疏欄位
+"""
+
+import json
+
+from src.shared.api.streaming import NDJSON_MEDIA_TYPE
+from src.tests.contexts.user.integration.helpers import add_users, auth_headers
+
+
+def test_export_streams_every_user_as_ndjson(client, engine):
+    """每行一筆 JSON，依 ID 順序包含所有使用者"""
+    user_ids = add_users(engine, 7)
+
+    response = client.get("/users/export", headers=auth_headers(user_ids[0]))
+
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith(NDJSON_MEDIA_TYPE)
+    assert 'filename="users.ndjson"' in response.headers["content-disposition"]
+    lines = response.text.splitlines()
+    assert response.text.endswith("\n")
+    rows = [json.loads(line) for line in lines]
+    assert [row["id"] for row in rows] == user_ids
+    assert rows[0]["username"] == "user0" and rows[0]["email"] == "user0@example.com"
+
+
+def test_export_sparse_fields(client, engine):
+    """?fields= 只輸出指定欄位（id 一律輸出）"""
+    user_ids = add_users(engine, 3)
+
+    response = client.get("/users/export", params={"fields": "username"}, headers=auth_headers(user_ids[0]))
+
+    assert response.status_code == 200, response.text
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows == [{"id": user_id, "username": f"user{index}"} for index, user_id in enumerate(user_ids)]
+
+
+def test_export_empty_table(client):
+    """沒有使用者時回傳空內容"""
+    response = client.get("/users/export", headers=auth_headers(1))
+
+    assert response.status_code == 200, response.text
+    assert response.text == ""
+
+
+def test_export_requires_authentication(client):
+    """未帶 token 時回傳 401，不開始串流"""
+    response = client.get("/users/export")
+
+    assert response.status_code == 401
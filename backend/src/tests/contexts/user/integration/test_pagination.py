@@ -0,0 +1,87 @@
+"""
+test_pagination.py - 使用者列表的 keyset 分頁測試
+檢查游標編碼、keyset 驗證，以及 GET /users 逐頁取回所有資料、拒絕被竄改的游標
+"""
+
+from datetime import datetime
+
+import pytest
+
+from src.shared.dto.pagination_dto import decode_cursor, encode_cursor, validate_keyset
+from src.shared.errors.domain_error.validation_error import ValidationError
+from src.tests.contexts.user.integration.helpers import add_users, auth_headers
+
+
+def test_cursor_round_trip():
+    """encode_cursor 產生不含 padding 的 URL-safe 字串，decode_cursor 還原內容"""
+    payload = {"s": "created_at", "k": {"created_at": "2024-01-01T00:00:00+00:00", "id": 7}}
+
+    cursor = encode_cursor(payload)
+
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+    assert decode_cursor(cursor) == payload
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor([1, 2])[:-1], "W10"])
+def test_decode_cursor_rejects_garbage(cursor):
+    """無法解碼或不是物件的游標一律視為驗證錯誤"""
+    with pytest.raises(ValidationError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("keyset", [
+    None,
+    {},
+    {"id": "7"},
+    {"id": True},
+    {"id": 7, "created_at": "yesterday"},
+])
+def test_validate_keyset_rejects_tampered_values(keyset):
+    """缺少排序欄位或型別不符（包含 bool 冒充 int、非 ISO 8601 時間）"""
+    with pytest.raises(ValidationError):
+        validate_keyset(keyset, {"id": int, "created_at": datetime})
+
+
+def test_validate_keyset_drops_extra_fields():
+    """只回傳排序欄位，游標中的其他內容不會帶入查詢"""
+    keyset = {"id": 7, "created_at": "2024-01-01T00:00:00", "username": "x"}
+
+    assert validate_keyset(keyset, {"id": int, "created_at": datetime}) == {
+        "id": 7, "created_at": "2024-01-01T00:00:00"
+    }
+
+
+@pytest.mark.parametrize("sort", ["id", "created_at"])
+def test_list_users_pages_through_all_users(client, engine, sort):
+    """依 next_cursor 逐頁查詢，每位使用者剛好出現一次，最後一頁沒有下一頁"""
+    user_ids = add_users(engine, 5)
+    headers = auth_headers(user_ids[0])
+
+    seen = []
+    cursor = None
+    for _ in range(len(user_ids)):
+        params = {"limit": 2, "sort": sort, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/users", params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        page = response.json()["data"]
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        assert page["has_more"] == (cursor is not None)
+        if cursor is None:
+            break
+
+    assert seen == user_ids
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor",
+    encode_cursor({"s": "id", "k": {"id": "1 OR 1=1"}}),
+    encode_cursor({"s": "created_at", "k": {"id": 1}}),
+])
+def test_list_users_rejects_tampered_cursor(client, engine, cursor):
+    """被竄改的游標回傳 422，而不是 500"""
+    user_ids = add_users(engine, 1)
+
+    response = client.get("/users", params={"cursor": cursor}, headers=auth_headers(user_ids[0]))
+
+    assert response.status_code == 422, response.text
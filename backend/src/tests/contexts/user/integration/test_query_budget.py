@@ -0,0 +1,47 @@
+"""
+test_query_budget.py - 使用者 API 的 SQL 數量測試
+以 assert_max_queries 固定各端點執行的 SQL 數量，新增查詢（例如 N+1）時測試會失敗並列出各 fingerprint 的次數
+"""
+
+from src.core.db.query_budget import assert_max_queries
+from src.tests.contexts.user.integration.helpers import auth_headers, register
+
+
+def test_register_user_queries(client):
+    """註冊：檢查 username、檢查 email、INSERT"""
+    with assert_max_queries(3, repeat_limit=1):
+        register(client)
+
+
+def test_change_email_queries(client):
+    """修改 Email：檢查 email、載入使用者、載入要更新的資料列、UPDATE"""
+    user = register(client)
+
+    with assert_max_queries(4, repeat_limit=2):
+        response = client.put(
+            f"/users/{user['id']}/email",
+            json={"new_email": "budget.changed@example.com"},
+            headers=auth_headers(user["id"])
+        )
+    assert response.status_code == 200, response.text
+
+
+def test_get_user_queries(client):
+    """查詢使用者：沒有 If-None-Match 時只有一次 SELECT，ETag 由載入的資料產生"""
+    user = register(client)
+
+    with assert_max_queries(1) as queries:
+        response = client.get(f"/users/{user['id']}", headers=auth_headers(user["id"]))
+    assert response.status_code == 200, response.text
+    assert queries.count == 1
+
+
+def test_get_user_not_modified_queries(client):
+    """條件式查詢：If-None-Match 相符時只查詢版本"""
+    user = register(client)
+    headers = auth_headers(user["id"])
+    etag = client.get(f"/users/{user['id']}", headers=headers).headers["ETag"]
+
+    with assert_max_queries(1):
+        response = client.get(f"/users/{user['id']}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
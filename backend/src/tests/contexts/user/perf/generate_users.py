@@ -0,0 +1,284 @@
+"""
+generate_users.py - 大量使用者測試資料產生器
+產生 N 筆擬真的使用者資料，供 Repository、登入流程與分頁端點的效能測試使用
+
+使用方式：
+    # 產生 100 萬筆使用者並輸出為 NDJSON（可直接放進 infra/seed/data/users.ndjson）
+    python -m src.tests.contexts.user.perf.generate_users --count 1000000 --output users.ndjson
+
+    # 產生 500 萬筆使用者並直接匯入資料庫
+    python -m src.tests.contexts.user.perf.generate_users --count 5000000 --load
+
+密碼：第 i 筆使用者的密碼為 f"{--password}{i % --password-pool}"，
+雜湊值在啟動時預先計算一次，之後重複使用
+"""
+
+import argparse
+import itertools
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import bcrypt
+
+# 添加項目根目錄到 Python 路徑
+project_root = Path(__file__).parent.parent.parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+
+# 常見名稱（依出現頻率排序，搭配 Zipf 權重產生偏斜分布）
+FIRST_NAMES = [
+    "john", "david", "michael", "chris", "alex", "james", "daniel", "mark", "paul", "kevin",
+    "jason", "ryan", "eric", "brian", "steven", "tom", "andrew", "peter", "sam", "matt",
+    "mary", "sarah", "emma", "anna", "lisa", "laura", "amy", "jessica", "emily", "kate",
+    "wei", "ming", "jun", "hui", "yu", "ling", "hao", "jie", "xin", "yan",
+    "kenji", "yuki", "haruto", "sakura", "minjun", "jiwoo", "seoyeon", "arjun", "priya", "rahul",
+    "carlos", "maria", "jose", "lucas", "sofia", "mateo", "pedro", "ana", "diego", "lucia",
+]
+
+# 常見 Email 網域（依市佔排序，搭配 Zipf 權重）
+EMAIL_DOMAINS = [
+    "gmail.com", "yahoo.com", "outlook.com", "hotmail.com", "icloud.com",
+    "qq.com", "163.com", "yahoo.com.tw", "naver.com", "proton.me",
+    "gmx.de", "mail.ru", "aol.com", "live.com", "example.com",
+    "company.io", "university.edu", "startup.dev", "agency.co", "corp.net",
+]
+
+USERNAME_SEPARATORS = ["", "_", ".", ""]
+
+
+def zipf_cum_weights(size: int, exponent: float) -> List[float]:
+    """
+    計算 Zipf 分布的累積權重（供 random.choices 使用）
+
+    Args:
+        size: 項目數量
+        exponent: Zipf 指數，越大分布越偏斜
+
+    Returns:
+        累積權重列表
+    """
+    return list(itertools.accumulate(1.0 / (rank ** exponent) for rank in range(1, size + 1)))
+
+
+def precompute_password_hashes(base_password: str, pool_size: int, rounds: int) -> List[str]:
+    """
+    預先計算密碼雜湊
+
+    Args:
+        base_password: 密碼前綴
+        pool_size: 密碼數量
+        rounds: bcrypt rounds
+
+    Returns:
+        雜湊列表，索引 i 對應密碼 f"{base_password}{i}"
+    """
+    return [
+        bcrypt.hashpw(f"{base_password}{i}".encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+        for i in range(pool_size)
+    ]
+
+
+class UserDataGenerator:
+    """
+    使用者資料產生器
+
+    - 使用者名稱：名稱前綴依 Zipf 分布偏斜，後綴為流水號的 16 進位以保證唯一
+    - Email 網域：依 Zipf 分布偏斜，部分使用者沒有 Email
+    - created_at：隨流水號遞增並加入抖動，模擬真實的註冊時間分布
+    """
+
+    def __init__(
+        self,
+        password_hashes: Sequence[str],
+        prefix: str = "",
+        start_index: int = 0,
+        skew: float = 1.1,
+        null_email_ratio: float = 0.05,
+        days: int = 730,
+        seed: Optional[int] = None
+    ):
+        """
+        初始化產生器
+
+        Args:
+            password_hashes: 預先計算的密碼雜湊
+            prefix: 使用者名稱前綴（避免與既有資料衝突）
+            start_index: 流水號起始值
+            skew: Zipf 指數
+            null_email_ratio: 沒有 Email 的比例
+            days: created_at 分布的天數範圍
+            seed: 亂數種子
+        """
+        self.password_hashes = password_hashes
+        self.prefix = prefix
+        self.start_index = start_index
+        self.null_email_ratio = null_email_ratio
+        self.days = days
+        self.random = random.Random(seed)
+        self.name_weights = zipf_cum_weights(len(FIRST_NAMES), skew)
+        self.domain_weights = zipf_cum_weights(len(EMAIL_DOMAINS), skew)
+
+    def iter_batches(self, count: int, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """
+        分批產生使用者資料
+
+        Args:
+            count: 總筆數
+            batch_size: 每批筆數
+
+        Yields:
+            一批使用者資料
+        """
+        now = datetime.now(timezone.utc)
+        start_time = now - timedelta(days=self.days)
+        span_seconds = self.days * 86400
+        pool_size = len(self.password_hashes)
+        rng = self.random
+
+        for batch_start in range(0, count, batch_size):
+            size = min(batch_size, count - batch_start)
+            names = rng.choices(FIRST_NAMES, cum_weights=self.name_weights, k=size)
+            domains = rng.choices(EMAIL_DOMAINS, cum_weights=self.domain_weights, k=size)
+            separators = rng.choices(USERNAME_SEPARATORS, k=size)
+
+            batch = []
+            for offset in range(size):
+                index = self.start_index + batch_start + offset
+                username = f"{self.prefix}{names[offset]}{separators[offset]}{index:x}"
+
+                email = None
+                if rng.random() >= self.null_email_ratio:
+                    email = f"{username}@{domains[offset]}"
+
+                # 註冊時間隨流水號遞增，並加入最多一小時的抖動
+                progress = (batch_start + offset) / count
+                created_at = start_time + timedelta(seconds=progress * span_seconds + rng.random() * 3600)
+
+                batch.append({
+                    "username": username,
+                    "email": email,
+                    "password_hash": self.password_hashes[index % pool_size],
+                    "created_at": min(created_at, now)
+                })
+
+            yield batch
+
+
+def _json_default(value: Any) -> str:
+    """將 datetime 序列化為 ISO 8601 字串"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def write_ndjson(batches: Iterator[List[Dict[str, Any]]], output: str) -> int:
+    """
+    將資料寫成 NDJSON
+
+    Args:
+        batches: 資料批次
+        output: 輸出檔案路徑，"-" 代表標準輸出
+
+    Returns:
+        寫入筆數
+    """
+    written = 0
+    stream = sys.stdout if output == "-" else open(output, "w", encoding="utf-8")
+    try:
+        for batch in batches:
+            stream.write("".join(json.dumps(row, ensure_ascii=False, default=_json_default) + "\n" for row in batch))
+            written += len(batch)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    return written
+
+
+def load_into_database(batches: Iterator[List[Dict[str, Any]]], database_url: Optional[str]) -> int:
+    """
+    使用 BulkLoader 將資料匯入資料庫
+
+    Args:
+        batches: 資料批次
+        database_url: 資料庫連線字串，未提供則使用設定檔
+
+    Returns:
+        寫入筆數
+    """
+    from sqlalchemy import create_engine
+    from src.core.db.bulk_loader import BulkLoader
+    from src.core.db.connection import Base, get_engine
+    from src.contexts.user.infra.schema.user import User as UserSchema
+
+    engine = create_engine(database_url) if database_url else get_engine()
+    Base.metadata.create_all(bind=engine, tables=[UserSchema.__table__])
+
+    result = BulkLoader(engine, UserSchema, progress_interval=2.0).load(batches)
+    return result.inserted
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """解析命令列參數"""
+    parser = argparse.ArgumentParser(description="產生大量使用者測試資料")
+    parser.add_argument("--count", type=int, required=True, help="產生的使用者數量")
+    parser.add_argument("--output", help="輸出 NDJSON 檔案路徑（- 代表標準輸出）")
+    parser.add_argument("--load", action="store_true", help="直接匯入資料庫")
+    parser.add_argument("--database-url", help="資料庫連線字串（預設使用設定檔）")
+    parser.add_argument("--batch-size", type=int, default=10000, help="每批筆數")
+    parser.add_argument("--prefix", default="", help="使用者名稱前綴")
+    parser.add_argument("--start-index", type=int, default=0, help="流水號起始值")
+    parser.add_argument("--skew", type=float, default=1.1, help="名稱與網域分布的 Zipf 指數")
+    parser.add_argument("--null-email-ratio", type=float, default=0.05, help="沒有 Email 的比例")
+    parser.add_argument("--days", type=int, default=730, help="註冊時間分布的天數範圍")
+    parser.add_argument("--password", default="PerfPass", help="密碼前綴")
+    parser.add_argument("--password-pool", type=int, default=16, help="不同密碼的數量")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12, help="預先計算雜湊的 bcrypt rounds")
+    parser.add_argument("--seed", type=int, default=None, help="亂數種子（固定後可重現資料）")
+
+    args = parser.parse_args(argv)
+    if not args.output and not args.load:
+        parser.error("必須指定 --output 或 --load")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令列入口"""
+    args = parse_args(argv)
+    log = sys.stderr
+
+    print(f"🔐 預先計算 {args.password_pool} 組密碼雜湊 (rounds={args.bcrypt_rounds})", file=log)
+    password_hashes = precompute_password_hashes(args.password, args.password_pool, args.bcrypt_rounds)
+
+    generator = UserDataGenerator(
+        password_hashes=password_hashes,
+        prefix=args.prefix,
+        start_index=args.start_index,
+        skew=args.skew,
+        null_email_ratio=args.null_email_ratio,
+        days=args.days,
+        seed=args.seed
+    )
+    batches = generator.iter_batches(args.count, args.batch_size)
+
+    started_at = time.perf_counter()
+    if args.load:
+        print(f"🚀 產生並匯入 {args.count} 筆使用者", file=log)
+        written = load_into_database(batches, args.database_url)
+    else:
+        print(f"🚀 產生 {args.count} 筆使用者 → {args.output}", file=log)
+        written = write_ndjson(batches, args.output)
+    elapsed = time.perf_counter() - started_at
+
+    rate = written / elapsed if elapsed > 0 else 0.0
+    print(f"✅ 完成 {written} 筆，耗時 {elapsed:.1f}s ({rate:.0f} 筆/秒)", file=log)
+    print(f"💡 第 i 筆使用者的密碼為 '{args.password}{{i % {args.password_pool}}}'", file=log)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())